@@ -1,5 +1,5 @@
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -26,6 +26,31 @@ class MemoryItem(BaseModel):
     updated_at: Optional[str] = Field(None, description="The timestamp when the memory was updated")
 
 
+class FactExtractionBatchConfig(BaseModel):
+    max_wait_ms: float = Field(
+        description="Milliseconds a fact extraction request waits for others to share its LLM call", default=20
+    )
+    max_batch_size: int = Field(description="Conversations sent in one fact extraction LLM call", default=8)
+
+
+class FactExtractionFilterConfig(BaseModel):
+    min_chars: int = Field(
+        description="Letters and digits that have to be left once greetings and other stop phrases are taken out",
+        default=2,
+    )
+    stop_phrases: List[str] = Field(
+        description="Phrases carrying no facts in addition to the built-in lexicon", default_factory=list
+    )
+    classifier: Optional[Callable[[str], float]] = Field(
+        description="Local model returning the probability that a text holds facts worth remembering",
+        default=None,
+    )
+    classifier_threshold: float = Field(
+        description="Texts scored below this by the classifier are skipped",
+        default=0.5,
+    )
+
+
 class MemoryConfig(BaseModel):
     vector_store: VectorStoreConfig = Field(
         description="Configuration for the vector store",
@@ -59,6 +84,24 @@ class MemoryConfig(BaseModel):
         description="Custom prompt for the update memory",
         default=None,
     )
+    update_memory_token_budget: Optional[int] = Field(
+        description="Tokens allowed in a memory update prompt. Retrieved memories are cut to the closest matches "
+        "and large fact sets are split into parallel update calls to stay within it. Unlimited if None",
+        default=None,
+    )
+    stream_memory_actions: bool = Field(
+        description="Stream the memory update response and apply each ADD, UPDATE or DELETE as soon as the model "
+        "has written it, instead of waiting for the whole response",
+        default=False,
+    )
+    fact_extraction_filter: Optional[FactExtractionFilterConfig] = Field(
+        description="Skip the fact extraction LLM call for messages without facts, such as greetings and thanks",
+        default=None,
+    )
+    fact_extraction_batch: Optional[FactExtractionBatchConfig] = Field(
+        description="Coalesce the fact extraction of concurrent add calls into shared LLM calls",
+        default=None,
+    )
 
 
 class AzureConfig(BaseModel):
@@ -18,6 +18,9 @@ class BaseEmbedderConfig(ABC):
         embedding_dims: Optional[int] = None,
         # Ollama specific
         ollama_base_url: Optional[str] = None,
+        ollama_batch_size: int = 64,
+        ollama_keep_alive: Optional[Union[str, float]] = None,
+        ollama_legacy_embeddings: bool = False,
         # Openai specific
         openai_base_url: Optional[str] = None,
         # Huggingface specific
@@ -51,6 +54,14 @@ class BaseEmbedderConfig(ABC):
         :type embedding_dims: Optional[int], optional
         :param ollama_base_url: Base URL for the Ollama API, defaults to None
         :type ollama_base_url: Optional[str], optional
+        :param ollama_batch_size: Texts sent per Ollama embed request, defaults to 64
+        :type ollama_batch_size: int, optional
+        :param ollama_keep_alive: How long Ollama keeps the model loaded after a request, e.g. "10m" or -1 to keep it
+            loaded, defaults to None for the server default
+        :type ollama_keep_alive: Optional[Union[str, float]], optional
+        :param ollama_legacy_embeddings: Embed one text per request with the legacy /api/embeddings endpoint, whose
+            vectors are not normalized, e.g. for collections written before the switch to /api/embed, defaults to False
+        :type ollama_legacy_embeddings: bool, optional
         :param model_kwargs: key-value arguments for the huggingface embedding model, defaults a dict inside init
         :type model_kwargs: Optional[Dict[str, Any]], defaults a dict inside init
         :param huggingface_base_url: Huggingface base URL to be use, defaults to None
@@ -83,6 +94,9 @@ class BaseEmbedderConfig(ABC):
 
         # Ollama specific
         self.ollama_base_url = ollama_base_url
+        self.ollama_batch_size = ollama_batch_size
+        self.ollama_keep_alive = ollama_keep_alive
+        self.ollama_legacy_embeddings = ollama_legacy_embeddings
 
         # Huggingface specific
         self.model_kwargs = model_kwargs or {}
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from mem0.configs.llms.base import BaseLlmConfig
 
@@ -23,6 +23,9 @@ class AnthropicConfig(BaseLlmConfig):
         http_client_proxies: Optional[dict] = None,
         # Anthropic-specific parameters
         anthropic_base_url: Optional[str] = None,
+        prompt_caching: bool = True,
+        # Response monitoring callback
+        response_callback: Optional[Callable[[Any, Any, dict], None]] = None,
     ):
         """
         Initialize Anthropic configuration.
@@ -38,6 +41,11 @@ class AnthropicConfig(BaseLlmConfig):
             vision_details: Vision detail level, defaults to "auto"
             http_client_proxies: HTTP client proxy settings, defaults to None
             anthropic_base_url: Anthropic API base URL, defaults to None
+            prompt_caching: Mark the system prompt with a ``cache_control`` breakpoint so Anthropic caches it,
+                defaults to True
+            response_callback: Optional callback for monitoring LLM responses. It receives the LLM, the raw
+                response and the request params, cached prompt tokens are in
+                ``response.usage.cache_read_input_tokens``, defaults to None
         """
         # Initialize base parameters
         super().__init__(
@@ -54,3 +62,6 @@ class AnthropicConfig(BaseLlmConfig):
 
         # Anthropic-specific parameters
         self.anthropic_base_url = anthropic_base_url
+        self.prompt_caching = prompt_caching
+        # Response monitoring
+        self.response_callback = response_callback
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Callable, List
 from mem0.configs.llms.base import BaseLlmConfig
 import os
 
@@ -23,6 +23,8 @@ class AWSBedrockConfig(BaseLlmConfig):
         aws_session_token: Optional[str] = None,
         aws_profile: Optional[str] = None,
         model_kwargs: Optional[Dict[str, Any]] = None,
+        prompt_caching: bool = False,
+        response_callback: Optional[Callable[[Any, dict, dict], None]] = None,
         **kwargs,
     ):
         """
@@ -40,6 +42,10 @@ class AWSBedrockConfig(BaseLlmConfig):
             aws_session_token: AWS session token for temporary credentials
             aws_profile: AWS profile name for credentials
             model_kwargs: Additional model-specific parameters
+            prompt_caching: Add a cache point after the system prompt, for models that support Bedrock prompt
+                caching
+            response_callback: Optional callback for monitoring LLM responses. It receives the LLM, the response
+                and the request params, the response usage holds the cached prompt tokens
             **kwargs: Additional arguments passed to base class
         """
         super().__init__(
@@ -57,6 +63,8 @@ class AWSBedrockConfig(BaseLlmConfig):
         self.aws_session_token = aws_session_token
         self.aws_profile = aws_profile
         self.model_kwargs = model_kwargs or {}
+        self.prompt_caching = prompt_caching
+        self.response_callback = response_callback
 
     @property
     def provider(self) -> str:
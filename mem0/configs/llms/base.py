@@ -59,4 +59,5 @@ class BaseLlmConfig(ABC):
         self.top_k = top_k
         self.enable_vision = enable_vision
         self.vision_details = vision_details
+        self.http_client_proxies = http_client_proxies
         self.http_client = httpx.Client(proxies=http_client_proxies) if http_client_proxies else None
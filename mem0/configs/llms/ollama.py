@@ -23,6 +23,7 @@ class OllamaConfig(BaseLlmConfig):
         http_client_proxies: Optional[dict] = None,
         # Ollama-specific parameters
         ollama_base_url: Optional[str] = None,
+        structured_output: bool = True,
     ):
         """
         Initialize Ollama configuration.
@@ -38,6 +39,7 @@ class OllamaConfig(BaseLlmConfig):
             vision_details: Vision detail level, defaults to "auto"
             http_client_proxies: HTTP client proxy settings, defaults to None
             ollama_base_url: Ollama base URL, defaults to None
+            structured_output: Constrain JSON responses and tool calls to their JSON schema, defaults to True
         """
         # Initialize base parameters
         super().__init__(
@@ -54,3 +56,4 @@ class OllamaConfig(BaseLlmConfig):
 
         # Ollama-specific parameters
         self.ollama_base_url = ollama_base_url
+        self.structured_output = structured_output
@@ -50,7 +50,9 @@ class OpenAIConfig(BaseLlmConfig):
             openrouter_base_url: OpenRouter base URL, defaults to None
             site_url: Site URL for OpenRouter, defaults to None
             app_name: Application name for OpenRouter, defaults to None
-            response_callback: Optional callback for monitoring LLM responses.
+            response_callback: Optional callback for monitoring LLM responses. It receives the LLM, the raw
+                response and the request params, prompt tokens served from OpenAI's prompt cache are in
+                ``response.usage.prompt_tokens_details.cached_tokens``.
         """
         # Initialize base parameters
         super().__init__(
@@ -23,6 +23,7 @@ class VllmConfig(BaseLlmConfig):
         http_client_proxies: Optional[dict] = None,
         # vLLM-specific parameters
         vllm_base_url: Optional[str] = None,
+        structured_output: bool = True,
     ):
         """
         Initialize vLLM configuration.
@@ -38,6 +39,7 @@ class VllmConfig(BaseLlmConfig):
             vision_details: Vision detail level, defaults to "auto"
             http_client_proxies: HTTP client proxy settings, defaults to None
             vllm_base_url: vLLM base URL, defaults to None
+            structured_output: Constrain JSON responses and tool calls to their JSON schema, defaults to True
         """
         # Initialize base parameters
         super().__init__(
@@ -54,3 +56,4 @@ class VllmConfig(BaseLlmConfig):
 
         # vLLM-specific parameters
         self.vllm_base_url = vllm_base_url or "http://localhost:8000/v1"
+        self.structured_output = structured_output
@@ -15,6 +15,9 @@ class ChromaDbConfig(BaseModel):
     path: Optional[str] = Field(None, description="Path to the database directory")
     host: Optional[str] = Field(None, description="Database connection remote host")
     port: Optional[int] = Field(None, description="Database connection remote port")
+    batch_size: Optional[int] = Field(
+        None, description="Records per add/update/delete request. Defaults to the client's max_batch_size"
+    )
 
     @model_validator(mode="before")
     def check_host_port_or_path(cls, values):
@@ -1,5 +1,5 @@
 from collections.abc import Callable
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -20,6 +20,14 @@ class ElasticsearchConfig(BaseModel):
         None, description="Custom search query function. Parameters: (query, limit, filters) -> Dict"
     )
     headers: Optional[Dict[str, str]] = Field(None, description="Custom headers to include in requests")
+    bulk_chunk_size: int = Field(500, description="Number of documents sent per bulk request")
+    bulk_thread_count: int = Field(1, description="Threads used for bulk writes; values above 1 use parallel_bulk")
+    refresh: Optional[Union[bool, str]] = Field(
+        None, description="Refresh policy for writes: True, False or 'wait_for'. Defaults to the index setting"
+    )
+    num_candidates_multiplier: int = Field(
+        2, description="kNN num_candidates as a multiple of the requested limit (capped at 10000)"
+    )
 
     @model_validator(mode="before")
     @classmethod
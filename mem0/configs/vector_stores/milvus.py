@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -26,6 +26,17 @@ class MilvusDBConfig(BaseModel):
     embedding_model_dims: int = Field(1536, description="Dimensions of the embedding model")
     metric_type: str = Field("L2", description="Metric type for similarity search")
     db_name: str = Field("", description="Name of the database")
+    partition_key_field: Optional[str] = Field(
+        "user_id", description="Scope field stored as the Milvus partition key for new collections (None to disable)"
+    )
+    index_type: str = Field("AUTOINDEX", description="Vector index type, e.g. AUTOINDEX, HNSW, IVF_FLAT or DISKANN")
+    index_params: Optional[Dict[str, Any]] = Field(
+        None, description="Index build parameters, e.g. {'M': 16, 'efConstruction': 200} for HNSW"
+    )
+    search_params: Optional[Dict[str, Any]] = Field(
+        None, description="Search parameters, e.g. {'ef': 64} for HNSW or {'nprobe': 16} for IVF"
+    )
+    batch_size: int = Field(1000, description="Number of rows sent per insert/upsert request")
 
     @model_validator(mode="before")
     @classmethod
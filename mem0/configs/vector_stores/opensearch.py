@@ -18,6 +18,15 @@ class OpenSearchConfig(BaseModel):
         "RequestsHttpConnection", description="Connection class for OpenSearch"
     )
     pool_maxsize: int = Field(20, description="Maximum number of connections in the pool")
+    engine: str = Field(
+        "nmslib", description="k-NN engine for new indices. 'lucene' and 'faiss' support filtering inside the kNN query"
+    )
+    bulk_chunk_size: int = Field(500, description="Number of documents sent per bulk request")
+    bulk_thread_count: int = Field(1, description="Threads used for bulk writes; values above 1 use parallel_bulk")
+    refresh: Optional[Union[bool, str]] = Field(
+        None, description="Refresh policy for writes: True, False or 'wait_for'. Defaults to the index setting"
+    )
+    num_candidates_multiplier: int = Field(2, description="kNN k as a multiple of the requested limit")
 
     @model_validator(mode="before")
     @classmethod
@@ -19,6 +19,12 @@ class PineconeConfig(BaseModel):
     batch_size: int = Field(100, description="Batch size for operations")
     extra_params: Optional[Dict[str, Any]] = Field(None, description="Additional parameters for Pinecone client")
     namespace: Optional[str] = Field(None, description="Namespace for the collection")
+    namespace_field: Optional[str] = Field(
+        None,
+        description="Payload key (e.g. 'user_id') whose value is used as a per-tenant namespace. ID-based calls for "
+        "IDs this process has not recently written or read look them up in every namespace of the index",
+    )
+    pool_threads: int = Field(1, description="Threads used to send upsert chunks and batched queries concurrently")
 
     @model_validator(mode="before")
     @classmethod
@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Literal
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -8,6 +8,14 @@ class RedisDBConfig(BaseModel):
     redis_url: str = Field(..., description="Redis URL")
     collection_name: str = Field("mem0", description="Collection name")
     embedding_model_dims: int = Field(1536, description="Embedding model dimensions")
+    index_algorithm: Literal["flat", "hnsw"] = Field("flat", description="Vector index algorithm ('flat' or 'hnsw')")
+    hnsw_m: int = Field(16, description="HNSW max outgoing edges per node (M)")
+    hnsw_ef_construction: int = Field(200, description="HNSW candidate list size at build time (EF_CONSTRUCTION)")
+    hnsw_ef_runtime: int = Field(10, description="HNSW candidate list size at query time (EF_RUNTIME)")
+    vector_datatype: Literal["float32", "float16"] = Field(
+        "float32", description="Datatype used to store vectors ('float16' halves memory usage)"
+    )
+    batch_size: int = Field(500, description="Number of commands sent per pipeline for batch operations")
 
     @model_validator(mode="before")
     @classmethod
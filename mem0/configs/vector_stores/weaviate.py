@@ -13,6 +13,10 @@ class WeaviateConfig(BaseModel):
     cluster_url: Optional[str] = Field(None, description="URL for Weaviate server")
     auth_client_secret: Optional[str] = Field(None, description="API key for Weaviate authentication")
     additional_headers: Optional[Dict[str, str]] = Field(None, description="Additional headers for requests")
+    batch_size: Optional[int] = Field(
+        None, description="Fixed batch size for writes. Dynamic batching is used when not set"
+    )
+    batch_concurrent_requests: int = Field(2, description="Concurrent requests used by fixed-size batches")
 
     @model_validator(mode="before")
     @classmethod
@@ -11,6 +11,9 @@ SCOPE = "https://cognitiveservices.azure.com/.default"
 
 
 class AzureOpenAIEmbedding(EmbeddingBase):
+    # Inputs the embeddings endpoint accepts per request
+    MAX_BATCH_SIZE = 2048
+
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
         super().__init__(config)
 
@@ -53,3 +56,24 @@ class AzureOpenAIEmbedding(EmbeddingBase):
         """
         text = text.replace("\n", " ")
         return self.client.embeddings.create(input=[text], model=self.config.model).data[0].embedding
+
+    def embed_batch(self, texts, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for several texts with one Azure OpenAI request per MAX_BATCH_SIZE texts.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in the same order.
+        """
+        if not texts:
+            return []
+        texts = [text.replace("\n", " ") for text in texts]
+        embeddings = []
+        for start in range(0, len(texts), self.MAX_BATCH_SIZE):
+            response = self.client.embeddings.create(
+                input=texts[start : start + self.MAX_BATCH_SIZE], model=self.config.model
+            )
+            embeddings.extend(item.embedding for item in response.data)
+        return embeddings
@@ -29,3 +29,17 @@ class EmbeddingBase(ABC):
             list: The embedding vector.
         """
         pass
+
+    def embed_batch(self, texts, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for several texts.
+
+        Providers with a batch endpoint override this to embed all texts in one request.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in the same order.
+        """
+        return [self.embed(text, memory_action) for text in texts]
@@ -2,7 +2,12 @@ import logging
 from typing import Literal, Optional
 
 from openai import OpenAI
-from sentence_transformers import SentenceTransformer
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    # Not needed for TEI or the ONNX Runtime backend
+    SentenceTransformer = None
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
 from mem0.embeddings.base import EmbeddingBase
@@ -16,14 +21,27 @@ class HuggingFaceEmbedding(EmbeddingBase):
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
         super().__init__(config)
 
+        self.onnx_encoder = None
         if config.huggingface_base_url:
             self.client = OpenAI(base_url=config.huggingface_base_url)
         else:
             self.config.model = self.config.model or "multi-qa-MiniLM-L6-cos-v1"
 
-            self.model = SentenceTransformer(self.config.model, **self.config.model_kwargs)
+            model_kwargs = dict(self.config.model_kwargs)
+            if model_kwargs.pop("backend", None) == "onnxruntime":
+                # Encodes on ONNX Runtime without loading PyTorch, see OnnxSentenceEncoder for the options
+                from mem0.embeddings.huggingface_onnx import get_onnx_encoder
 
-            self.config.embedding_dims = self.config.embedding_dims or self.model.get_sentence_embedding_dimension()
+                self.onnx_encoder = get_onnx_encoder(self.config.model, **model_kwargs)
+                self.config.embedding_dims = self.config.embedding_dims or self.onnx_encoder.dimension
+            else:
+                if SentenceTransformer is None:
+                    raise ImportError(
+                        "The 'sentence-transformers' library is required. Please install it using "
+                        "'pip install sentence-transformers'."
+                    )
+                self.model = SentenceTransformer(self.config.model, **self.config.model_kwargs)
+                self.config.embedding_dims = self.config.embedding_dims or self.model.get_sentence_embedding_dimension()
 
     def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
         """
@@ -37,5 +55,27 @@ class HuggingFaceEmbedding(EmbeddingBase):
         """
         if self.config.huggingface_base_url:
             return self.client.embeddings.create(input=text, model="tei").data[0].embedding
+        elif self.onnx_encoder:
+            # Concurrent callers share the session run of a micro-batch
+            return self.onnx_encoder.submit(text).result().tolist()
         else:
             return self.model.encode(text, convert_to_numpy=True).tolist()
+
+    def embed_batch(self, texts, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for several texts with a single Hugging Face request or batched encode.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in the same order.
+        """
+        if not texts:
+            return []
+        if self.config.huggingface_base_url:
+            return [item.embedding for item in self.client.embeddings.create(input=texts, model="tei").data]
+        elif self.onnx_encoder:
+            return [embedding.tolist() for embedding in self.onnx_encoder.encode_many(texts)]
+        else:
+            return self.model.encode(texts, convert_to_numpy=True).tolist()
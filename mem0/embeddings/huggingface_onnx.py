@@ -0,0 +1,298 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    from huggingface_hub import hf_hub_download
+    from huggingface_hub.utils import EntryNotFoundError
+    from tokenizers import Tokenizer
+except ImportError:
+    raise ImportError(
+        "The ONNX Runtime backend requires the 'onnxruntime', 'tokenizers' and 'huggingface_hub' libraries. "
+        "Please install them using 'pip install onnxruntime tokenizers huggingface_hub'."
+    )
+
+from mem0.memory.setup import mem0_dir
+
+logger = logging.getLogger(__name__)
+
+# Encoders by model and options, so every embedder of a process shares one warm tokenizer, session and worker
+_encoders = {}
+_encoders_lock = threading.Lock()
+
+
+def get_onnx_encoder(model: str, **options) -> "OnnxSentenceEncoder":
+    """
+    The process-wide encoder of a model, loaded on first use.
+
+    Args:
+        model (str): Hugging Face model id or local directory of a Sentence Transformers model.
+        **options: The other arguments of ``OnnxSentenceEncoder``.
+
+    Returns:
+        OnnxSentenceEncoder: The shared encoder.
+    """
+    key = (model, tuple(sorted(options.items())))
+    with _encoders_lock:
+        if key not in _encoders:
+            _encoders[key] = OnnxSentenceEncoder(model, **options)
+        return _encoders[key]
+
+
+def _model_id(model):
+    # Sentence Transformers resolves the short names of its own models, e.g. "all-MiniLM-L6-v2", the same way
+    if "/" in model or os.path.isdir(model):
+        return model
+    return f"sentence-transformers/{model}"
+
+
+def _resolve_file(model, filename, required=True):
+    if os.path.isdir(model):
+        path = os.path.join(model, filename)
+        if os.path.exists(path):
+            return path
+        if required:
+            raise FileNotFoundError(f"{filename} not found in {model}")
+        return None
+    try:
+        return hf_hub_download(model, filename)
+    except EntryNotFoundError:
+        if required:
+            raise
+        return None
+
+
+def _load_json(model, filename):
+    path = _resolve_file(model, filename, required=False)
+    if path is None:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _export_onnx(model):
+    try:
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+    except ImportError:
+        raise ImportError(
+            f"The model '{model}' ships no ONNX weights, exporting it requires the 'optimum' library. "
+            "Please install it using 'pip install optimum[onnxruntime]', or set 'file_name' to an ONNX file."
+        )
+    directory = os.path.join(mem0_dir, "onnx", model.replace("/", "--"))
+    path = os.path.join(directory, "model.onnx")
+    if not os.path.exists(path):
+        logger.info(f"Exporting {model} to ONNX in {directory}")
+        ORTModelForFeatureExtraction.from_pretrained(model, export=True).save_pretrained(directory)
+    return path
+
+
+def _quantize_onnx(path):
+    quantized = f"{os.path.splitext(path)[0]}_qint8.onnx"
+    if not os.path.exists(quantized):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info(f"Quantizing {path} to int8")
+        quantize_dynamic(path, quantized, weight_type=QuantType.QInt8)
+    return quantized
+
+
+class OnnxSentenceEncoder:
+    """Encodes texts with the ONNX export of a Sentence Transformers model on ONNX Runtime, without PyTorch.
+
+    The pooling and normalization are read from the model's Sentence Transformers configuration, so the embeddings
+    match those of ``SentenceTransformer.encode``. Texts submitted one at a time by concurrent callers are encoded
+    together in micro-batches by a background worker: it waits at most ``max_wait_ms`` after the first text for
+    others, up to ``max_batch_size``.
+
+    Args:
+        model (str): Hugging Face model id or local directory of a Sentence Transformers model.
+        file_name (str, optional): ONNX file in the model repository. Defaults to ``onnx/model.onnx``, exported with
+            ``optimum`` if the repository has none.
+        quantize (bool): Quantize the weights to int8 with dynamic quantization, saved next to the ONNX file.
+        intra_op_num_threads (int, optional): Threads used within an operator. Defaults to ONNX Runtime's choice.
+        inter_op_num_threads (int, optional): Threads used across operators. Defaults to ONNX Runtime's choice.
+        max_batch_size (int): Texts encoded in one session run.
+        max_wait_ms (float): How long the worker waits for more texts before encoding a micro-batch.
+        max_length (int, optional): Tokens kept per text. Defaults to the model's ``max_seq_length``.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        file_name: Optional[str] = None,
+        quantize: bool = False,
+        intra_op_num_threads: Optional[int] = None,
+        inter_op_num_threads: Optional[int] = None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+        max_length: Optional[int] = None,
+    ):
+        model = _model_id(model)
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+
+        st_config = _load_json(model, "sentence_bert_config.json") or {}
+        self.tokenizer = Tokenizer.from_file(_resolve_file(model, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length or st_config.get("max_seq_length") or 512)
+        if self.tokenizer.padding is None:
+            pad_token = "<pad>" if self.tokenizer.token_to_id("<pad>") is not None else "[PAD]"
+            self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id(pad_token) or 0, pad_token=pad_token)
+
+        self.pooling_modes, self.normalize = self._load_pooling(model)
+
+        if file_name:
+            path = _resolve_file(model, file_name)
+        else:
+            path = _resolve_file(model, "onnx/model.onnx", required=False) or _export_onnx(model)
+        if quantize:
+            path = _quantize_onnx(path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_num_threads:
+            options.intra_op_num_threads = intra_op_num_threads
+        if inter_op_num_threads:
+            options.inter_op_num_threads = inter_op_num_threads
+        self.session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.output_names = [output.name for output in self.session.get_outputs()]
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._dimension = None
+
+    @staticmethod
+    def _load_pooling(model):
+        modules = _load_json(model, "modules.json")
+        if not modules:
+            # A plain transformers model, Sentence Transformers mean-pools those without normalizing
+            return ["mean_tokens"], False
+
+        pooling_modes = ["mean_tokens"]
+        for module in modules:
+            if module.get("type", "").endswith("Pooling"):
+                config = _load_json(model, f"{module['path']}/config.json") or {}
+                pooling_modes = [
+                    mode
+                    for mode in ("cls_token", "max_tokens", "mean_tokens", "lasttoken")
+                    if config.get(f"pooling_mode_{mode}")
+                ]
+                unsupported = ("pooling_mode_mean_sqrt_len_tokens", "pooling_mode_weightedmean_tokens")
+                if not pooling_modes or any(config.get(key) for key in unsupported):
+                    raise ValueError(f"Unsupported pooling configuration of {model}: {config}")
+        normalize = any(module.get("type", "").endswith("Normalize") for module in modules)
+        return pooling_modes, normalize
+
+    @property
+    def dimension(self) -> int:
+        """Size of the embeddings."""
+        if self._dimension is None:
+            self._dimension = len(self.encode(["dimension"])[0])
+        return self._dimension
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts with one session run.
+
+        Args:
+            texts (list): The texts to encode.
+
+        Returns:
+            np.ndarray: One embedding per text.
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feeds = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": attention_mask,
+            "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        outputs = self.session.run(None, {name: value for name, value in feeds.items() if name in self.input_names})
+
+        if "sentence_embedding" in self.output_names:
+            embeddings = outputs[self.output_names.index("sentence_embedding")]
+        else:
+            embeddings = self._pool(outputs[0], attention_mask)
+        if self.normalize:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings.astype(np.float32)
+
+    def _pool(self, token_embeddings, attention_mask):
+        mask = attention_mask[:, :, None].astype(token_embeddings.dtype)
+        pooled = []
+        for mode in self.pooling_modes:
+            if mode == "cls_token":
+                pooled.append(token_embeddings[:, 0])
+            elif mode == "max_tokens":
+                pooled.append(np.where(mask > 0, token_embeddings, -1e9).max(axis=1))
+            elif mode == "mean_tokens":
+                pooled.append((token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None))
+            elif mode == "lasttoken":
+                last = attention_mask.shape[1] - 1 - np.argmax(attention_mask[:, ::-1], axis=1)
+                pooled.append(token_embeddings[np.arange(len(last)), last])
+        return np.concatenate(pooled, axis=1)
+
+    def encode_many(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Encode texts ``max_batch_size`` at a time, grouping texts of similar length to pad less.
+
+        Args:
+            texts (list): The texts to encode.
+
+        Returns:
+            list: One embedding per text, in the same order.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        embeddings = [None] * len(texts)
+        for start in range(0, len(order), self.max_batch_size):
+            indices = order[start : start + self.max_batch_size]
+            for i, embedding in zip(indices, self.encode([texts[i] for i in indices])):
+                embeddings[i] = embedding
+        return embeddings
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for the next micro-batch.
+
+        Returns:
+            Future: Resolves to the embedding of the text.
+        """
+        future = Future()
+        self._queue.put((text, future))
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="mem0-onnx-encoder", daemon=True)
+                self._worker.start()
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                embeddings = self.encode([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
@@ -21,6 +21,15 @@ except ImportError:
         sys.exit(1)
 
 
+# Models this process has already found or pulled, per Ollama server, so the check runs once and not per embedder
+_available_models = set()
+
+
+def _with_tag(model):
+    """Model name with the tag Ollama lists it under, ``latest`` if none is given."""
+    return model if ":" in model.rsplit("/", 1)[-1] else f"{model}:latest"
+
+
 class OllamaEmbedding(EmbeddingBase):
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
         super().__init__(config)
@@ -29,14 +38,20 @@ class OllamaEmbedding(EmbeddingBase):
         self.config.embedding_dims = self.config.embedding_dims or 512
 
         self.client = Client(host=self.config.ollama_base_url)
-        self._ensure_model_exists()
+
+        model_key = (self.config.ollama_base_url, _with_tag(self.config.model))
+        if model_key not in _available_models:
+            self._ensure_model_exists()
+            _available_models.add(model_key)
 
     def _ensure_model_exists(self):
         """
         Ensure the specified model exists locally. If not, pull it from Ollama.
         """
+        model = _with_tag(self.config.model)
         local_models = self.client.list()["models"]
-        if not any(model.get("name") == self.config.model or model.get("model") == self.config.model for model in local_models):
+        local_names = {_with_tag(m.get("name") or m.get("model") or "") for m in local_models}
+        if model not in local_names:
             self.client.pull(self.config.model)
 
     def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
@@ -49,5 +64,38 @@ class OllamaEmbedding(EmbeddingBase):
         Returns:
             list: The embedding vector.
         """
-        response = self.client.embeddings(model=self.config.model, prompt=text)
-        return response["embedding"]
+        return self.embed_batch([text], memory_action)[0]
+
+    def embed_batch(self, texts, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for several texts with Ollama's multi-input embed endpoint.
+
+        The texts are sent ``ollama_batch_size`` at a time. The endpoint returns L2-normalized vectors, with
+        ``ollama_legacy_embeddings`` the texts are sent one at a time to the legacy endpoint instead, which does not
+        normalize them.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in the same order.
+        """
+        if self.config.ollama_legacy_embeddings:
+            embeddings = []
+            for text in texts:
+                response = self.client.embeddings(
+                    model=self.config.model, prompt=text, keep_alive=self.config.ollama_keep_alive
+                )
+                embeddings.append(response["embedding"])
+            return embeddings
+
+        batch_size = max(1, self.config.ollama_batch_size)
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            response = self.client.embed(
+                model=self.config.model,
+                input=texts[start : start + batch_size],
+                keep_alive=self.config.ollama_keep_alive,
+            )
+            embeddings.extend(response["embeddings"])
+        return embeddings
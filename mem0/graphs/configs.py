@@ -11,6 +11,35 @@ class Neo4jConfig(BaseModel):
     password: Optional[str] = Field(None, description="Password for the graph database")
     database: Optional[str] = Field(None, description="Database for the graph database")
     base_label: Optional[bool] = Field(None, description="Whether to use base node label __Entity__ for all entities")
+    vector_index: bool = Field(
+        False,
+        description="Look up similar nodes through a vector index on the entity embeddings, only with base_label. The "
+        "index is shared by all users and filtered by user/agent/run afterwards, so in a graph shared by many users "
+        "the nearest candidates can all belong to other users. By default the nodes of the scope are compared exactly",
+    )
+    vector_index_candidates: Optional[int] = Field(
+        50,
+        description="Nearest nodes fetched from the entity vector index before the user/agent/run filter is applied",
+    )
+    entity_match_fast_path: bool = Field(
+        False,
+        description="Resolve search entities by matching the query against the stored entity names of the user "
+        "before asking the LLM to extract them. The LLM is skipped whenever a stored name is found in the query. The "
+        "names are cached per process and only follow the writes of this process, so entities added by other "
+        "processes are not matched until the index is refreshed, see lexical_index_refresh_seconds",
+    )
+    lexical_index_max_rows: int = Field(
+        100_000,
+        description="Maximum rows, one per relation or per entity without relations, loaded into the in-memory "
+        "lexical index of a user/agent/run scope, which reranks search results and serves entity_match_fast_path. "
+        "Up to 256 scopes are cached per process. Larger scopes are not cached, their results are reranked on their "
+        "own and their entities are always extracted by the LLM",
+    )
+    lexical_index_refresh_seconds: float = Field(
+        60,
+        description="The lexical index of a scope only follows the writes of this process. At most this often, its "
+        "relation count is compared with the graph and the index is rebuilt when they differ",
+    )
 
     @model_validator(mode="before")
     def check_host_port_or_path(cls, values):
@@ -50,6 +79,8 @@ class NeptuneConfig(BaseModel):
         ),
     )
     base_label: Optional[bool] = Field(None, description="Whether to use base node label __Entity__ for all entities")
+    batch_size: int = Field(100, description="Rows sent in one UNWIND query to Neptune")
+    max_concurrency: int = Field(4, description="Queries sent to Neptune at the same time")
 
     @model_validator(mode="before")
     def check_host_port_or_path(cls, values):
@@ -73,20 +104,41 @@ class NeptuneConfig(BaseModel):
 
 class KuzuConfig(BaseModel):
     db: Optional[str] = Field(":memory:", description="Path to a Kuzu database file")
+    vector_index: bool = Field(
+        True,
+        description="Resolve nodes through an HNSW vector index on the entity embeddings. Only databases created "
+        "with a fixed embedding size can be indexed",
+    )
+    vector_index_candidates: int = Field(
+        50,
+        description="Nearest nodes first fetched from the vector index before the user/agent/run filter is applied. "
+        "More are fetched when all of them belong to other scopes",
+    )
+
+
+class LocalGraphConfig(BaseModel):
+    path: Optional[str] = Field(
+        None, description="Directory for the snapshot and write-ahead log, the graph is kept in memory only if unset"
+    )
+    snapshot_every: int = Field(1000, description="Write-ahead log records after which a new snapshot is written")
 
 
 class GraphStoreConfig(BaseModel):
     provider: str = Field(
-        description="Provider of the data store (e.g., 'neo4j', 'memgraph', 'neptune', 'kuzu')",
+        description="Provider of the data store (e.g., 'neo4j', 'memgraph', 'neptune', 'kuzu', 'local')",
         default="neo4j",
     )
-    config: Union[Neo4jConfig, MemgraphConfig, NeptuneConfig, KuzuConfig] = Field(
+    config: Union[Neo4jConfig, MemgraphConfig, NeptuneConfig, KuzuConfig, LocalGraphConfig] = Field(
         description="Configuration for the specific data store", default=None
     )
     llm: Optional[LlmConfig] = Field(description="LLM configuration for querying the graph store", default=None)
     custom_prompt: Optional[str] = Field(
         description="Custom prompt to fetch entities from the given text", default=None
     )
+    combined_extraction: bool = Field(
+        description="Extract entities and relations with a single LLM call instead of two when adding to the graph",
+        default=False,
+    )
 
     @field_validator("config")
     def validate_config(cls, v, values):
@@ -99,5 +151,7 @@ class GraphStoreConfig(BaseModel):
             return NeptuneConfig(**v.model_dump())
         elif provider == "kuzu":
             return KuzuConfig(**v.model_dump())
+        elif provider == "local":
+            return LocalGraphConfig(**v.model_dump())
         else:
             raise ValueError(f"Unsupported graph store provider: {provider}")
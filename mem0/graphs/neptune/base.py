@@ -1,7 +1,9 @@
+import concurrent.futures
 import logging
 from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
 
-from mem0.memory.utils import format_entities
+from mem0.memory.utils import format_entities, get_conflict_candidates
 
 try:
     from rank_bm25 import BM25Okapi
@@ -16,7 +18,7 @@ from mem0.graphs.tools import (
     RELATIONS_STRUCT_TOOL,
     RELATIONS_TOOL,
 )
-from mem0.graphs.utils import EXTRACT_RELATIONS_PROMPT, get_delete_messages
+from mem0.graphs.utils import extract_entities_and_relations, get_delete_messages, get_relations_extraction_messages
 from mem0.utils.factory import EmbedderFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
@@ -54,9 +56,9 @@ class NeptuneBase(ABC):
             data (str): The data to add to the graph.
             filters (dict): A dictionary containing filters to be applied during the addition.
         """
-        entity_type_map = self._retrieve_nodes_from_data(data, filters)
-        to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
+        entity_type_map, to_be_added = extract_entities_and_relations(self, data, filters, filters["user_id"])
         search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        search_output = get_conflict_candidates(search_output, to_be_added)
         to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
         deleted_entities = self._delete_entities(to_be_deleted, filters["user_id"])
@@ -102,27 +104,9 @@ class NeptuneBase(ABC):
         """
         Establish relations among the extracted nodes.
         """
-        if self.config.graph_store.custom_prompt:
-            messages = [
-                {
-                    "role": "system",
-                    "content": EXTRACT_RELATIONS_PROMPT.replace("USER_ID", filters["user_id"]).replace(
-                        "CUSTOM_PROMPT", f"4. {self.config.graph_store.custom_prompt}"
-                    ),
-                },
-                {"role": "user", "content": data},
-            ]
-        else:
-            messages = [
-                {
-                    "role": "system",
-                    "content": EXTRACT_RELATIONS_PROMPT.replace("USER_ID", filters["user_id"]),
-                },
-                {
-                    "role": "user",
-                    "content": f"List of entities: {list(entity_type_map.keys())}. \n\nText: {data}",
-                },
-            ]
+        messages = get_relations_extraction_messages(
+            data, filters["user_id"], list(entity_type_map.keys()), self.config.graph_store.custom_prompt
+        )
 
         _tools = [RELATIONS_TOOL]
         if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
@@ -153,6 +137,10 @@ class NeptuneBase(ABC):
         Get the entities to be deleted from the search output.
         """
 
+        if not search_output:
+            # Nothing stored can conflict with the new data, skip the LLM round trip
+            return []
+
         search_output_string = format_entities(search_output)
         system_prompt, user_prompt = get_delete_messages(search_output_string, data, filters["user_id"])
 
@@ -179,27 +167,50 @@ class NeptuneBase(ABC):
         logger.debug(f"Deleted relationships: {to_be_deleted}")
         return to_be_deleted
 
+    def _run_queries(self, queries):
+        """
+        Run ``(cypher, params)`` pairs and return their results in order.
+
+        Each query is a separate HTTP round trip to Neptune, so they are dispatched on a pool of at most
+        ``max_concurrency`` threads.
+        """
+        if len(queries) <= 1 or self.max_concurrency <= 1:
+            return [self.graph.query(cypher, params=params) for cypher, params in queries]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(queries))) as executor:
+            return list(executor.map(lambda query: self.graph.query(query[0], params=query[1]), queries))
+
+    def _batches(self, rows):
+        """Split the ``UNWIND`` rows of a query into chunks of ``batch_size``."""
+        return [rows[i : i + self.batch_size] for i in range(0, len(rows), self.batch_size)]
+
     def _delete_entities(self, to_be_deleted, user_id):
         """
         Delete the entities from the graph.
-        """
 
-        results = []
+        Relationship types cannot be parameters, so one ``UNWIND`` query is sent per type and chunk of rows.
+        """
+        rows_by_relationship = defaultdict(list)
         for item in to_be_deleted:
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
+            rows_by_relationship[item["relationship"]].append(
+                {"source_name": item["source"], "dest_name": item["destination"]}
+            )
+
+        queries = [
+            self._delete_entities_batch_cypher(relationship, batch, user_id)
+            for relationship, rows in rows_by_relationship.items()
+            for batch in self._batches(rows)
+        ]
+        deleted = defaultdict(list)
+        for result in self._run_queries(queries):
+            for row in result:
+                deleted[(row["source"], row["relationship"], row["target"])].append(row)
 
-            # Delete the specific relationship between nodes
-            cypher, params = self._delete_entities_cypher(source, destination, relationship, user_id)
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
-        return results
+        return [deleted[(item["source"], item["relationship"], item["destination"])] for item in to_be_deleted]
 
     @abstractmethod
-    def _delete_entities_cypher(self, source, destination, relationship, user_id):
+    def _delete_entities_batch_cypher(self, relationship, rows, user_id):
         """
-        Returns the OpenCypher query and parameters for deleting entities in the graph DB
+        Returns the OpenCypher query and parameters for deleting the relationships of one type in the graph DB
         """
 
         pass
@@ -207,63 +218,92 @@ class NeptuneBase(ABC):
     def _add_entities(self, to_be_added, user_id, entity_type_map):
         """
         Add the new entities to the graph. Merge the nodes if they already exist.
+
+        All names are embedded with one call and resolved against the stored nodes with one search per chunk.
+        Mentions of resolved nodes are updated and new nodes created per label before the relationships are
+        merged per type, each step as batched ``UNWIND`` queries sent concurrently.
         """
+        if not to_be_added:
+            return []
 
-        results = []
-        for item in to_be_added:
-            # entities
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            # types
-            source_type = entity_type_map.get(source, "__User__")
-            destination_type = entity_type_map.get(destination, "__User__")
-
-            # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            # search for the nodes with the closest embeddings
-            source_node_search_result = self._search_source_node(source_embedding, user_id, threshold=0.9)
-            destination_node_search_result = self._search_destination_node(dest_embedding, user_id, threshold=0.9)
-
-            cypher, params = self._add_entities_cypher(
-                source_node_search_result,
-                source,
-                source_embedding,
-                source_type,
-                destination_node_search_result,
-                destination,
-                dest_embedding,
-                destination_type,
-                relationship,
-                user_id,
+        names = list(dict.fromkeys(name for item in to_be_added for name in (item["source"], item["destination"])))
+        embeddings = dict(zip(names, self.embedding_model.embed_batch(names)))
+        mentions = Counter(name for item in to_be_added for name in (item["source"], item["destination"]))
+
+        # search for the nodes with the closest embeddings
+        node_ids = self._search_nodes(names, embeddings, user_id, threshold=0.9)
+
+        node_mentions = Counter()
+        for name in names:
+            if name in node_ids:
+                node_mentions[node_ids[name]] += mentions[name]
+        new_rows = defaultdict(list)
+        for name in names:
+            if name not in node_ids:
+                new_rows[entity_type_map.get(name, "__User__")].append(
+                    {"name": name, "embedding": embeddings[name], "mentions": mentions[name]}
+                )
+
+        mention_rows = [{"node_id": node_id, "mentions": count} for node_id, count in node_mentions.items()]
+        queries = [self._mention_nodes_batch_cypher(batch) for batch in self._batches(mention_rows)]
+        queries += [
+            self._add_nodes_batch_cypher(entity_type, batch, user_id)
+            for entity_type, rows in new_rows.items()
+            for batch in self._batches(rows)
+        ]
+        for result in self._run_queries(queries):
+            for row in result:
+                # Only the merge queries return names, the mention updates return ids alone
+                if "name" in row:
+                    node_ids[row["name"]] = row["node_id"]
+
+        edge_mentions = Counter(
+            (node_ids[item["source"]], item["relationship"], node_ids[item["destination"]]) for item in to_be_added
+        )
+        rows_by_relationship = defaultdict(list)
+        for (source_id, relationship, destination_id), count in edge_mentions.items():
+            rows_by_relationship[relationship].append(
+                {"source_id": source_id, "destination_id": destination_id, "mentions": count}
             )
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
-        return results
+        queries = [
+            self._add_edges_batch_cypher(relationship, batch)
+            for relationship, rows in rows_by_relationship.items()
+            for batch in self._batches(rows)
+        ]
+        added = defaultdict(list)
+        for result in self._run_queries(queries):
+            for row in result:
+                added[(row["source_id"], row["relationship"], row["destination_id"])].append(
+                    {"source": row["source"], "relationship": row["relationship"], "target": row["target"]}
+                )
+
+        return [
+            added[(node_ids[item["source"]], item["relationship"], node_ids[item["destination"]])]
+            for item in to_be_added
+        ]
 
     @abstractmethod
-    def _add_entities_cypher(
-        self,
-        source_node_list,
-        source,
-        source_embedding,
-        source_type,
-        destination_node_list,
-        destination,
-        dest_embedding,
-        destination_type,
-        relationship,
-        user_id,
-    ):
-        """
-        Returns the OpenCypher query and parameters for adding entities in the graph DB
+    def _mention_nodes_batch_cypher(self, rows):
+        """
+        Returns the OpenCypher query and parameters for counting new mentions of existing nodes
         """
         pass
 
-    def search(self, query, filters, limit=100):
+    @abstractmethod
+    def _add_nodes_batch_cypher(self, entity_type, rows, user_id):
+        """
+        Returns the OpenCypher query and parameters for merging the nodes of one entity type in the graph DB
+        """
+        pass
+
+    @abstractmethod
+    def _add_edges_batch_cypher(self, relationship, rows):
+        """
+        Returns the OpenCypher query and parameters for merging the relationships of one type in the graph DB
+        """
+        pass
+
+    def search(self, query, filters, limit=100, context=None):
         """
         Search for memories and related graph data.
 
@@ -271,6 +311,8 @@ class NeptuneBase(ABC):
             query (str): Query to search for.
             filters (dict): A dictionary containing filters to be applied during the search.
             limit (int): The maximum number of nodes and relationships to retrieve. Defaults to 100.
+            context (SearchContext, optional): State shared with the vector store search. When the query names no
+                entity, the nodes closest to its embedding, computed once for both searches, are searched instead.
 
         Returns:
             dict: A dictionary containing:
@@ -279,7 +321,10 @@ class NeptuneBase(ABC):
         """
 
         entity_type_map = self._retrieve_nodes_from_data(query, filters)
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        if entity_type_map or context is None:
+            search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        else:
+            search_output = self._search_graph_db(node_list=[query], filters=filters, embeddings=[context.embedding])
 
         if not search_output:
             return []
@@ -298,27 +343,23 @@ class NeptuneBase(ABC):
 
         return search_results
 
-    def _search_source_node(self, source_embedding, user_id, threshold=0.9):
-        cypher, params = self._search_source_node_cypher(source_embedding, user_id, threshold)
-        result = self.graph.query(cypher, params=params)
-        return result
-
-    @abstractmethod
-    def _search_source_node_cypher(self, source_embedding, user_id, threshold):
+    def _search_nodes(self, names, embeddings, user_id, threshold=0.9):
         """
-        Returns the OpenCypher query and parameters to search for source nodes
+        Returns the id of the most similar stored node for every name that has one above ``threshold``.
         """
-        pass
+        rows = [{"idx": i, "embedding": embeddings[name]} for i, name in enumerate(names)]
+        queries = [self._search_nodes_batch_cypher(batch, user_id, threshold) for batch in self._batches(rows)]
 
-    def _search_destination_node(self, destination_embedding, user_id, threshold=0.9):
-        cypher, params = self._search_destination_node_cypher(destination_embedding, user_id, threshold)
-        result = self.graph.query(cypher, params=params)
-        return result
+        node_ids = {}
+        for result in self._run_queries(queries):
+            for row in result:
+                node_ids[names[row["idx"]]] = row["node_id"]
+        return node_ids
 
     @abstractmethod
-    def _search_destination_node_cypher(self, destination_embedding, user_id, threshold):
+    def _search_nodes_batch_cypher(self, rows, user_id, threshold):
         """
-        Returns the OpenCypher query and parameters to search for destination nodes
+        Returns the OpenCypher query and parameters to find the most similar node for each embedding
         """
         pass
 
@@ -371,24 +412,32 @@ class NeptuneBase(ABC):
         """
         pass
 
-    def _search_graph_db(self, node_list, filters, limit=100):
+    def _search_graph_db(self, node_list, filters, limit=100, embeddings=None):
         """
         Search similar nodes among and their respective incoming and outgoing relations.
+
+        All entities are embedded with one call and searched with one ``UNWIND`` query per chunk. A relation
+        reached from several entities is returned once, with its best similarity.
         """
-        result_relations = []
+        if not node_list:
+            return []
+
+        embeddings = embeddings if embeddings is not None else self.embedding_model.embed_batch(node_list)
+        queries = [self._search_graph_db_batch_cypher(batch, filters, limit) for batch in self._batches(embeddings)]
 
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
-            cypher_query, params = self._search_graph_db_cypher(n_embedding, filters, limit)
-            ans = self.graph.query(cypher_query, params=params)
-            result_relations.extend(ans)
+        best = {}
+        for result in self._run_queries(queries):
+            for row in result:
+                current = best.get(row["relation_id"])
+                if current is None or row["similarity"] > current["similarity"]:
+                    best[row["relation_id"]] = row
 
-        return result_relations
+        return sorted(best.values(), key=lambda row: row["similarity"], reverse=True)[:limit]
 
     @abstractmethod
-    def _search_graph_db_cypher(self, n_embedding, filters, limit):
+    def _search_graph_db_batch_cypher(self, embeddings, filters, limit):
         """
-        Returns the OpenCypher query and parameters to search for similar nodes in the memory store
+        Returns the OpenCypher query and parameters to search for nodes similar to any of the embeddings
         """
         pass
 
@@ -12,13 +12,18 @@ logger = logging.getLogger(__name__)
 
 
 class MemoryGraph(NeptuneBase):
-    def __init__(self, config):
+    def __init__(self, config, graph=None):
+        """
+        :param config: memory configuration
+        :param graph: optional executor with a ``query(cypher, params=...)`` method used instead of a Neptune
+            Analytics client, e.g. a stand-in that records the generated openCypher in tests
+        """
         self.config = config
 
-        self.graph = None
+        self.graph = graph
         endpoint = self.config.graph_store.config.endpoint
         app_id = self.config.graph_store.config.app_id
-        if endpoint and endpoint.startswith("neptune-graph://"):
+        if not self.graph and endpoint and endpoint.startswith("neptune-graph://"):
             graph_identifier = endpoint.replace("neptune-graph://", "")
             self.graph = NeptuneAnalyticsGraph(graph_identifier = graph_identifier,
                                                config = Config(user_agent_appid=app_id))
@@ -27,6 +32,8 @@ class MemoryGraph(NeptuneBase):
             raise ValueError("Unable to create a Neptune client: missing 'endpoint' in config")
 
         self.node_label = ":`__Entity__`" if self.config.graph_store.config.base_label else ""
+        self.batch_size = self.config.graph_store.config.batch_size
+        self.max_concurrency = self.config.graph_store.config.max_concurrency
 
         self.embedding_model = NeptuneBase._create_embedding_model(self.config)
 
@@ -40,287 +47,161 @@ class MemoryGraph(NeptuneBase):
         self.user_id = None
         self.threshold = 0.7
 
-    def _delete_entities_cypher(self, source, destination, relationship, user_id):
+    def _delete_entities_batch_cypher(self, relationship, rows, user_id):
         """
-        Returns the OpenCypher query and parameters for deleting entities in the graph DB
+        Returns the OpenCypher query and parameters for deleting the relationships of one type in the graph DB
 
-        :param source: source node
-        :param destination: destination node
         :param relationship: relationship label
+        :param rows: list of dicts with source_name and dest_name
         :param user_id: user_id to use
         :return: str, dict
         """
 
         cypher = f"""
-            MATCH (n {self.node_label} {{name: $source_name, user_id: $user_id}})
+            UNWIND $rows AS row
+            MATCH (n {self.node_label} {{name: row.source_name, user_id: $user_id}})
             -[r:{relationship}]->
-            (m {self.node_label} {{name: $dest_name, user_id: $user_id}})
+            (m {self.node_label} {{name: row.dest_name, user_id: $user_id}})
             DELETE r
-            RETURN 
+            RETURN
                 n.name AS source,
                 m.name AS target,
                 type(r) AS relationship
             """
         params = {
-            "source_name": source,
-            "dest_name": destination,
+            "rows": rows,
             "user_id": user_id,
         }
         logger.debug(f"_delete_entities\n  query={cypher}")
         return cypher, params
 
-    def _add_entities_cypher(
-        self,
-        source_node_list,
-        source,
-        source_embedding,
-        source_type,
-        destination_node_list,
-        destination,
-        dest_embedding,
-        destination_type,
-        relationship,
-        user_id,
-    ):
+    def _mention_nodes_batch_cypher(self, rows):
         """
-        Returns the OpenCypher query and parameters for adding entities in the graph DB
-
-        :param source_node_list: list of source nodes
-        :param source: source node name
-        :param source_embedding: source node embedding
-        :param source_type: source node label
-        :param destination_node_list: list of dest nodes
-        :param destination: destination name
-        :param dest_embedding: destination embedding
-        :param destination_type: destination node label
-        :param relationship: relationship label
-        :param user_id: user id to use
+        Returns the OpenCypher query and parameters for counting new mentions of existing nodes
+
+        :param rows: list of dicts with node_id and mentions
         :return: str, dict
         """
 
-        source_label = self.node_label if self.node_label else f":`{source_type}`"
-        source_extra_set = f", source:`{source_type}`" if self.node_label else ""
-        destination_label = self.node_label if self.node_label else f":`{destination_type}`"
-        destination_extra_set = f", destination:`{destination_type}`" if self.node_label else ""
-
-        # Refactor this code with the graph_memory.py implementation
-        if not destination_node_list and source_node_list:
-            cypher = f"""
-                    MATCH (source)
-                    WHERE id(source) = $source_id
-                    SET source.mentions = coalesce(source.mentions, 0) + 1
-                    WITH source
-                    MERGE (destination {destination_label} {{name: $destination_name, user_id: $user_id}})
-                    ON CREATE SET
-                        destination.created = timestamp(),
-                        destination.updated = timestamp(),
-                        destination.mentions = 1
-                        {destination_extra_set}
-                    ON MATCH SET
-                        destination.mentions = coalesce(destination.mentions, 0) + 1,
-                        destination.updated = timestamp()
-                    WITH source, destination, $dest_embedding as dest_embedding
-                    CALL neptune.algo.vectors.upsert(destination, dest_embedding)
-                    WITH source, destination
-                    MERGE (source)-[r:{relationship}]->(destination)
-                    ON CREATE SET 
-                        r.created = timestamp(),
-                        r.updated = timestamp(),
-                        r.mentions = 1
-                    ON MATCH SET
-                        r.mentions = coalesce(r.mentions, 0) + 1,
-                        r.updated = timestamp()
-                    RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                    """
-
-            params = {
-                "source_id": source_node_list[0]["id(source_candidate)"],
-                "destination_name": destination,
-                "dest_embedding": dest_embedding,
-                "user_id": user_id,
-            }
-        elif destination_node_list and not source_node_list:
-            cypher = f"""
-                    MATCH (destination)
-                    WHERE id(destination) = $destination_id
-                    SET 
-                        destination.mentions = coalesce(destination.mentions, 0) + 1,
-                        destination.updated = timestamp()
-                    WITH destination
-                    MERGE (source {source_label} {{name: $source_name, user_id: $user_id}})
-                    ON CREATE SET
-                        source.created = timestamp(),
-                        source.updated = timestamp(),
-                        source.mentions = 1
-                        {source_extra_set}
-                    ON MATCH SET
-                        source.mentions = coalesce(source.mentions, 0) + 1,
-                        source.updated = timestamp()
-                    WITH source, destination, $source_embedding as source_embedding
-                    CALL neptune.algo.vectors.upsert(source, source_embedding)
-                    WITH source, destination
-                    MERGE (source)-[r:{relationship}]->(destination)
-                    ON CREATE SET 
-                        r.created = timestamp(),
-                        r.updated = timestamp(),
-                        r.mentions = 1
-                    ON MATCH SET
-                        r.mentions = coalesce(r.mentions, 0) + 1,
-                        r.updated = timestamp()
-                    RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                    """
-
-            params = {
-                "destination_id": destination_node_list[0]["id(destination_candidate)"],
-                "source_name": source,
-                "source_embedding": source_embedding,
-                "user_id": user_id,
-            }
-        elif source_node_list and destination_node_list:
-            cypher = f"""
-                    MATCH (source)
-                    WHERE id(source) = $source_id
-                    SET 
-                        source.mentions = coalesce(source.mentions, 0) + 1,
-                        source.updated = timestamp()
-                    WITH source
-                    MATCH (destination)
-                    WHERE id(destination) = $destination_id
-                    SET 
-                        destination.mentions = coalesce(destination.mentions) + 1,
-                        destination.updated = timestamp()
-                    MERGE (source)-[r:{relationship}]->(destination)
-                    ON CREATE SET 
-                        r.created_at = timestamp(),
-                        r.updated_at = timestamp(),
-                        r.mentions = 1
-                    ON MATCH SET r.mentions = coalesce(r.mentions, 0) + 1
-                    RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                    """
-            params = {
-                "source_id": source_node_list[0]["id(source_candidate)"],
-                "destination_id": destination_node_list[0]["id(destination_candidate)"],
-                "user_id": user_id,
-            }
-        else:
-            cypher = f"""
-                    MERGE (n {source_label} {{name: $source_name, user_id: $user_id}})
-                    ON CREATE SET n.created = timestamp(),
-                                  n.updated = timestamp(),
-                                  n.mentions = 1
-                                  {source_extra_set}
-                    ON MATCH SET 
-                                n.mentions = coalesce(n.mentions, 0) + 1,
-                                n.updated = timestamp()
-                    WITH n, $source_embedding as source_embedding
-                    CALL neptune.algo.vectors.upsert(n, source_embedding)
-                    WITH n
-                    MERGE (m {destination_label} {{name: $dest_name, user_id: $user_id}})
-                    ON CREATE SET 
-                                m.created = timestamp(),
-                                m.updated = timestamp(),
-                                m.mentions = 1
-                                {destination_extra_set}
-                    ON MATCH SET 
-                                m.updated = timestamp(),
-                                m.mentions = coalesce(m.mentions, 0) + 1
-                    WITH n, m, $dest_embedding as dest_embedding
-                    CALL neptune.algo.vectors.upsert(m, dest_embedding)
-                    WITH n, m
-                    MERGE (n)-[rel:{relationship}]->(m)
-                    ON CREATE SET 
-                                rel.created = timestamp(),
-                                rel.updated = timestamp(),
-                                rel.mentions = 1
-                    ON MATCH SET 
-                                rel.updated = timestamp(),
-                                rel.mentions = coalesce(rel.mentions, 0) + 1
-                    RETURN n.name AS source, type(rel) AS relationship, m.name AS target
-                    """
-            params = {
-                "source_name": source,
-                "dest_name": destination,
-                "source_embedding": source_embedding,
-                "dest_embedding": dest_embedding,
-                "user_id": user_id,
-            }
-        logger.debug(
-            f"_add_entities:\n  destination_node_search_result={destination_node_list}\n  source_node_search_result={source_node_list}\n  query={cypher}"
-        )
+        cypher = """
+            UNWIND $rows AS row
+            MATCH (n)
+            WHERE id(n) = row.node_id
+            SET
+                n.mentions = coalesce(n.mentions, 0) + row.mentions,
+                n.updated = timestamp()
+            RETURN id(n) AS node_id
+            """
+        params = {"rows": rows}
+        logger.debug(f"_mention_nodes\n  query={cypher}")
         return cypher, params
 
-    def _search_source_node_cypher(self, source_embedding, user_id, threshold):
+    def _add_nodes_batch_cypher(self, entity_type, rows, user_id):
         """
-        Returns the OpenCypher query and parameters to search for source nodes
+        Returns the OpenCypher query and parameters for merging the nodes of one entity type in the graph DB
 
-        :param source_embedding: source vector
-        :param user_id: user_id to use
-        :param threshold: the threshold for similarity
+        :param entity_type: node label
+        :param rows: list of dicts with name, embedding and mentions
+        :param user_id: user id to use
         :return: str, dict
         """
-        cypher = f"""
-            MATCH (source_candidate {self.node_label})
-            WHERE source_candidate.user_id = $user_id 
 
-            WITH source_candidate, $source_embedding as v_embedding
-            CALL neptune.algo.vectors.distanceByEmbedding(
-                v_embedding,
-                source_candidate,
-                {{metric:"CosineSimilarity"}}
-            ) YIELD distance
-            WITH source_candidate, distance AS cosine_similarity
-            WHERE cosine_similarity >= $threshold
-
-            WITH source_candidate, cosine_similarity
-            ORDER BY cosine_similarity DESC
-            LIMIT 1
+        label = self.node_label if self.node_label else f":`{entity_type}`"
+        extra_set = f", n:`{entity_type}`" if self.node_label else ""
 
-            RETURN id(source_candidate), cosine_similarity
+        cypher = f"""
+            UNWIND $rows AS row
+            MERGE (n {label} {{name: row.name, user_id: $user_id}})
+            ON CREATE SET
+                n.created = timestamp(),
+                n.updated = timestamp(),
+                n.mentions = row.mentions
+                {extra_set}
+            ON MATCH SET
+                n.mentions = coalesce(n.mentions, 0) + row.mentions,
+                n.updated = timestamp()
+            WITH n, row
+            CALL neptune.algo.vectors.upsert(n, row.embedding)
+            WITH n, row
+            RETURN row.name AS name, id(n) AS node_id
             """
-
         params = {
-            "source_embedding": source_embedding,
+            "rows": rows,
             "user_id": user_id,
-            "threshold": threshold,
         }
-        logger.debug(f"_search_source_node\n  query={cypher}")
+        logger.debug(f"_add_nodes\n  query={cypher}")
+        return cypher, params
+
+    def _add_edges_batch_cypher(self, relationship, rows):
+        """
+        Returns the OpenCypher query and parameters for merging the relationships of one type in the graph DB
+
+        :param relationship: relationship label
+        :param rows: list of dicts with source_id, destination_id and mentions
+        :return: str, dict
+        """
+
+        cypher = f"""
+            UNWIND $rows AS row
+            MATCH (source)
+            WHERE id(source) = row.source_id
+            MATCH (destination)
+            WHERE id(destination) = row.destination_id
+            MERGE (source)-[r:{relationship}]->(destination)
+            ON CREATE SET
+                r.created = timestamp(),
+                r.updated = timestamp(),
+                r.mentions = row.mentions
+            ON MATCH SET
+                r.mentions = coalesce(r.mentions, 0) + row.mentions,
+                r.updated = timestamp()
+            RETURN
+                source.name AS source,
+                id(source) AS source_id,
+                type(r) AS relationship,
+                destination.name AS target,
+                id(destination) AS destination_id
+            """
+        params = {"rows": rows}
+        logger.debug(f"_add_edges\n  query={cypher}")
         return cypher, params
 
-    def _search_destination_node_cypher(self, destination_embedding, user_id, threshold):
+    def _search_nodes_batch_cypher(self, rows, user_id, threshold):
         """
-        Returns the OpenCypher query and parameters to search for destination nodes
+        Returns the OpenCypher query and parameters to find the most similar node for each embedding
 
-        :param source_embedding: source vector
+        :param rows: list of dicts with idx and embedding
         :param user_id: user_id to use
         :param threshold: the threshold for similarity
         :return: str, dict
         """
         cypher = f"""
-                MATCH (destination_candidate {self.node_label})
-                WHERE destination_candidate.user_id = $user_id
-                
-                WITH destination_candidate, $destination_embedding as v_embedding
-                CALL neptune.algo.vectors.distanceByEmbedding(
-                    v_embedding,
-                    destination_candidate, 
-                    {{metric:"CosineSimilarity"}}
-                ) YIELD distance
-                WITH destination_candidate, distance AS cosine_similarity
-                WHERE cosine_similarity >= $threshold
-
-                WITH destination_candidate, cosine_similarity
-                ORDER BY cosine_similarity DESC
-                LIMIT 1
-    
-                RETURN id(destination_candidate), cosine_similarity
-                """
+            UNWIND $rows AS row
+            MATCH (candidate {self.node_label})
+            WHERE candidate.user_id = $user_id
+
+            WITH row, candidate
+            CALL neptune.algo.vectors.distanceByEmbedding(
+                row.embedding,
+                candidate,
+                {{metric:"CosineSimilarity"}}
+            ) YIELD distance
+            WITH row, candidate, distance AS cosine_similarity
+            WHERE cosine_similarity >= $threshold
+
+            WITH row, candidate, cosine_similarity
+            ORDER BY cosine_similarity DESC
+            WITH row, collect(id(candidate))[0] AS node_id, max(cosine_similarity) AS cosine_similarity
+
+            RETURN row.idx AS idx, node_id, cosine_similarity
+            """
+
         params = {
-            "destination_embedding": destination_embedding,
+            "rows": rows,
             "user_id": user_id,
             "threshold": threshold,
         }
-
-        logger.debug(f"_search_destination_node\n  query={cypher}")
+        logger.debug(f"_search_nodes\n  query={cypher}")
         return cypher, params
 
     def _delete_all_cypher(self, filters):
@@ -356,20 +237,21 @@ class MemoryGraph(NeptuneBase):
         params = {"user_id": filters["user_id"], "limit": limit}
         return cypher, params
 
-    def _search_graph_db_cypher(self, n_embedding, filters, limit):
+    def _search_graph_db_batch_cypher(self, embeddings, filters, limit):
         """
-        Returns the OpenCypher query and parameters to search for similar nodes in the memory store
+        Returns the OpenCypher query and parameters to search for nodes similar to any of the embeddings
 
-        :param n_embedding: node vector
+        :param embeddings: node vectors
         :param filters: search filters
         :param limit: return limit
         :return: str, dict
         """
 
         cypher_query = f"""
+            UNWIND $embeddings AS n_embedding
             MATCH (n {self.node_label})
             WHERE n.user_id = $user_id
-            WITH n, $n_embedding as n_embedding
+            WITH n, n_embedding
             CALL neptune.algo.vectors.distanceByEmbedding(
                 n_embedding,
                 n,
@@ -377,6 +259,7 @@ class MemoryGraph(NeptuneBase):
             ) YIELD distance
             WITH n, distance as similarity
             WHERE similarity >= $threshold
+            WITH n, max(similarity) AS similarity
             CALL {{
                 WITH n
                 MATCH (n)-[r]->(m) 
@@ -392,7 +275,7 @@ class MemoryGraph(NeptuneBase):
             LIMIT $limit
             """
         params = {
-            "n_embedding": n_embedding,
+            "embeddings": embeddings,
             "threshold": self.threshold,
             "user_id": filters["user_id"],
             "limit": limit,
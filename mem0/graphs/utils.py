@@ -1,3 +1,9 @@
+import logging
+
+from mem0.graphs.tools import EXTRACT_ENTITIES_AND_RELATIONS_STRUCT_TOOL, EXTRACT_ENTITIES_AND_RELATIONS_TOOL
+
+logger = logging.getLogger(__name__)
+
 UPDATE_GRAPH_PROMPT = """
 您是一位专注于图记忆管理和优化的 AI 专家。您的任务是分析现有的图记忆和新的信息，并更新记忆列表中的关系，以确保知识表示最准确、最新和连贯。
 
@@ -37,7 +43,7 @@ EXTRACT_RELATIONS_PROMPT = """
 
 1. 仅从文本中提取明确说明的信息。
 2. 在提供的实体之间建立关系。
-3. 在用户消息中，使用“USER_ID”作为任何自我指称（例如“我”、“我的”等）的源实体。
+3. 在用户消息中，使用输入开头“用户标识”一行给出的标识作为任何自我指称（例如“我”、“我的”等）的源实体。
 CUSTOM_PROMPT
 
 关系:
@@ -54,13 +60,34 @@ CUSTOM_PROMPT
 严格遵守这些指南，以确保高质量的知识图谱提取。
 """
 
+EXTRACT_ENTITIES_AND_RELATIONS_PROMPT = """
+您是一种先进的算法，旨在从文本中一次性提取实体及其关系以构建知识图谱。您的目标是捕获全面而准确的信息。请遵循以下关键原则：
+
+1. 仅从文本中提取明确说明的信息。
+2. 提取文本中提到的所有实体及其类型，然后在这些实体之间建立关系。
+3. 在用户消息中，使用输入开头“用户标识”一行给出的标识作为任何自我指称（例如“我”、“我的”等）的实体，实体类型为“用户”。
+4. 如果文本是一个问题，只提取其中的实体和关系，***不要***回答问题本身。
+CUSTOM_PROMPT
+
+实体:
+    - 每个实体包含名称和类型，类型应简洁通用（如：人物、地点、组织、歌手）。
+    - 关系中的源实体和目标实体必须出现在实体列表中。
+
+关系:
+    - 使用一致、通用且不受时间影响的关系类型。
+    - 示例：优先使用“是教授”而不是“成为了教授”。
+    - 关系应仅在用户消息中明确提及的实体之间建立。
+
+严格遵守这些指南，以确保高质量的知识图谱提取。
+"""
+
 DELETE_RELATIONS_SYSTEM_PROMPT = """
 您是一位图记忆管理器，专注于识别、管理和优化基于图的记忆中的关系。您的主要任务是分析现有关系列表，并根据提供的新信息确定应删除哪些关系。
 
 输入:
 1. 现有图记忆: 当前的图记忆列表，每条包含源、关系和目标信息。
 2. 新文本: 需要整合到现有图结构中的新信息。
-3. 在用户消息中，使用“USER_ID”作为任何自我指称（例如“我”、“我的”等）的节点。
+3. 在用户消息中，使用输入开头“用户标识”一行给出的标识作为任何自我指称（例如“我”、“我的”等）的节点。
 
 指南:
 1. 识别: 利用新信息来评估记忆图中的现有关系。
@@ -92,7 +119,86 @@ DELETE_RELATIONS_SYSTEM_PROMPT = """
 """
 
 
+# The system prompts do not depend on the user, so providers can cache them across users and calls. The user
+# identity goes at the start of the user message.
+
+
 def get_delete_messages(existing_memories_string, data, user_id):
-    return DELETE_RELATIONS_SYSTEM_PROMPT.replace(
-        "USER_ID", user_id
-    ), f"Here are the existing memories: {existing_memories_string} \n\n New Information: {data}"
+    return DELETE_RELATIONS_SYSTEM_PROMPT, (
+        f"用户标识: {user_id}\n\n"
+        f"Here are the existing memories: {existing_memories_string} \n\n New Information: {data}"
+    )
+
+
+def get_extraction_messages(data, user_id, custom_prompt=None):
+    system_prompt = EXTRACT_ENTITIES_AND_RELATIONS_PROMPT.replace(
+        "CUSTOM_PROMPT", f"5. {custom_prompt}" if custom_prompt else ""
+    )
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"用户标识: {user_id}\n\n{data}"},
+    ]
+
+
+def get_relations_extraction_messages(data, user_id, entities, custom_prompt=None):
+    system_prompt = EXTRACT_RELATIONS_PROMPT.replace("CUSTOM_PROMPT", f"4. {custom_prompt}" if custom_prompt else "")
+    user_prompt = data if custom_prompt else f"List of entities: {entities}. \n\nText: {data}"
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"用户标识: {user_id}\n\n{user_prompt}"},
+    ]
+
+
+def extract_entities_and_relations(graph, data, filters, user_identity):
+    """
+    Extract the entities of a text, their types and the relations among them for a graph memory.
+
+    With ``combined_extraction`` a single LLM call returns both. The two-step extraction, entities then relations, is
+    used when it is disabled or when the response has no tool calls, i.e. the provider does not support tools.
+
+    Args:
+        graph: The graph memory, providing ``llm``, ``llm_provider``, ``config``, ``_retrieve_nodes_from_data``,
+            ``_establish_nodes_relations_from_data`` and ``_remove_spaces_from_entities``.
+        data (str): The text to extract from.
+        filters (dict): The filters of the memory being added.
+        user_identity (str): The user identity given to the LLM for self-references.
+
+    Returns:
+        tuple: The entity type map and the relations to add.
+    """
+    if graph.config.graph_store.combined_extraction:
+        _tools = [EXTRACT_ENTITIES_AND_RELATIONS_TOOL]
+        if graph.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [EXTRACT_ENTITIES_AND_RELATIONS_STRUCT_TOOL]
+        extracted = graph.llm.generate_response(
+            messages=get_extraction_messages(data, user_identity, graph.config.graph_store.custom_prompt),
+            tools=_tools,
+        )
+
+        tool_calls = extracted.get("tool_calls") if isinstance(extracted, dict) else None
+        if tool_calls:
+            entity_type_map = {}
+            relations = []
+            try:
+                for tool_call in tool_calls:
+                    if tool_call["name"] != "extract_entities_and_relations":
+                        continue
+                    for item in tool_call["arguments"]["entities"]:
+                        entity_type_map[item["entity"]] = item["entity_type"]
+                    relations.extend(tool_call["arguments"]["relations"])
+            except Exception as e:
+                logger.exception(
+                    f"Error in extraction tool: {e}, llm_provider={graph.llm_provider}, extracted={extracted}"
+                )
+
+            entity_type_map = {
+                k.lower().replace(" ", "_"): v.lower().replace(" ", "_") for k, v in entity_type_map.items()
+            }
+            relations = graph._remove_spaces_from_entities(relations)
+            logger.debug(f"Entity type map: {entity_type_map}, extracted relations: {relations}")
+            return entity_type_map, relations
+
+        logger.info(f"No tool calls in the combined extraction, llm_provider={graph.llm_provider}, using two steps")
+
+    entity_type_map = graph._retrieve_nodes_from_data(data, filters)
+    return entity_type_map, graph._establish_nodes_relations_from_data(data, filters, entity_type_map)
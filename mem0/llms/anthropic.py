@@ -38,29 +38,14 @@ class AnthropicLLM(LLMBase):
             self.config.model = "claude-3-5-sonnet-20240620"
 
         api_key = self.config.api_key or os.getenv("ANTHROPIC_API_KEY")
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self._client_kwargs = {"api_key": api_key, "base_url": self.config.anthropic_base_url}
+        self.client = anthropic.Anthropic(http_client=self.config.http_client, **self._client_kwargs)
 
-    def generate_response(
-        self,
-        messages: List[Dict[str, str]],
-        response_format=None,
-        tools: Optional[List[Dict]] = None,
-        tool_choice: str = "auto",
-        **kwargs,
-    ):
-        """
-        Generate a response based on the given messages using Anthropic.
-
-        Args:
-            messages (list): List of message dicts containing 'role' and 'content'.
-            response_format (str or object, optional): Format of the response. Defaults to "text".
-            tools (list, optional): List of tools that the model can call. Defaults to None.
-            tool_choice (str, optional): Tool choice method. Defaults to "auto".
-            **kwargs: Additional Anthropic-specific parameters.
+    def _create_async_client(self):
+        return anthropic.AsyncAnthropic(http_client=self._async_http_client(), **self._client_kwargs)
 
-        Returns:
-            str: The generated response.
-        """
+    def _prepare_params(self, messages, tools=None, tool_choice="auto", **kwargs):
+        """Build the messages request shared by the sync and async calls."""
         # Separate system message from other messages
         system_message = ""
         filtered_messages = []
@@ -70,6 +55,10 @@ class AnthropicLLM(LLMBase):
             else:
                 filtered_messages.append(message)
 
+        if system_message and self.config.prompt_caching:
+            # The static instructions come first, a cache breakpoint after them lets later calls reuse them
+            system_message = [{"type": "text", "text": system_message, "cache_control": {"type": "ephemeral"}}]
+
         params = self._get_supported_params(messages=messages, **kwargs)
         params.update(
             {
@@ -82,6 +71,53 @@ class AnthropicLLM(LLMBase):
         if tools:  # TODO: Remove tools if no issues found with new memory addition logic
             params["tools"] = tools
             params["tool_choice"] = tool_choice
+        return params
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        **kwargs,
+    ):
+        """
+        Generate a response based on the given messages using Anthropic.
+
+        Args:
+            messages (list): List of message dicts containing 'role' and 'content'.
+            response_format (str or object, optional): Format of the response. Defaults to "text".
+            tools (list, optional): List of tools that the model can call. Defaults to None.
+            tool_choice (str, optional): Tool choice method. Defaults to "auto".
+            **kwargs: Additional Anthropic-specific parameters.
 
+        Returns:
+            str: The generated response.
+        """
+        params = self._prepare_params(messages, tools, tool_choice, **kwargs)
         response = self.client.messages.create(**params)
+        self._run_response_callback(response, params)
+        return response.content[0].text
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        **kwargs,
+    ):
+        """
+        Generate a response based on the given messages with the async Anthropic client.
+
+        Takes the same arguments and returns the same response as ``generate_response``.
+        """
+        if self._has_custom_http_client():
+            return await super().agenerate_response(
+                messages, response_format=response_format, tools=tools, tool_choice=tool_choice, **kwargs
+            )
+
+        params = self._prepare_params(messages, tools, tool_choice, **kwargs)
+        response = await self.async_client.messages.create(**params)
+        self._run_response_callback(response, params)
         return response.content[0].text
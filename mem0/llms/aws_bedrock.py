@@ -145,7 +145,7 @@ class AWSBedrockLLM(LLMBase):
             content = message["content"]
 
             if role == "system":
-                # Anthropic doesn't support system messages, prepend to first user message
+                # Sent as the request's system prompt, see _system_prompt
                 continue
             elif role == "user":
                 formatted_messages.append({"role": "user", "content": [{"type": "text", "text": content}]})
@@ -154,6 +154,28 @@ class AWSBedrockLLM(LLMBase):
 
         return formatted_messages
 
+    def _format_messages_converse(self, messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Format messages for the Converse API, system messages go to ``_converse_system``."""
+        return [
+            {"role": message["role"], "content": [{"text": message["content"]}]}
+            for message in messages
+            if message["role"] in ("user", "assistant")
+        ]
+
+    def _system_prompt(self, messages: List[Dict[str, str]]) -> str:
+        """The system messages joined into one system prompt."""
+        return "\n\n".join(message["content"] for message in messages if message["role"] == "system")
+
+    def _converse_system(self, messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """System blocks of a Converse request, followed by a cache point if prompt caching is enabled."""
+        system_prompt = self._system_prompt(messages)
+        if not system_prompt:
+            return []
+        blocks = [{"text": system_prompt}]
+        if self.config.prompt_caching:
+            blocks.append({"cachePoint": {"type": "default"}})
+        return blocks
+
     def _format_messages_cohere(self, messages: List[Dict[str, str]]) -> str:
         """Format messages for Cohere models."""
         formatted_messages = []
@@ -345,7 +367,7 @@ class AWSBedrockLLM(LLMBase):
         return new_tools
 
     def _parse_response(
-        self, response: Dict[str, Any], tools: Optional[List[Dict]] = None
+        self, response: Dict[str, Any], tools: Optional[List[Dict]] = None, params: Optional[Dict[str, Any]] = None
     ) -> Union[str, Dict[str, Any]]:
         """
         Parse response from Bedrock API.
@@ -353,10 +375,14 @@ class AWSBedrockLLM(LLMBase):
         Args:
             response: Raw API response
             tools: List of tools if used
+            params: The request, passed to ``response_callback`` with the response
 
         Returns:
             Parsed response
         """
+        if "output" in response:
+            # Converse API responses carry their token usage, cached prompt tokens included
+            self._run_response_callback(response, params)
         if tools:
             # Handle tool-enabled responses
             processed_response = {"tool_calls": []}
@@ -373,10 +399,15 @@ class AWSBedrockLLM(LLMBase):
 
             return processed_response
 
+        if "output" in response:
+            content = response["output"].get("message", {}).get("content", [])
+            return "".join(item.get("text", "") for item in content)
+
         # Handle regular text responses
         try:
             response_body = response.get("body").read().decode()
             response_json = json.loads(response_body)
+            self._run_response_callback(response_json, params)
 
             # Provider-specific response parsing
             if self.provider == "anthropic":
@@ -454,12 +485,10 @@ class AWSBedrockLLM(LLMBase):
     def _generate_with_tools(self, messages: List[Dict[str, str]], tools: List[Dict], stream: bool = False) -> Dict[str, Any]:
         """Generate response with tool calling support."""
         # Format messages for tool-enabled models
-        if self.provider == "anthropic":
-            formatted_messages = self._format_messages_anthropic(messages)
-        elif self.provider == "amazon":
-            formatted_messages = self._format_messages_amazon(messages)
+        if self.provider in ("anthropic", "amazon"):
+            formatted_messages = self._format_messages_converse(messages)
         else:
-            formatted_messages = [{"role": "user", "content": messages[-1]["content"]}]
+            formatted_messages = self._format_messages_converse(messages[-1:])
 
         # Prepare inference configuration
         inference_config = {
@@ -472,14 +501,18 @@ class AWSBedrockLLM(LLMBase):
         tools_config = {"tools": self._convert_tool_format(tools)}
 
         # Make API call
-        response = self.client.converse(
-            modelId=self.config.model,
-            messages=formatted_messages,
-            inferenceConfig=inference_config,
-            toolConfig=tools_config,
-        )
+        params = {
+            "modelId": self.config.model,
+            "messages": formatted_messages,
+            "inferenceConfig": inference_config,
+            "toolConfig": tools_config,
+        }
+        system = self._converse_system(messages)
+        if system:
+            params["system"] = system
+        response = self.client.converse(**params)
 
-        return self._parse_response(response, tools)
+        return self._parse_response(response, tools, params)
 
     def _generate_standard(self, messages: List[Dict[str, str]], stream: bool = False) -> str:
         """Generate standard text response."""
@@ -493,28 +526,30 @@ class AWSBedrockLLM(LLMBase):
                 "top_p": self.model_config.get("top_p", 0.9),
                 "anthropic_version": "bedrock-2023-05-31",
             }
+            system_prompt = self._system_prompt(messages)
+            if system_prompt and self.config.prompt_caching:
+                input_body["system"] = [
+                    {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+                ]
+            elif system_prompt:
+                input_body["system"] = system_prompt
         elif self.provider == "amazon" and "nova" in self.config.model.lower():
             # Nova models use converse API even without tools
-            formatted_messages = self._format_messages_amazon(messages)
-            input_body = {
-                "messages": formatted_messages,
-                "max_tokens": self.model_config.get("max_tokens", 5000),
-                "temperature": self.model_config.get("temperature", 0.1),
-                "top_p": self.model_config.get("top_p", 0.9),
+            params = {
+                "modelId": self.config.model,
+                "messages": self._format_messages_converse(messages),
+                "inferenceConfig": {
+                    "maxTokens": self.model_config.get("max_tokens", 5000),
+                    "temperature": self.model_config.get("temperature", 0.1),
+                    "topP": self.model_config.get("top_p", 0.9),
+                },
             }
-            
-            # Use converse API for Nova models
-            response = self.client.converse(
-                modelId=self.config.model,
-                messages=input_body["messages"],
-                inferenceConfig={
-                    "maxTokens": input_body["max_tokens"],
-                    "temperature": input_body["temperature"],
-                    "topP": input_body["top_p"],
-                }
-            )
-            
-            return self._parse_response(response)
+            system = self._converse_system(messages)
+            if system:
+                params["system"] = system
+            response = self.client.converse(**params)
+
+            return self._parse_response(response, params=params)
         else:
             prompt = self._format_messages(messages)
             input_body = self._prepare_input(prompt)
@@ -530,7 +565,7 @@ class AWSBedrockLLM(LLMBase):
             contentType="application/json",
         )
 
-        return self._parse_response(response)
+        return self._parse_response(response, params=input_body)
 
     def list_available_models(self) -> List[Dict[str, Any]]:
         """List all available models in the current region."""
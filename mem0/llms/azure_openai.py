@@ -3,7 +3,7 @@ import os
 from typing import Dict, List, Optional, Union
 
 from azure.identity import DefaultAzureCredential, get_bearer_token_provider
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
 
 from mem0.configs.llms.azure import AzureOpenAIConfig
 from mem0.configs.llms.base import BaseLlmConfig
@@ -57,15 +57,18 @@ class AzureOpenAILLM(LLMBase):
         else:
             azure_ad_token_provider = None
 
-        self.client = AzureOpenAI(
-            azure_deployment=azure_deployment,
-            azure_endpoint=azure_endpoint,
-            azure_ad_token_provider=azure_ad_token_provider,
-            api_version=api_version,
-            api_key=api_key,
-            http_client=self.config.http_client,
-            default_headers=default_headers,
-        )
+        self._client_kwargs = {
+            "azure_deployment": azure_deployment,
+            "azure_endpoint": azure_endpoint,
+            "azure_ad_token_provider": azure_ad_token_provider,
+            "api_version": api_version,
+            "api_key": api_key,
+            "default_headers": default_headers,
+        }
+        self.client = AzureOpenAI(http_client=self.config.http_client, **self._client_kwargs)
+
+    def _create_async_client(self):
+        return AsyncAzureOpenAI(http_client=self._async_http_client(), **self._client_kwargs)
 
     def _parse_response(self, response, tools):
         """
@@ -97,6 +100,27 @@ class AzureOpenAILLM(LLMBase):
         else:
             return response.choices[0].message.content
 
+    def _prepare_params(self, messages, tools=None, tool_choice="auto", **kwargs):
+        """Build the chat completion request shared by the sync and async calls."""
+        user_prompt = messages[-1]["content"]
+
+        user_prompt = user_prompt.replace("assistant", "ai")
+
+        messages[-1]["content"] = user_prompt
+
+        params = self._get_supported_params(messages=messages, **kwargs)
+        
+        # Add model and messages
+        params.update({
+            "model": self.config.model,
+            "messages": messages,
+        })
+
+        if tools:
+            params["tools"] = tools
+            params["tool_choice"] = tool_choice
+        return params
+
     def generate_response(
         self,
         messages: List[Dict[str, str]],
@@ -118,24 +142,28 @@ class AzureOpenAILLM(LLMBase):
         Returns:
             str: The generated response.
         """
+        params = self._prepare_params(messages, tools, tool_choice, **kwargs)
+        response = self.client.chat.completions.create(**params)
+        return self._parse_response(response, tools)
 
-        user_prompt = messages[-1]["content"]
-
-        user_prompt = user_prompt.replace("assistant", "ai")
-
-        messages[-1]["content"] = user_prompt
-
-        params = self._get_supported_params(messages=messages, **kwargs)
-        
-        # Add model and messages
-        params.update({
-            "model": self.config.model,
-            "messages": messages,
-        })
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        **kwargs,
+    ):
+        """
+        Generate a response based on the given messages with the async Azure OpenAI client.
 
-        if tools:
-            params["tools"] = tools
-            params["tool_choice"] = tool_choice
+        Takes the same arguments and returns the same response as ``generate_response``.
+        """
+        if self._has_custom_http_client():
+            return await super().agenerate_response(
+                messages, response_format=response_format, tools=tools, tool_choice=tool_choice, **kwargs
+            )
 
-        response = self.client.chat.completions.create(**params)
+        params = self._prepare_params(messages, tools, tool_choice, **kwargs)
+        response = await self.async_client.chat.completions.create(**params)
         return self._parse_response(response, tools)
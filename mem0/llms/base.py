@@ -1,7 +1,15 @@
+import asyncio
+import json
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Union
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Union
+
+import httpx
 
 from mem0.configs.llms.base import BaseLlmConfig
+from mem0.memory.utils import JSONArrayStreamParser, count_tokens, extract_json
+
+logger = logging.getLogger(__name__)
 
 
 class LLMBase(ABC):
@@ -10,6 +18,9 @@ class LLMBase(ABC):
     Handles common functionality and delegates provider-specific logic to subclasses.
     """
 
+    # Whether the backend constrains decoding to the JSON schema of a ``json_schema`` response format
+    supports_json_schema = False
+
     def __init__(self, config: Optional[Union[BaseLlmConfig, Dict]] = None):
         """Initialize a base LLM class
 
@@ -24,6 +35,9 @@ class LLMBase(ABC):
         else:
             self.config = config
 
+        # Async SDK client, created on first use by agenerate_response
+        self._async_client = None
+
         # Validate configuration
         self._validate_config()
 
@@ -112,6 +126,211 @@ class LLMBase(ABC):
         """
         pass
 
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs):
+        """
+        Generate a response without blocking the event loop.
+
+        Providers whose SDK ships an async client override this and share the request building and response
+        parsing of ``generate_response``. For the others the sync call runs in a worker thread.
+
+        Args:
+            messages (list): List of message dicts containing 'role' and 'content'.
+            **kwargs: The other arguments accepted by ``generate_response``.
+
+        Returns:
+            str or dict: The generated response.
+        """
+        return await asyncio.to_thread(self.generate_response, messages, **kwargs)
+
+    def stream_response(self, messages: List[Dict[str, str]], **kwargs) -> Iterator[str]:
+        """
+        Generate a response, yielding its text as it is produced.
+
+        Providers whose SDK can stream override this. For the others the whole response of ``generate_response``
+        is yielded as one chunk.
+
+        Args:
+            messages (list): List of message dicts containing 'role' and 'content'.
+            **kwargs: The other arguments accepted by ``generate_response``, except tools.
+
+        Yields:
+            str: The next chunk of the response text.
+        """
+        yield self.generate_response(messages, **kwargs)
+
+    async def astream_response(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[str]:
+        """
+        Async variant of ``stream_response``, falling back to ``agenerate_response`` for providers that cannot
+        stream.
+        """
+        yield await self.agenerate_response(messages, **kwargs)
+
+    def stream_json_items(self, messages: List[Dict[str, str]], key: Optional[str] = None, **kwargs) -> Iterator:
+        """
+        Generate a JSON response, yielding the items of one of its arrays as soon as each of them is complete.
+
+        Args:
+            messages (list): List of message dicts containing 'role' and 'content'.
+            key (str, optional): Key of the array in the response object. Defaults to the first array.
+            **kwargs: The other arguments accepted by ``generate_response``, except tools.
+
+        Yields:
+            The parsed array items.
+        """
+        parser = JSONArrayStreamParser(key)
+        for chunk in self.stream_response(messages, **kwargs):
+            yield from parser.feed(chunk)
+        yield from parser.close()
+
+    async def astream_json_items(
+        self, messages: List[Dict[str, str]], key: Optional[str] = None, **kwargs
+    ) -> AsyncIterator:
+        """Async variant of ``stream_json_items``."""
+        parser = JSONArrayStreamParser(key)
+        async for chunk in self.astream_response(messages, **kwargs):
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the tokens of a prompt for the configured model.
+
+        Uses tiktoken, or an estimate from the text size if it is not installed. Providers with their own
+        tokenizer can override this.
+
+        Args:
+            text (str): The prompt text.
+
+        Returns:
+            int: The number of tokens.
+        """
+        return count_tokens(text, self.config.model)
+
+    @staticmethod
+    def _get_json_schema(response_format) -> Optional[Dict]:
+        """The JSON schema of a ``json_schema`` response format, None for other formats."""
+        if isinstance(response_format, dict) and response_format.get("type") == "json_schema":
+            return response_format.get("json_schema", {}).get("schema")
+        return None
+
+    @staticmethod
+    def _get_tool_calls_schema(tools: List[Dict]) -> Dict:
+        """
+        JSON schema of a response holding calls to the given tools, for backends that constrain decoding to a schema
+        instead of calling tools natively.
+
+        The response is ``{"tool_calls": [{"name": ..., "arguments": ...}]}`` with the arguments of each call matching
+        the parameters of its tool. The list may be empty, so the model is never forced to call a tool.
+        """
+        calls = [
+            {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "enum": [tool["function"]["name"]]},
+                    "arguments": tool["function"].get("parameters", {"type": "object"}),
+                },
+                "required": ["name", "arguments"],
+            }
+            for tool in tools
+        ]
+        return {
+            "type": "object",
+            "properties": {"tool_calls": {"type": "array", "items": calls[0] if len(calls) == 1 else {"anyOf": calls}}},
+            "required": ["tool_calls"],
+        }
+
+    @staticmethod
+    def _add_tool_instructions(messages: List[Dict], tools: List[Dict]) -> List[Dict]:
+        """Describe the tools in the system message, for backends that get them through a schema instead."""
+        lines = ["可用工具:"]
+        for tool in tools:
+            function = tool["function"]
+            lines.append(f"- {function['name']}: {function.get('description', '')}")
+            lines.append(f"  参数: {json.dumps(function.get('parameters', {}), ensure_ascii=False)}")
+        lines.append(
+            '以JSON格式返回要调用的工具: {"tool_calls": [{"name": "<工具名>", "arguments": {<参数>}}]}，'
+            '每次调用占一项；无需调用工具时返回 {"tool_calls": []}。'
+        )
+        instructions = "\n".join(lines)
+
+        if messages and messages[0].get("role") == "system" and isinstance(messages[0].get("content"), str):
+            return [{**messages[0], "content": f"{messages[0]['content']}\n\n{instructions}"}, *messages[1:]]
+        return [{"role": "system", "content": instructions}, *messages]
+
+    @staticmethod
+    def _parse_tool_calls_json(content: str, tools: List[Dict]) -> Dict:
+        """Turn a response written against ``_get_tool_calls_schema`` into the processed tool call response."""
+        names = {tool["function"]["name"] for tool in tools}
+        tool_calls = []
+        try:
+            calls = json.loads(extract_json(content or "")).get("tool_calls") or []
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"Invalid tool calls response: {e}")
+            calls = []
+        for call in calls:
+            if isinstance(call, dict) and call.get("name") in names and isinstance(call.get("arguments"), dict):
+                tool_calls.append({"name": call["name"], "arguments": call["arguments"]})
+        return {"content": content, "tool_calls": tool_calls}
+
+    def _run_response_callback(self, response, params):
+        """
+        Hand the raw provider response to the configured ``response_callback``.
+
+        The raw response carries the token usage, including the prompt tokens served from the provider's prompt
+        cache. Errors raised by the callback are logged and never fail the call.
+        """
+        callback = getattr(self.config, "response_callback", None)
+        if not callback:
+            return
+        try:
+            callback(self, response, params)
+        except Exception as e:
+            logger.error(f"Error due to callback: {e}")
+
+    @property
+    def async_client(self):
+        """The provider's async SDK client, created on first use so sync-only callers never build one."""
+        if getattr(self, "_async_client", None) is None:
+            self._async_client = self._create_async_client()
+        return self._async_client
+
+    def _async_http_client(self) -> Optional[httpx.AsyncClient]:
+        """
+        The async counterpart of the configured ``http_client``, built from the same proxy settings.
+
+        Returns:
+            httpx.AsyncClient or None: None when no proxy is configured and the SDK default applies.
+        """
+        proxies = getattr(self.config, "http_client_proxies", None)
+        if not proxies:
+            return None
+        if isinstance(proxies, dict):
+            # One proxy per URL pattern, e.g. {"http://": ..., "https://": ...}
+            return httpx.AsyncClient(
+                mounts={pattern: httpx.AsyncHTTPTransport(proxy=proxy) for pattern, proxy in proxies.items()}
+            )
+        return httpx.AsyncClient(proxy=proxies)
+
+    def _has_custom_http_client(self) -> bool:
+        """
+        Whether an ``http_client`` was set directly on the config instead of being built from ``http_client_proxies``.
+
+        Its transport and TLS settings can not be carried over to an async client, so providers with an async client
+        run the sync one in a worker thread instead.
+        """
+        if getattr(self.config, "http_client", None) is None:
+            return False
+        return not getattr(self.config, "http_client_proxies", None)
+
+    def _create_async_client(self):
+        """
+        Create the async SDK client used by ``agenerate_response``.
+        Override in subclasses that implement ``agenerate_response`` with an async SDK.
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no async client")
+
     def _get_common_params(self, **kwargs) -> Dict:
         """
         Get common parameters that most providers use.
@@ -2,7 +2,7 @@ import json
 import os
 from typing import Dict, List, Optional, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from mem0.configs.llms.base import BaseLlmConfig
 from mem0.configs.llms.deepseek import DeepSeekConfig
@@ -40,6 +40,24 @@ class DeepSeekLLM(LLMBase):
         base_url = self.config.deepseek_base_url or os.getenv("DEEPSEEK_API_BASE") or "https://api.deepseek.com"
         self.client = OpenAI(api_key=api_key, base_url=base_url)
 
+    def _create_async_client(self):
+        return AsyncOpenAI(api_key=self.client.api_key, base_url=self.client.base_url)
+
+    def _prepare_params(self, messages, tools=None, tool_choice="auto", **kwargs):
+        """Build the chat completion request shared by the sync and async calls."""
+        params = self._get_supported_params(messages=messages, **kwargs)
+        params.update(
+            {
+                "model": self.config.model,
+                "messages": messages,
+            }
+        )
+
+        if tools:
+            params["tools"] = tools
+            params["tool_choice"] = tool_choice
+        return params
+
     def _parse_response(self, response, tools):
         """
         Process the response based on whether tools are used or not.
@@ -91,17 +109,23 @@ class DeepSeekLLM(LLMBase):
         Returns:
             str: The generated response.
         """
-        params = self._get_supported_params(messages=messages, **kwargs)
-        params.update(
-            {
-                "model": self.config.model,
-                "messages": messages,
-            }
-        )
+        params = self._prepare_params(messages, tools, tool_choice, **kwargs)
+        response = self.client.chat.completions.create(**params)
+        return self._parse_response(response, tools)
 
-        if tools:
-            params["tools"] = tools
-            params["tool_choice"] = tool_choice
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        **kwargs,
+    ):
+        """
+        Generate a response based on the given messages with the async DeepSeek client.
 
-        response = self.client.chat.completions.create(**params)
+        Takes the same arguments and returns the same response as ``generate_response``.
+        """
+        params = self._prepare_params(messages, tools, tool_choice, **kwargs)
+        response = await self.async_client.chat.completions.create(**params)
         return self._parse_response(response, tools)
@@ -3,7 +3,7 @@ import os
 from typing import Dict, List, Optional
 
 try:
-    from groq import Groq
+    from groq import AsyncGroq, Groq
 except ImportError:
     raise ImportError("The 'groq' library is required. Please install it using 'pip install groq'.")
 
@@ -22,6 +22,25 @@ class GroqLLM(LLMBase):
         api_key = self.config.api_key or os.getenv("GROQ_API_KEY")
         self.client = Groq(api_key=api_key)
 
+    def _create_async_client(self):
+        return AsyncGroq(api_key=self.client.api_key)
+
+    def _prepare_params(self, messages, response_format=None, tools=None, tool_choice="auto"):
+        """Build the chat completion request shared by the sync and async calls."""
+        params = {
+            "model": self.config.model,
+            "messages": messages,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "top_p": self.config.top_p,
+        }
+        if response_format:
+            params["response_format"] = response_format
+        if tools:
+            params["tools"] = tools
+            params["tool_choice"] = tool_choice
+        return params
+
     def _parse_response(self, response, tools):
         """
         Process the response based on whether tools are used or not.
@@ -71,18 +90,22 @@ class GroqLLM(LLMBase):
         Returns:
             str: The generated response.
         """
-        params = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": self.config.temperature,
-            "max_tokens": self.config.max_tokens,
-            "top_p": self.config.top_p,
-        }
-        if response_format:
-            params["response_format"] = response_format
-        if tools:
-            params["tools"] = tools
-            params["tool_choice"] = tool_choice
-
+        params = self._prepare_params(messages, response_format, tools, tool_choice)
         response = self.client.chat.completions.create(**params)
         return self._parse_response(response, tools)
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+    ):
+        """
+        Generate a response based on the given messages with the async Groq client.
+
+        Takes the same arguments and returns the same response as ``generate_response``.
+        """
+        params = self._prepare_params(messages, response_format, tools, tool_choice)
+        response = await self.async_client.chat.completions.create(**params)
+        return self._parse_response(response, tools)
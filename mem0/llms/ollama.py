@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional, Union
 
 try:
-    from ollama import Client
+    from ollama import AsyncClient, Client
 except ImportError:
     raise ImportError("The 'ollama' library is required. Please install it using 'pip install ollama'.")
 
@@ -38,6 +38,44 @@ class OllamaLLM(LLMBase):
 
         self.client = Client(host=self.config.ollama_base_url)
 
+    def _create_async_client(self):
+        return AsyncClient(host=self.config.ollama_base_url)
+
+    @property
+    def supports_json_schema(self):
+        return self.config.structured_output
+
+    def _prepare_params(self, messages, response_format=None, tools=None):
+        """Build the chat request shared by the sync and async calls."""
+        # Build parameters for Ollama
+        params = {
+            "model": self.config.model,
+            "messages": messages,
+        }
+
+        # Add options for Ollama (temperature, num_predict, top_p)
+        options = {
+            "temperature": self.config.temperature,
+            "num_predict": self.config.max_tokens,
+            "top_p": self.config.top_p,
+        }
+        params["options"] = options
+
+        # Remove OpenAI-specific parameters that Ollama doesn't support
+        params.pop("max_tokens", None)  # Ollama uses different parameter names
+
+        if tools and self.config.structured_output:
+            # Tool calls are generated as JSON constrained to the schema of the tools
+            params["messages"] = self._add_tool_instructions(messages, tools)
+            params["format"] = self._get_tool_calls_schema(tools)
+        elif response_format:
+            schema = self._get_json_schema(response_format)
+            if schema is not None and self.config.structured_output:
+                params["format"] = schema
+            elif response_format.get("type") in ("json_object", "json_schema"):
+                params["format"] = "json"
+        return params
+
     def _parse_response(self, response, tools):
         """
         Process the response based on whether tools are used or not.
@@ -50,13 +88,12 @@ class OllamaLLM(LLMBase):
             str or dict: The processed response.
         """
         if tools:
-            processed_response = {
-                "content": response["message"]["content"] if isinstance(response, dict) else response.message.content,
-                "tool_calls": [],
-            }
+            content = response["message"]["content"] if isinstance(response, dict) else response.message.content
+            if self.config.structured_output:
+                return self._parse_tool_calls_json(content, tools)
 
-            # Ollama doesn't support tool calls in the same way, so we return the content
-            return processed_response
+            # Without structured output the tools are not sent to Ollama, so we return the content
+            return {"content": content, "tool_calls": []}
         else:
             # Handle both dict and object responses
             if isinstance(response, dict):
@@ -77,30 +114,34 @@ class OllamaLLM(LLMBase):
 
         Args:
             messages (list): List of message dicts containing 'role' and 'content'.
-            response_format (str or object, optional): Format of the response. Defaults to "text".
-            tools (list, optional): List of tools that the model can call. Defaults to None.
+            response_format (str or object, optional): Format of the response. Defaults to "text". JSON formats are
+                passed as Ollama's ``format``, the schema of a ``json_schema`` format if ``structured_output`` is
+                enabled.
+            tools (list, optional): List of tools that the model can call. Defaults to None. With
+                ``structured_output`` the calls are generated as JSON constrained to the schema of the tools.
             tool_choice (str, optional): Tool choice method. Defaults to "auto".
             **kwargs: Additional Ollama-specific parameters.
 
         Returns:
             str: The generated response.
         """
-        # Build parameters for Ollama
-        params = {
-            "model": self.config.model,
-            "messages": messages,
-        }
-
-        # Add options for Ollama (temperature, num_predict, top_p)
-        options = {
-            "temperature": self.config.temperature,
-            "num_predict": self.config.max_tokens,
-            "top_p": self.config.top_p,
-        }
-        params["options"] = options
+        params = self._prepare_params(messages, response_format, tools)
+        response = self.client.chat(**params)
+        return self._parse_response(response, tools)
 
-        # Remove OpenAI-specific parameters that Ollama doesn't support
-        params.pop("max_tokens", None)  # Ollama uses different parameter names
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        **kwargs,
+    ):
+        """
+        Generate a response based on the given messages with the async Ollama client.
 
-        response = self.client.chat(**params)
+        Takes the same arguments and returns the same response as ``generate_response``.
+        """
+        params = self._prepare_params(messages, response_format, tools)
+        response = await self.async_client.chat(**params)
         return self._parse_response(response, tools)
@@ -1,9 +1,8 @@
 import json
-import logging
 import os
 from typing import Dict, List, Optional, Union
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from mem0.configs.llms.base import BaseLlmConfig
 from mem0.configs.llms.openai import OpenAIConfig
@@ -38,17 +37,21 @@ class OpenAILLM(LLMBase):
             self.config.model = "gpt-4o-mini"
 
         if os.environ.get("OPENROUTER_API_KEY"):  # Use OpenRouter
-            self.client = OpenAI(
-                api_key=os.environ.get("OPENROUTER_API_KEY"),
-                base_url=self.config.openrouter_base_url
+            self._client_kwargs = {
+                "api_key": os.environ.get("OPENROUTER_API_KEY"),
+                "base_url": self.config.openrouter_base_url
                 or os.getenv("OPENROUTER_API_BASE")
                 or "https://openrouter.ai/api/v1",
-            )
+            }
         else:
             api_key = self.config.api_key or os.getenv("OPENAI_API_KEY")
             base_url = self.config.openai_base_url or os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1"
+            self._client_kwargs = {"api_key": api_key, "base_url": base_url}
+
+        self.client = OpenAI(**self._client_kwargs)
 
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
+    def _create_async_client(self):
+        return AsyncOpenAI(**self._client_kwargs)
 
     def _parse_response(self, response, tools):
         """
@@ -80,27 +83,8 @@ class OpenAILLM(LLMBase):
         else:
             return response.choices[0].message.content
 
-    def generate_response(
-        self,
-        messages: List[Dict[str, str]],
-        response_format=None,
-        tools: Optional[List[Dict]] = None,
-        tool_choice: str = "auto",
-        **kwargs,
-    ):
-        """
-        Generate a JSON response based on the given messages using OpenAI.
-
-        Args:
-            messages (list): List of message dicts containing 'role' and 'content'.
-            response_format (str or object, optional): Format of the response. Defaults to "text".
-            tools (list, optional): List of tools that the model can call. Defaults to None.
-            tool_choice (str, optional): Tool choice method. Defaults to "auto".
-            **kwargs: Additional OpenAI-specific parameters.
-
-        Returns:
-            json: The generated response.
-        """
+    def _prepare_params(self, messages, response_format=None, tools=None, tool_choice="auto", **kwargs):
+        """Build the chat completion request shared by the sync and async calls."""
         params = self._get_supported_params(messages=messages, **kwargs)
         
         params.update({
@@ -129,13 +113,73 @@ class OpenAILLM(LLMBase):
         if tools:  # TODO: Remove tools if no issues found with new memory addition logic
             params["tools"] = tools
             params["tool_choice"] = tool_choice
-        response = self.client.chat.completions.create(**params)
+        return params
+
+    def _handle_response(self, response, params, tools):
         parsed_response = self._parse_response(response, tools)
-        if self.config.response_callback:
-            try:
-                self.config.response_callback(self, response, params)
-            except Exception as e:
-                # Log error but don't propagate
-                logging.error(f"Error due to callback: {e}")
-                pass
+        self._run_response_callback(response, params)
         return parsed_response
+
+    def generate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        **kwargs,
+    ):
+        """
+        Generate a JSON response based on the given messages using OpenAI.
+
+        Args:
+            messages (list): List of message dicts containing 'role' and 'content'.
+            response_format (str or object, optional): Format of the response. Defaults to "text".
+            tools (list, optional): List of tools that the model can call. Defaults to None.
+            tool_choice (str, optional): Tool choice method. Defaults to "auto".
+            **kwargs: Additional OpenAI-specific parameters.
+
+        Returns:
+            json: The generated response.
+        """
+        params = self._prepare_params(messages, response_format, tools, tool_choice, **kwargs)
+        response = self.client.chat.completions.create(**params)
+        return self._handle_response(response, params, tools)
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+        **kwargs,
+    ):
+        """
+        Generate a JSON response based on the given messages with the async OpenAI client.
+
+        Takes the same arguments and returns the same response as ``generate_response``.
+        """
+        params = self._prepare_params(messages, response_format, tools, tool_choice, **kwargs)
+        response = await self.async_client.chat.completions.create(**params)
+        return self._handle_response(response, params, tools)
+
+    def stream_response(self, messages: List[Dict[str, str]], response_format=None, **kwargs):
+        """
+        Stream the text of a response with OpenAI.
+
+        Takes the same arguments as ``generate_response`` except tools. ``response_callback`` is not called for
+        streamed responses.
+
+        Yields:
+            str: The next chunk of the response text.
+        """
+        params = self._prepare_params(messages, response_format, **kwargs)
+        for chunk in self.client.chat.completions.create(stream=True, **params):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def astream_response(self, messages: List[Dict[str, str]], response_format=None, **kwargs):
+        """Stream the text of a response with the async OpenAI client, see ``stream_response``."""
+        params = self._prepare_params(messages, response_format, **kwargs)
+        async for chunk in await self.async_client.chat.completions.create(stream=True, **params):
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -3,7 +3,7 @@ import os
 from typing import Dict, List, Optional
 
 try:
-    from together import Together
+    from together import AsyncTogether, Together
 except ImportError:
     raise ImportError("The 'together' library is required. Please install it using 'pip install together'.")
 
@@ -22,6 +22,25 @@ class TogetherLLM(LLMBase):
         api_key = self.config.api_key or os.getenv("TOGETHER_API_KEY")
         self.client = Together(api_key=api_key)
 
+    def _create_async_client(self):
+        return AsyncTogether(api_key=self.client.api_key)
+
+    def _prepare_params(self, messages, response_format=None, tools=None, tool_choice="auto"):
+        """Build the chat completion request shared by the sync and async calls."""
+        params = {
+            "model": self.config.model,
+            "messages": messages,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "top_p": self.config.top_p,
+        }
+        if response_format:
+            params["response_format"] = response_format
+        if tools:  # TODO: Remove tools if no issues found with new memory addition logic
+            params["tools"] = tools
+            params["tool_choice"] = tool_choice
+        return params
+
     def _parse_response(self, response, tools):
         """
         Process the response based on whether tools are used or not.
@@ -71,18 +90,22 @@ class TogetherLLM(LLMBase):
         Returns:
             str: The generated response.
         """
-        params = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": self.config.temperature,
-            "max_tokens": self.config.max_tokens,
-            "top_p": self.config.top_p,
-        }
-        if response_format:
-            params["response_format"] = response_format
-        if tools:  # TODO: Remove tools if no issues found with new memory addition logic
-            params["tools"] = tools
-            params["tool_choice"] = tool_choice
-
+        params = self._prepare_params(messages, response_format, tools, tool_choice)
         response = self.client.chat.completions.create(**params)
         return self._parse_response(response, tools)
+
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+    ):
+        """
+        Generate a response based on the given messages with the async TogetherAI client.
+
+        Takes the same arguments and returns the same response as ``generate_response``.
+        """
+        params = self._prepare_params(messages, response_format, tools, tool_choice)
+        response = await self.async_client.chat.completions.create(**params)
+        return self._parse_response(response, tools)
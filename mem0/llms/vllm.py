@@ -40,6 +40,10 @@ class VllmLLM(LLMBase):
         base_url = self.config.vllm_base_url or os.getenv("VLLM_BASE_URL")
         self.client = OpenAI(api_key=self.config.api_key, base_url=base_url)
 
+    @property
+    def supports_json_schema(self):
+        return self.config.structured_output
+
     def _parse_response(self, response, tools):
         """
         Process the response based on whether tools are used or not.
@@ -83,8 +87,10 @@ class VllmLLM(LLMBase):
 
         Args:
             messages (list): List of message dicts containing 'role' and 'content'.
-            response_format (str or object, optional): Format of the response. Defaults to "text".
-            tools (list, optional): List of tools that the model can call. Defaults to None.
+            response_format (str or object, optional): Format of the response. Defaults to "text". The schema of a
+                ``json_schema`` format is enforced with guided decoding if ``structured_output`` is enabled.
+            tools (list, optional): List of tools that the model can call. Defaults to None. With
+                ``structured_output`` the calls are generated with guided decoding instead of vLLM's tool parsers.
             tool_choice (str, optional): Tool choice method. Defaults to "auto".
             **kwargs: Additional vLLM-specific parameters.
 
@@ -99,9 +105,23 @@ class VllmLLM(LLMBase):
             }
         )
 
+        if tools and self.config.structured_output:
+            # Tool calls are decoded against the schema of the tools, so the server needs no tool call parser and
+            # the arguments always parse
+            params["messages"] = self._add_tool_instructions(messages, tools)
+            params["extra_body"] = {**params.get("extra_body", {}), "guided_json": self._get_tool_calls_schema(tools)}
+            response = self.client.chat.completions.create(**params)
+            return self._parse_tool_calls_json(response.choices[0].message.content, tools)
+
         if tools:
             params["tools"] = tools
             params["tool_choice"] = tool_choice
+        elif response_format:
+            schema = self._get_json_schema(response_format)
+            if schema is not None and self.config.structured_output:
+                params["extra_body"] = {**params.get("extra_body", {}), "guided_json": schema}
+            else:
+                params["response_format"] = response_format
 
         response = self.client.chat.completions.create(**params)
         return self._parse_response(response, tools)
@@ -1,7 +1,7 @@
 import os
 from typing import Dict, List, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 from mem0.configs.llms.base import BaseLlmConfig
 from mem0.llms.base import LLMBase
@@ -18,6 +18,23 @@ class XAILLM(LLMBase):
         base_url = self.config.xai_base_url or os.getenv("XAI_API_BASE") or "https://api.x.ai/v1"
         self.client = OpenAI(api_key=api_key, base_url=base_url)
 
+    def _create_async_client(self):
+        return AsyncOpenAI(api_key=self.client.api_key, base_url=self.client.base_url)
+
+    def _prepare_params(self, messages, response_format=None):
+        """Build the chat completion request shared by the sync and async calls."""
+        params = {
+            "model": self.config.model,
+            "messages": messages,
+            "temperature": self.config.temperature,
+            "max_tokens": self.config.max_tokens,
+            "top_p": self.config.top_p,
+        }
+
+        if response_format:
+            params["response_format"] = response_format
+        return params
+
     def generate_response(
         self,
         messages: List[Dict[str, str]],
@@ -37,16 +54,22 @@ class XAILLM(LLMBase):
         Returns:
             str: The generated response.
         """
-        params = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": self.config.temperature,
-            "max_tokens": self.config.max_tokens,
-            "top_p": self.config.top_p,
-        }
+        params = self._prepare_params(messages, response_format)
+        response = self.client.chat.completions.create(**params)
+        return response.choices[0].message.content
 
-        if response_format:
-            params["response_format"] = response_format
+    async def agenerate_response(
+        self,
+        messages: List[Dict[str, str]],
+        response_format=None,
+        tools: Optional[List[Dict]] = None,
+        tool_choice: str = "auto",
+    ):
+        """
+        Generate a response based on the given messages with the async XAI client.
 
-        response = self.client.chat.completions.create(**params)
+        Takes the same arguments and returns the same response as ``generate_response``.
+        """
+        params = self._prepare_params(messages, response_format)
+        response = await self.async_client.chat.completions.create(**params)
         return response.choices[0].message.content
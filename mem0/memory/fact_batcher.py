@@ -0,0 +1,213 @@
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import Future
+
+from mem0.configs.prompts import FACT_RETRIEVAL_BATCH_SCHEMA
+from mem0.memory.utils import get_batch_fact_retrieval_messages, get_json_response_format, remove_code_blocks
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    def __init__(self):
+        self.items = []
+        self.timer = None
+
+
+class FactExtractionBatcher:
+    """Coalesces the fact extraction requests of concurrent add calls into one LLM request.
+
+    Requests arriving within ``max_wait_ms`` of the first one, up to ``max_batch_size``, are sent together as one
+    prompt holding every conversation. The facts of each conversation are handed back as the ``{"facts": [...]}``
+    response a single extraction call returns, so callers parse them as before. Conversations missing from the
+    batched answer, or all of them if the batched call fails, fall back to a single extraction call.
+
+    Requests of sync callers are sent from a worker thread with ``generate_response``. Requests of async callers
+    are batched per event loop and sent with ``agenerate_response``.
+
+    Single extraction calls use the ``response_format`` of the caller. The batched call asks for the batched
+    answer's schema from LLMs that support schemas, and for any JSON object from the others.
+    """
+
+    def __init__(self, llm, max_wait_ms: float = 20, max_batch_size: int = 8, response_format=None):
+        self.llm = llm
+        self.response_format = response_format or {"type": "json_object"}
+        self.batch_response_format = get_json_response_format(llm, "fact_batches", FACT_RETRIEVAL_BATCH_SCHEMA)
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Batches of async callers, keyed by event loop and system prompt, only touched from their loop
+        self._async_pending = {}
+        # Running batched calls of async callers, referenced until done so they are not garbage collected
+        self._async_tasks = set()
+
+    def extract(self, system_prompt, user_prompt):
+        """Extract facts, waiting at most ``max_wait_ms`` for other requests to share the LLM call with."""
+        response = self.submit(system_prompt, user_prompt).result()
+        if response is None:
+            response = self.llm.generate_response(
+                messages=self._messages(system_prompt, user_prompt), response_format=self.response_format
+            )
+        return response
+
+    async def aextract(self, system_prompt, user_prompt):
+        """
+        Async variant of ``extract``. Requests of the same event loop are batched together and sent with
+        ``agenerate_response``, so the caller awaits the shared call without holding a thread.
+        """
+        response = await self.asubmit(system_prompt, user_prompt)
+        if response is None:
+            response = await self.llm.agenerate_response(
+                messages=self._messages(system_prompt, user_prompt), response_format=self.response_format
+            )
+        return response
+
+    def submit(self, system_prompt, user_prompt) -> Future:
+        """
+        Queue an extraction request.
+
+        Returns:
+            Future: Resolves to the extraction response, or to None if the caller has to extract on its own.
+        """
+        future = Future()
+        with self._lock:
+            # Only requests with the same instructions can share a prompt
+            batch = self._pending.get(system_prompt)
+            if batch is None:
+                batch = self._pending[system_prompt] = _Batch()
+                batch.timer = threading.Timer(self.max_wait, self._flush_on_timeout, args=(system_prompt, batch))
+                batch.timer.daemon = True
+                batch.timer.start()
+            batch.items.append((user_prompt, future))
+            full = len(batch.items) >= self.max_batch_size
+            if full:
+                del self._pending[system_prompt]
+                batch.timer.cancel()
+        if full:
+            threading.Thread(target=self._run, args=(system_prompt, batch.items), daemon=True).start()
+        return future
+
+    def asubmit(self, system_prompt, user_prompt) -> asyncio.Future:
+        """
+        Queue an extraction request of an async caller.
+
+        Returns:
+            asyncio.Future: Resolves to the extraction response, or to None if the caller has to extract on its own.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (loop, system_prompt)
+        batch = self._async_pending.get(key)
+        if batch is None:
+            batch = self._async_pending[key] = _Batch()
+            batch.timer = loop.call_later(self.max_wait, self._aflush, key, batch)
+        batch.items.append((user_prompt, future))
+        if len(batch.items) >= self.max_batch_size:
+            batch.timer.cancel()
+            self._aflush(key, batch)
+        return future
+
+    def _aflush(self, key, batch):
+        if self._async_pending.get(key) is batch:
+            del self._async_pending[key]
+            task = key[0].create_task(self._arun(key[1], batch.items))
+            self._async_tasks.add(task)
+            task.add_done_callback(self._async_tasks.discard)
+
+    async def _arun(self, system_prompt, items):
+        # Callers that gave up waiting, e.g. cancelled tasks, are left out
+        items = [(user_prompt, future) for user_prompt, future in items if not future.done()]
+        if not items:
+            return
+
+        if len(items) == 1:
+            user_prompt, future = items[0]
+            try:
+                response = await self.llm.agenerate_response(
+                    messages=self._messages(system_prompt, user_prompt), response_format=self.response_format
+                )
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(response)
+            return
+
+        batch_system_prompt, batch_user_prompt = get_batch_fact_retrieval_messages(
+            system_prompt, [user_prompt for user_prompt, _ in items]
+        )
+        try:
+            response = await self.llm.agenerate_response(
+                messages=self._messages(batch_system_prompt, batch_user_prompt),
+                response_format=self.batch_response_format,
+            )
+            results = self._parse_batch(response)
+        except Exception as e:
+            logger.warning(f"Batched fact extraction of {len(items)} requests failed, extracting one by one: {e}")
+            results = {}
+
+        for i, (_, future) in enumerate(items):
+            if not future.done():
+                future.set_result(self._facts_response(results.get(str(i))))
+
+    def _flush_on_timeout(self, system_prompt, batch):
+        with self._lock:
+            if self._pending.get(system_prompt) is not batch:
+                # Already sent because it filled up
+                return
+            del self._pending[system_prompt]
+        self._run(system_prompt, batch.items)
+
+    def _run(self, system_prompt, items):
+        # Callers that gave up waiting, e.g. cancelled tasks, are left out
+        items = [(user_prompt, future) for user_prompt, future in items if future.set_running_or_notify_cancel()]
+        if not items:
+            return
+
+        if len(items) == 1:
+            user_prompt, future = items[0]
+            try:
+                future.set_result(
+                    self.llm.generate_response(
+                        messages=self._messages(system_prompt, user_prompt), response_format=self.response_format
+                    )
+                )
+            except Exception as e:
+                future.set_exception(e)
+            return
+
+        batch_system_prompt, batch_user_prompt = get_batch_fact_retrieval_messages(
+            system_prompt, [user_prompt for user_prompt, _ in items]
+        )
+        try:
+            response = self.llm.generate_response(
+                messages=self._messages(batch_system_prompt, batch_user_prompt),
+                response_format=self.batch_response_format,
+            )
+            results = self._parse_batch(response)
+        except Exception as e:
+            logger.warning(f"Batched fact extraction of {len(items)} requests failed, extracting one by one: {e}")
+            results = {}
+
+        for i, (_, future) in enumerate(items):
+            future.set_result(self._facts_response(results.get(str(i))))
+
+    @staticmethod
+    def _parse_batch(response):
+        """The facts of each conversation of a batched answer, by conversation id."""
+        return {
+            str(result["id"]): result.get("facts", []) for result in json.loads(remove_code_blocks(response))["results"]
+        }
+
+    @staticmethod
+    def _facts_response(facts):
+        """The response a single extraction call returns, None for a conversation missing from the batched answer."""
+        return json.dumps({"facts": facts}, ensure_ascii=False) if facts is not None else None
+
+    @staticmethod
+    def _messages(system_prompt, user_prompt):
+        return [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
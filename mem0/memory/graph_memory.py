@@ -1,17 +1,15 @@
 import logging
+import threading
+import time
+from collections import Counter, OrderedDict
 
-from mem0.memory.utils import format_entities, sanitize_relationship_for_cypher
+from mem0.memory.utils import format_entities, get_conflict_candidates, sanitize_relationship_for_cypher
 
 try:
     from langchain_neo4j import Neo4jGraph
 except ImportError:
     raise ImportError("langchain_neo4j is not installed. Please install it using pip install langchain-neo4j")
 
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
 from mem0.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
@@ -20,13 +18,17 @@ from mem0.graphs.tools import (
     RELATIONS_STRUCT_TOOL,
     RELATIONS_TOOL,
 )
-from mem0.graphs.utils import EXTRACT_RELATIONS_PROMPT, get_delete_messages
+from mem0.graphs.utils import extract_entities_and_relations, get_delete_messages, get_relations_extraction_messages
+from mem0.memory.lexical_index import LexicalIndex
 from mem0.utils.factory import EmbedderFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
 
 
 class MemoryGraph:
+    # Number of user/agent/run scopes whose lexical index is kept in memory
+    LEXICAL_INDEX_SCOPES = 256
+
     def __init__(self, config):
         self.config = config
         self.graph = Neo4jGraph(
@@ -41,6 +43,17 @@ class MemoryGraph:
             self.config.embedder.provider, self.config.embedder.config, self.config.vector_store.config
         )
         self.node_label = ":`__Entity__`" if self.config.graph_store.config.base_label else ""
+        # Node lookups go through the vector index only when it is enabled, it only covers nodes with the base label
+        self.use_vector_index = False
+        self.vector_index_candidates = self.config.graph_store.config.vector_index_candidates or 50
+        # Lexical index of entity names and relations per (user_id, agent_id, run_id) scope, used to resolve
+        # search entities without the LLM and to rerank search results
+        self.entity_match_fast_path = self.config.graph_store.config.entity_match_fast_path
+        self.lexical_index_max_rows = self.config.graph_store.config.lexical_index_max_rows
+        self.lexical_index_refresh_seconds = self.config.graph_store.config.lexical_index_refresh_seconds
+        self._lexical_indexes = OrderedDict()
+        self._lexical_index_checked_at = {}
+        self._lexical_indexes_lock = threading.Lock()
 
         if self.config.graph_store.config.base_label:
             # Safely add user_id index
@@ -55,18 +68,8 @@ class MemoryGraph:
             except Exception:
                 pass
 
-            # Safely add vector index
-            try:
-                self.graph.query(
-                    f"CREATE VECTOR INDEX `entity_embedding_index` IF NOT EXISTS FOR (n{self.node_label}) ON (n.embedding) "
-                    "OPTIONS { indexConfig: { "
-                    "`vector.dimensions`: 1024, "
-                    "`vector.similarity_function`: 'cosine' "
-                    "} }"
-                )
-                logger.info("Successfully created or verified vector index.")
-            except Exception as e:
-                logger.warning(f"Could not create vector index, this may impact performance: {e}")
+            if self.config.graph_store.config.vector_index:
+                self._ensure_vector_index()
 
         # Default to openai if no specific provider is configured
         self.llm_provider = "openai"
@@ -85,6 +88,48 @@ class MemoryGraph:
         self.user_id = None
         self.threshold = 0.7
 
+    def _ensure_vector_index(self):
+        """
+        Create the entity vector index, or verify the existing one, and use it for node lookups only if its
+        dimensions match those of the embedder.
+
+        The index is shared by every process using the database, so an index with other dimensions, e.g. built for
+        another embedder, is left in place and this instance compares the scoped nodes instead.
+        """
+        try:
+            embedding_dims = getattr(self.embedding_model.config, "embedding_dims", None)
+            if not isinstance(embedding_dims, int):
+                # Not every embedder knows its dimensions before the first call
+                embedding_dims = len(self.embedding_model.embed("dimension probe"))
+
+            existing = self.graph.query(
+                "SHOW INDEXES YIELD name, options WHERE name = 'entity_embedding_index' RETURN options"
+            )
+            if existing:
+                index_dims = existing[0]["options"]["indexConfig"]["vector.dimensions"]
+                self.use_vector_index = index_dims == embedding_dims
+                if self.use_vector_index:
+                    logger.info("Verified vector index.")
+                else:
+                    logger.warning(
+                        f"Vector index entity_embedding_index has {index_dims} dimensions, the embedder "
+                        f"{embedding_dims}. Not using it, drop it manually to rebuild it for this embedder."
+                    )
+                return
+
+            self.graph.query(
+                f"CREATE VECTOR INDEX `entity_embedding_index` IF NOT EXISTS FOR (n{self.node_label}) ON (n.embedding) "
+                "OPTIONS { indexConfig: { "
+                f"`vector.dimensions`: {embedding_dims}, "
+                "`vector.similarity_function`: 'cosine' "
+                "} }"
+            )
+            self.use_vector_index = True
+            logger.info("Successfully created vector index.")
+        except Exception as e:
+            self.use_vector_index = False
+            logger.warning(f"Could not create vector index, this may impact performance: {e}")
+
     def add(self, data, filters):
         """
         Adds data to the graph.
@@ -93,19 +138,24 @@ class MemoryGraph:
             data (str): The data to add to the graph.
             filters (dict): A dictionary containing filters to be applied during the addition.
         """
-        entity_type_map = self._retrieve_nodes_from_data(data, filters)
-        to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
+        # Compose user identification string for prompt
+        user_identity = f"user_id: {filters['user_id']}"
+        if filters.get("agent_id"):
+            user_identity += f", agent_id: {filters['agent_id']}"
+        if filters.get("run_id"):
+            user_identity += f", run_id: {filters['run_id']}"
+        entity_type_map, to_be_added = extract_entities_and_relations(self, data, filters, user_identity)
         search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        search_output = get_conflict_candidates(search_output, to_be_added)
         to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
-        # TODO: Batch queries with APOC plugin
         # TODO: Add more filter support
         deleted_entities = self._delete_entities(to_be_deleted, filters)
         added_entities = self._add_entities(to_be_added, filters, entity_type_map)
 
         return {"deleted_entities": deleted_entities, "added_entities": added_entities}
 
-    def search(self, query, filters, limit=100):
+    def search(self, query, filters, limit=100, context=None):
         """
         Search for memories and related graph data.
 
@@ -113,6 +163,8 @@ class MemoryGraph:
             query (str): Query to search for.
             filters (dict): A dictionary containing filters to be applied during the search.
             limit (int): The maximum number of nodes and relationships to retrieve. Defaults to 100.
+            context (SearchContext, optional): State shared with the vector store search. When the query names no
+                entity, the nodes closest to its embedding, computed once for both searches, are searched instead.
 
         Returns:
             dict: A dictionary containing:
@@ -121,37 +173,53 @@ class MemoryGraph:
         """
         logger.info(f"Graph search start | query_len={len(query)}")
 
-        entity_type_map = self._retrieve_nodes_from_data(query, filters)
+        entity_type_map = self._match_entities_from_query(query, filters) if self.entity_match_fast_path else {}
+        if entity_type_map:
+            logger.info(f"Entities matched from stored names: {len(entity_type_map)}")
+        else:
+            entity_type_map = self._retrieve_nodes_from_data(query, filters)
         logger.info(f"Entities extracted: {len(entity_type_map)}")
 
-        if not entity_type_map:
-            logger.warning("Graph search: no entities extracted.")
-
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters, limit=limit)
+        if entity_type_map or context is None:
+            if not entity_type_map:
+                logger.warning("Graph search: no entities extracted.")
+            search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters, limit=limit)
+        else:
+            logger.info("Graph search: no entities extracted, searching nodes close to the query.")
+            search_output = self._search_graph_db(
+                node_list=[query], filters=filters, limit=limit, embeddings=[context.embedding]
+            )
         logger.info(f"Graph relations found: {len(search_output)}")
 
         if not search_output:
             logger.info("--- Exiting search method: No relations found in DB. ---")
             return []
 
-        search_outputs_sequence = [
-            [item["source"], item["relationship"], item["destination"]] for item in search_output
-        ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
+        index = self._lexical_index(filters)
+        if index is None:
+            # The scope is too large to cache, score the results against their own statistics
+            index = LexicalIndex()
+            index.add_relations(search_output)
+        with self._lexical_indexes_lock:
+            reranked_results = index.top_n(query, search_output, n=5)
         logger.info(f"BM25 re-ranked results: {len(reranked_results)}")
 
         search_results = []
         for item in reranked_results:
-            search_results.append({"source": item[0], "relationship": item[1], "destination": item[2]})
+            search_results.append(
+                {"source": item["source"], "relationship": item["relationship"], "destination": item["destination"]}
+            )
 
         logger.info(f"Graph search done | results={len(search_results)}")
 
         return search_results
 
-    def delete_all(self, filters):
+    def delete_all(self, filters, batch_size=10000):
+        """Delete all nodes and relationships of a user, agent or run.
+
+        The nodes are detached and deleted in separate transactions of ``batch_size`` rows, so wiping a large
+        scope stays within the transaction memory limit.
+        """
         # Build node properties for filtering
         node_props = []
         params = {}
@@ -173,9 +241,52 @@ class MemoryGraph:
 
         cypher = f"""
         MATCH (n {self.node_label} {{{node_props_str}}})
-        DETACH DELETE n
+        CALL {{
+            WITH n
+            DETACH DELETE n
+        }} IN TRANSACTIONS OF {int(batch_size)} ROWS
+        """
+        # CALL ... IN TRANSACTIONS only runs in an implicit transaction, which a session_params query uses
+        self.graph.query(cypher, params=params, session_params={"database": self.config.graph_store.config.database})
+        self._forget_lexical_indexes(filters)
+
+    def iter_all(self, filters, batch_size=1000):
+        """
+        Iterates over all relationships of a user, agent or run, one page of ``batch_size`` at a time.
+
+        Pages are fetched with a keyset cursor on the relationship id, so exporting a large graph neither holds
+        a long transaction open nor skips relationships the way an offset would.
+
+        Args:
+            filters (dict): A dictionary containing filters to be applied during the retrieval.
+            batch_size (int): The number of relationships fetched per query. Defaults to 1000.
+        Yields:
+            dict: The 'source', 'relationship' and 'target' of each relationship.
         """
-        self.graph.query(cypher, params=params)
+        params = {"user_id": filters["user_id"], "batch_size": batch_size, "cursor": ""}
+        node_props = ["user_id: $user_id"]
+        if filters.get("agent_id"):
+            node_props.append("agent_id: $agent_id")
+            params["agent_id"] = filters["agent_id"]
+        if filters.get("run_id"):
+            node_props.append("run_id: $run_id")
+            params["run_id"] = filters["run_id"]
+        node_props_str = ", ".join(node_props)
+
+        query = f"""
+        MATCH (n {self.node_label} {{{node_props_str}}})-[r]->(m {self.node_label} {{{node_props_str}}})
+        WHERE elementId(r) > $cursor
+        RETURN n.name AS source, type(r) AS relationship, m.name AS target, elementId(r) AS relation_id
+        ORDER BY relation_id
+        LIMIT $batch_size
+        """
+        while True:
+            results = self.graph.query(query, params=params)
+            for result in results:
+                yield {"source": result["source"], "relationship": result["relationship"], "target": result["target"]}
+            if len(results) < batch_size:
+                return
+            params["cursor"] = results[-1]["relation_id"]
 
     def get_all(self, filters, limit=100):
         """
@@ -297,20 +408,9 @@ class MemoryGraph:
         if filters.get("run_id"):
             user_identity += f", run_id: {filters['run_id']}"
 
-        if self.config.graph_store.custom_prompt:
-            system_content = EXTRACT_RELATIONS_PROMPT.replace("USER_ID", user_identity)
-            # Add the custom prompt line if configured
-            system_content = system_content.replace("CUSTOM_PROMPT", f"4. {self.config.graph_store.custom_prompt}")
-            messages = [
-                {"role": "system", "content": system_content},
-                {"role": "user", "content": data},
-            ]
-        else:
-            system_content = EXTRACT_RELATIONS_PROMPT.replace("USER_ID", user_identity)
-            messages = [
-                {"role": "system", "content": system_content},
-                {"role": "user", "content": f"List of entities: {list(entity_type_map.keys())}. \n\nText: {data}"},
-            ]
+        messages = get_relations_extraction_messages(
+            data, user_identity, list(entity_type_map.keys()), self.config.graph_store.custom_prompt
+        )
 
         _tools = [RELATIONS_TOOL]
         if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
@@ -394,9 +494,37 @@ class MemoryGraph:
         logger.debug(f"Extracted entities: {entities}")
         return entities
 
-    def _search_graph_db(self, node_list, filters, limit=100):
-        """Search similar nodes among and their respective incoming and outgoing relations."""
-        result_relations = []
+    def _similar_nodes_clause(self, node_var, embedding_expr, similarity_var, where_conditions):
+        """Build the Cypher that yields scoped nodes with their similarity to an embedding.
+
+        By default every scoped node is compared. With the opt-in vector index, the nearest `$candidate_k` nodes of
+        the whole database are taken from `db.index.vector.queryNodes` and then filtered by `where_conditions`, so the
+        cost does not grow with the size of the user's graph but nodes of other scopes can crowd out the user's own.
+        The similarity is denormalized to [-1, 1] for backward compatibility.
+        """
+        scope_clause = " AND ".join(where_conditions)
+
+        if self.use_vector_index:
+            return f"""
+            CALL db.index.vector.queryNodes('entity_embedding_index', $candidate_k, {embedding_expr})
+            YIELD node AS {node_var}, score
+            WHERE {scope_clause}
+            WITH {node_var}, round(2 * score - 1, 4) AS {similarity_var}"""
+
+        similarity = f"vector.similarity.cosine({node_var}.embedding, {embedding_expr})"
+        return f"""
+            MATCH ({node_var} {self.node_label})
+            WHERE {node_var}.embedding IS NOT NULL AND {scope_clause}
+            WITH {node_var}, round(2 * {similarity} - 1, 4) AS {similarity_var}"""
+
+    def _search_graph_db(self, node_list, filters, limit=100, embeddings=None):
+        """Search similar nodes among and their respective incoming and outgoing relations.
+
+        All entities are embedded with one call and searched with a single UNWIND query. Relations reached from
+        several entities are returned once, with their best similarity.
+        """
+        if not node_list:
+            return []
 
         # Build node properties for filtering
         node_props = ["user_id: $user_id"]
@@ -406,20 +534,27 @@ class MemoryGraph:
             node_props.append("run_id: $run_id")
         node_props_str = ", ".join(node_props)
 
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
+        # Build WHERE conditions for the matched nodes
+        where_conditions = ["n.user_id = $user_id"]
+        if filters.get("agent_id"):
+            where_conditions.append("n.agent_id = $agent_id")
+        if filters.get("run_id"):
+            where_conditions.append("n.run_id = $run_id")
+
+        embeddings = embeddings if embeddings is not None else self.embedding_model.embed_batch(node_list)
 
-            cypher_query = f"""
-            MATCH (n {self.node_label} {{{node_props_str}}})
-            WHERE n.embedding IS NOT NULL
-            WITH n, round(2 * vector.similarity.cosine(n.embedding, $n_embedding) - 1, 4) AS similarity // denormalize for backward compatibility
+        cypher_query = f"""
+        UNWIND $n_embeddings AS n_embedding
+        CALL {{
+            WITH n_embedding
+            {self._similar_nodes_clause("n", "n_embedding", "similarity", where_conditions)}
             WHERE similarity >= $threshold
             CALL {{
                 WITH n
                 MATCH (n)-[r]->(m {self.node_label} {{{node_props_str}}})
                 RETURN n.name AS source, elementId(n) AS source_id, type(r) AS relationship, elementId(r) AS relation_id, m.name AS destination, elementId(m) AS destination_id
                 UNION
-                WITH n  
+                WITH n
                 MATCH (n)<-[r]-(m {self.node_label} {{{node_props_str}}})
                 RETURN m.name AS source, elementId(m) AS source_id, type(r) AS relationship, elementId(r) AS relation_id, n.name AS destination, elementId(n) AS destination_id
             }}
@@ -427,26 +562,33 @@ class MemoryGraph:
             RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity
             ORDER BY similarity DESC
             LIMIT $limit
-            """
-
-            params = {
-                "n_embedding": n_embedding,
-                "threshold": self.threshold,
-                "user_id": filters["user_id"],
-                "limit": limit,
-            }
-            if filters.get("agent_id"):
-                params["agent_id"] = filters["agent_id"]
-            if filters.get("run_id"):
-                params["run_id"] = filters["run_id"]
+        }}
+        WITH source, source_id, relationship, relation_id, destination, destination_id, max(similarity) AS similarity
+        RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity
+        ORDER BY similarity DESC
+        LIMIT $limit
+        """
 
-            ans = self.graph.query(cypher_query, params=params)
-            result_relations.extend(ans)
+        params = {
+            "n_embeddings": embeddings,
+            "threshold": self.threshold,
+            "user_id": filters["user_id"],
+            "limit": limit,
+            "candidate_k": self.vector_index_candidates,
+        }
+        if filters.get("agent_id"):
+            params["agent_id"] = filters["agent_id"]
+        if filters.get("run_id"):
+            params["run_id"] = filters["run_id"]
 
-        return result_relations
+        return self.graph.query(cypher_query, params=params)
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
+        if not search_output:
+            # Nothing stored can conflict with the new data, skip the LLM round trip
+            return []
+
         search_output_string = format_entities(search_output)
 
         # Compose user identification string for prompt
@@ -534,203 +676,277 @@ class MemoryGraph:
             result = self.graph.query(cypher, params=params)
             results.append(result)
 
+        self._update_lexical_indexes(filters, deleted=to_be_deleted)
         return results
 
     def _add_entities(self, to_be_added, filters, entity_type_map):
-        """Add the new entities to the graph. Merge the nodes if they already exist."""
+        """Add the new entities to the graph. Merge the nodes if they already exist.
+
+        All names are embedded in one call and resolved against the existing nodes with one query, then every node
+        and relationship is merged by a single UNWIND statement.
+        """
+        if not to_be_added:
+            return []
+
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
         run_id = filters.get("run_id", None)
-        results = []
-        for item in to_be_added:
-            # entities
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
 
-            # types
-            source_type = entity_type_map.get(source, "__User__")
-            source_label = self.node_label if self.node_label else f":`{source_type}`"
-            source_extra_set = f", source:`{source_type}`" if self.node_label else ""
-            destination_type = entity_type_map.get(destination, "__User__")
-            destination_label = self.node_label if self.node_label else f":`{destination_type}`"
-            destination_extra_set = f", destination:`{destination_type}`" if self.node_label else ""
-
-            # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            # search for the nodes with the closest embeddings
-            source_node_search_result = self._search_source_node(source_embedding, filters, threshold=0.75)
-            destination_node_search_result = self._search_destination_node(dest_embedding, filters, threshold=0.75)
-
-            # TODO: Create a cypher query and common params for all the cases
-            if not destination_node_search_result and source_node_search_result:
-                # Build destination MERGE properties
-                merge_props = ["name: $destination_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                if run_id:
-                    merge_props.append("run_id: $run_id")
-                merge_props_str = ", ".join(merge_props)
-
-                cypher = f"""
-                MATCH (source)
-                WHERE elementId(source) = $source_id
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MERGE (destination {destination_label} {{{merge_props_str}}})
-                ON CREATE SET
-                    destination.created = timestamp(),
-                    destination.mentions = 1
-                    {destination_extra_set}
-                ON MATCH SET
-                    destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(destination, 'embedding', $destination_embedding)
-                WITH source, destination
-                MERGE (source)-[r:`{relationship}`]->(destination)
-                ON CREATE SET 
-                    r.created = timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "source_id": source_node_search_result[0]["elementId(source_candidate)"],
-                    "destination_name": destination,
-                    "destination_embedding": dest_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-                if run_id:
-                    params["run_id"] = run_id
-
-            elif destination_node_search_result and not source_node_search_result:
-                # Build source MERGE properties
-                merge_props = ["name: $source_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                if run_id:
-                    merge_props.append("run_id: $run_id")
-                merge_props_str = ", ".join(merge_props)
-
-                cypher = f"""
-                MATCH (destination)
-                WHERE elementId(destination) = $destination_id
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH destination
-                MERGE (source {source_label} {{{merge_props_str}}})
-                ON CREATE SET
-                    source.created = timestamp(),
-                    source.mentions = 1
-                    {source_extra_set}
-                ON MATCH SET
-                    source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(source, 'embedding', $source_embedding)
-                WITH source, destination
-                MERGE (source)-[r:`{relationship}`]->(destination)
-                ON CREATE SET 
-                    r.created = timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "destination_id": destination_node_search_result[0]["elementId(destination_candidate)"],
-                    "source_name": source,
-                    "source_embedding": source_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-                if run_id:
-                    params["run_id"] = run_id
-
-            elif source_node_search_result and destination_node_search_result:
-                cypher = f"""
-                MATCH (source)
-                WHERE elementId(source) = $source_id
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MATCH (destination)
-                WHERE elementId(destination) = $destination_id
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                MERGE (source)-[r:`{relationship}`]->(destination)
-                ON CREATE SET 
-                    r.created_at = timestamp(),
-                    r.updated_at = timestamp(),
-                    r.mentions = 1
+        names = list(dict.fromkeys(name for item in to_be_added for name in (item["source"], item["destination"])))
+        embeddings = dict(zip(names, self.embedding_model.embed_batch(names)))
+        matched_ids = self._search_nodes_batch(embeddings, filters, threshold=0.75)
+        mentions = Counter(name for item in to_be_added for name in (item["source"], item["destination"]))
+
+        nodes = [
+            {
+                "name": name,
+                "embedding": embeddings[name],
+                "id": matched_ids.get(name),
+                "type": entity_type_map.get(name, "__User__"),
+                "mentions": mentions[name],
+            }
+            for name in names
+        ]
+        relations = [
+            {"source": item["source"], "destination": item["destination"], "relationship": item["relationship"]}
+            for item in to_be_added
+        ]
+        node_types = list(dict.fromkeys(node["type"] for node in nodes if node["id"] is None))
+        relationship_types = list(dict.fromkeys(relation["relationship"] for relation in relations))
+
+        # Build node MERGE properties
+        merge_props = ["name: node.name", "user_id: $user_id"]
+        if agent_id:
+            merge_props.append("agent_id: $agent_id")
+        if run_id:
+            merge_props.append("run_id: $run_id")
+        merge_props_str = ", ".join(merge_props)
+
+        # Labels and relationship types cannot be parameters, so each one gets its own UNION branch
+        node_branches = [
+            """
+                WITH node
+                WITH node WHERE node.id IS NOT NULL
+                MATCH (n) WHERE elementId(n) = node.id
+                SET n.mentions = coalesce(n.mentions, 0) + node.mentions
+                RETURN n"""
+        ]
+        for idx, node_type in enumerate(node_types):
+            label = self.node_label if self.node_label else f":`{self._escape_name(node_type)}`"
+            extra_set = f", n:`{self._escape_name(node_type)}`" if self.node_label else ""
+            node_branches.append(
+                f"""
+                WITH node
+                WITH node WHERE node.id IS NULL AND node.type = $node_types[{idx}]
+                MERGE (n {label} {{{merge_props_str}}})
+                ON CREATE SET n.created = timestamp(), n.mentions = node.mentions{extra_set}
+                ON MATCH SET n.mentions = coalesce(n.mentions, 0) + node.mentions
+                WITH n, node
+                CALL db.create.setNodeVectorProperty(n, 'embedding', node.embedding)
+                RETURN n"""
+            )
+
+        relation_branches = []
+        for idx, relationship in enumerate(relationship_types):
+            relation_branches.append(
+                f"""
+                WITH rel, source, destination
+                WITH rel, source, destination WHERE rel.relationship = $relationship_types[{idx}]
+                MERGE (source)-[r:`{self._escape_name(relationship)}`]->(destination)
+                ON CREATE SET r.created = timestamp(), r.mentions = 1
                 ON MATCH SET r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                """
+                RETURN type(r) AS relationship"""
+            )
 
-                params = {
-                    "source_id": source_node_search_result[0]["elementId(source_candidate)"],
-                    "destination_id": destination_node_search_result[0]["elementId(destination_candidate)"],
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-                if run_id:
-                    params["run_id"] = run_id
-
-            else:
-                # Build dynamic MERGE props for both source and destination
-                source_props = ["name: $source_name", "user_id: $user_id"]
-                dest_props = ["name: $dest_name", "user_id: $user_id"]
-                if agent_id:
-                    source_props.append("agent_id: $agent_id")
-                    dest_props.append("agent_id: $agent_id")
-                if run_id:
-                    source_props.append("run_id: $run_id")
-                    dest_props.append("run_id: $run_id")
-                source_props_str = ", ".join(source_props)
-                dest_props_str = ", ".join(dest_props)
-
-                cypher = f"""
-                MERGE (source {source_label} {{{source_props_str}}})
-                ON CREATE SET source.created = timestamp(),
-                            source.mentions = 1
-                            {source_extra_set}
-                ON MATCH SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                CALL db.create.setNodeVectorProperty(source, 'embedding', $source_embedding)
-                WITH source
-                MERGE (destination {destination_label} {{{dest_props_str}}})
-                ON CREATE SET destination.created = timestamp(),
-                            destination.mentions = 1
-                            {destination_extra_set}
-                ON MATCH SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(destination, 'embedding', $dest_embedding)
-                WITH source, destination
-                MERGE (source)-[rel:`{relationship}`]->(destination)
-                ON CREATE SET rel.created = timestamp(), rel.mentions = 1
-                ON MATCH SET rel.mentions = coalesce(rel.mentions, 0) + 1
-                RETURN source.name AS source, type(rel) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "source_name": source,
-                    "dest_name": destination,
-                    "source_embedding": source_embedding,
-                    "dest_embedding": dest_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-                if run_id:
-                    params["run_id"] = run_id
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
-        return results
+        union = "\n                UNION ALL"
+        cypher = f"""
+        UNWIND $nodes AS node
+        CALL {{{union.join(node_branches)}
+        }}
+        WITH collect({{name: node.name, node: n}}) AS resolved
+        UNWIND $relations AS rel
+        WITH rel,
+             [x IN resolved WHERE x.name = rel.source][0].node AS source,
+             [x IN resolved WHERE x.name = rel.destination][0].node AS destination
+        WHERE source IS NOT NULL AND destination IS NOT NULL
+        CALL {{{union.join(relation_branches)}
+        }}
+        RETURN source.name AS source, relationship, destination.name AS target
+        """
+
+        params = {
+            "nodes": nodes,
+            "relations": relations,
+            "node_types": node_types,
+            "relationship_types": relationship_types,
+            "user_id": user_id,
+        }
+        if agent_id:
+            params["agent_id"] = agent_id
+        if run_id:
+            params["run_id"] = run_id
+
+        result = self.graph.query(cypher, params=params)
+        self._update_lexical_indexes(
+            filters,
+            added=[
+                {"source": row["source"], "relationship": row["relationship"], "destination": row["target"]}
+                for row in result
+            ],
+        )
+        # Keep the one-result-list-per-relation shape of the previous per-triple queries
+        return [[row] for row in result]
+
+    @staticmethod
+    def _scope_key(filters):
+        return filters.get("user_id"), filters.get("agent_id"), filters.get("run_id")
+
+    def _lexical_index(self, filters):
+        """Return the lexical index of the scope of ``filters``, loading it from the graph on first use.
+
+        The index follows the writes of this process. Every ``lexical_index_refresh_seconds`` its relation count is
+        checked against the graph, and the index is rebuilt when they differ, e.g. after writes by another process.
+        Returns None for a scope with more than ``lexical_index_max_rows`` rows, which is not cached.
+        """
+        key = self._scope_key(filters)
+        with self._lexical_indexes_lock:
+            index = self._lexical_indexes.get(key)
+            if index is not None:
+                self._lexical_indexes.move_to_end(key)
+                if time.monotonic() - self._lexical_index_checked_at[key] < self.lexical_index_refresh_seconds:
+                    return index
+
+        node_props = []
+        params = {}
+        for field in ("user_id", "agent_id", "run_id"):
+            if filters.get(field):
+                node_props.append(f"{field}: ${field}")
+                params[field] = filters[field]
+        node_props_str = ", ".join(node_props)
+
+        if index is not None:
+            count_cypher = f"""
+            MATCH (n {self.node_label} {{{node_props_str}}})-[r]->(m {self.node_label} {{{node_props_str}}})
+            RETURN count(DISTINCT [n.name, type(r), m.name]) AS relations
+            """
+            relations = self.graph.query(count_cypher, params=params)[0]["relations"]
+            if relations == len(index):
+                with self._lexical_indexes_lock:
+                    if key in self._lexical_index_checked_at:
+                        self._lexical_index_checked_at[key] = time.monotonic()
+                return index
+            logger.info(f"Lexical index holds {len(index)} relations, the graph {relations}, rebuilding it")
+
+        cypher = f"""
+        MATCH (n {self.node_label} {{{node_props_str}}})
+        OPTIONAL MATCH (n)-[r]->(m {self.node_label} {{{node_props_str}}})
+        RETURN n.name AS source, type(r) AS relationship, m.name AS destination
+        LIMIT $max_rows
+        """
+        rows = self.graph.query(cypher, params={**params, "max_rows": self.lexical_index_max_rows + 1})
+        if len(rows) > self.lexical_index_max_rows:
+            logger.info(f"Scope {key} exceeds {self.lexical_index_max_rows} lexical index rows, not caching it")
+            with self._lexical_indexes_lock:
+                self._lexical_indexes.pop(key, None)
+                self._lexical_index_checked_at.pop(key, None)
+            return None
+
+        index = LexicalIndex()
+        index.add_names(row["source"] for row in rows)
+        index.add_relations(row for row in rows if row["relationship"] is not None)
+
+        with self._lexical_indexes_lock:
+            self._lexical_indexes[key] = index
+            self._lexical_indexes.move_to_end(key)
+            self._lexical_index_checked_at[key] = time.monotonic()
+            while len(self._lexical_indexes) > self.LEXICAL_INDEX_SCOPES:
+                evicted, _ = self._lexical_indexes.popitem(last=False)
+                del self._lexical_index_checked_at[evicted]
+        return index
+
+    def _update_lexical_indexes(self, filters, added=(), deleted=()):
+        """Apply written or deleted relations to every cached scope that can see them."""
+        user_id, agent_id, run_id = self._scope_key(filters)
+        with self._lexical_indexes_lock:
+            for (cached_user_id, cached_agent_id, cached_run_id), index in self._lexical_indexes.items():
+                if (
+                    cached_user_id in (None, user_id)
+                    and cached_agent_id in (None, agent_id)
+                    and cached_run_id in (None, run_id)
+                ):
+                    index.add_relations(added)
+                    index.remove_relations(deleted)
+
+    def _forget_lexical_indexes(self, filters):
+        user_id = filters.get("user_id")
+        with self._lexical_indexes_lock:
+            for key in [key for key in self._lexical_indexes if user_id is None or key[0] in (None, user_id)]:
+                del self._lexical_indexes[key]
+                del self._lexical_index_checked_at[key]
+
+    def _match_entities_from_query(self, query, filters):
+        """Resolve the query entities by looking up stored entity names in the query.
+
+        A name matches when all of its tokens occur in the query, CJK text is compared by character bigrams.
+        Types are unknown here and left as None.
+        """
+        index = self._lexical_index(filters)
+        if index is None:
+            return {}
+        with self._lexical_indexes_lock:
+            return {name: None for name in index.match_entities(query)}
+
+    @staticmethod
+    def _escape_name(name):
+        """Escape a label or relationship type for use inside backticks."""
+        return str(name).replace("`", "``")
+
+    def _search_nodes_batch(self, embeddings, filters, threshold=0.9):
+        """Find the closest existing node for every name with a single UNWIND query.
+
+        Args:
+            embeddings (dict): Mapping of entity name to its embedding.
+            filters (dict): A dictionary containing filters to be applied during the search.
+            threshold (float): Minimum similarity for a node to be considered a match.
+
+        Returns:
+            dict: Mapping of entity name to the elementId of the matching node, for the names that matched.
+        """
+        if not embeddings:
+            return {}
+
+        # Build WHERE conditions
+        where_conditions = ["candidate_node.user_id = $user_id"]
+        if filters.get("agent_id"):
+            where_conditions.append("candidate_node.agent_id = $agent_id")
+        if filters.get("run_id"):
+            where_conditions.append("candidate_node.run_id = $run_id")
+
+        cypher = f"""
+            UNWIND $candidates AS candidate
+            CALL {{
+                WITH candidate
+                {self._similar_nodes_clause("candidate_node", "candidate.embedding", "similarity", where_conditions)}
+                WHERE similarity >= $threshold
+                RETURN elementId(candidate_node) AS node_id
+                ORDER BY similarity DESC
+                LIMIT 1
+            }}
+            RETURN candidate.name AS name, node_id
+            """
+
+        params = {
+            "candidates": [{"name": name, "embedding": embedding} for name, embedding in embeddings.items()],
+            "user_id": filters["user_id"],
+            "threshold": threshold,
+            "candidate_k": self.vector_index_candidates,
+        }
+        if filters.get("agent_id"):
+            params["agent_id"] = filters["agent_id"]
+        if filters.get("run_id"):
+            params["run_id"] = filters["run_id"]
+
+        return {row["name"]: row["node_id"] for row in self.graph.query(cypher, params=params)}
 
     def _remove_spaces_from_entities(self, entity_list):
         """Normalize triples safely; skip incomplete or malformed items.
@@ -761,19 +977,14 @@ class MemoryGraph:
 
     def _search_source_node(self, source_embedding, filters, threshold=0.9):
         # Build WHERE conditions
-        where_conditions = ["source_candidate.embedding IS NOT NULL", "source_candidate.user_id = $user_id"]
+        where_conditions = ["source_candidate.user_id = $user_id"]
         if filters.get("agent_id"):
             where_conditions.append("source_candidate.agent_id = $agent_id")
         if filters.get("run_id"):
             where_conditions.append("source_candidate.run_id = $run_id")
-        where_clause = " AND ".join(where_conditions)
 
         cypher = f"""
-            MATCH (source_candidate {self.node_label})
-            WHERE {where_clause}
-
-            WITH source_candidate,
-            round(2 * vector.similarity.cosine(source_candidate.embedding, $source_embedding) - 1, 4) AS source_similarity // denormalize for backward compatibility
+            {self._similar_nodes_clause("source_candidate", "$source_embedding", "source_similarity", where_conditions)}
             WHERE source_similarity >= $threshold
 
             WITH source_candidate, source_similarity
@@ -787,6 +998,7 @@ class MemoryGraph:
             "source_embedding": source_embedding,
             "user_id": filters["user_id"],
             "threshold": threshold,
+            "candidate_k": self.vector_index_candidates,
         }
         if filters.get("agent_id"):
             params["agent_id"] = filters["agent_id"]
@@ -798,19 +1010,17 @@ class MemoryGraph:
 
     def _search_destination_node(self, destination_embedding, filters, threshold=0.9):
         # Build WHERE conditions
-        where_conditions = ["destination_candidate.embedding IS NOT NULL", "destination_candidate.user_id = $user_id"]
+        where_conditions = ["destination_candidate.user_id = $user_id"]
         if filters.get("agent_id"):
             where_conditions.append("destination_candidate.agent_id = $agent_id")
         if filters.get("run_id"):
             where_conditions.append("destination_candidate.run_id = $run_id")
-        where_clause = " AND ".join(where_conditions)
 
+        similar_nodes = self._similar_nodes_clause(
+            "destination_candidate", "$destination_embedding", "destination_similarity", where_conditions
+        )
         cypher = f"""
-            MATCH (destination_candidate {self.node_label})
-            WHERE {where_clause}
-
-            WITH destination_candidate,
-            round(2 * vector.similarity.cosine(destination_candidate.embedding, $destination_embedding) - 1, 4) AS destination_similarity // denormalize for backward compatibility
+            {similar_nodes}
 
             WHERE destination_similarity >= $threshold
 
@@ -825,6 +1035,7 @@ class MemoryGraph:
             "destination_embedding": destination_embedding,
             "user_id": filters["user_id"],
             "threshold": threshold,
+            "candidate_k": self.vector_index_candidates,
         }
         if filters.get("agent_id"):
             params["agent_id"] = filters["agent_id"]
@@ -841,4 +1052,7 @@ class MemoryGraph:
         cypher_query = """
         MATCH (n) DETACH DELETE n
         """
+        with self._lexical_indexes_lock:
+            self._lexical_indexes.clear()
+            self._lexical_index_checked_at.clear()
         return self.graph.query(cypher_query)
@@ -1,6 +1,8 @@
 import logging
+import warnings
+from collections import Counter
 
-from mem0.memory.utils import format_entities
+from mem0.memory.utils import format_entities, get_conflict_candidates
 
 try:
     import kuzu
@@ -20,13 +22,16 @@ from mem0.graphs.tools import (
     RELATIONS_STRUCT_TOOL,
     RELATIONS_TOOL,
 )
-from mem0.graphs.utils import EXTRACT_RELATIONS_PROMPT, get_delete_messages
+from mem0.graphs.utils import extract_entities_and_relations, get_delete_messages, get_relations_extraction_messages
 from mem0.utils.factory import EmbedderFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
 
 
 class MemoryGraph:
+    # Nearest nodes the vector index lookup of a name grows to before it falls back to comparing the scope's nodes
+    VECTOR_INDEX_MAX_CANDIDATES = 1000
+
     def __init__(self, config):
         self.config = config
 
@@ -39,10 +44,14 @@ class MemoryGraph:
 
         self.db = kuzu.Database(self.config.graph_store.config.db)
         self.graph = kuzu.Connection(self.db)
+        # Prepared statements keyed by query text, so repeated query shapes are parsed and planned once
+        self._prepared_statements = {}
 
         self.node_label = ":Entity"
         self.rel_label = ":CONNECTED_TO"
+        self.vector_index_candidates = self.config.graph_store.config.vector_index_candidates
         self.kuzu_create_schema()
+        self.use_vector_index = self.config.graph_store.config.vector_index and self.kuzu_create_vector_index()
 
         # Default to openai if no specific provider is configured
         self.llm_provider = "openai"
@@ -72,8 +81,8 @@ class MemoryGraph:
                 name STRING,
                 mentions INT64,
                 created TIMESTAMP,
-                embedding FLOAT[]);
-            """
+                embedding {embedding_type});
+            """.format(embedding_type=f"FLOAT[{self.embedding_dims}]" if self.embedding_dims else "FLOAT[]")
         )
         self.kuzu_execute(
             """
@@ -87,9 +96,40 @@ class MemoryGraph:
             """
         )
 
+    def kuzu_create_vector_index(self):
+        """Create the HNSW index used for node resolution, returns whether it can be used."""
+        try:
+            columns = {row["name"]: row["type"] for row in self.kuzu_execute("CALL TABLE_INFO('Entity') RETURN *")}
+            if columns.get("embedding") != f"FLOAT[{self.embedding_dims}]":
+                logger.warning(
+                    "Entity embeddings are stored without a fixed size, nodes are resolved without a vector index. "
+                    "Recreate the database to enable it."
+                )
+                return False
+            indexes = {row["index_name"] for row in self.kuzu_execute("CALL SHOW_INDEXES() RETURN *")}
+            if "entity_embedding_index" not in indexes:
+                self.kuzu_execute(
+                    "CALL CREATE_VECTOR_INDEX('Entity', 'entity_embedding_index', 'embedding', metric := 'cosine')"
+                )
+            return True
+        except Exception as e:
+            logger.warning(f"Could not create vector index, this may impact performance: {e}")
+            return False
+
     def kuzu_execute(self, query, parameters=None):
-        results = self.graph.execute(query, parameters)
-        return list(results.rows_as_dict())
+        if not parameters:
+            return list(self.graph.execute(query).rows_as_dict())
+
+        statement = self._prepared_statements.get(query)
+        if statement is None:
+            # Newer Kuzu releases deprecate prepare() in favour of execute(), which plans the query on every call
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                statement = self.graph.prepare(query)
+            if not statement.is_success():
+                raise RuntimeError(statement.get_error_message())
+            self._prepared_statements[query] = statement
+        return list(self.graph.execute(statement, parameters).rows_as_dict())
 
     def add(self, data, filters):
         """
@@ -99,9 +139,15 @@ class MemoryGraph:
             data (str): The data to add to the graph.
             filters (dict): A dictionary containing filters to be applied during the addition.
         """
-        entity_type_map = self._retrieve_nodes_from_data(data, filters)
-        to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
+        # Compose user identification string for prompt
+        user_identity = f"user_id: {filters['user_id']}"
+        if filters.get("agent_id"):
+            user_identity += f", agent_id: {filters['agent_id']}"
+        if filters.get("run_id"):
+            user_identity += f", run_id: {filters['run_id']}"
+        entity_type_map, to_be_added = extract_entities_and_relations(self, data, filters, user_identity)
         search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        search_output = get_conflict_candidates(search_output, to_be_added)
         to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
         deleted_entities = self._delete_entities(to_be_deleted, filters)
@@ -109,7 +155,7 @@ class MemoryGraph:
 
         return {"deleted_entities": deleted_entities, "added_entities": added_entities}
 
-    def search(self, query, filters, limit=5):
+    def search(self, query, filters, limit=5, context=None):
         """
         Search for memories and related graph data.
 
@@ -117,6 +163,8 @@ class MemoryGraph:
             query (str): Query to search for.
             filters (dict): A dictionary containing filters to be applied during the search.
             limit (int): The maximum number of nodes and relationships to retrieve. Defaults to 100.
+            context (SearchContext, optional): State shared with the vector store search. When the query names no
+                entity, the nodes closest to its embedding, computed once for both searches, are searched instead.
 
         Returns:
             dict: A dictionary containing:
@@ -124,7 +172,10 @@ class MemoryGraph:
                 - "entities": List of related graph data based on the query.
         """
         entity_type_map = self._retrieve_nodes_from_data(query, filters)
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        if entity_type_map or context is None:
+            search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        else:
+            search_output = self._search_graph_db(node_list=[query], filters=filters, embeddings=[context.embedding])
 
         if not search_output:
             return []
@@ -145,7 +196,8 @@ class MemoryGraph:
 
         return search_results
 
-    def delete_all(self, filters):
+    def delete_all(self, filters, batch_size=10000):
+        """Delete all nodes and relationships of a user, agent or run, ``batch_size`` nodes per transaction."""
         # Build node properties for filtering
         node_props = ["user_id: $user_id"]
         if filters.get("agent_id"):
@@ -156,14 +208,61 @@ class MemoryGraph:
 
         cypher = f"""
         MATCH (n {self.node_label} {{{node_props_str}}})
+        WITH n LIMIT $batch_size
         DETACH DELETE n
+        RETURN count(n) AS deleted
         """
-        params = {"user_id": filters["user_id"]}
+        params = {"user_id": filters["user_id"], "batch_size": batch_size}
         if filters.get("agent_id"):
             params["agent_id"] = filters["agent_id"]
         if filters.get("run_id"):
             params["run_id"] = filters["run_id"]
-        self.kuzu_execute(cypher, parameters=params)
+        while True:
+            results = self.kuzu_execute(cypher, parameters=params)
+            if not results or results[0]["deleted"] < batch_size:
+                return
+
+    def iter_all(self, filters, batch_size=1000):
+        """
+        Iterates over all relationships of a user, agent or run, one page of ``batch_size`` at a time.
+
+        Pages are fetched with a keyset cursor on the relationship offset, so a large graph can be exported
+        without materialising it in a single result.
+
+        Args:
+            filters (dict): A dictionary containing filters to be applied during the retrieval.
+            batch_size (int): The number of relationships fetched per query. Defaults to 1000.
+        Yields:
+            dict: The 'source', 'relationship' and 'target' of each relationship.
+        """
+        params = {"user_id": filters["user_id"], "batch_size": batch_size, "cursor": -1}
+        node_props = ["user_id: $user_id"]
+        if filters.get("agent_id"):
+            node_props.append("agent_id: $agent_id")
+            params["agent_id"] = filters["agent_id"]
+        if filters.get("run_id"):
+            node_props.append("run_id: $run_id")
+            params["run_id"] = filters["run_id"]
+        node_props_str = ", ".join(node_props)
+
+        query = f"""
+        MATCH (n {self.node_label} {{{node_props_str}}})-[r]->(m {self.node_label} {{{node_props_str}}})
+        WHERE offset(ID(r)) > $cursor
+        RETURN
+            n.name AS source,
+            r.name AS relationship,
+            m.name AS target,
+            offset(ID(r)) AS relation_id
+        ORDER BY relation_id
+        LIMIT $batch_size
+        """
+        while True:
+            results = self.kuzu_execute(query, parameters=params)
+            for result in results:
+                yield {"source": result["source"], "relationship": result["relationship"], "target": result["target"]}
+            if len(results) < batch_size:
+                return
+            params["cursor"] = results[-1]["relation_id"]
 
     def get_all(self, filters, limit=100):
         """
@@ -258,20 +357,9 @@ class MemoryGraph:
         if filters.get("run_id"):
             user_identity += f", run_id: {filters['run_id']}"
 
-        if self.config.graph_store.custom_prompt:
-            system_content = EXTRACT_RELATIONS_PROMPT.replace("USER_ID", user_identity)
-            # Add the custom prompt line if configured
-            system_content = system_content.replace("CUSTOM_PROMPT", f"4. {self.config.graph_store.custom_prompt}")
-            messages = [
-                {"role": "system", "content": system_content},
-                {"role": "user", "content": data},
-            ]
-        else:
-            system_content = EXTRACT_RELATIONS_PROMPT.replace("USER_ID", user_identity)
-            messages = [
-                {"role": "system", "content": system_content},
-                {"role": "user", "content": f"List of entities: {list(entity_type_map.keys())}. \n\nText: {data}"},
-            ]
+        messages = get_relations_extraction_messages(
+            data, user_identity, list(entity_type_map.keys()), self.config.graph_store.custom_prompt
+        )
 
         _tools = [RELATIONS_TOOL]
         if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
@@ -290,14 +378,19 @@ class MemoryGraph:
         logger.debug(f"Extracted entities: {entities}")
         return entities
 
-    def _search_graph_db(self, node_list, filters, limit=100, threshold=None):
-        """Search similar nodes among and their respective incoming and outgoing relations."""
-        result_relations = []
+    def _search_graph_db(self, node_list, filters, limit=100, threshold=None, embeddings=None):
+        """Search similar nodes among and their respective incoming and outgoing relations.
+
+        All entities are embedded with one call and searched with a single UNWIND query. Relations reached from
+        several entities are returned once, with their best similarity.
+        """
+        if not node_list:
+            return []
 
         params = {
             "threshold": threshold if threshold else self.threshold,
             "user_id": filters["user_id"],
-            "limit": limit,
+            "n_embeddings": embeddings if embeddings is not None else self.embedding_model.embed_batch(node_list),
         }
         # Build node properties for filtering
         node_props = ["user_id: $user_id"]
@@ -309,41 +402,47 @@ class MemoryGraph:
             params["run_id"] = filters["run_id"]
         node_props_str = ", ".join(node_props)
 
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
-            params["n_embedding"] = n_embedding
-
-            results = []
-            for match_fragment in [
-                f"(n)-[r]->(m {self.node_label} {{{node_props_str}}}) WITH n as src, r, m as dst, similarity",
-                f"(m {self.node_label} {{{node_props_str}}})-[r]->(n) WITH m as src, r, n as dst, similarity"
-            ]:
-                results.extend(self.kuzu_execute(
-                    f"""
-                    MATCH (n {self.node_label} {{{node_props_str}}})
-                    WHERE n.embedding IS NOT NULL
-                    WITH n, array_cosine_similarity(n.embedding, CAST($n_embedding,'FLOAT[{self.embedding_dims}]')) AS similarity
-                    WHERE similarity >= CAST($threshold, 'DOUBLE')
-                    MATCH {match_fragment}
-                    RETURN
-                        src.name AS source,
-                        id(src) AS source_id,
-                        r.name AS relationship,
-                        id(r) AS relation_id,
-                        dst.name AS destination,
-                        id(dst) AS destination_id,
-                        similarity
-                    LIMIT $limit
-                    """,
-                    parameters=params))
-
-            # Kuzu does not support sort/limit over unions. Do it manually for now.
-            result_relations.extend(sorted(results, key=lambda x: x["similarity"], reverse=True)[:limit])
-
-        return result_relations
+        queries = []
+        for match_fragment in [
+            f"(n)-[r]->(m {self.node_label} {{{node_props_str}}}) WITH n as src, r, m as dst, similarity",
+            f"(m {self.node_label} {{{node_props_str}}})-[r]->(n) WITH m as src, r, n as dst, similarity"
+        ]:
+            queries.append(
+                f"""
+                UNWIND $n_embeddings AS n_embedding
+                MATCH (n {self.node_label} {{{node_props_str}}})
+                WHERE n.embedding IS NOT NULL
+                WITH n,
+                    array_cosine_similarity(n.embedding, CAST(n_embedding,'FLOAT[{self.embedding_dims}]'))
+                    AS similarity
+                WHERE similarity >= CAST($threshold, 'DOUBLE')
+                MATCH {match_fragment}
+                RETURN
+                    src.name AS source,
+                    id(src) AS source_id,
+                    r.name AS relationship,
+                    id(r) AS relation_id,
+                    dst.name AS destination,
+                    id(dst) AS destination_id,
+                    similarity
+                """
+            )
+        results = self.kuzu_execute("\nUNION ALL\n".join(queries), parameters=params)
+
+        # Kuzu does not support sort/limit over unions. Deduplicate and sort manually for now.
+        best_by_relation = {}
+        for result in results:
+            key = (result["relation_id"]["table"], result["relation_id"]["offset"])
+            if key not in best_by_relation or result["similarity"] > best_by_relation[key]["similarity"]:
+                best_by_relation[key] = result
+        return sorted(best_by_relation.values(), key=lambda x: x["similarity"], reverse=True)[:limit]
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
+        if not search_output:
+            # Nothing stored can conflict with the new data, skip the LLM round trip
+            return []
+
         search_output_string = format_entities(search_output)
 
         # Compose user identification string for prompt
@@ -428,204 +527,211 @@ class MemoryGraph:
         return results
 
     def _add_entities(self, to_be_added, filters, entity_type_map):
-        """Add the new entities to the graph. Merge the nodes if they already exist."""
+        """Add the new entities to the graph. Merge the nodes if they already exist.
+
+        All names are embedded in one call and resolved against the existing nodes, then the mentions of the
+        resolved nodes, the new nodes and the relationships are each written by one UNWIND statement.
+        """
+        if not to_be_added:
+            return []
+
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
         run_id = filters.get("run_id", None)
-        results = []
-        for item in to_be_added:
-            # entities
-            source = item["source"]
-            source_label = self.node_label
 
-            destination = item["destination"]
-            destination_label = self.node_label
+        names = list(dict.fromkeys(name for item in to_be_added for name in (item["source"], item["destination"])))
+        embeddings = dict(zip(names, self.embedding_model.embed_batch(names)))
+        node_ids = self._resolve_nodes(embeddings, filters, threshold=0.9)
+        mentions = Counter(name for item in to_be_added for name in (item["source"], item["destination"]))
 
-            relationship = item["relationship"]
-            relationship_label = self.rel_label
-
-            # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            # search for the nodes with the closest embeddings
-            source_node_search_result = self._search_source_node(source_embedding, filters, threshold=0.9)
-            destination_node_search_result = self._search_destination_node(dest_embedding, filters, threshold=0.9)
-
-            if not destination_node_search_result and source_node_search_result:
-                params = {
-                    "table_id": source_node_search_result[0]["id"]["table"],
-                    "offset_id": source_node_search_result[0]["id"]["offset"],
-                    "destination_name": destination,
-                    "destination_embedding": dest_embedding,
-                    "relationship_name": relationship,
-                    "user_id": user_id,
-                }
-                # Build source MERGE properties
-                merge_props = ["name: $destination_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                    params["agent_id"] = agent_id
-                if run_id:
-                    merge_props.append("run_id: $run_id")
-                    params["run_id"] = run_id
-                merge_props_str = ", ".join(merge_props)
-
-                cypher = f"""
-                MATCH (source)
-                WHERE id(source) = internal_id($table_id, $offset_id)
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MERGE (destination {destination_label} {{{merge_props_str}}})
-                ON CREATE SET
-                    destination.created = current_timestamp(),
-                    destination.mentions = 1,
-                    destination.embedding = CAST($destination_embedding,'FLOAT[{self.embedding_dims}]')
-                ON MATCH SET
-                    destination.mentions = coalesce(destination.mentions, 0) + 1,
-                    destination.embedding = CAST($destination_embedding,'FLOAT[{self.embedding_dims}]')
-                WITH source, destination
-                MERGE (source)-[r {relationship_label} {{name: $relationship_name}}]->(destination)
-                ON CREATE SET
-                    r.created = current_timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN
-                    source.name AS source,
-                    r.name AS relationship,
-                    destination.name AS target
-                """
-            elif destination_node_search_result and not source_node_search_result:
-                params = {
-                    "table_id": destination_node_search_result[0]["id"]["table"],
-                    "offset_id": destination_node_search_result[0]["id"]["offset"],
-                    "source_name": source,
-                    "source_embedding": source_embedding,
-                    "user_id": user_id,
-                    "relationship_name": relationship,
-                }
-                # Build source MERGE properties
-                merge_props = ["name: $source_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                    params["agent_id"] = agent_id
-                if run_id:
-                    merge_props.append("run_id: $run_id")
-                    params["run_id"] = run_id
-                merge_props_str = ", ".join(merge_props)
-
-                cypher = f"""
-                MATCH (destination)
-                WHERE id(destination) = internal_id($table_id, $offset_id)
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH destination
-                MERGE (source {source_label} {{{merge_props_str}}})
-                ON CREATE SET
-                source.created = current_timestamp(),
-                source.mentions = 1,
-                source.embedding = CAST($source_embedding,'FLOAT[{self.embedding_dims}]')
-                ON MATCH SET
-                source.mentions = coalesce(source.mentions, 0) + 1,
-                source.embedding = CAST($source_embedding,'FLOAT[{self.embedding_dims}]')
-                WITH source, destination
-                MERGE (source)-[r {relationship_label} {{name: $relationship_name}}]->(destination)
-                ON CREATE SET
-                    r.created = current_timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN
-                    source.name AS source,
-                    r.name AS relationship,
-                    destination.name AS target
-                """
-            elif source_node_search_result and destination_node_search_result:
-                cypher = f"""
-                MATCH (source)
-                WHERE id(source) = internal_id($src_table, $src_offset)
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MATCH (destination)
-                WHERE id(destination) = internal_id($dst_table, $dst_offset)
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                MERGE (source)-[r {relationship_label} {{name: $relationship_name}}]->(destination)
-                ON CREATE SET
-                    r.created = current_timestamp(),
-                    r.updated = current_timestamp(),
-                    r.mentions = 1
-                ON MATCH SET r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN
-                    source.name AS source,
-                    r.name AS relationship,
-                    destination.name AS target
-                """
+        resolved = [
+            {
+                "table_id": node_ids[name]["table"],
+                "offset_id": node_ids[name]["offset"],
+                "mentions": mentions[name],
+            }
+            for name in names
+            if name in node_ids
+        ]
+        if resolved:
+            self.kuzu_execute(
+                f"""
+                UNWIND $nodes AS node
+                MATCH (n {self.node_label})
+                WHERE id(n) = internal_id(node.table_id, node.offset_id)
+                SET n.mentions = coalesce(n.mentions, 0) + node.mentions
+                """,
+                parameters={"nodes": resolved},
+            )
 
-                params = {
-                    "src_table": source_node_search_result[0]["id"]["table"],
-                    "src_offset": source_node_search_result[0]["id"]["offset"],
-                    "dst_table": destination_node_search_result[0]["id"]["table"],
-                    "dst_offset": destination_node_search_result[0]["id"]["offset"],
-                    "relationship_name": relationship,
-                }
-            else:
-                params = {
-                    "source_name": source,
-                    "dest_name": destination,
-                    "relationship_name": relationship,
-                    "source_embedding": source_embedding,
-                    "dest_embedding": dest_embedding,
-                    "user_id": user_id,
-                }
-                # Build dynamic MERGE props for both source and destination
-                source_props = ["name: $source_name", "user_id: $user_id"]
-                dest_props = ["name: $dest_name", "user_id: $user_id"]
-                if agent_id:
-                    source_props.append("agent_id: $agent_id")
-                    dest_props.append("agent_id: $agent_id")
-                    params["agent_id"] = agent_id
-                if run_id:
-                    source_props.append("run_id: $run_id")
-                    dest_props.append("run_id: $run_id")
-                    params["run_id"] = run_id
-                source_props_str = ", ".join(source_props)
-                dest_props_str = ", ".join(dest_props)
-
-                cypher = f"""
-                MERGE (source {source_label} {{{source_props_str}}})
-                ON CREATE SET
-                    source.created = current_timestamp(),
-                    source.mentions = 1,
-                    source.embedding = CAST($source_embedding,'FLOAT[{self.embedding_dims}]')
-                ON MATCH SET
-                    source.mentions = coalesce(source.mentions, 0) + 1,
-                    source.embedding = CAST($source_embedding,'FLOAT[{self.embedding_dims}]')
-                WITH source
-                MERGE (destination {destination_label} {{{dest_props_str}}})
-                ON CREATE SET
-                    destination.created = current_timestamp(),
-                    destination.mentions = 1,
-                    destination.embedding = CAST($dest_embedding,'FLOAT[{self.embedding_dims}]')
-                ON MATCH SET
-                    destination.mentions = coalesce(destination.mentions, 0) + 1,
-                    destination.embedding = CAST($dest_embedding,'FLOAT[{self.embedding_dims}]')
-                WITH source, destination
-                MERGE (source)-[rel {relationship_label} {{name: $relationship_name}}]->(destination)
-                ON CREATE SET
-                    rel.created = current_timestamp(),
-                    rel.mentions = 1
-                ON MATCH SET
-                    rel.mentions = coalesce(rel.mentions, 0) + 1
-                RETURN
-                    source.name AS source,
-                    rel.name AS relationship,
-                    destination.name AS target
-                """
+        new_nodes = [
+            {"name": name, "embedding": embeddings[name], "mentions": mentions[name]}
+            for name in names
+            if name not in node_ids
+        ]
+        if new_nodes:
+            # The embedding is part of CREATE since Kuzu does not allow SET on a vector indexed property
+            params = {"nodes": new_nodes, "user_id": user_id}
+            create_props = ["name: node.name", "user_id: $user_id"]
+            if agent_id:
+                create_props.append("agent_id: $agent_id")
+                params["agent_id"] = agent_id
+            if run_id:
+                create_props.append("run_id: $run_id")
+                params["run_id"] = run_id
+            create_props.extend(
+                [
+                    "mentions: node.mentions",
+                    "created: current_timestamp()",
+                    f"embedding: CAST(node.embedding,'FLOAT[{self.embedding_dims}]')",
+                ]
+            )
+            create_props_str = ", ".join(create_props)
+            created = self.kuzu_execute(
+                f"""
+                UNWIND $nodes AS node
+                CREATE (n {self.node_label} {{{create_props_str}}})
+                RETURN node.name AS name, id(n) AS id
+                """,
+                parameters=params,
+            )
+            node_ids.update({row["name"]: row["id"] for row in created})
+
+        # Repeated triples are merged once, MERGE does not see relationships created earlier in the same UNWIND
+        keys = [(item["source"], item["relationship"], item["destination"]) for item in to_be_added]
+        relation_mentions = Counter(keys)
+        relations = [
+            {
+                "key": idx,
+                "src_table": node_ids[source]["table"],
+                "src_offset": node_ids[source]["offset"],
+                "dst_table": node_ids[destination]["table"],
+                "dst_offset": node_ids[destination]["offset"],
+                "relationship": relationship,
+                "mentions": relation_mentions[(source, relationship, destination)],
+            }
+            for idx, (source, relationship, destination) in enumerate(relation_mentions)
+        ]
+        rows = self.kuzu_execute(
+            f"""
+            UNWIND $relations AS rel
+            MATCH (source {self.node_label}), (destination {self.node_label})
+            WHERE id(source) = internal_id(rel.src_table, rel.src_offset)
+                AND id(destination) = internal_id(rel.dst_table, rel.dst_offset)
+            MERGE (source)-[r {self.rel_label} {{name: rel.relationship}}]->(destination)
+            ON CREATE SET
+                r.created = current_timestamp(),
+                r.updated = current_timestamp(),
+                r.mentions = rel.mentions
+            ON MATCH SET
+                r.mentions = coalesce(r.mentions, 0) + rel.mentions
+            RETURN
+                rel.key AS key,
+                source.name AS source,
+                r.name AS relationship,
+                destination.name AS target
+            """,
+            parameters={"relations": relations},
+        )
+        by_key = {row.pop("key"): row for row in rows}
 
-            result = self.kuzu_execute(cypher, parameters=params)
-            results.append(result)
+        # Keep the one-result-list-per-relation shape of the previous per-triple queries
+        key_index = {key: idx for idx, key in enumerate(relation_mentions)}
+        return [[by_key[key_index[key]]] if key_index[key] in by_key else [] for key in keys]
 
-        return results
+    def _resolve_nodes(self, embeddings, filters, threshold=0.9):
+        """Map each name to the id of the existing node it refers to.
+
+        Nodes with the same name in the scope are matched first, the remaining names are resolved to the most
+        similar node above ``threshold``, through the vector index when it is available.
+        """
+        params = {"user_id": filters["user_id"]}
+        name_conditions = ["n.user_id = $user_id"]
+        where_conditions = ["candidate.user_id = $user_id"]
+        for field in ("agent_id", "run_id"):
+            if filters.get(field):
+                name_conditions.append(f"n.{field} = ${field}")
+                where_conditions.append(f"candidate.{field} = ${field}")
+                params[field] = filters[field]
+        name_clause = " AND ".join(name_conditions)
+        where_clause = " AND ".join(where_conditions)
+
+        rows = self.kuzu_execute(
+            f"""
+            UNWIND $names AS name
+            MATCH (n {self.node_label})
+            WHERE n.name = name AND {name_clause}
+            RETURN name, id(n) AS id
+            """,
+            parameters={**params, "names": list(embeddings)},
+        )
+        node_ids = {row["name"]: row["id"] for row in rows}
+
+        pending = {name: embedding for name, embedding in embeddings.items() if name not in node_ids}
+        if not pending:
+            return node_ids
+
+        if self.use_vector_index:
+            pending = self._resolve_nodes_with_vector_index(pending, params, where_clause, threshold, node_ids)
+            if not pending:
+                return node_ids
+
+        rows = self.kuzu_execute(
+            f"""
+            UNWIND $items AS item
+            MATCH (candidate {self.node_label})
+            WHERE candidate.embedding IS NOT NULL AND {where_clause}
+            WITH item, candidate,
+                array_cosine_similarity(candidate.embedding, CAST(item.embedding,'FLOAT[{self.embedding_dims}]'))
+                AS similarity
+            WHERE similarity >= $threshold
+            RETURN item.name AS name, id(candidate) AS id, similarity
+            """,
+            parameters={
+                **params,
+                "items": [{"name": name, "embedding": embedding} for name, embedding in pending.items()],
+                "threshold": threshold,
+            },
+        )
+        best = {}
+        for row in rows:
+            if row["name"] not in best or row["similarity"] > best[row["name"]]["similarity"]:
+                best[row["name"]] = row
+        node_ids.update({name: row["id"] for name, row in best.items()})
+        return node_ids
+
+    def _resolve_nodes_with_vector_index(self, pending, params, where_clause, threshold, node_ids):
+        """Resolve names to the most similar node of the scope through the vector index.
+
+        The index covers every scope, so the nearest nodes may all belong to other users. The candidates of a name
+        grow from ``vector_index_candidates`` until one of the scope is above ``threshold``, or the candidates reach
+        below it. Names still unresolved at ``VECTOR_INDEX_MAX_CANDIDATES`` are returned for the scoped comparison.
+        """
+        # Table functions only take literals or parameters, so every name runs the same prepared query
+        cypher = f"""
+        CALL QUERY_VECTOR_INDEX('Entity', 'entity_embedding_index', $embedding, $candidate_k)
+        WITH node AS candidate, 1 - distance AS similarity
+        RETURN id(candidate) AS id, similarity, {where_clause} AS in_scope
+        """
+        unresolved = {}
+        for name, embedding in pending.items():
+            candidate_k = self.vector_index_candidates
+            while True:
+                rows = self.kuzu_execute(
+                    cypher, parameters={**params, "embedding": embedding, "candidate_k": candidate_k}
+                )
+                matches = [row for row in rows if row["in_scope"] and row["similarity"] >= threshold]
+                if matches:
+                    node_ids[name] = max(matches, key=lambda row: row["similarity"])["id"]
+                    break
+                if len(rows) < candidate_k or min(row["similarity"] for row in rows) < threshold:
+                    # Every node above the threshold was a candidate, none of them in the scope
+                    break
+                if candidate_k >= self.VECTOR_INDEX_MAX_CANDIDATES:
+                    unresolved[name] = embedding
+                    break
+                candidate_k = min(candidate_k * 4, self.VECTOR_INDEX_MAX_CANDIDATES)
+        return unresolved
 
     def _remove_spaces_from_entities(self, entity_list):
         for item in entity_list:
@@ -634,72 +740,6 @@ class MemoryGraph:
             item["destination"] = item["destination"].lower().replace(" ", "_")
         return entity_list
 
-    def _search_source_node(self, source_embedding, filters, threshold=0.9):
-        params = {
-            "source_embedding": source_embedding,
-            "user_id": filters["user_id"],
-            "threshold": threshold,
-        }
-        where_conditions = ["source_candidate.embedding IS NOT NULL", "source_candidate.user_id = $user_id"]
-        if filters.get("agent_id"):
-            where_conditions.append("source_candidate.agent_id = $agent_id")
-            params["agent_id"] = filters["agent_id"]
-        if filters.get("run_id"):
-            where_conditions.append("source_candidate.run_id = $run_id")
-            params["run_id"] = filters["run_id"]
-        where_clause = " AND ".join(where_conditions)
-
-        cypher = f"""
-            MATCH (source_candidate {self.node_label})
-            WHERE {where_clause}
-
-            WITH source_candidate,
-            array_cosine_similarity(source_candidate.embedding, CAST($source_embedding,'FLOAT[{self.embedding_dims}]')) AS source_similarity
-
-            WHERE source_similarity >= $threshold
-
-            WITH source_candidate, source_similarity
-            ORDER BY source_similarity DESC
-            LIMIT 2
-
-            RETURN id(source_candidate) as id, source_similarity
-            """
-
-        return self.kuzu_execute(cypher, parameters=params)
-
-    def _search_destination_node(self, destination_embedding, filters, threshold=0.9):
-        params = {
-            "destination_embedding": destination_embedding,
-            "user_id": filters["user_id"],
-            "threshold": threshold,
-        }
-        where_conditions = ["destination_candidate.embedding IS NOT NULL", "destination_candidate.user_id = $user_id"]
-        if filters.get("agent_id"):
-            where_conditions.append("destination_candidate.agent_id = $agent_id")
-            params["agent_id"] = filters["agent_id"]
-        if filters.get("run_id"):
-            where_conditions.append("destination_candidate.run_id = $run_id")
-            params["run_id"] = filters["run_id"]
-        where_clause = " AND ".join(where_conditions)
-
-        cypher = f"""
-            MATCH (destination_candidate {self.node_label})
-            WHERE {where_clause}
-
-            WITH destination_candidate,
-            array_cosine_similarity(destination_candidate.embedding, CAST($destination_embedding,'FLOAT[{self.embedding_dims}]')) AS destination_similarity
-
-            WHERE destination_similarity >= $threshold
-
-            WITH destination_candidate, destination_similarity
-            ORDER BY destination_similarity DESC
-            LIMIT 2
-
-            RETURN id(destination_candidate) as id, destination_similarity
-            """
-
-        return self.kuzu_execute(cypher, parameters=params)
-
     # Reset is not defined in base.py
     def reset(self):
         """Reset the graph by clearing all nodes and relationships."""
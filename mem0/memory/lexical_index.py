@@ -0,0 +1,116 @@
+import math
+import re
+from collections import Counter, defaultdict
+
+# Hiragana, katakana, CJK ideographs and hangul are written without spaces between words
+_CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_TOKEN_PATTERN = re.compile(rf"[{_CJK_RANGES}]+|[^\W_{_CJK_RANGES}]+")
+_CJK_PATTERN = re.compile(rf"[{_CJK_RANGES}]")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens.
+
+    Underscores separate words, so stored names such as ``ice_cream`` tokenize like ``ice cream``. Runs of CJK
+    characters are segmented into overlapping character bigrams, a run of a single character is kept as is.
+    """
+    tokens = []
+    for run in _TOKEN_PATTERN.findall(text.lower()):
+        if _CJK_PATTERN.match(run) and len(run) > 1:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+class LexicalIndex:
+    """Incrementally maintained lexical index over the entity names and relations of one graph scope.
+
+    Relations are scored with BM25 against the statistics of the whole scope, so reranking a search result
+    does not rebuild a model from the result rows. Entity names are kept in an inverted index to find the
+    entities mentioned in a query.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._relations = {}
+        self._doc_freq = Counter()
+        self._total_length = 0
+        self._name_tokens = {}
+        self._names_by_token = defaultdict(set)
+
+    @staticmethod
+    def _relation_key(relation):
+        return relation["source"], relation["relationship"], relation["destination"]
+
+    @property
+    def entity_names(self):
+        return set(self._name_tokens)
+
+    def __len__(self):
+        return len(self._relations)
+
+    def add_names(self, names):
+        for name in names:
+            if not name or name in self._name_tokens:
+                continue
+            tokens = frozenset(tokenize(name))
+            if not tokens:
+                continue
+            self._name_tokens[name] = tokens
+            for token in tokens:
+                self._names_by_token[token].add(name)
+
+    def add_relations(self, relations):
+        for relation in relations:
+            key = self._relation_key(relation)
+            self.add_names([key[0], key[2]])
+            if key in self._relations:
+                continue
+            terms = Counter(tokenize(" ".join(key)))
+            self._relations[key] = terms
+            self._doc_freq.update(terms.keys())
+            self._total_length += sum(terms.values())
+
+    def remove_relations(self, relations):
+        for relation in relations:
+            terms = self._relations.pop(self._relation_key(relation), None)
+            if terms is None:
+                continue
+            self._doc_freq.subtract(terms.keys())
+            self._total_length -= sum(terms.values())
+
+    def match_entities(self, query):
+        """Return the stored entity names whose tokens all occur in the query."""
+        query_tokens = set(tokenize(query))
+        candidates = set()
+        for token in query_tokens:
+            candidates.update(self._names_by_token.get(token, ()))
+        return sorted(name for name in candidates if self._name_tokens[name] <= query_tokens)
+
+    def top_n(self, query, relations, n=5):
+        """Return the ``n`` relations scoring highest for the query, ties keep their input order."""
+        query_tokens = tokenize(query)
+        doc_count = max(len(self._relations), 1)
+        average_length = self._total_length / doc_count if self._total_length else 1.0
+
+        scored = []
+        for position, relation in enumerate(relations):
+            key = self._relation_key(relation)
+            terms = self._relations.get(key) or Counter(tokenize(" ".join(key)))
+            length = sum(terms.values())
+            score = 0.0
+            for token in query_tokens:
+                frequency = terms.get(token, 0)
+                if not frequency:
+                    continue
+                doc_freq = self._doc_freq.get(token, 0)
+                idf = math.log(1 + (doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                score += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            scored.append((-score, position, relation))
+
+        scored.sort(key=lambda item: item[:2])
+        return [relation for _, _, relation in scored[:n]]
+
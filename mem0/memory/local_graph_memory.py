@@ -0,0 +1,713 @@
+import json
+import logging
+import os
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from itertools import islice
+
+from mem0.memory.lexical_index import LexicalIndex
+from mem0.memory.utils import format_entities, get_conflict_candidates
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("numpy is not installed. Please install it using pip install numpy")
+
+from mem0.graphs.tools import (
+    DELETE_MEMORY_STRUCT_TOOL_GRAPH,
+    DELETE_MEMORY_TOOL_GRAPH,
+    EXTRACT_ENTITIES_STRUCT_TOOL,
+    EXTRACT_ENTITIES_TOOL,
+    RELATIONS_STRUCT_TOOL,
+    RELATIONS_TOOL,
+)
+from mem0.graphs.utils import extract_entities_and_relations, get_delete_messages, get_relations_extraction_messages
+from mem0.utils.factory import EmbedderFactory, LlmFactory
+
+logger = logging.getLogger(__name__)
+
+
+class LocalGraphStore:
+    """In-process entity graph shared by all users, agents and runs.
+
+    Nodes live in a dict keyed by integer id, relationships in outgoing and incoming adjacency dicts, and the
+    node embeddings in one contiguous float32 matrix whose row is the node id. Rows are L2 normalised on
+    insertion so cosine similarity is a single matrix product.
+
+    When ``path`` is set every change is appended to a write-ahead log before ``snapshot_every`` records
+    trigger a compaction into ``snapshot.npz``. Loading replays the log records newer than the snapshot.
+    """
+
+    SNAPSHOT_FILE = "snapshot.npz"
+    WAL_FILE = "wal.jsonl"
+
+    def __init__(self, path=None, snapshot_every=1000):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self._lock = threading.RLock()
+        self._wal = None
+        self._seq = 0
+        self._wal_records = 0
+        self._clear()
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._load()
+            self._wal = open(os.path.join(path, self.WAL_FILE), "a", encoding="utf-8")
+
+    def _clear(self):
+        self.nodes = {}
+        self.out_edges = defaultdict(dict)
+        self.in_edges = defaultdict(set)
+        self._ids_by_name = defaultdict(set)
+        self._ids_by_user = defaultdict(set)
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._free_ids = []
+        self._next_id = 0
+
+    # Reads
+
+    def scope_ids(self, filters):
+        """Ids of the nodes visible under the user/agent/run ``filters``."""
+        with self._lock:
+            return [
+                node_id for node_id in self._ids_by_user.get(filters["user_id"], ()) if self._in_scope(node_id, filters)
+            ]
+
+    def ids_by_name(self, name, filters):
+        with self._lock:
+            ids = self._ids_by_name.get((filters["user_id"], name), ())
+            return sorted(node_id for node_id in ids if self._in_scope(node_id, filters))
+
+    def _in_scope(self, node_id, filters):
+        node = self.nodes[node_id]
+        return all(not filters.get(field) or node[field] == filters[field] for field in ("agent_id", "run_id"))
+
+    def most_similar(self, embeddings, node_ids, threshold, top_k=1):
+        """Return, for every embedding, up to ``top_k`` ``(node_id, similarity)`` pairs at or above ``threshold``."""
+        if not node_ids or not len(embeddings):
+            return [[] for _ in embeddings]
+
+        queries = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        ids = np.asarray(node_ids)
+        with self._lock:
+            similarities = queries @ self._embeddings[ids].T
+
+        results = []
+        for row in similarities:
+            if top_k < len(row):
+                candidates = np.argpartition(-row, top_k - 1)[:top_k]
+            else:
+                candidates = np.arange(len(row))
+            candidates = candidates[np.argsort(-row[candidates], kind="stable")]
+            results.append([(int(ids[i]), float(row[i])) for i in candidates if row[i] >= threshold])
+        return results
+
+    def edges_of(self, node_id):
+        """Outgoing and incoming relationships of a node as ``(source_id, relationship, destination_id)``."""
+        with self._lock:
+            outgoing = [(node_id, relationship, dst) for relationship, dst in self.out_edges.get(node_id, {})]
+            incoming = [(src, relationship, node_id) for relationship, src in self.in_edges.get(node_id, ())]
+        return outgoing + incoming
+
+    def relations(self, node_ids, scope):
+        """Outgoing relationships of ``node_ids`` that end in ``scope``, with the node names resolved."""
+        with self._lock:
+            return [
+                {"source": self.nodes[src]["name"], "relationship": relationship, "target": self.nodes[dst]["name"]}
+                for src in node_ids
+                if src in self.nodes
+                for relationship, dst in self.out_edges.get(src, {})
+                if dst in scope
+            ]
+
+    def has_edge(self, src, relationship, dst):
+        with self._lock:
+            return (relationship, dst) in self.out_edges.get(src, {})
+
+    # Writes, each one is a single write-ahead log record
+
+    def add_nodes(self, nodes):
+        """Create nodes from dicts with name, user_id, agent_id, run_id, mentions and embedding, returns their ids."""
+        if not nodes:
+            return []
+        with self._lock:
+            records = []
+            for node in nodes:
+                node_id = self._free_ids[-1] if self._free_ids else self._next_id
+                record = {**node, "id": node_id, "created": _now(), "embedding": [float(x) for x in node["embedding"]]}
+                self._apply_add_node(record)
+                records.append(record)
+            self._log({"op": "add_nodes", "nodes": records})
+            return [record["id"] for record in records]
+
+    def mention_nodes(self, counts):
+        if not counts:
+            return
+        self._write({"op": "mention_nodes", "counts": [[node_id, count] for node_id, count in counts.items()]})
+
+    def merge_edges(self, edges):
+        """Create or strengthen relationships given as ``(source_id, relationship, destination_id, mentions)``."""
+        if not edges:
+            return
+        self._write({"op": "merge_edges", "edges": [list(edge) for edge in edges], "created": _now()})
+
+    def delete_edges(self, edges):
+        if not edges:
+            return
+        self._write({"op": "delete_edges", "edges": [list(edge) for edge in edges]})
+
+    def delete_nodes(self, node_ids):
+        if not node_ids:
+            return
+        self._write({"op": "delete_nodes", "ids": list(node_ids)})
+
+    def locked(self):
+        """Hold the store lock, so a sequence of reads and writes sees no writes of other threads in between."""
+        return self._lock
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+            if self.path:
+                self.snapshot()
+
+    def _write(self, record):
+        with self._lock:
+            self._apply(record)
+            self._log(record)
+
+    def _log(self, record):
+        if self._wal is None:
+            return
+        self._seq += 1
+        self._wal.write(json.dumps({**record, "seq": self._seq}) + "\n")
+        self._wal.flush()
+        self._wal_records += 1
+        if self._wal_records >= self.snapshot_every:
+            self.snapshot()
+
+    def _apply(self, record):
+        op = record["op"]
+        if op == "add_nodes":
+            for node in record["nodes"]:
+                self._apply_add_node(node)
+        elif op == "mention_nodes":
+            for node_id, count in record["counts"]:
+                if node_id in self.nodes:
+                    self.nodes[node_id]["mentions"] += count
+        elif op == "merge_edges":
+            for src, relationship, dst, mentions in record["edges"]:
+                if src not in self.nodes or dst not in self.nodes:
+                    continue
+                edge = self.out_edges[src].get((relationship, dst))
+                if edge is None:
+                    self.out_edges[src][(relationship, dst)] = {"mentions": mentions, "created": record["created"]}
+                    self.in_edges[dst].add((relationship, src))
+                else:
+                    edge["mentions"] += mentions
+        elif op == "delete_edges":
+            for src, relationship, dst in record["edges"]:
+                if self.out_edges.get(src, {}).pop((relationship, dst), None) is not None:
+                    self.in_edges[dst].discard((relationship, src))
+        elif op == "delete_nodes":
+            for node_id in record["ids"]:
+                self._apply_delete_node(node_id)
+        else:
+            raise ValueError(f"Unknown graph log record: {op}")
+
+    def _apply_add_node(self, record):
+        node_id = record["id"]
+        embedding = self._normalize(np.asarray(record["embedding"], dtype=np.float32)[None, :])[0]
+        if self._embeddings.shape[1] != len(embedding):
+            if self.nodes:
+                raise ValueError(
+                    f"Embedding size {len(embedding)} does not match the stored {self._embeddings.shape[1]}"
+                )
+            self._embeddings = np.zeros((0, len(embedding)), dtype=np.float32)
+        if node_id >= len(self._embeddings):
+            # Grow geometrically so adding nodes one by one stays amortised O(1)
+            capacity = max(node_id + 1, 2 * len(self._embeddings), 16)
+            grown = np.zeros((capacity, len(embedding)), dtype=np.float32)
+            grown[: len(self._embeddings)] = self._embeddings
+            self._embeddings = grown
+        self._embeddings[node_id] = embedding
+
+        if node_id in self._free_ids:
+            self._free_ids.remove(node_id)
+        self._next_id = max(self._next_id, node_id + 1)
+        self.nodes[node_id] = {
+            "name": record["name"],
+            "user_id": record["user_id"],
+            "agent_id": record.get("agent_id"),
+            "run_id": record.get("run_id"),
+            "mentions": record.get("mentions", 1),
+            "created": record.get("created"),
+        }
+        self._ids_by_name[(record["user_id"], record["name"])].add(node_id)
+        self._ids_by_user[record["user_id"]].add(node_id)
+
+    def _apply_delete_node(self, node_id):
+        node = self.nodes.pop(node_id, None)
+        if node is None:
+            return
+        for relationship, dst in self.out_edges.pop(node_id, {}):
+            self.in_edges[dst].discard((relationship, node_id))
+        for relationship, src in self.in_edges.pop(node_id, set()):
+            self.out_edges[src].pop((relationship, node_id), None)
+        self._ids_by_name[(node["user_id"], node["name"])].discard(node_id)
+        self._ids_by_user[node["user_id"]].discard(node_id)
+        self._embeddings[node_id] = 0
+        self._free_ids.append(node_id)
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    # Persistence
+
+    def snapshot(self):
+        """Write the whole graph to the snapshot file and truncate the write-ahead log."""
+        if not self.path:
+            return
+        with self._lock:
+            state = {
+                "seq": self._seq,
+                "next_id": self._next_id,
+                "free_ids": self._free_ids,
+                "nodes": [[node_id, node] for node_id, node in self.nodes.items()],
+                "edges": [
+                    [src, relationship, dst, edge["mentions"], edge["created"]]
+                    for src, edges in self.out_edges.items()
+                    for (relationship, dst), edge in edges.items()
+                ],
+            }
+            snapshot_path = os.path.join(self.path, self.SNAPSHOT_FILE)
+            tmp_path = snapshot_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, embeddings=self._embeddings, state=np.array(json.dumps(state)))
+            os.replace(tmp_path, snapshot_path)
+
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = open(os.path.join(self.path, self.WAL_FILE), "w", encoding="utf-8")
+            self._wal_records = 0
+
+    def _load(self):
+        snapshot_path = os.path.join(self.path, self.SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with np.load(snapshot_path, allow_pickle=False) as data:
+                state = json.loads(str(data["state"]))
+                self._embeddings = data["embeddings"].astype(np.float32)
+            self._seq = state["seq"]
+            self._next_id = state["next_id"]
+            self._free_ids = state["free_ids"]
+            for node_id, node in state["nodes"]:
+                self.nodes[node_id] = node
+                self._ids_by_name[(node["user_id"], node["name"])].add(node_id)
+                self._ids_by_user[node["user_id"]].add(node_id)
+            for src, relationship, dst, mentions, created in state["edges"]:
+                self.out_edges[src][(relationship, dst)] = {"mentions": mentions, "created": created}
+                self.in_edges[dst].add((relationship, src))
+
+        wal_path = os.path.join(self.path, self.WAL_FILE)
+        if not os.path.exists(wal_path):
+            return
+        with open(wal_path, "rb+") as f:
+            valid_length = 0
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn write at the end of the log, drop it so new records are not appended after it
+                    logger.warning("Dropping an incomplete record at the end of the graph write-ahead log")
+                    f.truncate(valid_length)
+                    break
+                valid_length += len(line)
+                # Records up to the snapshot sequence are already part of the snapshot
+                if record["seq"] <= self._seq:
+                    continue
+                self._apply(record)
+                self._seq = record["seq"]
+                self._wal_records += 1
+
+    def close(self):
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                self._wal = None
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MemoryGraph:
+    def __init__(self, config):
+        self.config = config
+        self.embedding_model = EmbedderFactory.create(
+            self.config.embedder.provider, self.config.embedder.config, self.config.vector_store.config
+        )
+        self.store = LocalGraphStore(
+            path=self.config.graph_store.config.path,
+            snapshot_every=self.config.graph_store.config.snapshot_every,
+        )
+
+        # Default to openai if no specific provider is configured
+        self.llm_provider = "openai"
+        if self.config.llm and self.config.llm.provider:
+            self.llm_provider = self.config.llm.provider
+        if self.config.graph_store and self.config.graph_store.llm and self.config.graph_store.llm.provider:
+            self.llm_provider = self.config.graph_store.llm.provider
+        # Get LLM config with proper null checks
+        llm_config = None
+        if self.config.graph_store and self.config.graph_store.llm and hasattr(self.config.graph_store.llm, "config"):
+            llm_config = self.config.graph_store.llm.config
+        elif hasattr(self.config.llm, "config"):
+            llm_config = self.config.llm.config
+        self.llm = LlmFactory.create(self.llm_provider, llm_config)
+
+        self.user_id = None
+        self.threshold = 0.7
+
+    def add(self, data, filters):
+        """
+        Adds data to the graph.
+
+        Args:
+            data (str): The data to add to the graph.
+            filters (dict): A dictionary containing filters to be applied during the addition.
+        """
+        entity_type_map, to_be_added = extract_entities_and_relations(self, data, filters, self._user_identity(filters))
+        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        search_output = get_conflict_candidates(search_output, to_be_added)
+        to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
+
+        deleted_entities = self._delete_entities(to_be_deleted, filters)
+        added_entities = self._add_entities(to_be_added, filters, entity_type_map)
+
+        return {"deleted_entities": deleted_entities, "added_entities": added_entities}
+
+    def search(self, query, filters, limit=100, context=None):
+        """
+        Search for memories and related graph data.
+
+        Args:
+            query (str): Query to search for.
+            filters (dict): A dictionary containing filters to be applied during the search.
+            limit (int): The maximum number of nodes and relationships to retrieve. Defaults to 100.
+            context (SearchContext, optional): State shared with the vector store search. When the query names no
+                entity, the nodes closest to its embedding, computed once for both searches, are searched instead.
+
+        Returns:
+            dict: A dictionary containing:
+                - "contexts": List of search results from the base data store.
+                - "entities": List of related graph data based on the query.
+        """
+        entity_type_map = self._retrieve_nodes_from_data(query, filters)
+        if entity_type_map or context is None:
+            search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters, limit=limit)
+        else:
+            search_output = self._search_graph_db(
+                node_list=[query], filters=filters, limit=limit, embeddings=[context.embedding]
+            )
+
+        if not search_output:
+            return []
+
+        index = LexicalIndex()
+        index.add_relations(search_output)
+        reranked_results = index.top_n(query, search_output, n=5)
+
+        search_results = []
+        for item in reranked_results:
+            search_results.append(
+                {"source": item["source"], "relationship": item["relationship"], "destination": item["destination"]}
+            )
+
+        logger.info(f"Returned {len(search_results)} search results")
+
+        return search_results
+
+    def delete_all(self, filters, batch_size=10000):
+        """Delete all nodes and relationships of a user, agent or run, ``batch_size`` nodes per log record."""
+        node_ids = self.store.scope_ids(filters)
+        for i in range(0, len(node_ids), batch_size):
+            self.store.delete_nodes(node_ids[i : i + batch_size])
+
+    def iter_all(self, filters, batch_size=1000):
+        """
+        Iterates over all relationships of a user, agent or run.
+
+        The relationships of ``batch_size`` nodes are read at a time, so the store lock is not held while the
+        caller consumes a large graph.
+
+        Args:
+            filters (dict): A dictionary containing filters to be applied during the retrieval.
+            batch_size (int): The number of nodes whose relationships are read at once. Defaults to 1000.
+        Yields:
+            dict: The 'source', 'relationship' and 'target' of each relationship.
+        """
+        scope = set(self.store.scope_ids(filters))
+        node_ids = sorted(scope)
+        for i in range(0, len(node_ids), batch_size):
+            yield from self.store.relations(node_ids[i : i + batch_size], scope)
+
+    def get_all(self, filters, limit=100):
+        """
+        Retrieves all nodes and relationships from the graph based on optional filtering criteria.
+         Args:
+            filters (dict): A dictionary containing filters to be applied during the retrieval.
+            limit (int): The maximum number of nodes and relationships to retrieve. Defaults to 100.
+        Returns:
+            list: A list of dictionaries, each containing:
+                - 'contexts': The base data store response for each memory.
+                - 'entities': A list of strings representing the nodes and relationships
+        """
+        final_results = list(islice(self.iter_all(filters), limit))
+
+        logger.info(f"Retrieved {len(final_results)} relationships")
+
+        return final_results
+
+    def _retrieve_nodes_from_data(self, data, filters):
+        """Extracts all the entities mentioned in the query."""
+        _tools = [EXTRACT_ENTITIES_TOOL]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [EXTRACT_ENTITIES_STRUCT_TOOL]
+        search_results = self.llm.generate_response(
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a smart assistant who understands entities and their types in a given text. "
+                    "If user message contains self reference such as 'I', 'me', 'my' etc. then use "
+                    f"{filters['user_id']} as the source entity. Extract all the entities from the text. "
+                    "***DO NOT*** answer the question itself if the given text is a question.",
+                },
+                {"role": "user", "content": data},
+            ],
+            tools=_tools,
+        )
+
+        entity_type_map = {}
+
+        try:
+            for tool_call in search_results["tool_calls"]:
+                if tool_call["name"] != "extract_entities":
+                    continue
+                for item in tool_call["arguments"]["entities"]:
+                    entity_type_map[item["entity"]] = item["entity_type"]
+        except Exception as e:
+            logger.exception(
+                f"Error in search tool: {e}, llm_provider={self.llm_provider}, search_results={search_results}"
+            )
+
+        entity_type_map = {k.lower().replace(" ", "_"): v.lower().replace(" ", "_") for k, v in entity_type_map.items()}
+        logger.debug(f"Entity type map: {entity_type_map}\n search_results={search_results}")
+        return entity_type_map
+
+    def _establish_nodes_relations_from_data(self, data, filters, entity_type_map):
+        """Establish relations among the extracted nodes."""
+        messages = get_relations_extraction_messages(
+            data, self._user_identity(filters), list(entity_type_map.keys()), self.config.graph_store.custom_prompt
+        )
+
+        _tools = [RELATIONS_TOOL]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [RELATIONS_STRUCT_TOOL]
+
+        extracted_entities = self.llm.generate_response(
+            messages=messages,
+            tools=_tools,
+        )
+
+        entities = []
+        if extracted_entities.get("tool_calls"):
+            entities = extracted_entities["tool_calls"][0].get("arguments", {}).get("entities", [])
+
+        entities = self._remove_spaces_from_entities(entities)
+        logger.debug(f"Extracted entities: {entities}")
+        return entities
+
+    def _search_graph_db(self, node_list, filters, limit=100, threshold=None, embeddings=None):
+        """Search similar nodes among and their respective incoming and outgoing relations.
+
+        All names are embedded in one call and compared against every node of the scope with one matrix
+        product. A relationship reached from several names keeps its highest similarity.
+        """
+        if not node_list:
+            return []
+
+        scope_ids = self.store.scope_ids(filters)
+        matches = self.store.most_similar(
+            embeddings if embeddings is not None else self.embedding_model.embed_batch(node_list),
+            scope_ids,
+            self.threshold if threshold is None else threshold,
+            top_k=len(scope_ids),
+        )
+
+        best = {}
+        for node_matches in matches:
+            for node_id, similarity in node_matches:
+                for edge in self.store.edges_of(node_id):
+                    if similarity > best.get(edge, -1.0):
+                        best[edge] = similarity
+
+        results = []
+        for (src, relationship, dst), similarity in sorted(best.items(), key=lambda item: -item[1])[:limit]:
+            results.append(
+                {
+                    "source": self.store.nodes[src]["name"],
+                    "source_id": src,
+                    "relationship": relationship,
+                    "relation_id": f"{src}:{relationship}:{dst}",
+                    "destination": self.store.nodes[dst]["name"],
+                    "destination_id": dst,
+                    "similarity": similarity,
+                }
+            )
+        return results
+
+    def _get_delete_entities_from_search_output(self, search_output, data, filters):
+        """Get the entities to be deleted from the search output."""
+        if not search_output:
+            # Nothing stored can conflict with the new data, skip the LLM round trip
+            return []
+
+        search_output_string = format_entities(search_output)
+        system_prompt, user_prompt = get_delete_messages(search_output_string, data, self._user_identity(filters))
+
+        _tools = [DELETE_MEMORY_TOOL_GRAPH]
+        if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
+            _tools = [
+                DELETE_MEMORY_STRUCT_TOOL_GRAPH,
+            ]
+
+        memory_updates = self.llm.generate_response(
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            tools=_tools,
+        )
+
+        to_be_deleted = []
+        for item in memory_updates.get("tool_calls", []):
+            if item.get("name") == "delete_graph_memory":
+                to_be_deleted.append(item.get("arguments"))
+        # Clean entities formatting
+        to_be_deleted = self._remove_spaces_from_entities(to_be_deleted)
+        logger.debug(f"Deleted relationships: {to_be_deleted}")
+        return to_be_deleted
+
+    def _delete_entities(self, to_be_deleted, filters):
+        """Delete the entities from the graph."""
+        results = []
+        edges = []
+        for item in to_be_deleted:
+            result = []
+            for src in self.store.ids_by_name(item["source"], filters):
+                for dst in self.store.ids_by_name(item["destination"], filters):
+                    if self.store.has_edge(src, item["relationship"], dst):
+                        edges.append((src, item["relationship"], dst))
+                        result.append(
+                            {
+                                "source": item["source"],
+                                "relationship": item["relationship"],
+                                "target": item["destination"],
+                            }
+                        )
+            results.append(result)
+
+        if edges:
+            self.store.delete_edges(edges)
+        return results
+
+    def _add_entities(self, to_be_added, filters, entity_type_map):
+        """Add the new entities to the graph. Merge the nodes if they already exist.
+
+        Names are matched exactly in the scope first, the rest are resolved to the most similar node above 0.9
+        with one matrix product, and nodes that match nothing are created.
+        """
+        if not to_be_added:
+            return []
+
+        names = list(dict.fromkeys(name for item in to_be_added for name in (item["source"], item["destination"])))
+        embeddings = dict(zip(names, self.embedding_model.embed_batch(names)))
+
+        # Resolving and creating under one lock keeps concurrent adds from creating the same node twice
+        with self.store.locked():
+            node_ids = {}
+            for name in names:
+                ids = self.store.ids_by_name(name, filters)
+                if ids:
+                    node_ids[name] = ids[0]
+            pending = [name for name in names if name not in node_ids]
+            matches = self.store.most_similar(
+                [embeddings[name] for name in pending], self.store.scope_ids(filters), 0.9
+            )
+            for name, node_matches in zip(pending, matches):
+                if node_matches:
+                    node_ids[name] = node_matches[0][0]
+
+            mentions = Counter(name for item in to_be_added for name in (item["source"], item["destination"]))
+            self.store.mention_nodes({node_ids[name]: mentions[name] for name in names if name in node_ids})
+
+            new_names = [name for name in names if name not in node_ids]
+            created = self.store.add_nodes(
+                [
+                    {
+                        "name": name,
+                        "user_id": filters["user_id"],
+                        "agent_id": filters.get("agent_id"),
+                        "run_id": filters.get("run_id"),
+                        "mentions": mentions[name],
+                        "embedding": embeddings[name],
+                    }
+                    for name in new_names
+                ]
+            )
+            node_ids.update(zip(new_names, created))
+
+            edge_mentions = Counter(
+                (node_ids[item["source"]], item["relationship"], node_ids[item["destination"]]) for item in to_be_added
+            )
+            self.store.merge_edges(
+                [(src, relationship, dst, count) for (src, relationship, dst), count in edge_mentions.items()]
+            )
+
+            results = []
+            for item in to_be_added:
+                results.append(
+                    [
+                        {
+                            "source": self.store.nodes[node_ids[item["source"]]]["name"],
+                            "relationship": item["relationship"],
+                            "target": self.store.nodes[node_ids[item["destination"]]]["name"],
+                        }
+                    ]
+                )
+        return results
+
+    @staticmethod
+    def _user_identity(filters):
+        user_identity = f"user_id: {filters['user_id']}"
+        if filters.get("agent_id"):
+            user_identity += f", agent_id: {filters['agent_id']}"
+        if filters.get("run_id"):
+            user_identity += f", run_id: {filters['run_id']}"
+        return user_identity
+
+    def _remove_spaces_from_entities(self, entity_list):
+        for item in entity_list:
+            item["source"] = item["source"].lower().replace(" ", "_")
+            item["relationship"] = item["relationship"].lower().replace(" ", "_")
+            item["destination"] = item["destination"].lower().replace(" ", "_")
+        return entity_list
+
+    def reset(self):
+        """Reset the graph by clearing all nodes and relationships."""
+        logger.warning("Clearing graph...")
+        self.store.reset()
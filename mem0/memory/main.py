@@ -5,6 +5,7 @@ import hashlib
 import json
 import logging
 import os
+import queue
 import uuid
 import warnings
 from copy import deepcopy
@@ -17,15 +18,26 @@ from pydantic import ValidationError
 from mem0.configs.base import MemoryConfig, MemoryItem
 from mem0.configs.enums import MemoryType
 from mem0.configs.prompts import (
+    FACT_RETRIEVAL_SCHEMA,
     PROCEDURAL_MEMORY_SYSTEM_PROMPT,
+    UPDATE_MEMORY_SCHEMA,
     get_update_memory_messages,
 )
 from mem0.memory.base import MemoryBase
+from mem0.memory.fact_batcher import FactExtractionBatcher
+from mem0.memory.message_filter import MessageFilter
 from mem0.memory.setup import mem0_dir, setup_config
 from mem0.memory.storage import SQLiteManager
 from mem0.memory.telemetry import capture_event
 from mem0.memory.utils import (
+    SearchContext,
+    assign_temp_memory_ids,
+    build_update_memory_prompts,
+    dedupe_memory_actions,
     get_fact_retrieval_messages,
+    get_json_response_format,
+    get_update_memory_chat_messages,
+    merge_memory_actions,
     parse_messages,
     parse_vision_messages,
     process_telemetry_filters,
@@ -125,6 +137,8 @@ class Memory(MemoryBase):
 
         self.custom_fact_extraction_prompt = self.config.custom_fact_extraction_prompt
         self.custom_update_memory_prompt = self.config.custom_update_memory_prompt
+        self.update_memory_token_budget = self.config.update_memory_token_budget
+        self.stream_memory_actions = self.config.stream_memory_actions
         self.embedding_model = EmbedderFactory.create(
             self.config.embedder.provider,
             self.config.embedder.config,
@@ -134,6 +148,20 @@ class Memory(MemoryBase):
             self.config.vector_store.provider, self.config.vector_store.config
         )
         self.llm = LlmFactory.create(self.config.llm.provider, self.config.llm.config)
+        self.fact_batcher = (
+            FactExtractionBatcher(
+                self.llm,
+                response_format=get_json_response_format(self.llm, "facts", FACT_RETRIEVAL_SCHEMA),
+                **self.config.fact_extraction_batch.model_dump(),
+            )
+            if self.config.fact_extraction_batch
+            else None
+        )
+        self.message_filter = (
+            MessageFilter(**self.config.fact_extraction_filter.model_dump())
+            if self.config.fact_extraction_filter
+            else None
+        )
         self.db = SQLiteManager(self.config.history_db_path)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
@@ -319,45 +347,56 @@ class Memory(MemoryBase):
                 )
             return returned_memories
 
-        parsed_messages = parse_messages(messages)
-
-        if self.config.custom_fact_extraction_prompt:
-            system_prompt = self.config.custom_fact_extraction_prompt
-            user_prompt = f"Input:\n{parsed_messages}"
+        if self.message_filter and not self.message_filter.should_extract(messages):
+            new_retrieved_facts = []
         else:
-            system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
-
-        response = self.llm.generate_response(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format={"type": "json_object"},
-        )
+            parsed_messages = parse_messages(messages)
 
-        try:
-            response = remove_code_blocks(response)
-            new_retrieved_facts = json.loads(response)["facts"]
-        except Exception as e:
-            logger.error(f"Error in new_retrieved_facts: {e}")
-            new_retrieved_facts = []
+            if self.config.custom_fact_extraction_prompt:
+                system_prompt = self.config.custom_fact_extraction_prompt
+                user_prompt = f"Input:\n{parsed_messages}"
+            else:
+                system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
+
+            if self.fact_batcher:
+                response = self.fact_batcher.extract(system_prompt, user_prompt)
+            else:
+                response = self.llm.generate_response(
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt},
+                    ],
+                    response_format=get_json_response_format(self.llm, "facts", FACT_RETRIEVAL_SCHEMA),
+                )
+
+            try:
+                response = remove_code_blocks(response)
+                new_retrieved_facts = json.loads(response)["facts"]
+            except Exception as e:
+                logger.error(f"Error in new_retrieved_facts: {e}")
+                new_retrieved_facts = []
 
         if not new_retrieved_facts:
             logger.debug("No new facts retrieved from input. Skipping memory update LLM call.")
 
         retrieved_old_memory = []
+        memories_by_fact = []
         new_message_embeddings = {}
-        for new_mem in new_retrieved_facts:
-            messages_embeddings = self.embedding_model.embed(new_mem, "add")
-            new_message_embeddings[new_mem] = messages_embeddings
-            existing_memories = self.vector_store.search(
-                query=new_mem,
-                vectors=messages_embeddings,
+        if new_retrieved_facts:
+            # One request for all facts with embedders that have a batch endpoint
+            embeddings = self.embedding_model.embed_batch(new_retrieved_facts, "add")
+            new_message_embeddings = dict(zip(new_retrieved_facts, embeddings))
+
+            # One batched search for all facts, stores with a multi-query API answer it in a single round trip
+            search_results = self.vector_store.search_batch(
+                queries=new_retrieved_facts,
+                vectors_list=embeddings,
                 limit=5,
                 filters=filters,
             )
-            for mem in existing_memories:
-                retrieved_old_memory.append({"id": mem.id, "text": mem.payload["data"]})
+            for existing_memories in search_results:
+                memories_by_fact.append([{"id": mem.id, "text": mem.payload["data"]} for mem in existing_memories])
+                retrieved_old_memory.extend(memories_by_fact[-1])
 
         unique_data = {}
         for item in retrieved_old_memory:
@@ -366,37 +405,31 @@ class Memory(MemoryBase):
         logger.info(f"Total existing memories: {len(retrieved_old_memory)}")
 
         # mapping UUIDs with integers for handling UUID hallucinations
-        temp_uuid_mapping = {}
-        for idx, item in enumerate(retrieved_old_memory):
-            temp_uuid_mapping[str(idx)] = item["id"]
-            retrieved_old_memory[idx]["id"] = str(idx)
+        retrieved_old_memory, memories_by_fact, temp_uuid_mapping = assign_temp_memory_ids(
+            retrieved_old_memory, memories_by_fact
+        )
 
-        if new_retrieved_facts:
-            function_calling_prompt = get_update_memory_messages(
-                retrieved_old_memory, new_retrieved_facts, self.config.custom_update_memory_prompt
+        if not new_retrieved_facts:
+            memory_actions = []
+        elif self.stream_memory_actions:
+            # Actions are applied while the model is still writing the rest of them
+            memory_actions = self._stream_memory_actions(
+                self._get_update_memory_prompts(retrieved_old_memory, memories_by_fact, new_retrieved_facts)
             )
-
-            try:
-                response: str = self.llm.generate_response(
-                    messages=[{"role": "user", "content": function_calling_prompt}],
-                    response_format={"type": "json_object"},
-                )
-            except Exception as e:
-                logger.error(f"Error in new memory actions response: {e}")
-                response = ""
-
-            try:
-                response = remove_code_blocks(response)
-                new_memories_with_actions = json.loads(response)
-            except Exception as e:
-                logger.error(f"Invalid JSON response: {e}")
-                new_memories_with_actions = {}
         else:
-            new_memories_with_actions = {}
+            prompts = self._get_update_memory_prompts(retrieved_old_memory, memories_by_fact, new_retrieved_facts)
+            if len(prompts) == 1:
+                new_memories_with_actions = self._get_memory_actions(prompts[0])
+            else:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+                    new_memories_with_actions = merge_memory_actions(
+                        list(executor.map(self._get_memory_actions, prompts))
+                    )
+            memory_actions = new_memories_with_actions.get("memory", [])
 
         returned_memories = []
         try:
-            for resp in new_memories_with_actions.get("memory", []):
+            for resp in memory_actions:
                 logger.info(resp)
                 try:
                     action_text = resp.get("text")
@@ -451,6 +484,83 @@ class Memory(MemoryBase):
         )
         return returned_memories
 
+    def _get_update_memory_prompts(self, retrieved_old_memory, memories_by_fact, new_retrieved_facts):
+        """Build the memory update prompts, split to fit ``update_memory_token_budget`` if one is set."""
+        if not self.update_memory_token_budget:
+            return [
+                get_update_memory_messages(
+                    retrieved_old_memory, new_retrieved_facts, self.config.custom_update_memory_prompt
+                )
+            ]
+        return build_update_memory_prompts(
+            memories_by_fact,
+            new_retrieved_facts,
+            self.config.custom_update_memory_prompt,
+            self.update_memory_token_budget,
+            self.llm.count_tokens,
+        )
+
+    def _get_memory_actions(self, function_calling_prompt):
+        messages = get_update_memory_chat_messages(function_calling_prompt, self.config.custom_update_memory_prompt)
+        try:
+            response: str = self.llm.generate_response(
+                messages=messages,
+                response_format=get_json_response_format(self.llm, "memory_actions", UPDATE_MEMORY_SCHEMA),
+            )
+        except Exception as e:
+            logger.error(f"Error in new memory actions response: {e}")
+            response = ""
+
+        try:
+            response = remove_code_blocks(response)
+            return json.loads(response)
+        except Exception as e:
+            logger.error(f"Invalid JSON response: {e}")
+            return {}
+
+    def _stream_memory_actions(self, prompts):
+        """Yield the actions of the memory update calls as the model writes them, the calls running in parallel."""
+        if len(prompts) == 1:
+            yield from self._stream_prompt_actions(prompts[0])
+            return
+
+        done = object()
+        actions = queue.Queue()
+
+        def produce(prompt):
+            try:
+                for action in self._stream_prompt_actions(prompt):
+                    actions.put(action)
+            finally:
+                actions.put(done)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+            for prompt in prompts:
+                executor.submit(produce, prompt)
+
+            def consume():
+                remaining = len(prompts)
+                while remaining:
+                    action = actions.get()
+                    if action is done:
+                        remaining -= 1
+                    else:
+                        yield action
+
+            # Memories shown to several calls keep the first change that arrives
+            yield from dedupe_memory_actions(consume())
+
+    def _stream_prompt_actions(self, function_calling_prompt):
+        messages = get_update_memory_chat_messages(function_calling_prompt, self.config.custom_update_memory_prompt)
+        try:
+            yield from self.llm.stream_json_items(
+                messages=messages,
+                key="memory",
+                response_format=get_json_response_format(self.llm, "memory_actions", UPDATE_MEMORY_SCHEMA),
+            )
+        except Exception as e:
+            logger.error(f"Error in new memory actions response: {e}")
+
     def _add_to_graph(self, messages, filters):
         added_entities = []
         if self.enable_graph:
@@ -660,10 +770,15 @@ class Memory(MemoryBase):
             },
         )
 
+        context = SearchContext(query, effective_filters, self.embedding_model)
         with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_memories = executor.submit(self._search_vector_store, query, effective_filters, limit, threshold)
+            future_memories = executor.submit(
+                self._search_vector_store, query, effective_filters, limit, threshold, context=context
+            )
             future_graph_entities = (
-                executor.submit(self.graph.search, query, effective_filters, limit) if self.enable_graph else None
+                executor.submit(self.graph.search, query, effective_filters, limit, context=context)
+                if self.enable_graph
+                else None
             )
 
             concurrent.futures.wait(
@@ -692,8 +807,10 @@ class Memory(MemoryBase):
         else:
             return {"results": original_memories}
 
-    def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
-        embeddings = self.embedding_model.embed(query, "search")
+    def _search_vector_store(
+        self, query, filters, limit, threshold: Optional[float] = None, context: Optional[SearchContext] = None
+    ):
+        embeddings = context.embedding if context else self.embedding_model.embed(query, "search")
         memories = self.vector_store.search(query=query, vectors=embeddings, limit=limit, filters=filters)
 
         promoted_payload_keys = [
@@ -799,8 +916,7 @@ class Memory(MemoryBase):
         keys, encoded_ids = process_telemetry_filters(filters)
         capture_event("mem0.delete_all", self, {"keys": keys, "encoded_ids": encoded_ids, "sync_type": "sync"})
         memories = self.vector_store.list(filters=filters)[0]
-        for memory in memories:
-            self._delete_memory(memory.id)
+        self._delete_memories(memories)
 
         logger.info(f"Deleted {len(memories)} memories")
 
@@ -968,6 +1084,23 @@ class Memory(MemoryBase):
         capture_event("mem0._delete_memory", self, {"memory_id": memory_id, "sync_type": "sync"})
         return memory_id
 
+    def _delete_memories(self, memories):
+        """Delete already listed memories with a single batched delete, recording a history entry for each."""
+        if not memories:
+            return
+        self.vector_store.delete_batch([memory.id for memory in memories])
+        for memory in memories:
+            self.db.add_history(
+                memory.id,
+                memory.payload.get("data"),
+                None,
+                "DELETE",
+                actor_id=memory.payload.get("actor_id"),
+                role=memory.payload.get("role"),
+                is_deleted=1,
+            )
+        capture_event("mem0._delete_memories", self, {"count": len(memories), "sync_type": "sync"})
+
     def reset(self):
         """
         Reset the memory store by:
@@ -1000,6 +1133,8 @@ class Memory(MemoryBase):
 class AsyncMemory(MemoryBase):
     def __init__(self, config: MemoryConfig = MemoryConfig()):
         self.config = config
+        self.update_memory_token_budget = self.config.update_memory_token_budget
+        self.stream_memory_actions = self.config.stream_memory_actions
 
         self.embedding_model = EmbedderFactory.create(
             self.config.embedder.provider,
@@ -1010,6 +1145,20 @@ class AsyncMemory(MemoryBase):
             self.config.vector_store.provider, self.config.vector_store.config
         )
         self.llm = LlmFactory.create(self.config.llm.provider, self.config.llm.config)
+        self.fact_batcher = (
+            FactExtractionBatcher(
+                self.llm,
+                response_format=get_json_response_format(self.llm, "facts", FACT_RETRIEVAL_SCHEMA),
+                **self.config.fact_extraction_batch.model_dump(),
+            )
+            if self.config.fact_extraction_batch
+            else None
+        )
+        self.message_filter = (
+            MessageFilter(**self.config.fact_extraction_filter.model_dump())
+            if self.config.fact_extraction_filter
+            else None
+        )
         self.db = SQLiteManager(self.config.history_db_path)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
@@ -1186,84 +1335,84 @@ class AsyncMemory(MemoryBase):
                 )
             return returned_memories
 
-        parsed_messages = parse_messages(messages)
-        if self.config.custom_fact_extraction_prompt:
-            system_prompt = self.config.custom_fact_extraction_prompt
-            user_prompt = f"Input:\n{parsed_messages}"
+        if self.message_filter and not self.message_filter.should_extract(messages):
+            new_retrieved_facts = []
         else:
-            system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
+            parsed_messages = parse_messages(messages)
+            if self.config.custom_fact_extraction_prompt:
+                system_prompt = self.config.custom_fact_extraction_prompt
+                user_prompt = f"Input:\n{parsed_messages}"
+            else:
+                system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
 
-        response = await asyncio.to_thread(
-            self.llm.generate_response,
-            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-            response_format={"type": "json_object"},
-        )
-        try:
-            response = remove_code_blocks(response)
-            new_retrieved_facts = json.loads(response)["facts"]
-        except Exception as e:
-            logger.error(f"Error in new_retrieved_facts: {e}")
-            new_retrieved_facts = []
+            if self.fact_batcher:
+                response = await self.fact_batcher.aextract(system_prompt, user_prompt)
+            else:
+                response = await self.llm.agenerate_response(
+                    messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+                    response_format=get_json_response_format(self.llm, "facts", FACT_RETRIEVAL_SCHEMA),
+                )
+            try:
+                response = remove_code_blocks(response)
+                new_retrieved_facts = json.loads(response)["facts"]
+            except Exception as e:
+                logger.error(f"Error in new_retrieved_facts: {e}")
+                new_retrieved_facts = []
 
         if not new_retrieved_facts:
             logger.debug("No new facts retrieved from input. Skipping memory update LLM call.")
 
         retrieved_old_memory = []
+        memories_by_fact = []
         new_message_embeddings = {}
-
-        async def process_fact_for_search(new_mem_content):
-            embeddings = await asyncio.to_thread(self.embedding_model.embed, new_mem_content, "add")
-            new_message_embeddings[new_mem_content] = embeddings
-            existing_mems = await asyncio.to_thread(
-                self.vector_store.search,
-                query=new_mem_content,
-                vectors=embeddings,
+        if new_retrieved_facts:
+            # One request for all facts with embedders that have a batch endpoint
+            embeddings = await asyncio.to_thread(self.embedding_model.embed_batch, new_retrieved_facts, "add")
+            new_message_embeddings = dict(zip(new_retrieved_facts, embeddings))
+
+            search_results_list = await asyncio.to_thread(
+                self.vector_store.search_batch,
+                queries=new_retrieved_facts,
+                vectors_list=embeddings,
                 limit=5,
                 filters=effective_filters,  # 'filters' is query_filters_for_inference
             )
-            return [{"id": mem.id, "text": mem.payload["data"]} for mem in existing_mems]
-
-        search_tasks = [process_fact_for_search(fact) for fact in new_retrieved_facts]
-        search_results_list = await asyncio.gather(*search_tasks)
-        for result_group in search_results_list:
-            retrieved_old_memory.extend(result_group)
+            for existing_mems in search_results_list:
+                memories_by_fact.append([{"id": mem.id, "text": mem.payload["data"]} for mem in existing_mems])
+                retrieved_old_memory.extend(memories_by_fact[-1])
 
         unique_data = {}
         for item in retrieved_old_memory:
             unique_data[item["id"]] = item
         retrieved_old_memory = list(unique_data.values())
         logger.info(f"Total existing memories: {len(retrieved_old_memory)}")
-        temp_uuid_mapping = {}
-        for idx, item in enumerate(retrieved_old_memory):
-            temp_uuid_mapping[str(idx)] = item["id"]
-            retrieved_old_memory[idx]["id"] = str(idx)
+        # mapping UUIDs with integers for handling UUID hallucinations
+        retrieved_old_memory, memories_by_fact, temp_uuid_mapping = assign_temp_memory_ids(
+            retrieved_old_memory, memories_by_fact
+        )
 
-        if new_retrieved_facts:
-            function_calling_prompt = get_update_memory_messages(
-                retrieved_old_memory, new_retrieved_facts, self.config.custom_update_memory_prompt
-            )
-            try:
-                response = await asyncio.to_thread(
-                    self.llm.generate_response,
-                    messages=[{"role": "user", "content": function_calling_prompt}],
-                    response_format={"type": "json_object"},
+        async def get_memory_actions():
+            if not new_retrieved_facts:
+                return
+            prompts = self._get_update_memory_prompts(retrieved_old_memory, memories_by_fact, new_retrieved_facts)
+            if self.stream_memory_actions:
+                # The tasks applying the actions start while the model is still writing the rest of them
+                async for action in self._stream_memory_actions(prompts):
+                    yield action
+                return
+            if len(prompts) == 1:
+                new_memories_with_actions = await self._get_memory_actions(prompts[0])
+            else:
+                new_memories_with_actions = merge_memory_actions(
+                    await asyncio.gather(*[self._get_memory_actions(prompt) for prompt in prompts])
                 )
-            except Exception as e:
-                logger.error(f"Error in new memory actions response: {e}")
-                response = ""
-            try:
-                response = remove_code_blocks(response)
-                new_memories_with_actions = json.loads(response)
-            except Exception as e:
-                logger.error(f"Invalid JSON response: {e}")
-                new_memories_with_actions = {}
-        else:
-            new_memories_with_actions = {}
+            for action in new_memories_with_actions.get("memory", []):
+                yield action
 
         returned_memories = []
         try:
             memory_tasks = []
-            for resp in new_memories_with_actions.get("memory", []):
+            async for resp in get_memory_actions():
                 logger.info(resp)
                 try:
                     action_text = resp.get("text")
@@ -1327,6 +1476,84 @@ class AsyncMemory(MemoryBase):
         )
         return returned_memories
 
+    def _get_update_memory_prompts(self, retrieved_old_memory, memories_by_fact, new_retrieved_facts):
+        """Build the memory update prompts, split to fit ``update_memory_token_budget`` if one is set."""
+        if not self.update_memory_token_budget:
+            return [
+                get_update_memory_messages(
+                    retrieved_old_memory, new_retrieved_facts, self.config.custom_update_memory_prompt
+                )
+            ]
+        return build_update_memory_prompts(
+            memories_by_fact,
+            new_retrieved_facts,
+            self.config.custom_update_memory_prompt,
+            self.update_memory_token_budget,
+            self.llm.count_tokens,
+        )
+
+    async def _get_memory_actions(self, function_calling_prompt):
+        messages = get_update_memory_chat_messages(function_calling_prompt, self.config.custom_update_memory_prompt)
+        try:
+            response = await self.llm.agenerate_response(
+                messages=messages,
+                response_format=get_json_response_format(self.llm, "memory_actions", UPDATE_MEMORY_SCHEMA),
+            )
+        except Exception as e:
+            logger.error(f"Error in new memory actions response: {e}")
+            response = ""
+        try:
+            response = remove_code_blocks(response)
+            return json.loads(response)
+        except Exception as e:
+            logger.error(f"Invalid JSON response: {e}")
+            return {}
+
+    async def _stream_memory_actions(self, prompts):
+        """Yield the actions of the memory update calls as the model writes them, the calls running concurrently."""
+        if len(prompts) == 1:
+            async for action in self._stream_prompt_actions(prompts[0]):
+                yield action
+            return
+
+        done = object()
+        actions = asyncio.Queue()
+
+        async def produce(prompt):
+            try:
+                async for action in self._stream_prompt_actions(prompt):
+                    actions.put_nowait(action)
+            finally:
+                actions.put_nowait(done)
+
+        tasks = [asyncio.create_task(produce(prompt)) for prompt in prompts]
+        # Memories shown to several calls keep the first change that arrives
+        changed = set()
+        remaining = len(prompts)
+        try:
+            while remaining:
+                action = await actions.get()
+                if action is done:
+                    remaining -= 1
+                    continue
+                for kept in dedupe_memory_actions([action], changed):
+                    yield kept
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _stream_prompt_actions(self, function_calling_prompt):
+        messages = get_update_memory_chat_messages(function_calling_prompt, self.config.custom_update_memory_prompt)
+        try:
+            async for action in self.llm.astream_json_items(
+                messages=messages,
+                key="memory",
+                response_format=get_json_response_format(self.llm, "memory_actions", UPDATE_MEMORY_SCHEMA),
+            ):
+                yield action
+        except Exception as e:
+            logger.error(f"Error in new memory actions response: {e}")
+
     async def _add_to_graph(self, messages, filters):
         added_entities = []
         if self.enable_graph:
@@ -1542,14 +1769,19 @@ class AsyncMemory(MemoryBase):
             },
         )
 
-        vector_store_task = asyncio.create_task(self._search_vector_store(query, effective_filters, limit, threshold))
+        context = SearchContext(query, effective_filters, self.embedding_model)
+        vector_store_task = asyncio.create_task(
+            self._search_vector_store(query, effective_filters, limit, threshold, context=context)
+        )
 
         graph_task = None
         if self.enable_graph:
             if hasattr(self.graph.search, "__await__"):  # Check if graph search is async
-                graph_task = asyncio.create_task(self.graph.search(query, effective_filters, limit))
+                graph_task = asyncio.create_task(self.graph.search(query, effective_filters, limit, context=context))
             else:
-                graph_task = asyncio.create_task(asyncio.to_thread(self.graph.search, query, effective_filters, limit))
+                graph_task = asyncio.create_task(
+                    asyncio.to_thread(self.graph.search, query, effective_filters, limit, context=context)
+                )
 
         if graph_task:
             original_memories, graph_entities = await asyncio.gather(vector_store_task, graph_task)
@@ -1572,8 +1804,13 @@ class AsyncMemory(MemoryBase):
         else:
             return {"results": original_memories}
 
-    async def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
-        embeddings = await asyncio.to_thread(self.embedding_model.embed, query, "search")
+    async def _search_vector_store(
+        self, query, filters, limit, threshold: Optional[float] = None, context: Optional[SearchContext] = None
+    ):
+        if context:
+            embeddings = await asyncio.to_thread(lambda: context.embedding)
+        else:
+            embeddings = await asyncio.to_thread(self.embedding_model.embed, query, "search")
         memories = await asyncio.to_thread(
             self.vector_store.search, query=query, vectors=embeddings, limit=limit, filters=filters
         )
@@ -1683,11 +1920,7 @@ class AsyncMemory(MemoryBase):
         capture_event("mem0.delete_all", self, {"keys": keys, "encoded_ids": encoded_ids, "sync_type": "async"})
         memories = await asyncio.to_thread(self.vector_store.list, filters=filters)
 
-        delete_tasks = []
-        for memory in memories[0]:
-            delete_tasks.append(self._delete_memory(memory.id))
-
-        await asyncio.gather(*delete_tasks)
+        await self._delete_memories(memories[0])
 
         logger.info(f"Deleted {len(memories[0])} memories")
 
@@ -1777,7 +2010,7 @@ class AsyncMemory(MemoryBase):
                 response = await asyncio.to_thread(llm.invoke, input=parsed_messages)
                 procedural_memory = response.content
             else:
-                procedural_memory = await asyncio.to_thread(self.llm.generate_response, messages=parsed_messages)
+                procedural_memory = await self.llm.agenerate_response(messages=parsed_messages)
         except Exception as e:
             logger.error(f"Error generating procedural memory summary: {e}")
             raise
@@ -1879,6 +2112,24 @@ class AsyncMemory(MemoryBase):
         capture_event("mem0._delete_memory", self, {"memory_id": memory_id, "sync_type": "async"})
         return memory_id
 
+    async def _delete_memories(self, memories):
+        """Delete already listed memories with a single batched delete, recording a history entry for each."""
+        if not memories:
+            return
+        await asyncio.to_thread(self.vector_store.delete_batch, [memory.id for memory in memories])
+        for memory in memories:
+            await asyncio.to_thread(
+                self.db.add_history,
+                memory.id,
+                memory.payload.get("data"),
+                None,
+                "DELETE",
+                actor_id=memory.payload.get("actor_id"),
+                role=memory.payload.get("role"),
+                is_deleted=1,
+            )
+        capture_event("mem0._delete_memories", self, {"count": len(memories), "sync_type": "async"})
+
     async def reset(self):
         """
         Reset the memory store asynchronously by:
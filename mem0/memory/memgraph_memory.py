@@ -1,6 +1,6 @@
 import logging
 
-from mem0.memory.utils import format_entities, sanitize_relationship_for_cypher
+from mem0.memory.utils import format_entities, get_conflict_candidates, sanitize_relationship_for_cypher
 
 try:
     from langchain_memgraph.graphs.memgraph import Memgraph
@@ -20,7 +20,7 @@ from mem0.graphs.tools import (
     RELATIONS_STRUCT_TOOL,
     RELATIONS_TOOL,
 )
-from mem0.graphs.utils import EXTRACT_RELATIONS_PROMPT, get_delete_messages
+from mem0.graphs.utils import extract_entities_and_relations, get_delete_messages, get_relations_extraction_messages
 from mem0.utils.factory import EmbedderFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
@@ -87,9 +87,9 @@ class MemoryGraph:
             data (str): The data to add to the graph.
             filters (dict): A dictionary containing filters to be applied during the addition.
         """
-        entity_type_map = self._retrieve_nodes_from_data(data, filters)
-        to_be_added = self._establish_nodes_relations_from_data(data, filters, entity_type_map)
+        entity_type_map, to_be_added = extract_entities_and_relations(self, data, filters, filters["user_id"])
         search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        search_output = get_conflict_candidates(search_output, to_be_added)
         to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
         # TODO: Batch queries with APOC plugin
@@ -99,7 +99,7 @@ class MemoryGraph:
 
         return {"deleted_entities": deleted_entities, "added_entities": added_entities}
 
-    def search(self, query, filters, limit=100):
+    def search(self, query, filters, limit=100, context=None):
         """
         Search for memories and related graph data.
 
@@ -107,6 +107,8 @@ class MemoryGraph:
             query (str): Query to search for.
             filters (dict): A dictionary containing filters to be applied during the search.
             limit (int): The maximum number of nodes and relationships to retrieve. Defaults to 100.
+            context (SearchContext, optional): State shared with the vector store search. When the query names no
+                entity, the nodes closest to its embedding, computed once for both searches, are searched instead.
 
         Returns:
             dict: A dictionary containing:
@@ -114,7 +116,10 @@ class MemoryGraph:
                 - "entities": List of related graph data based on the query.
         """
         entity_type_map = self._retrieve_nodes_from_data(query, filters)
-        search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        if entity_type_map or context is None:
+            search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
+        else:
+            search_output = self._search_graph_db(node_list=[query], filters=filters, embeddings=[context.embedding])
 
         if not search_output:
             return []
@@ -135,21 +140,73 @@ class MemoryGraph:
 
         return search_results
 
-    def delete_all(self, filters):
-        """Delete all nodes and relationships for a user or specific agent."""
+    def delete_all(self, filters, batch_size=10000):
+        """Delete all nodes and relationships for a user or specific agent.
+
+        Nodes are deleted ``batch_size`` at a time, each batch in its own transaction, until none is left.
+        """
         if filters.get("agent_id"):
             cypher = """
             MATCH (n:Entity {user_id: $user_id, agent_id: $agent_id})
+            WITH n LIMIT $batch_size
             DETACH DELETE n
+            RETURN count(n) AS deleted
             """
-            params = {"user_id": filters["user_id"], "agent_id": filters["agent_id"]}
+            params = {"user_id": filters["user_id"], "agent_id": filters["agent_id"], "batch_size": batch_size}
         else:
             cypher = """
             MATCH (n:Entity {user_id: $user_id})
+            WITH n LIMIT $batch_size
             DETACH DELETE n
+            RETURN count(n) AS deleted
+            """
+            params = {"user_id": filters["user_id"], "batch_size": batch_size}
+        while True:
+            results = self.graph.query(cypher, params=params)
+            if not results or results[0]["deleted"] < batch_size:
+                return
+
+    def iter_all(self, filters, batch_size=1000):
+        """
+        Iterates over all relationships of a user or specific agent, one page of ``batch_size`` at a time.
+
+        Pages are fetched with a keyset cursor on the relationship id, so a large graph can be exported without
+        one long running query.
+
+        Args:
+            filters (dict): A dictionary containing filters to be applied during the retrieval.
+                Supports 'user_id' (required) and 'agent_id' (optional).
+            batch_size (int): The number of relationships fetched per query. Defaults to 1000.
+        Yields:
+            dict: The 'source', 'relationship' and 'target' of each relationship.
+        """
+        if filters.get("agent_id"):
+            query = """
+            MATCH (n:Entity {user_id: $user_id, agent_id: $agent_id})-[r]->(m:Entity {user_id: $user_id, agent_id: $agent_id})
+            WHERE id(r) > $cursor
+            RETURN n.name AS source, type(r) AS relationship, m.name AS target, id(r) AS relation_id
+            ORDER BY relation_id
+            LIMIT $batch_size
+            """
+            params = {"user_id": filters["user_id"], "agent_id": filters["agent_id"]}
+        else:
+            query = """
+            MATCH (n:Entity {user_id: $user_id})-[r]->(m:Entity {user_id: $user_id})
+            WHERE id(r) > $cursor
+            RETURN n.name AS source, type(r) AS relationship, m.name AS target, id(r) AS relation_id
+            ORDER BY relation_id
+            LIMIT $batch_size
             """
             params = {"user_id": filters["user_id"]}
-        self.graph.query(cypher, params=params)
+        params.update({"batch_size": batch_size, "cursor": -1})
+
+        while True:
+            results = self.graph.query(query, params=params)
+            for result in results:
+                yield {"source": result["source"], "relationship": result["relationship"], "target": result["target"]}
+            if len(results) < batch_size:
+                return
+            params["cursor"] = results[-1]["relation_id"]
 
     def get_all(self, filters, limit=100):
         """
@@ -232,27 +289,9 @@ class MemoryGraph:
 
     def _establish_nodes_relations_from_data(self, data, filters, entity_type_map):
         """Eshtablish relations among the extracted nodes."""
-        if self.config.graph_store.custom_prompt:
-            messages = [
-                {
-                    "role": "system",
-                    "content": EXTRACT_RELATIONS_PROMPT.replace("USER_ID", filters["user_id"]).replace(
-                        "CUSTOM_PROMPT", f"4. {self.config.graph_store.custom_prompt}"
-                    ),
-                },
-                {"role": "user", "content": data},
-            ]
-        else:
-            messages = [
-                {
-                    "role": "system",
-                    "content": EXTRACT_RELATIONS_PROMPT.replace("USER_ID", filters["user_id"]),
-                },
-                {
-                    "role": "user",
-                    "content": f"List of entities: {list(entity_type_map.keys())}. \n\nText: {data}",
-                },
-            ]
+        messages = get_relations_extraction_messages(
+            data, filters["user_id"], list(entity_type_map.keys()), self.config.graph_store.custom_prompt
+        )
 
         _tools = [RELATIONS_TOOL]
         if self.llm_provider in ["azure_openai_structured", "openai_structured"]:
@@ -271,83 +310,52 @@ class MemoryGraph:
         logger.debug(f"Extracted entities: {entities}")
         return entities
 
-    def _search_graph_db(self, node_list, filters, limit=100):
-        """Search similar nodes among and their respective incoming and outgoing relations."""
-        result_relations = []
-
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
-
-            # Build query based on whether agent_id is provided
-            if filters.get("agent_id"):
-                cypher_query = """
-                MATCH (n:Entity {user_id: $user_id, agent_id: $agent_id})
-                WHERE n.embedding IS NOT NULL
-                WITH n, $n_embedding as n_embedding
-                CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
-                YIELD node1, node2, similarity
-                WITH n, similarity
-                WHERE similarity >= $threshold
-                MATCH (n)-[r]->(m:Entity)
-                RETURN n.name AS source, id(n) AS source_id, type(r) AS relationship, id(r) AS relation_id, m.name AS destination, id(m) AS destination_id, similarity
-                UNION
-                MATCH (n:Entity {user_id: $user_id, agent_id: $agent_id})
-                WHERE n.embedding IS NOT NULL
-                WITH n, $n_embedding as n_embedding
-                CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
-                YIELD node1, node2, similarity
-                WITH n, similarity
-                WHERE similarity >= $threshold
-                MATCH (m:Entity)-[r]->(n)
-                RETURN m.name AS source, id(m) AS source_id, type(r) AS relationship, id(r) AS relation_id, n.name AS destination, id(n) AS destination_id, similarity
-                ORDER BY similarity DESC
-                LIMIT $limit;
-                """
-                params = {
-                    "n_embedding": n_embedding,
-                    "threshold": self.threshold,
-                    "user_id": filters["user_id"],
-                    "agent_id": filters["agent_id"],
-                    "limit": limit,
-                }
-            else:
-                cypher_query = """
-                MATCH (n:Entity {user_id: $user_id})
-                WHERE n.embedding IS NOT NULL
-                WITH n, $n_embedding as n_embedding
-                CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
-                YIELD node1, node2, similarity
-                WITH n, similarity
-                WHERE similarity >= $threshold
-                MATCH (n)-[r]->(m:Entity)
-                RETURN n.name AS source, id(n) AS source_id, type(r) AS relationship, id(r) AS relation_id, m.name AS destination, id(m) AS destination_id, similarity
-                UNION
-                MATCH (n:Entity {user_id: $user_id})
-                WHERE n.embedding IS NOT NULL
-                WITH n, $n_embedding as n_embedding
-                CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
-                YIELD node1, node2, similarity
-                WITH n, similarity
-                WHERE similarity >= $threshold
-                MATCH (m:Entity)-[r]->(n)
-                RETURN m.name AS source, id(m) AS source_id, type(r) AS relationship, id(r) AS relation_id, n.name AS destination, id(n) AS destination_id, similarity
-                ORDER BY similarity DESC
-                LIMIT $limit;
-                """
-                params = {
-                    "n_embedding": n_embedding,
-                    "threshold": self.threshold,
-                    "user_id": filters["user_id"],
-                    "limit": limit,
-                }
+    def _search_graph_db(self, node_list, filters, limit=100, embeddings=None):
+        """Search similar nodes among and their respective incoming and outgoing relations.
+
+        All entities are embedded with one call and searched with a single UNWIND query. Relations reached from
+        several entities are returned once, with their best similarity.
+        """
+        if not node_list:
+            return []
 
-            ans = self.graph.query(cypher_query, params=params)
-            result_relations.extend(ans)
+        params = {
+            "n_embeddings": embeddings if embeddings is not None else self.embedding_model.embed_batch(node_list),
+            "threshold": self.threshold,
+            "user_id": filters["user_id"],
+            "limit": limit,
+        }
+        # Build node properties for filtering
+        node_props = ["user_id: $user_id"]
+        if filters.get("agent_id"):
+            node_props.append("agent_id: $agent_id")
+            params["agent_id"] = filters["agent_id"]
+        node_props_str = ", ".join(node_props)
+
+        cypher_query = f"""
+        UNWIND $n_embeddings AS n_embedding
+        MATCH (n:Entity {{{node_props_str}}})
+        WHERE n.embedding IS NOT NULL
+        WITH n, n_embedding
+        CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
+        YIELD node1, node2, similarity
+        WITH n, similarity
+        WHERE similarity >= $threshold
+        MATCH (n)-[r]-(m:Entity)
+        WITH startNode(r) AS src, r, endNode(r) AS dst, max(similarity) AS similarity
+        RETURN src.name AS source, id(src) AS source_id, type(r) AS relationship, id(r) AS relation_id, dst.name AS destination, id(dst) AS destination_id, similarity
+        ORDER BY similarity DESC
+        LIMIT $limit;
+        """
 
-        return result_relations
+        return self.graph.query(cypher_query, params=params)
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
+        if not search_output:
+            # Nothing stored can conflict with the new data, skip the LLM round trip
+            return []
+
         search_output_string = format_entities(search_output)
         system_prompt, user_prompt = get_delete_messages(search_output_string, data, filters["user_id"])
 
@@ -0,0 +1,163 @@
+import logging
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Phrases that carry no facts on their own, grouped by the script they are written in. Matching is done on
+# lowercased text with apostrophes dropped and other punctuation replaced by spaces.
+# fmt: off
+STOP_PHRASES = {
+    "latin": [
+        # English
+        "hi", "hello", "hey", "hi there", "hello there", "hey there", "good morning", "good afternoon",
+        "good evening", "good night", "morning", "thanks", "thank you", "thank you so much", "thanks a lot",
+        "many thanks", "thx", "ty", "appreciate it", "ok", "okay", "k", "kk", "sure", "yes", "yeah", "yep", "no",
+        "nope", "cool", "great", "nice", "awesome", "perfect", "got it", "sounds good", "alright", "all right",
+        "fine", "i am fine", "im fine", "noted", "understood", "will do", "of course", "no problem", "np",
+        "no worries", "bye", "goodbye", "bye bye", "see you", "see ya", "see you later", "cheers", "lol", "haha",
+        "hahaha", "hmm", "please", "how are you", "how are you doing", "you are welcome", "youre welcome",
+        "welcome", "how can i help you", "how can i help you today", "how may i help you",
+        "what can i do for you", "is there anything else", "anything else", "glad to help", "happy to help",
+        "let me know if you need anything else", "i am doing well", "im doing well",
+        # Spanish, French, German
+        "hola", "gracias", "muchas gracias", "buenos dias", "buenos días", "buenas noches", "adios", "adiós",
+        "vale", "de nada", "si", "sí", "bonjour", "salut", "merci", "merci beaucoup", "bonsoir", "au revoir",
+        "oui", "daccord", "hallo", "danke", "danke schön", "guten morgen", "guten tag", "tschüss",
+        "ja", "gut",
+    ],
+    "han": [
+        "你好", "您好", "嗨", "哈喽", "早上好", "早安", "下午好", "晚上好", "晚安", "谢谢", "谢谢你", "谢谢您",
+        "多谢", "感谢", "非常感谢", "好的", "好", "好吧", "嗯", "嗯嗯", "哦", "噢", "是的", "是", "对", "对的",
+        "行", "可以", "没问题", "收到", "明白", "明白了", "知道了", "了解", "拜拜", "再见", "哈哈", "哈哈哈",
+        "不客气", "不用谢", "在吗", "在的", "你好吗", "我很好", "有什么可以帮你的吗", "有什么可以帮您的吗",
+        "有什么我可以帮你的吗", "请问有什么可以帮您", "很高兴为您服务", "还有其他问题吗", "还有什么需要帮忙的吗",
+    ],
+    "kana": [
+        "こんにちは", "こんばんは", "おはよう", "おはようございます", "ありがとう", "ありがとうございます",
+        "どうも", "はい", "うん", "ええ", "いいえ", "了解", "了解です", "よろしく", "よろしくお願いします",
+        "さようなら", "またね", "おやすみ", "おやすみなさい",
+    ],
+    "hangul": [
+        "안녕", "안녕하세요", "감사합니다", "고마워", "고맙습니다", "네", "응", "아니요", "좋아요", "알겠습니다",
+        "잘가", "안녕히 가세요",
+    ],
+}
+# fmt: on
+
+_SCRIPTS = {
+    "han": re.compile(r"[\u4e00-\u9fff\u3400-\u4dbf]"),
+    "kana": re.compile(r"[\u3040-\u30ff]"),
+    "hangul": re.compile(r"[\uac00-\ud7af\u1100-\u11ff]"),
+    "latin": re.compile(r"[A-Za-z\u00c0-\u024f]"),
+}
+
+
+def _phrase_pattern(phrases, word_boundaries):
+    phrases = sorted({phrase for phrase in phrases if phrase}, key=len, reverse=True)
+    if not phrases:
+        return None
+    alternatives = "|".join(re.escape(phrase) for phrase in phrases)
+    # Latin phrases must be whole words, "hi" must not eat the start of "history"
+    return re.compile(rf"\b(?:{alternatives})\b" if word_boundaries else f"(?:{alternatives})")
+
+
+class MessageFilter:
+    """Rule and lexicon filter deciding before the fact extraction LLM call whether messages can hold facts.
+
+    Messages are skipped when nothing is left of their user and assistant text once greetings, thanks,
+    acknowledgements and other stop phrases of the languages it is written in are taken out, or when fewer than
+    ``min_chars`` letters and digits are left. An optional local ``classifier`` is asked about the messages that pass
+    the rules.
+
+    Args:
+        min_chars (int): Letters and digits that have to be left after the stop phrases are taken out.
+        stop_phrases (list, optional): Phrases skipped in addition to the built-in lexicon.
+        classifier (callable, optional): Returns the probability that a text holds facts worth remembering.
+        classifier_threshold (float): Texts scored below this by the classifier are skipped.
+    """
+
+    def __init__(
+        self,
+        min_chars: int = 2,
+        stop_phrases: Optional[List[str]] = None,
+        classifier: Optional[Callable[[str], float]] = None,
+        classifier_threshold: float = 0.5,
+    ):
+        self.min_chars = min_chars
+        self.classifier = classifier
+        self.classifier_threshold = classifier_threshold
+
+        phrases = {script: list(script_phrases) for script, script_phrases in STOP_PHRASES.items()}
+        for phrase in stop_phrases or []:
+            phrase = self._normalize(phrase)
+            scripts = [script for script, pattern in _SCRIPTS.items() if pattern.search(phrase)] or ["latin"]
+            for script in scripts:
+                phrases[script].append(phrase)
+        self._patterns = {
+            script: _phrase_pattern(script_phrases, word_boundaries=script in ("latin", "hangul"))
+            for script, script_phrases in phrases.items()
+        }
+
+        self._lock = threading.Lock()
+        self._counts = {"checked": 0, "skipped": 0, "empty": 0, "stop_phrases": 0, "too_short": 0, "classifier": 0}
+
+    def should_extract(self, messages: List[Dict]) -> bool:
+        """
+        Whether the fact extraction LLM call is worth making for the messages.
+
+        Args:
+            messages (list): The messages passed to ``add``.
+
+        Returns:
+            bool: False if the messages cannot hold facts.
+        """
+        texts = []
+        for message in messages:
+            if not isinstance(message, dict) or message.get("role") not in ("user", "assistant"):
+                continue
+            content = message.get("content")
+            if not isinstance(content, str):
+                # Images and other structured content are left to the LLM
+                return self._record(None)
+            texts.append(content)
+
+        text = "\n".join(texts)
+        if not any(ch.isalnum() for ch in text):
+            return self._record("empty")
+
+        remainder = self._normalize(text)
+        for script, pattern in _SCRIPTS.items():
+            if pattern.search(remainder) and self._patterns[script]:
+                remainder = self._patterns[script].sub(" ", remainder)
+        left = sum(1 for ch in remainder if ch.isalnum())
+        if left == 0:
+            return self._record("stop_phrases")
+        if left < self.min_chars:
+            return self._record("too_short")
+
+        if self.classifier is not None and self.classifier(text) < self.classifier_threshold:
+            return self._record("classifier")
+        return self._record(None)
+
+    def stats(self) -> Dict[str, int]:
+        """Messages checked and skipped so far, with the skips broken down by the rule that caught them."""
+        with self._lock:
+            return dict(self._counts)
+
+    def _record(self, skip_reason):
+        with self._lock:
+            self._counts["checked"] += 1
+            if skip_reason:
+                self._counts["skipped"] += 1
+                self._counts[skip_reason] += 1
+        if skip_reason:
+            logger.debug(f"Skipping fact extraction, the messages carry no facts ({skip_reason})")
+        return skip_reason is None
+
+    @staticmethod
+    def _normalize(text):
+        text = re.sub(r"['\u2019]", "", text.lower())
+        text = re.sub(r"[^\w\s]|_", " ", text)
+        return re.sub(r"\s+", " ", text).strip()
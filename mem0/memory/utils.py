@@ -1,11 +1,346 @@
+import functools
 import hashlib
+import json
+import logging
 import re
+import threading
+from datetime import datetime
 
-from mem0.configs.prompts import FACT_RETRIEVAL_PROMPT
+from mem0.configs.prompts import (
+    FACT_RETRIEVAL_BATCH_PROMPT,
+    FACT_RETRIEVAL_PROMPT,
+    get_update_memory_messages,
+    get_update_memory_system_prompt,
+)
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+
+class SearchContext:
+    """Per-query state shared by the vector store and graph store branches of a search.
+
+    The query embedding is computed once, on first access, whichever branch asks for it first. The vector store
+    search ranks memories by it, and the graph search looks for the nodes closest to it when the query names no
+    entity.
+    """
+
+    def __init__(self, query, filters, embedding_model):
+        self.query = query
+        self.filters = filters
+        self._embedding_model = embedding_model
+        self._embedding = None
+        self._lock = threading.Lock()
+
+    @property
+    def embedding(self):
+        with self._lock:
+            if self._embedding is None:
+                self._embedding = self._embedding_model.embed(self.query, "search")
+            return self._embedding
 
 
 def get_fact_retrieval_messages(message):
-    return FACT_RETRIEVAL_PROMPT, f"Input:\n{message}"
+    # The date goes with the input so the system prompt stays the same, and cacheable, across days
+    return FACT_RETRIEVAL_PROMPT, f"当前日期: {datetime.now().strftime('%Y-%m-%d')}\n\nInput:\n{message}"
+
+
+def get_update_memory_chat_messages(prompt, custom_update_memory_prompt=None):
+    """
+    Turn a memory update prompt into chat messages.
+
+    The static instructions at the start of prompts built by ``get_update_memory_messages`` become the system
+    message, so providers can cache them, and the memories and facts the user message. Other prompts are sent as a
+    single user message.
+    """
+    system_prompt = get_update_memory_system_prompt(custom_update_memory_prompt)
+    if prompt.startswith(system_prompt) and len(prompt) > len(system_prompt):
+        return [
+            {"role": "system", "content": system_prompt.strip()},
+            {"role": "user", "content": prompt[len(system_prompt) :].strip()},
+        ]
+    return [{"role": "user", "content": prompt}]
+
+
+def get_json_response_format(llm, name, schema):
+    """
+    The ``response_format`` asking an LLM for a JSON response.
+
+    LLMs whose backend constrains decoding to a JSON schema, see ``LLMBase.supports_json_schema``, get the schema
+    and always return valid JSON. The others are asked for any JSON object.
+
+    Args:
+        llm: The LLM the response is requested from.
+        name (str): Name of the schema.
+        schema (dict): JSON schema of the response.
+
+    Returns:
+        dict: The response format.
+    """
+    if getattr(llm, "supports_json_schema", False) is True:
+        return {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}
+    return {"type": "json_object"}
+
+
+def get_batch_fact_retrieval_messages(system_prompt, user_prompts):
+    batch_system_prompt = system_prompt + FACT_RETRIEVAL_BATCH_PROMPT
+    batch_user_prompt = "\n\n".join(f"对话 {i}:\n{user_prompt}" for i, user_prompt in enumerate(user_prompts))
+    return batch_system_prompt, batch_user_prompt
+
+
+@functools.lru_cache(maxsize=None)
+def _get_token_encoding(model):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+    except KeyError:
+        # Models tiktoken does not know, e.g. of other providers, are counted with the GPT-4 encoding
+        return _get_token_encoding(None)
+    except Exception as e:
+        # The encoding files are downloaded on first use, which fails offline
+        logger.warning(f"Could not load the tiktoken encoding, estimating token counts from the text size: {e}")
+        return None
+
+
+def count_tokens(text, model=None):
+    """
+    Count the tokens of ``text`` with tiktoken.
+
+    Without tiktoken the count is estimated as one token per three UTF-8 bytes, which overestimates English
+    text and comes close for Chinese, so budgets based on it stay on the safe side.
+
+    Args:
+        text (str): The text.
+        model (str, optional): Model whose encoding to use. Defaults to cl100k_base.
+
+    Returns:
+        int: The number of tokens.
+    """
+    encoding = _get_token_encoding(model if isinstance(model, str) else None)
+    if encoding is None:
+        return -(-len(text.encode("utf-8")) // 3)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def assign_temp_memory_ids(memories, memories_by_fact):
+    """
+    Replace the UUIDs of the retrieved memories with short integer ids the LLM cannot garble.
+
+    Args:
+        memories (list): The retrieved memories as {"id", "text"} dicts, without repeats.
+        memories_by_fact (list): For each fact, its retrieved memories, which may repeat across facts.
+
+    Returns:
+        tuple: The memories and the memories of each fact with the temporary ids, and the mapping from temporary
+            ids back to UUIDs. A memory retrieved by several facts gets the same id everywhere.
+    """
+    temp_ids = {memory["id"]: str(idx) for idx, memory in enumerate(memories)}
+    memories = [{**memory, "id": temp_ids[memory["id"]]} for memory in memories]
+    memories_by_fact = [
+        [{**memory, "id": temp_ids[memory["id"]]} for memory in fact_memories if memory["id"] in temp_ids]
+        for fact_memories in memories_by_fact
+    ]
+    return memories, memories_by_fact, {temp_id: memory_id for memory_id, temp_id in temp_ids.items()}
+
+
+def _rank_memories(memories_by_fact):
+    """Order memories by their best position in the search results of any fact, dropping repeats."""
+    ranked = {}
+    for position in range(max((len(memories) for memories in memories_by_fact), default=0)):
+        for memories in memories_by_fact:
+            if position < len(memories) and memories[position]["id"] not in ranked:
+                ranked[memories[position]["id"]] = memories[position]
+    return list(ranked.values())
+
+
+def build_update_memory_prompts(memories_by_fact, new_facts, custom_update_memory_prompt, token_budget, count):
+    """
+    Build memory update prompts of at most ``token_budget`` tokens each.
+
+    If everything fits, the single prompt is the same as ``get_update_memory_messages`` builds. Otherwise the facts
+    are split into groups taking at most half of the budget, and each group gets the memories retrieved for its
+    own facts, closest matches first, until the budget is used up. The groups can be sent as parallel update calls.
+
+    Args:
+        memories_by_fact (list): For each fact, the retrieved memories as {"id", "text"} dicts, best match first.
+        new_facts (list): The newly extracted facts.
+        custom_update_memory_prompt (str): Custom update prompt, the default prompt is used if None.
+        token_budget (int): Tokens allowed per prompt.
+        count (callable): Returns the number of tokens of a text.
+
+    Returns:
+        list: The prompts.
+    """
+    available = token_budget - count(get_update_memory_messages([], [], custom_update_memory_prompt))
+    # Each entry is rendered as its repr followed by ", " in the prompt
+    fact_costs = [count(repr(fact)) + 1 for fact in new_facts]
+
+    all_memories = list({memory["id"]: memory for memories in memories_by_fact for memory in memories}.values())
+    if sum(fact_costs) + sum(count(repr(memory)) + 1 for memory in all_memories) <= available:
+        return [get_update_memory_messages(all_memories, new_facts, custom_update_memory_prompt)]
+
+    groups, group, group_cost = [], [], 0
+    for i, cost in enumerate(fact_costs):
+        if group and group_cost + cost > available // 2:
+            groups.append(group)
+            group, group_cost = [], 0
+        group.append(i)
+        group_cost += cost
+    groups.append(group)
+
+    prompts = []
+    for group in groups:
+        room = available - sum(fact_costs[i] for i in group)
+        kept = []
+        for memory in _rank_memories([memories_by_fact[i] for i in group]):
+            room -= count(repr(memory)) + 1
+            if room < 0:
+                break
+            kept.append(memory)
+        prompts.append(
+            get_update_memory_messages(kept, [new_facts[i] for i in group], custom_update_memory_prompt)
+        )
+    logger.info(f"Split the memory update of {len(new_facts)} facts into {len(prompts)} calls")
+    return prompts
+
+
+def merge_memory_actions(results):
+    """
+    Merge the parsed responses of update calls made for separate fact groups.
+
+    Memories are shown to every group that retrieved them, so only the first UPDATE or DELETE of each existing
+    memory is kept.
+    """
+    actions = (action for result in results if isinstance(result, dict) for action in result.get("memory", []))
+    return {"memory": list(dedupe_memory_actions(actions))}
+
+
+def dedupe_memory_actions(actions, changed=None):
+    """Yield the actions, leaving out UPDATE and DELETE actions of memories an earlier action already changed."""
+    changed = set() if changed is None else changed
+    for action in actions:
+        if not isinstance(action, dict):
+            continue
+        if action.get("event") in ("UPDATE", "DELETE"):
+            if action.get("id") in changed:
+                continue
+            changed.add(action.get("id"))
+        yield action
+
+
+class JSONArrayStreamParser:
+    """Incremental parser handing out the items of a JSON array while the rest of the document is still arriving.
+
+    Text is fed chunk by chunk as the LLM streams it. The array is the value of ``key`` in the response object, or
+    the first array of the response if no key is given, and anything around it, like code fences, is ignored. Each
+    item is parsed as soon as its closing bracket arrives.
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        self.finished = False
+        self._start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[' if key else r"\[")
+        self._buffer = ""
+        self._in_array = False
+        self._pos = 0
+        self._item_start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk):
+        """
+        Add the next chunk of the response.
+
+        Returns:
+            list: The items completed by the chunk.
+        """
+        if self.finished or not chunk:
+            return []
+        self._buffer += chunk
+        if not self._in_array:
+            match = self._start.search(self._buffer)
+            if not match:
+                return []
+            self._in_array = True
+            self._buffer = self._buffer[match.end() :]
+            self._pos = 0
+
+        items = []
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self.finished:
+            ch = buffer[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+                if self._item_start is None:
+                    self._item_start = self._pos
+            elif ch in "{[":
+                if self._item_start is None:
+                    self._item_start = self._pos
+                self._depth += 1
+            elif ch in "}]" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(items, self._pos + 1)
+            elif ch == "]" or (ch == "," and self._depth == 0):
+                # End of a scalar item, and for "]" of the array
+                self._emit(items, self._pos)
+                self.finished = ch == "]"
+            elif not ch.isspace() and self._item_start is None:
+                self._item_start = self._pos
+            self._pos += 1
+
+        # Only the unfinished item has to be kept
+        cut = self._pos if self._item_start is None else self._item_start
+        self._buffer = buffer[cut:]
+        self._pos -= cut
+        if self._item_start is not None:
+            self._item_start -= cut
+        return items
+
+    def close(self):
+        """
+        End the stream.
+
+        Returns:
+            list: The items of a response the array could not be found in while streaming, e.g. one with
+                ``key`` at a different place, parsed as a whole.
+        """
+        if self._in_array or self.finished:
+            if not self.finished:
+                logger.warning("Streamed JSON array ended before it was closed")
+            self.finished = True
+            return []
+        self.finished = True
+        try:
+            document = json.loads(remove_code_blocks(self._buffer))
+        except ValueError:
+            logger.error(f"Invalid JSON response: {self._buffer[:200]}")
+            return []
+        items = document.get(self.key) if self.key and isinstance(document, dict) else document
+        return items if isinstance(items, list) else []
+
+    def _emit(self, items, end):
+        if self._item_start is None:
+            return
+        text = self._buffer[self._item_start : end]
+        self._item_start = None
+        try:
+            items.append(json.loads(text))
+        except ValueError:
+            logger.error(f"Skipping invalid item of streamed JSON array: {text}")
 
 
 def parse_messages(messages):
@@ -32,6 +367,16 @@ def format_entities(entities):
     return "\n".join(formatted_lines)
 
 
+def get_conflict_candidates(existing_relations, new_relations):
+    """Drop existing relations that the new relations restate unchanged, only the rest can conflict."""
+    restated = {(item["source"], item["relationship"], item["destination"]) for item in new_relations}
+    return [
+        item
+        for item in existing_relations
+        if (item["source"], item["relationship"], item["destination"]) not in restated
+    ]
+
+
 def remove_code_blocks(content: str) -> str:
     """
     Removes enclosing code block markers ```[language] and ``` from a given string.
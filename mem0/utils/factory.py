@@ -3,6 +3,7 @@ from typing import Dict, Optional, Union
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
 from mem0.configs.llms.anthropic import AnthropicConfig
+from mem0.configs.llms.aws_bedrock import AWSBedrockConfig
 from mem0.configs.llms.azure import AzureOpenAIConfig
 from mem0.configs.llms.base import BaseLlmConfig
 from mem0.configs.llms.deepseek import DeepSeekConfig
@@ -11,6 +12,7 @@ from mem0.configs.llms.ollama import OllamaConfig
 from mem0.configs.llms.openai import OpenAIConfig
 from mem0.configs.llms.vllm import VllmConfig
 from mem0.embeddings.mock import MockEmbeddings
+from mem0.utils.rate_limit import limit_embedder, limit_llm
 
 
 def load_class(class_type):
@@ -31,7 +33,7 @@ class LlmFactory:
         "openai": ("mem0.llms.openai.OpenAILLM", OpenAIConfig),
         "groq": ("mem0.llms.groq.GroqLLM", BaseLlmConfig),
         "together": ("mem0.llms.together.TogetherLLM", BaseLlmConfig),
-        "aws_bedrock": ("mem0.llms.aws_bedrock.AWSBedrockLLM", BaseLlmConfig),
+        "aws_bedrock": ("mem0.llms.aws_bedrock.AWSBedrockLLM", AWSBedrockConfig),
         "litellm": ("mem0.llms.litellm.LiteLLM", BaseLlmConfig),
         "azure_openai": ("mem0.llms.azure_openai.AzureOpenAILLM", AzureOpenAIConfig),
         "openai_structured": ("mem0.llms.openai_structured.OpenAIStructuredLLM", OpenAIConfig),
@@ -56,6 +58,9 @@ class LlmFactory:
             config: Configuration object or dict. If None, will create default config
             **kwargs: Additional configuration parameters
 
+        A ``rate_limit`` entry in the config or kwargs (see ``mem0.utils.rate_limit.RateLimitConfig``) routes the
+        calls of the instance through the limiter shared by all instances of the provider.
+
         Returns:
             Configured LLM instance
 
@@ -65,6 +70,11 @@ class LlmFactory:
         if provider_name not in cls.provider_to_class:
             raise ValueError(f"Unsupported Llm provider: {provider_name}")
 
+        rate_limit = kwargs.pop("rate_limit", None)
+        if isinstance(config, dict) and "rate_limit" in config:
+            config = dict(config)
+            rate_limit = config.pop("rate_limit")
+
         class_type, config_class = cls.provider_to_class[provider_name]
         llm_class = load_class(class_type)
 
@@ -100,7 +110,10 @@ class LlmFactory:
             # Assume it's already the correct config type
             pass
 
-        return llm_class(config)
+        llm = llm_class(config)
+        if rate_limit:
+            llm = limit_llm(llm, provider_name, rate_limit)
+        return llm
 
     @classmethod
     def register_provider(cls, name: str, class_path: str, config_class=None):
@@ -148,8 +161,12 @@ class EmbedderFactory:
         class_type = cls.provider_to_class.get(provider_name)
         if class_type:
             embedder_instance = load_class(class_type)
-            base_config = BaseEmbedderConfig(**config)
-            return embedder_instance(base_config)
+            config = dict(config or {})
+            rate_limit = config.pop("rate_limit", None)
+            embedder = embedder_instance(BaseEmbedderConfig(**config))
+            if rate_limit:
+                embedder = limit_embedder(embedder, provider_name, rate_limit)
+            return embedder
         else:
             raise ValueError(f"Unsupported Embedder provider: {provider_name}")
 
@@ -203,6 +220,7 @@ class GraphStoreFactory:
         "memgraph": "mem0.memory.memgraph_memory.MemoryGraph",
         "neptune": "mem0.graphs.neptune.main.MemoryGraph",
         "kuzu": "mem0.memory.kuzu_memory.MemoryGraph",
+        "local": "mem0.memory.local_graph_memory.MemoryGraph",
         "default": "mem0.memory.graph_memory.MemoryGraph",
     }
 
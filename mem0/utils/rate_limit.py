@@ -0,0 +1,510 @@
+"""
+Client-side limits for LLM and embedding provider calls.
+
+Limiters are kept per provider for the whole process, so every Memory, AsyncMemory and graph store that calls
+the same provider draws from one budget instead of each retrying into the provider's quota on its own.
+"""
+
+import asyncio
+import functools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Union
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitConfig(BaseModel):
+    key: Optional[str] = Field(
+        None,
+        description="Name of the shared limiter, defaults to the provider. Give separate API keys separate names "
+        "to give them separate budgets",
+    )
+    max_concurrency: Optional[int] = Field(None, description="Requests in flight at the same time")
+    requests_per_minute: Optional[float] = Field(None, description="Requests started per minute")
+    tokens_per_minute: Optional[float] = Field(
+        None, description="Input tokens sent per minute, estimated as four characters per token"
+    )
+    max_retries: int = Field(3, description="Retries of a request rejected with a rate limit or server error")
+    backoff_base: float = Field(
+        0.5, description="Seconds before the first retry when the provider does not send Retry-After"
+    )
+    backoff_max: float = Field(30.0, description="Longest wait before a retry")
+    failure_threshold: int = Field(5, description="Consecutive failed requests after which the circuit opens")
+    recovery_timeout: float = Field(
+        30.0, description="Seconds the circuit stays open before one request is let through"
+    )
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider that keeps failing."""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously, holding at most one minute of budget."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Take ``amount`` tokens, going into debt if the bucket is short.
+
+        Returns:
+            float: Seconds the caller has to wait until the debt is paid back.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class ConcurrencyLimiter:
+    """Semaphore with a FIFO queue that both threads and coroutines can wait on."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def acquire(self):
+        with self._lock:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return
+            event = threading.Event()
+            self._waiters.append(event.set)
+        event.wait()
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_flight < self.limit and not self._waiters:
+                self.in_flight += 1
+                return
+            future = loop.create_future()
+            waiter = functools.partial(self._wake_async, loop, future)
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = waiter in self._waiters
+                if queued:
+                    self._waiters.remove(waiter)
+            # A slot handed over just before the cancellation must not be lost
+            if not queued and future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            if not self._waiters:
+                self.in_flight -= 1
+                return
+            # The slot passes to the next waiter, in_flight is unchanged
+            wake = self._waiters.popleft()
+        wake()
+
+    def _wake_async(self, loop, future):
+        def resolve():
+            if future.cancelled():
+                self.release()
+            else:
+                future.set_result(None)
+
+        loop.call_soon_threadsafe(resolve)
+
+
+class CircuitBreaker:
+    """Stops calls after repeated failures and lets a single probe through once the recovery timeout passed."""
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self, name: str) -> bool:
+        """Let a call through, returning True if it is the probe of a half-open circuit."""
+        with self._lock:
+            if self.state == "closed":
+                return False
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = "half_open"
+                return True
+        raise CircuitOpenError(f"Circuit for '{name}' is open after {self.failures} consecutive failures")
+
+    def release_probe(self):
+        """Reopen the circuit if the probe ended without a result, e.g. because it was cancelled."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class RateLimiter:
+    """
+    Concurrency, request and token limits plus retries and a circuit breaker around provider calls.
+
+    Args:
+        name (str): Name reported in the stats.
+        config (RateLimitConfig): The limits.
+    """
+
+    def __init__(self, name: str, config: RateLimitConfig):
+        self.name = name
+        self.config = config
+        self._slots = ConcurrencyLimiter(config.max_concurrency) if config.max_concurrency else None
+        self._requests = TokenBucket(config.requests_per_minute) if config.requests_per_minute else None
+        self._tokens = TokenBucket(config.tokens_per_minute) if config.tokens_per_minute else None
+        self._breaker = CircuitBreaker(config.failure_threshold, config.recovery_timeout)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._waiting = 0
+        self._counts = {"requests": 0, "retries": 0, "throttled": 0, "rejected": 0}
+
+    def call(self, fn, *args, tokens: int = 0, **kwargs):
+        """Call ``fn`` within the limits, retrying rate limit and server errors."""
+        attempt = 0
+        while True:
+            probe = self._admit()
+            try:
+                delay = self._reserve(tokens)
+                if delay > 0:
+                    self._track_waiting(1)
+                    try:
+                        time.sleep(delay)
+                    finally:
+                        self._track_waiting(-1)
+                if self._slots:
+                    self._slots.acquire()
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    backoff = self._on_error(e, attempt)
+                    if backoff is None:
+                        raise
+                else:
+                    self._breaker.record_success()
+                    return result
+                finally:
+                    if self._slots:
+                        self._slots.release()
+            except BaseException:
+                # A probe interrupted before its outcome was recorded must not leave the circuit half-open
+                if probe:
+                    self._breaker.release_probe()
+                raise
+            attempt += 1
+            time.sleep(backoff)
+
+    async def acall(self, fn, *args, tokens: int = 0, **kwargs):
+        """Await ``fn`` within the limits, retrying rate limit and server errors."""
+        attempt = 0
+        while True:
+            probe = self._admit()
+            try:
+                delay = self._reserve(tokens)
+                if delay > 0:
+                    self._track_waiting(1)
+                    try:
+                        await asyncio.sleep(delay)
+                    finally:
+                        self._track_waiting(-1)
+                if self._slots:
+                    await self._slots.aacquire()
+                try:
+                    result = await fn(*args, **kwargs)
+                except Exception as e:
+                    backoff = self._on_error(e, attempt)
+                    if backoff is None:
+                        raise
+                else:
+                    self._breaker.record_success()
+                    return result
+                finally:
+                    if self._slots:
+                        self._slots.release()
+            except BaseException:
+                # A probe cancelled before its outcome was recorded, e.g. by a timeout, must not leave the circuit
+                # half-open
+                if probe:
+                    self._breaker.release_probe()
+                raise
+            attempt += 1
+            await asyncio.sleep(backoff)
+
+    def stats(self) -> Dict[str, Union[int, str]]:
+        """
+        Current load of the limiter.
+
+        Returns:
+            dict: Requests in flight, callers queued for a slot or for rate budget, the circuit state and counts of
+            requests, retries, throttled responses and calls rejected by the open circuit.
+        """
+        with self._lock:
+            waiting = self._waiting
+            counts = dict(self._counts)
+        return {
+            "in_flight": self._slots.in_flight if self._slots else None,
+            "queue_depth": waiting + (self._slots.queue_depth if self._slots else 0),
+            "circuit_state": self._breaker.state,
+            **counts,
+        }
+
+    def _admit(self) -> bool:
+        """Check the circuit breaker, returning True if the call is the probe of a half-open circuit."""
+        try:
+            return self._breaker.allow(self.name)
+        except CircuitOpenError:
+            with self._lock:
+                self._counts["rejected"] += 1
+            raise
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            self._counts["requests"] += 1
+            delay = max(0.0, self._paused_until - time.monotonic())
+        if self._requests:
+            delay = max(delay, self._requests.reserve(1))
+        if self._tokens and tokens:
+            delay = max(delay, self._tokens.reserve(tokens))
+        return delay
+
+    def _track_waiting(self, change: int):
+        with self._lock:
+            self._waiting += change
+
+    def _on_error(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failed call and return the wait before retrying it, or None if it must not be retried."""
+        status = _status_code(error)
+        if not _is_retryable(error, status):
+            # The provider answered, a bad request says nothing about its health
+            self._breaker.record_success()
+            return None
+        self._breaker.record_failure()
+
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = min(retry_after, self.config.backoff_max)
+        else:
+            cap = min(self.config.backoff_max, self.config.backoff_base * 2**attempt)
+            delay = cap / 2 + random.uniform(0, cap / 2)
+
+        with self._lock:
+            if status == 429:
+                # Hold back every caller of this provider, not only the one that was throttled
+                self._counts["throttled"] += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            if attempt >= self.config.max_retries:
+                return None
+            self._counts["retries"] += 1
+        logger.warning(f"Retrying '{self.name}' request in {delay:.2f}s after error: {error}")
+        return delay
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _is_retryable(error: Exception, status: Optional[int]) -> bool:
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    # SDK errors raised before a response arrived, e.g. openai.APIConnectionError or anthropic.APITimeoutError
+    name = type(error).__name__
+    return any(marker in name for marker in ("RateLimit", "Timeout", "Connection"))
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+        value = headers.get("retry-after") or headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _estimate_tokens(content) -> int:
+    if isinstance(content, str):
+        return len(content) // 4 + 1
+    if isinstance(content, dict):
+        return _estimate_tokens(content.get("content", ""))
+    if isinstance(content, (list, tuple)):
+        return sum(_estimate_tokens(item) for item in content)
+    return _estimate_tokens(str(content))
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, config: Union[RateLimitConfig, Dict]) -> RateLimiter:
+    """
+    Get the limiter registered under ``name``, creating it from ``config`` on first use.
+
+    Args:
+        name (str): Name of the limiter, e.g. "llm:openai".
+        config (RateLimitConfig or dict): Limits used if the limiter does not exist yet.
+
+    Returns:
+        RateLimiter: The shared limiter.
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            if isinstance(config, dict):
+                config = RateLimitConfig(**config)
+            _limiters[name] = RateLimiter(name, config)
+        return _limiters[name]
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Union[int, str]]]:
+    """Stats of every limiter in the process, keyed by limiter name."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
+
+
+def limit_llm(llm, provider: str, config: Union[RateLimitConfig, Dict]):
+    """Route the LLM's generate calls through the shared limiter of its provider."""
+    from mem0.llms.base import LLMBase
+
+    if isinstance(config, dict):
+        config = RateLimitConfig(**config)
+    limiter = get_rate_limiter(f"llm:{config.key or provider}", config)
+
+    generate_response = llm.generate_response
+
+    @functools.wraps(generate_response)
+    def limited_generate_response(messages, *args, **kwargs):
+        return limiter.call(generate_response, messages, *args, tokens=_estimate_tokens(messages), **kwargs)
+
+    llm.generate_response = limited_generate_response
+
+    # The default agenerate_response runs the limited generate_response in a thread
+    if type(llm).agenerate_response is not LLMBase.agenerate_response:
+        agenerate_response = llm.agenerate_response
+
+        @functools.wraps(agenerate_response)
+        async def limited_agenerate_response(messages, *args, **kwargs):
+            return await limiter.acall(agenerate_response, messages, *args, tokens=_estimate_tokens(messages), **kwargs)
+
+        llm.agenerate_response = limited_agenerate_response
+
+    # Streams count as one request, limited until the first chunk arrives, the default ones call generate_response
+    if type(llm).stream_response is not LLMBase.stream_response:
+        stream_response = llm.stream_response
+
+        def start_stream(messages, *args, **kwargs):
+            stream = stream_response(messages, *args, **kwargs)
+            return stream, next(stream, None)
+
+        @functools.wraps(stream_response)
+        def limited_stream_response(messages, *args, **kwargs):
+            stream, first = limiter.call(start_stream, messages, *args, tokens=_estimate_tokens(messages), **kwargs)
+            if first is not None:
+                yield first
+                yield from stream
+
+        llm.stream_response = limited_stream_response
+
+    if type(llm).astream_response is not LLMBase.astream_response:
+        astream_response = llm.astream_response
+
+        async def astart_stream(messages, *args, **kwargs):
+            stream = astream_response(messages, *args, **kwargs)
+            try:
+                return stream, await stream.__anext__()
+            except StopAsyncIteration:
+                return stream, None
+
+        @functools.wraps(astream_response)
+        async def limited_astream_response(messages, *args, **kwargs):
+            stream, first = await limiter.acall(
+                astart_stream, messages, *args, tokens=_estimate_tokens(messages), **kwargs
+            )
+            if first is not None:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+
+        llm.astream_response = limited_astream_response
+    return llm
+
+
+def limit_embedder(embedder, provider: str, config: Union[RateLimitConfig, Dict]):
+    """Route the embedder's calls through the shared limiter of its provider."""
+    from mem0.embeddings.base import EmbeddingBase
+
+    if isinstance(config, dict):
+        config = RateLimitConfig(**config)
+    limiter = get_rate_limiter(f"embedder:{config.key or provider}", config)
+
+    embed = embedder.embed
+
+    @functools.wraps(embed)
+    def limited_embed(text, *args, **kwargs):
+        return limiter.call(embed, text, *args, tokens=_estimate_tokens(text), **kwargs)
+
+    embedder.embed = limited_embed
+
+    # The default embed_batch calls the limited embed once per text
+    if type(embedder).embed_batch is not EmbeddingBase.embed_batch:
+        embed_batch = embedder.embed_batch
+
+        @functools.wraps(embed_batch)
+        def limited_embed_batch(texts, *args, **kwargs):
+            return limiter.call(embed_batch, texts, *args, tokens=_estimate_tokens(texts), **kwargs)
+
+        embedder.embed_batch = limited_embed_batch
+    return embedder
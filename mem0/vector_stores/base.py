@@ -56,3 +56,26 @@ class VectorStoreBase(ABC):
     def reset(self):
         """Reset by delete the collection and recreate it."""
         pass
+
+    def search_batch(self, queries, vectors_list, limit=5, filters=None):
+        """Search for similar vectors for several queries at once, returning one result list per query."""
+        return [
+            self.search(query=query, vectors=vectors, limit=limit, filters=filters)
+            for query, vectors in zip(queries, vectors_list)
+        ]
+
+    def update_batch(self, vector_ids, vectors=None, payloads=None):
+        """Update several vectors and their payloads."""
+        vectors = vectors or [None] * len(vector_ids)
+        payloads = payloads or [None] * len(vector_ids)
+        for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+            self.update(vector_id=vector_id, vector=vector, payload=payload)
+
+    def delete_batch(self, vector_ids):
+        """Delete several vectors by ID."""
+        for vector_id in vector_ids:
+            self.delete(vector_id=vector_id)
+
+    def get_batch(self, vector_ids):
+        """Retrieve several vectors by ID, returning None for IDs that were not found."""
+        return [self.get(vector_id=vector_id) for vector_id in vector_ids]
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from pydantic import BaseModel
 
@@ -13,6 +13,9 @@ from mem0.vector_stores.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+# Used when the client does not report its max_batch_size
+DEFAULT_BATCH_SIZE = 1000
+
 
 class OutputData(BaseModel):
     id: Optional[str]  # memory id
@@ -28,6 +31,7 @@ class ChromaDB(VectorStoreBase):
         host: Optional[str] = None,
         port: Optional[int] = None,
         path: Optional[str] = None,
+        batch_size: Optional[int] = None,
     ):
         """
         Initialize the Chromadb vector store.
@@ -38,6 +42,7 @@ class ChromaDB(VectorStoreBase):
             host (str, optional): Host address for chromadb server. Defaults to None.
             port (int, optional): Port for chromadb server. Defaults to None.
             path (str, optional): Path for local chromadb database. Defaults to None.
+            batch_size (int, optional): Records per add/update/delete request. Defaults to the client's max_batch_size.
         """
         if client:
             self.client = client
@@ -59,6 +64,30 @@ class ChromaDB(VectorStoreBase):
 
         self.collection_name = collection_name
         self.collection = self.create_col(collection_name)
+        self._batch_size = batch_size
+
+    @property
+    def batch_size(self) -> int:
+        """Number of records per request, capped by the client's max_batch_size (resolved once)."""
+        if self._batch_size is None:
+            try:
+                max_batch_size = self.client.get_max_batch_size()
+            except AttributeError:
+                max_batch_size = getattr(self.client, "max_batch_size", None)
+            except Exception as e:
+                logger.warning(f"Could not get max batch size from Chroma client: {e}")
+                max_batch_size = None
+            self._batch_size = (
+                max_batch_size if isinstance(max_batch_size, int) and max_batch_size > 0 else DEFAULT_BATCH_SIZE
+            )
+        return self._batch_size
+
+    def _batches(self, *columns: Optional[List]) -> Iterator[tuple]:
+        """Split parallel columns (ids, embeddings, metadatas) into chunks of at most batch_size records."""
+        total = len(columns[0])
+        for start in range(0, total, self.batch_size):
+            end = start + self.batch_size
+            yield tuple(column[start:end] if column is not None else None for column in columns)
 
     def _parse_output(self, data: Dict) -> List[OutputData]:
         """
@@ -125,7 +154,8 @@ class ChromaDB(VectorStoreBase):
             ids (Optional[List[str]], optional): List of IDs corresponding to vectors. Defaults to None.
         """
         logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
-        self.collection.add(ids=ids, embeddings=vectors, metadatas=payloads)
+        for batch_ids, batch_vectors, batch_payloads in self._batches(ids, vectors, payloads):
+            self.collection.add(ids=batch_ids, embeddings=batch_vectors, metadatas=batch_payloads)
 
     def search(
         self, query: str, vectors: List[list], limit: int = 5, filters: Optional[Dict] = None
@@ -143,10 +173,37 @@ class ChromaDB(VectorStoreBase):
             List[OutputData]: Search results.
         """
         where_clause = self._generate_where_clause(filters) if filters else None
-        results = self.collection.query(query_embeddings=vectors, where=where_clause, n_results=limit)
+        results = self.collection.query(
+            query_embeddings=vectors, where=where_clause, n_results=limit, include=["metadatas", "distances"]
+        )
         final_results = self._parse_output(results)
         return final_results
 
+    def search_batch(
+        self, queries: List[str], vectors_list: List[list], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[List[OutputData]]:
+        """
+        Search for several query vectors with a single multi-embedding query.
+
+        Args:
+            queries (List[str]): Queries.
+            vectors_list (List[list]): Query vectors, one per query.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to every query. Defaults to None.
+
+        Returns:
+            List[List[OutputData]]: Search results, one list per query.
+        """
+        where_clause = self._generate_where_clause(filters) if filters else None
+        results = self.collection.query(
+            query_embeddings=vectors_list, where=where_clause, n_results=limit, include=["metadatas", "distances"]
+        )
+        per_query = []
+        for i in range(len(vectors_list)):
+            data = {key: [(results.get(key) or [])[i]] for key in ("ids", "distances", "metadatas") if results.get(key)}
+            per_query.append(self._parse_output(data) if data.get("ids") else [])
+        return per_query
+
     def delete(self, vector_id: str):
         """
         Delete a vector by ID.
@@ -156,6 +213,16 @@ class ChromaDB(VectorStoreBase):
         """
         self.collection.delete(ids=vector_id)
 
+    def delete_batch(self, vector_ids: List[str]):
+        """
+        Delete several vectors by ID, in chunks of at most batch_size.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        for (batch_ids,) in self._batches(vector_ids):
+            self.collection.delete(ids=batch_ids)
+
     def update(
         self,
         vector_id: str,
@@ -172,6 +239,23 @@ class ChromaDB(VectorStoreBase):
         """
         self.collection.update(ids=vector_id, embeddings=vector, metadatas=payload)
 
+    def update_batch(
+        self,
+        vector_ids: List[str],
+        vectors: Optional[List[list]] = None,
+        payloads: Optional[List[Dict]] = None,
+    ):
+        """
+        Update several vectors and payloads, in chunks of at most batch_size.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (Optional[List[list]], optional): Updated vectors. Defaults to None.
+            payloads (Optional[List[Dict]], optional): Updated payloads. Defaults to None.
+        """
+        for batch_ids, batch_vectors, batch_payloads in self._batches(vector_ids, vectors, payloads):
+            self.collection.update(ids=batch_ids, embeddings=batch_vectors, metadatas=batch_payloads)
+
     def get(self, vector_id: str) -> OutputData:
         """
         Retrieve a vector by ID.
@@ -182,7 +266,7 @@ class ChromaDB(VectorStoreBase):
         Returns:
             OutputData: Retrieved vector.
         """
-        result = self.collection.get(ids=[vector_id])
+        result = self.collection.get(ids=[vector_id], include=["metadatas"])
         return self._parse_output(result)[0]
 
     def list_cols(self) -> List[chromadb.Collection]:
@@ -221,9 +305,30 @@ class ChromaDB(VectorStoreBase):
             List[OutputData]: List of vectors.
         """
         where_clause = self._generate_where_clause(filters) if filters else None
-        results = self.collection.get(where=where_clause, limit=limit)
+        results = self.collection.get(where=where_clause, limit=limit, include=["metadatas"])
         return [self._parse_output(results)]
 
+    def iter_all(self, filters: Optional[Dict] = None, batch_size: int = 1000) -> Iterator[OutputData]:
+        """
+        Iterate over all vectors in a collection, fetching them in offset-paged batches.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply. Defaults to None.
+            batch_size (int, optional): Number of records fetched per request. Defaults to 1000.
+
+        Yields:
+            OutputData: Stored records, without their embeddings.
+        """
+        where_clause = self._generate_where_clause(filters) if filters else None
+        offset = 0
+        while True:
+            results = self.collection.get(where=where_clause, limit=batch_size, offset=offset, include=["metadatas"])
+            page = self._parse_output(results) if results.get("ids") else []
+            yield from page
+            if len(page) < batch_size:
+                break
+            offset += batch_size
+
     def reset(self):
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
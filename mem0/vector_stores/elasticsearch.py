@@ -3,7 +3,7 @@ from typing import Any, Dict, List, Optional
 
 try:
     from elasticsearch import Elasticsearch
-    from elasticsearch.helpers import bulk
+    from elasticsearch.helpers import bulk, parallel_bulk
 except ImportError:
     raise ImportError("Elasticsearch requires extra dependencies. Install with `pip install elasticsearch`") from None
 
@@ -43,6 +43,10 @@ class ElasticsearchDB(VectorStoreBase):
 
         self.collection_name = config.collection_name
         self.embedding_model_dims = config.embedding_model_dims
+        self.bulk_chunk_size = config.bulk_chunk_size
+        self.bulk_thread_count = config.bulk_thread_count
+        self.refresh = config.refresh
+        self.num_candidates_multiplier = config.num_candidates_multiplier
 
         # Create index only if auto_create_index is True
         if config.auto_create_index:
@@ -93,6 +97,43 @@ class ElasticsearchDB(VectorStoreBase):
             self.client.indices.create(index=name, body=index_settings)
             logger.info(f"Created index {name}")
 
+    def _bulk(self, actions: List[Dict]) -> None:
+        """Send bulk actions in chunks, using parallel_bulk when more than one thread is configured."""
+        kwargs = {"chunk_size": self.bulk_chunk_size}
+        if self.refresh is not None:
+            kwargs["refresh"] = self.refresh
+
+        if self.bulk_thread_count > 1:
+            # parallel_bulk is lazy, the generator has to be consumed for the requests to be sent
+            for _ in parallel_bulk(self.client, actions, thread_count=self.bulk_thread_count, **kwargs):
+                pass
+        else:
+            bulk(self.client, actions, **kwargs)
+
+    def _build_search_query(self, vectors: List[float], limit: int, filters: Optional[Dict] = None) -> Dict:
+        if self.custom_search_query:
+            return self.custom_search_query(vectors, limit, filters)
+
+        num_candidates = min(max(limit * self.num_candidates_multiplier, limit), 10000)
+        search_query = {
+            "knn": {"field": "vector", "query_vector": vectors, "k": limit, "num_candidates": num_candidates},
+            # Only the payload is needed, skip sending the stored vectors back
+            "_source": ["metadata"],
+        }
+        if filters:
+            # Filters inside the knn block are applied during the search, so scoped queries still return k hits
+            filter_conditions = []
+            for key, value in filters.items():
+                filter_conditions.append({"term": {f"metadata.{key}": value}})
+            search_query["knn"]["filter"] = {"bool": {"must": filter_conditions}}
+        return search_query
+
+    def _parse_hits(self, response: Dict) -> List[OutputData]:
+        return [
+            OutputData(id=hit["_id"], score=hit["_score"], payload=hit.get("_source", {}).get("metadata", {}))
+            for hit in response["hits"]["hits"]
+        ]
+
     def insert(
         self, vectors: List[List[float]], payloads: Optional[List[Dict]] = None, ids: Optional[List[str]] = None
     ) -> List[OutputData]:
@@ -115,7 +156,7 @@ class ElasticsearchDB(VectorStoreBase):
             }
             actions.append(action)
 
-        bulk(self.client, actions)
+        self._bulk(actions)
 
         results = []
         for i, id_ in enumerate(ids):
@@ -136,27 +177,21 @@ class ElasticsearchDB(VectorStoreBase):
         1. Use custom search query if provided
         2. Use KNN search on vectors with pre-filtering if no custom search query is provided
         """
-        if self.custom_search_query:
-            search_query = self.custom_search_query(vectors, limit, filters)
-        else:
-            search_query = {
-                "knn": {"field": "vector", "query_vector": vectors, "k": limit, "num_candidates": limit * 2}
-            }
-            if filters:
-                filter_conditions = []
-                for key, value in filters.items():
-                    filter_conditions.append({"term": {f"metadata.{key}": value}})
-                search_query["knn"]["filter"] = {"bool": {"must": filter_conditions}}
-
+        search_query = self._build_search_query(vectors, limit, filters)
         response = self.client.search(index=self.collection_name, body=search_query)
+        return self._parse_hits(response)
 
-        results = []
-        for hit in response["hits"]["hits"]:
-            results.append(
-                OutputData(id=hit["_id"], score=hit["_score"], payload=hit.get("_source", {}).get("metadata", {}))
-            )
+    def search_batch(
+        self, queries: List[str], vectors_list: List[List[float]], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[List[OutputData]]:
+        """Run several kNN searches in a single msearch request."""
+        body = []
+        for vectors in vectors_list:
+            body.append({"index": self.collection_name})
+            body.append(self._build_search_query(vectors, limit, filters))
 
-        return results
+        response = self.client.msearch(body=body)
+        return [self._parse_hits(item) for item in response["responses"]]
 
     def delete(self, vector_id: str) -> None:
         """Delete a vector by ID."""
@@ -172,6 +207,30 @@ class ElasticsearchDB(VectorStoreBase):
 
         self.client.update(index=self.collection_name, id=vector_id, body={"doc": doc})
 
+    def update_batch(
+        self,
+        vector_ids: List[str],
+        vectors: Optional[List[List[float]]] = None,
+        payloads: Optional[List[Dict]] = None,
+    ) -> None:
+        """Update several vectors and payloads through the bulk API."""
+        vectors = vectors or [None] * len(vector_ids)
+        payloads = payloads or [None] * len(vector_ids)
+        actions = []
+        for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+            doc = {}
+            if vector is not None:
+                doc["vector"] = vector
+            if payload is not None:
+                doc["metadata"] = payload
+            actions.append({"_op_type": "update", "_index": self.collection_name, "_id": vector_id, "doc": doc})
+        self._bulk(actions)
+
+    def delete_batch(self, vector_ids: List[str]) -> None:
+        """Delete several vectors through the bulk API."""
+        actions = [{"_op_type": "delete", "_index": self.collection_name, "_id": vector_id} for vector_id in vector_ids]
+        self._bulk(actions)
+
     def get(self, vector_id: str) -> Optional[OutputData]:
         """Retrieve a vector by ID."""
         try:
@@ -216,6 +275,8 @@ class ElasticsearchDB(VectorStoreBase):
         if limit:
             query["size"] = limit
 
+        query["_source"] = ["metadata"]
+
         response = self.client.search(index=self.collection_name, body=query)
 
         results = []
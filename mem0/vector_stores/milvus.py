@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -31,26 +31,57 @@ class MilvusDB(VectorStoreBase):
         embedding_model_dims: int,
         metric_type: MetricType,
         db_name: str,
+        partition_key_field: Optional[str] = "user_id",
+        index_type: str = "AUTOINDEX",
+        index_params: Optional[Dict[str, Any]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
     ) -> None:
         """Initialize the MilvusDB database.
 
         Args:
-            url (str): Full URL for Milvus/Zilliz server.
+            url (str): Full URL for Milvus/Zilliz server, or a local file path for Milvus Lite.
             token (str): Token/api_key for Zilliz server / for local setup defaults to None.
             collection_name (str): Name of the collection (defaults to mem0).
             embedding_model_dims (int): Dimensions of the embedding model (defaults to 1536).
             metric_type (MetricType): Metric type for similarity search (defaults to L2).
             db_name (str): Name of the database (defaults to "").
+            partition_key_field (str, optional): Scope field used as partition key for new collections.
+                Defaults to "user_id". Set to None to disable.
+            index_type (str, optional): Vector index type (defaults to AUTOINDEX).
+            index_params (Dict, optional): Index build parameters. Defaults to None.
+            search_params (Dict, optional): Search parameters. Defaults to None.
+            batch_size (int, optional): Number of rows sent per insert/upsert request. Defaults to 1000.
         """
         self.collection_name = collection_name
         self.embedding_model_dims = embedding_model_dims
         self.metric_type = metric_type
+        self.partition_key_field = partition_key_field
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.search_params = search_params or {}
+        self.batch_size = batch_size
         self.client = MilvusClient(uri=url, token=token, db_name=db_name)
         self.create_col(
             collection_name=self.collection_name,
             vector_size=self.embedding_model_dims,
             metric_type=self.metric_type,
         )
+        self._partition_key_enabled = self._has_field(self.partition_key_field)
+
+    def _has_field(self, field_name: Optional[str]) -> bool:
+        """Check whether the collection schema has a top-level field.
+
+        Collections created before partition keys were supported only keep scope ids in the metadata JSON.
+        """
+        if not field_name:
+            return False
+        try:
+            description = self.client.describe_collection(collection_name=self.collection_name)
+        except Exception as e:
+            logger.warning(f"Could not describe collection {self.collection_name}: {e}")
+            return False
+        return any(field.get("name") == field_name for field in description.get("fields", []))
 
     def create_col(
         self,
@@ -58,7 +89,7 @@ class MilvusDB(VectorStoreBase):
         vector_size: str,
         metric_type: MetricType = MetricType.COSINE,
     ) -> None:
-        """Create a new collection with index_type AUTOINDEX.
+        """Create a new collection with the configured index type (AUTOINDEX by default).
 
         Args:
             collection_name (str): Name of the collection (defaults to mem0).
@@ -74,14 +105,33 @@ class MilvusDB(VectorStoreBase):
                 FieldSchema(name="vectors", dtype=DataType.FLOAT_VECTOR, dim=vector_size),
                 FieldSchema(name="metadata", dtype=DataType.JSON),
             ]
+            if self.partition_key_field:
+                # Scoped searches on the partition key only touch the partitions holding that scope
+                fields.append(
+                    FieldSchema(
+                        name=self.partition_key_field, dtype=DataType.VARCHAR, max_length=512, is_partition_key=True
+                    )
+                )
 
             schema = CollectionSchema(fields, enable_dynamic_field=True)
 
-            index = self.client.prepare_index_params(
-                field_name="vectors", metric_type=metric_type, index_type="AUTOINDEX", index_name="vector_index"
+            index = self.client.prepare_index_params()
+            index.add_index(
+                field_name="vectors",
+                metric_type=metric_type,
+                index_type=self.index_type,
+                index_name="vector_index",
+                params=self.index_params,
             )
             self.client.create_collection(collection_name=collection_name, schema=schema, index_params=index)
 
+    def _build_row(self, vector_id, vector, payload) -> dict:
+        row = {"id": vector_id, "vectors": vector, "metadata": payload}
+        if self._partition_key_enabled:
+            # The partition key can not be null, memories without the scope share the "" partition
+            row[self.partition_key_field] = str((payload or {}).get(self.partition_key_field) or "")
+        return row
+
     def insert(self, ids, vectors, payloads, **kwargs: Optional[dict[str, any]]):
         """Insert vectors into a collection.
 
@@ -90,9 +140,9 @@ class MilvusDB(VectorStoreBase):
             payloads (List[Dict], optional): List of payloads corresponding to vectors.
             ids (List[str], optional): List of IDs corresponding to vectors.
         """
-        for idx, embedding, metadata in zip(ids, vectors, payloads):
-            data = {"id": idx, "vectors": embedding, "metadata": metadata}
-            self.client.insert(collection_name=self.collection_name, data=data, **kwargs)
+        rows = [self._build_row(idx, embedding, metadata) for idx, embedding, metadata in zip(ids, vectors, payloads)]
+        for i in range(0, len(rows), self.batch_size):
+            self.client.insert(collection_name=self.collection_name, data=rows[i : i + self.batch_size], **kwargs)
 
     def _create_filter(self, filters: dict):
         """Prepare filters for efficient query.
@@ -105,10 +155,12 @@ class MilvusDB(VectorStoreBase):
         """
         operands = []
         for key, value in filters.items():
+            # Filtering on the partition key field lets Milvus prune partitions
+            field = key if self._partition_key_enabled and key == self.partition_key_field else f'metadata["{key}"]'
             if isinstance(value, str):
-                operands.append(f'(metadata["{key}"] == "{value}")')
+                operands.append(f'({field} == "{value}")')
             else:
-                operands.append(f'(metadata["{key}"] == {value})')
+                operands.append(f"({field} == {value})")
 
         return " and ".join(operands)
 
@@ -149,16 +201,31 @@ class MilvusDB(VectorStoreBase):
         Returns:
             list: Search results.
         """
+        return self.search_batch([query], [vectors], limit=limit, filters=filters)[0]
+
+    def search_batch(self, queries: List[str], vectors_list: List[list], limit: int = 5, filters: dict = None) -> list:
+        """
+        Search for several query vectors with a single multi-vector search request.
+
+        Args:
+            queries (List[str]): Queries.
+            vectors_list (List[List[float]]): Query vectors.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (Dict, optional): Filters to apply to every query. Defaults to None.
+
+        Returns:
+            list: One list of results per query vector.
+        """
         query_filter = self._create_filter(filters) if filters else None
         hits = self.client.search(
             collection_name=self.collection_name,
-            data=[vectors],
+            data=vectors_list,
             limit=limit,
             filter=query_filter,
-            output_fields=["*"],
+            output_fields=["metadata"],
+            search_params={"params": self.search_params},
         )
-        result = self._parse_output(data=hits[0])
-        return result
+        return [self._parse_output(data=query_hits) for query_hits in hits]
 
     def delete(self, vector_id):
         """
@@ -178,9 +245,31 @@ class MilvusDB(VectorStoreBase):
             vector (List[float], optional): Updated vector.
             payload (Dict, optional): Updated payload.
         """
-        schema = {"id": vector_id, "vectors": vector, "metadata": payload}
+        schema = self._build_row(vector_id, vector, payload)
         self.client.upsert(collection_name=self.collection_name, data=schema)
 
+    def update_batch(self, vector_ids: List[str], vectors: List[list] = None, payloads: List[Dict] = None):
+        """
+        Upsert several vectors and payloads in batched requests.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to update.
+            vectors (List[List[float]]): Updated vectors.
+            payloads (List[Dict]): Updated payloads.
+        """
+        rows = [self._build_row(*row) for row in zip(vector_ids, vectors, payloads)]
+        for i in range(0, len(rows), self.batch_size):
+            self.client.upsert(collection_name=self.collection_name, data=rows[i : i + self.batch_size])
+
+    def delete_batch(self, vector_ids: List[str]):
+        """
+        Delete several vectors by ID in one request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        self.client.delete(collection_name=self.collection_name, ids=vector_ids)
+
     def get(self, vector_id):
         """
         Retrieve a vector by ID.
@@ -235,7 +324,9 @@ class MilvusDB(VectorStoreBase):
             List[OutputData]: List of vectors.
         """
         query_filter = self._create_filter(filters) if filters else None
-        result = self.client.query(collection_name=self.collection_name, filter=query_filter, limit=limit)
+        result = self.client.query(
+            collection_name=self.collection_name, filter=query_filter, limit=limit, output_fields=["id", "metadata"]
+        )
         memories = []
         for data in result:
             obj = OutputData(id=data.get("id"), score=None, payload=data.get("metadata"))
@@ -247,3 +338,4 @@ class MilvusDB(VectorStoreBase):
         logger.warning(f"Resetting index {self.collection_name}...")
         self.delete_col()
         self.create_col(self.collection_name, self.embedding_model_dims, self.metric_type)
+        self._partition_key_enabled = self._has_field(self.partition_key_field)
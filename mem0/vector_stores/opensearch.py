@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Optional
 
 try:
     from opensearchpy import OpenSearch, RequestsHttpConnection
+    from opensearchpy.helpers import bulk, parallel_bulk
 except ImportError:
     raise ImportError("OpenSearch requires extra dependencies. Install with `pip install opensearch-py`") from None
 
@@ -39,6 +40,11 @@ class OpenSearchDB(VectorStoreBase):
 
         self.collection_name = config.collection_name
         self.embedding_model_dims = config.embedding_model_dims
+        self.engine = config.engine
+        self.bulk_chunk_size = config.bulk_chunk_size
+        self.bulk_thread_count = config.bulk_thread_count
+        self.refresh = config.refresh
+        self.num_candidates_multiplier = config.num_candidates_multiplier
         self.create_col(self.collection_name, self.embedding_model_dims)
 
     def create_index(self) -> None:
@@ -53,7 +59,7 @@ class OpenSearchDB(VectorStoreBase):
                     "vector_field": {
                         "type": "knn_vector",
                         "dimension": self.embedding_model_dims,
-                        "method": {"engine": "nmslib", "name": "hnsw", "space_type": "cosinesimil"},
+                        "method": {"engine": self.engine, "name": "hnsw", "space_type": "cosinesimil"},
                     },
                     "metadata": {"type": "object", "properties": {"user_id": {"type": "keyword"}}},
                 }
@@ -75,7 +81,7 @@ class OpenSearchDB(VectorStoreBase):
                     "vector_field": {
                         "type": "knn_vector",
                         "dimension": vector_size,
-                        "method": {"engine": "nmslib", "name": "hnsw", "space_type": "cosinesimil"},
+                        "method": {"engine": self.engine, "name": "hnsw", "space_type": "cosinesimil"},
                     },
                     "payload": {"type": "object"},
                     "id": {"type": "keyword"},
@@ -103,6 +109,58 @@ class OpenSearchDB(VectorStoreBase):
                         raise TimeoutError(f"Index {name} creation timed out after {max_retries} seconds")
                     time.sleep(0.5)
 
+    def _bulk(self, actions: List[Dict]) -> None:
+        """Send bulk actions in chunks, using parallel_bulk when more than one thread is configured."""
+        kwargs = {"chunk_size": self.bulk_chunk_size}
+        if self.refresh is not None:
+            kwargs["refresh"] = self.refresh
+
+        if self.bulk_thread_count > 1:
+            # parallel_bulk is lazy, the generator has to be consumed for the requests to be sent
+            for _ in parallel_bulk(self.client, actions, thread_count=self.bulk_thread_count, **kwargs):
+                pass
+        else:
+            bulk(self.client, actions, **kwargs)
+
+    def _build_filter_clauses(self, filters: Optional[Dict]) -> List[Dict]:
+        filter_clauses = []
+        if filters:
+            for key in ["user_id", "run_id", "agent_id"]:
+                value = filters.get(key)
+                if value:
+                    filter_clauses.append({"term": {f"payload.{key}.keyword": value}})
+        return filter_clauses
+
+    def _build_search_query(self, vectors: List[float], limit: int, filters: Optional[Dict] = None) -> Dict:
+        knn_field = {"vector": vectors, "k": limit * self.num_candidates_multiplier}
+        knn_query = {"knn": {"vector_field": knn_field}}
+
+        # Only the id and payload are needed, skip sending the stored vectors back
+        query_body = {"size": limit, "_source": ["id", "payload"], "query": knn_query}
+
+        filter_clauses = self._build_filter_clauses(filters)
+        if filter_clauses:
+            if self.engine in ("lucene", "faiss"):
+                # Efficient filtering: the filter is applied during the kNN search so scoped queries return a full top-k
+                knn_field["filter"] = {"bool": {"filter": filter_clauses}}
+            else:
+                # nmslib does not support filtering inside the kNN query, fall back to post-filtering
+                query_body["query"] = {"bool": {"must": knn_query, "filter": filter_clauses}}
+
+        return query_body
+
+    def _parse_hits(self, response: Dict) -> List[OutputData]:
+        return [
+            OutputData(id=hit["_source"].get("id"), score=hit["_score"], payload=hit["_source"].get("payload", {}))
+            for hit in response["hits"]["hits"]
+        ]
+
+    def _resolve_doc_ids(self, vector_ids: List[str]) -> Dict[str, str]:
+        """Map custom 'id' fields to OpenSearch document IDs with a single terms query."""
+        search_query = {"size": len(vector_ids), "_source": ["id"], "query": {"terms": {"id": vector_ids}}}
+        response = self.client.search(index=self.collection_name, body=search_query)
+        return {hit["_source"].get("id"): hit["_id"] for hit in response.get("hits", {}).get("hits", [])}
+
     def insert(
         self, vectors: List[List[float]], payloads: Optional[List[Dict]] = None, ids: Optional[List[str]] = None
     ) -> List[OutputData]:
@@ -113,13 +171,15 @@ class OpenSearchDB(VectorStoreBase):
         if payloads is None:
             payloads = [{} for _ in range(len(vectors))]
 
-        for i, (vec, id_) in enumerate(zip(vectors, ids)):
-            body = {
-                "vector_field": vec,
-                "payload": payloads[i],
-                "id": id_,
+        actions = [
+            {
+                "_index": self.collection_name,
+                "_id": id_,
+                "_source": {"vector_field": vec, "payload": payloads[i], "id": id_},
             }
-            self.client.index(index=self.collection_name, body=body)
+            for i, (vec, id_) in enumerate(zip(vectors, ids))
+        ]
+        self._bulk(actions)
 
         results = []
 
@@ -129,43 +189,21 @@ class OpenSearchDB(VectorStoreBase):
         self, query: str, vectors: List[float], limit: int = 5, filters: Optional[Dict] = None
     ) -> List[OutputData]:
         """Search for similar vectors using OpenSearch k-NN search with optional filters."""
-
-        # Base KNN query
-        knn_query = {
-            "knn": {
-                "vector_field": {
-                    "vector": vectors,
-                    "k": limit * 2,
-                }
-            }
-        }
-
-        # Start building the full query
-        query_body = {"size": limit * 2, "query": None}
-
-        # Prepare filter conditions if applicable
-        filter_clauses = []
-        if filters:
-            for key in ["user_id", "run_id", "agent_id"]:
-                value = filters.get(key)
-                if value:
-                    filter_clauses.append({"term": {f"payload.{key}.keyword": value}})
-
-        # Combine knn with filters if needed
-        if filter_clauses:
-            query_body["query"] = {"bool": {"must": knn_query, "filter": filter_clauses}}
-        else:
-            query_body["query"] = knn_query
-
-        # Execute search
+        query_body = self._build_search_query(vectors, limit, filters)
         response = self.client.search(index=self.collection_name, body=query_body)
+        return self._parse_hits(response)
 
-        hits = response["hits"]["hits"]
-        results = [
-            OutputData(id=hit["_source"].get("id"), score=hit["_score"], payload=hit["_source"].get("payload", {}))
-            for hit in hits
-        ]
-        return results
+    def search_batch(
+        self, queries: List[str], vectors_list: List[List[float]], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[List[OutputData]]:
+        """Run several k-NN searches in a single msearch request."""
+        body = []
+        for vectors in vectors_list:
+            body.append({"index": self.collection_name})
+            body.append(self._build_search_query(vectors, limit, filters))
+
+        response = self.client.msearch(body=body)
+        return [self._parse_hits(item) for item in response["responses"]]
 
     def delete(self, vector_id: str) -> None:
         """Delete a vector by custom ID."""
@@ -210,6 +248,42 @@ class OpenSearchDB(VectorStoreBase):
             except Exception:
                 pass
 
+    def update_batch(
+        self,
+        vector_ids: List[str],
+        vectors: Optional[List[List[float]]] = None,
+        payloads: Optional[List[Dict]] = None,
+    ) -> None:
+        """Update several vectors and payloads through the bulk API."""
+        doc_ids = self._resolve_doc_ids(vector_ids)
+        vectors = vectors or [None] * len(vector_ids)
+        payloads = payloads or [None] * len(vector_ids)
+
+        actions = []
+        for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+            if vector_id not in doc_ids:
+                continue
+            doc = {}
+            if vector is not None:
+                doc["vector_field"] = vector
+            if payload is not None:
+                doc["payload"] = payload
+            if doc:
+                actions.append(
+                    {"_op_type": "update", "_index": self.collection_name, "_id": doc_ids[vector_id], "doc": doc}
+                )
+        if actions:
+            self._bulk(actions)
+
+    def delete_batch(self, vector_ids: List[str]) -> None:
+        """Delete several vectors through the bulk API."""
+        doc_ids = self._resolve_doc_ids(vector_ids)
+        actions = [
+            {"_op_type": "delete", "_index": self.collection_name, "_id": doc_id} for doc_id in doc_ids.values()
+        ]
+        if actions:
+            self._bulk(actions)
+
     def get(self, vector_id: str) -> Optional[OutputData]:
         """Retrieve a vector by ID."""
         try:
@@ -247,15 +321,9 @@ class OpenSearchDB(VectorStoreBase):
     def list(self, filters: Optional[Dict] = None, limit: Optional[int] = None) -> List[OutputData]:
         try:
             """List all memories with optional filters."""
-            query: Dict = {"query": {"match_all": {}}}
-
-            filter_clauses = []
-            if filters:
-                for key in ["user_id", "run_id", "agent_id"]:
-                    value = filters.get(key)
-                    if value:
-                        filter_clauses.append({"term": {f"payload.{key}.keyword": value}})
+            query: Dict = {"query": {"match_all": {}}, "_source": ["id", "payload"]}
 
+            filter_clauses = self._build_filter_clauses(filters)
             if filter_clauses:
                 query["query"] = {"bool": {"filter": filter_clauses}}
 
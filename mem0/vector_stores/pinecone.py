@@ -1,5 +1,6 @@
 import logging
 import os
+from collections import OrderedDict, defaultdict
 from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel
@@ -23,6 +24,9 @@ class OutputData(BaseModel):
 
 
 class PineconeDB(VectorStoreBase):
+    # Record IDs whose namespace is remembered when namespace_field is set, least recently used evicted first
+    NAMESPACE_CACHE_SIZE = 10_000
+
     def __init__(
         self,
         collection_name: str,
@@ -37,6 +41,8 @@ class PineconeDB(VectorStoreBase):
         batch_size: int,
         extra_params: Optional[Dict[str, Any]],
         namespace: Optional[str] = None,
+        namespace_field: Optional[str] = None,
+        pool_threads: int = 1,
     ):
         """
         Initialize the Pinecone vector store.
@@ -54,6 +60,11 @@ class PineconeDB(VectorStoreBase):
             batch_size (int, optional): Batch size for operations. Defaults to 100.
             extra_params (Dict, optional): Additional parameters for Pinecone client. Defaults to None.
             namespace (str, optional): Namespace for the collection. Defaults to None.
+            namespace_field (str, optional): Payload/filter key (e.g. "user_id") whose value is used as the
+                namespace of each record, giving every tenant its own namespace. IDs are routed to the namespace
+                remembered for the last NAMESPACE_CACHE_SIZE records written or read, other IDs are looked up in
+                every namespace of the index. Defaults to None.
+            pool_threads (int, optional): Threads used to send upsert chunks concurrently. Defaults to 1.
         """
         if client:
             self.client = client
@@ -76,6 +87,11 @@ class PineconeDB(VectorStoreBase):
         self.metric = metric
         self.batch_size = batch_size
         self.namespace = namespace
+        self.namespace_field = namespace_field
+        self.pool_threads = pool_threads
+        # Namespace of the records recently seen by this instance, used to route id-based calls when namespace_field
+        # is set and the caller does not pass the namespace
+        self._id_namespaces: "OrderedDict[str, Optional[str]]" = OrderedDict()
 
         self.sparse_encoder = None
         if self.hybrid_search:
@@ -102,7 +118,7 @@ class PineconeDB(VectorStoreBase):
 
         if self.collection_name in existing_indexes:
             logger.debug(f"Index {self.collection_name} already exists. Skipping creation.")
-            self.index = self.client.Index(self.collection_name)
+            self.index = self._open_index()
             return
 
         if self.serverless_config:
@@ -119,7 +135,12 @@ class PineconeDB(VectorStoreBase):
             spec=spec,
         )
 
-        self.index = self.client.Index(self.collection_name)
+        self.index = self._open_index()
+
+    def _open_index(self):
+        if self.pool_threads > 1:
+            return self.client.Index(self.collection_name, pool_threads=self.pool_threads)
+        return self.client.Index(self.collection_name)
 
     def insert(
         self,
@@ -136,26 +157,133 @@ class PineconeDB(VectorStoreBase):
             ids (list, optional): List of IDs corresponding to vectors. Defaults to None.
         """
         logger.info(f"Inserting {len(vectors)} vectors into index {self.collection_name}")
-        items = []
+        records_by_namespace = defaultdict(list)
 
         for idx, vector in enumerate(vectors):
             item_id = str(ids[idx]) if ids is not None else str(idx)
             payload = payloads[idx] if payloads else {}
+            namespace = self._namespace_for(payload)
+            records_by_namespace[namespace].append(self._build_record(item_id, vector, payload))
+            self._remember_namespace(item_id, namespace)
 
-            vector_record = {"id": item_id, "values": vector, "metadata": payload}
+        self._upsert(records_by_namespace)
 
+    def _build_record(self, vector_id: str, vector: Optional[List[float]], payload: Optional[Dict]) -> Dict:
+        record = {"id": vector_id}
+        if vector is not None:
+            record["values"] = vector
+        if payload is not None:
+            record["metadata"] = payload
             if self.hybrid_search and self.sparse_encoder and "text" in payload:
-                sparse_vector = self.sparse_encoder.encode_documents(payload["text"])
-                vector_record["sparse_values"] = sparse_vector
+                record["sparse_values"] = self.sparse_encoder.encode_documents(payload["text"])
+        return record
+
+    def _upsert(self, records_by_namespace: Dict[Optional[str], List[Dict]]):
+        """
+        Upsert records in chunks of batch_size, one namespace at a time.
 
-            items.append(vector_record)
+        With more than one pool thread the chunks are sent with async_req and awaited together.
+        """
+        pending = []
+        for namespace, records in records_by_namespace.items():
+            for start in range(0, len(records), self.batch_size):
+                chunk = records[start : start + self.batch_size]
+                if self.pool_threads > 1:
+                    pending.append(self.index.upsert(vectors=chunk, namespace=namespace, async_req=True))
+                else:
+                    self.index.upsert(vectors=chunk, namespace=namespace)
+
+        for result in pending:
+            result.get()
+
+    def _namespace_for(self, values: Optional[Dict]) -> Optional[str]:
+        """Return the namespace for a payload or filter dict, falling back to the configured namespace."""
+        if self.namespace_field and values and values.get(self.namespace_field):
+            return str(values[self.namespace_field])
+        return self.namespace
+
+    def _remember_namespace(self, vector_id: str, namespace: Optional[str]):
+        if self.namespace_field:
+            self._id_namespaces[vector_id] = namespace
+            self._id_namespaces.move_to_end(vector_id)
+            while len(self._id_namespaces) > self.NAMESPACE_CACHE_SIZE:
+                self._id_namespaces.popitem(last=False)
+
+    def _route(
+        self, vector_ids: List[str], namespace: Optional[str] = None, payloads: Optional[List[Optional[Dict]]] = None
+    ):
+        """
+        Group IDs by the namespace they are known to live in.
 
-            if len(items) >= self.batch_size:
-                self.index.upsert(vectors=items, namespace=self.namespace)
-                items = []
+        Without namespace_field every ID lives in the configured namespace. With it, the namespace of an ID is the
+        explicit namespace, else the namespace_field value of its payload, else the one remembered when this instance
+        last wrote or read it.
 
-        if items:
-            self.index.upsert(vectors=items, namespace=self.namespace)
+        Returns:
+            tuple: The IDs grouped by namespace and the IDs whose namespace is unknown.
+        """
+        if namespace is not None or not self.namespace_field:
+            return {namespace if namespace is not None else self.namespace: list(vector_ids)}, []
+
+        payloads = payloads or [None] * len(vector_ids)
+        grouped = defaultdict(list)
+        unknown = []
+        for vector_id, payload in zip(vector_ids, payloads):
+            if payload and payload.get(self.namespace_field):
+                grouped[self._namespace_for(payload)].append(vector_id)
+            elif vector_id in self._id_namespaces:
+                self._id_namespaces.move_to_end(vector_id)
+                grouped[self._id_namespaces[vector_id]].append(vector_id)
+            else:
+                unknown.append(vector_id)
+        return grouped, unknown
+
+    def _group_by_namespace(
+        self, vector_ids: List[str], namespace: Optional[str] = None, payloads: Optional[List[Optional[Dict]]] = None
+    ) -> Dict[Optional[str], List[str]]:
+        """
+        Group IDs by the namespace they live in, looking up the IDs of unknown namespace in every namespace of the
+        index. IDs found in no namespace are left out.
+        """
+        grouped, unknown = self._route(vector_ids, namespace, payloads)
+        for vector_id, (ids_namespace, _) in self._fetch_from_all_namespaces(unknown).items():
+            grouped[ids_namespace].append(vector_id)
+        return grouped
+
+    def _fetch_ids(self, vector_ids: List[str], namespace: Optional[str], found: Dict[str, Any]):
+        for start in range(0, len(vector_ids), self.batch_size):
+            response = self.index.fetch(ids=vector_ids[start : start + self.batch_size], namespace=namespace)
+            for vector_id, vector in response.vectors.items():
+                found[vector_id] = (namespace, vector)
+                self._remember_namespace(vector_id, namespace)
+
+    def _fetch_from_all_namespaces(self, vector_ids: List[str]) -> Dict[str, Any]:
+        """
+        Fetch IDs this instance has no namespace for, e.g. after a restart or from another worker, from every
+        namespace of the index until all of them are found.
+        """
+        found = {}
+        if not vector_ids:
+            return found
+        for namespace in (self.index.describe_index_stats().namespaces or {}).keys():
+            missing = [vector_id for vector_id in vector_ids if vector_id not in found]
+            if not missing:
+                break
+            self._fetch_ids(missing, namespace, found)
+        return found
+
+    def _fetch(self, vector_ids: List[str], namespace: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch records by ID in chunks of batch_size.
+
+        Returns a mapping of ID to (namespace, vector).
+        """
+        found = {}
+        grouped, unknown = self._route(vector_ids, namespace)
+        for ids_namespace, ids in grouped.items():
+            self._fetch_ids(ids, ids_namespace, found)
+        found.update(self._fetch_from_all_namespaces(unknown))
+        return found
 
     def _parse_output(self, data: Dict) -> List[OutputData]:
         """
@@ -203,21 +331,7 @@ class PineconeDB(VectorStoreBase):
 
         return pinecone_filter
 
-    def search(
-        self, query: str, vectors: List[float], limit: int = 5, filters: Optional[Dict] = None
-    ) -> List[OutputData]:
-        """
-        Search for similar vectors.
-
-        Args:
-            query (str): Query.
-            vectors (list): List of vectors to search.
-            limit (int, optional): Number of results to return. Defaults to 5.
-            filters (dict, optional): Filters to apply to the search. Defaults to None.
-
-        Returns:
-            list: Search results.
-        """
+    def _build_query(self, vectors: List[float], limit: int, filters: Optional[Dict]) -> Dict:
         filter_dict = self._create_filter(filters) if filters else None
 
         query_params = {
@@ -230,27 +344,92 @@ class PineconeDB(VectorStoreBase):
         if filter_dict:
             query_params["filter"] = filter_dict
 
-        if self.hybrid_search and self.sparse_encoder and "text" in filters:
+        if self.hybrid_search and self.sparse_encoder and filters and "text" in filters:
             query_text = filters.get("text")
             if query_text:
                 sparse_vector = self.sparse_encoder.encode_queries(query_text)
                 query_params["sparse_vector"] = sparse_vector
 
-        response = self.index.query(**query_params, namespace=self.namespace)
+        return query_params
+
+    def search(
+        self, query: str, vectors: List[float], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[OutputData]:
+        """
+        Search for similar vectors.
+
+        Args:
+            query (str): Query.
+            vectors (list): List of vectors to search.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (dict, optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            list: Search results.
+        """
+        query_params = self._build_query(vectors, limit, filters)
+        response = self.index.query(**query_params, namespace=self._namespace_for(filters))
 
         results = self._parse_output(response.matches)
         return results
 
-    def delete(self, vector_id: Union[str, int]):
+    def search_batch(
+        self, queries: List[str], vectors_list: List[List[float]], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[List[OutputData]]:
+        """
+        Search for several query vectors, sending the queries concurrently when pool threads are configured.
+
+        Args:
+            queries (list): Queries.
+            vectors_list (list): One query vector per query.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (dict, optional): Filters to apply to every search. Defaults to None.
+
+        Returns:
+            list: One list of search results per query.
+        """
+        if self.pool_threads <= 1:
+            return super().search_batch(queries, vectors_list, limit=limit, filters=filters)
+
+        namespace = self._namespace_for(filters)
+        pending = [
+            self.index.query(**self._build_query(vectors, limit, filters), namespace=namespace, async_req=True)
+            for vectors in vectors_list
+        ]
+        return [self._parse_output(result.get().matches) for result in pending]
+
+    def delete(self, vector_id: Union[str, int], namespace: Optional[str] = None):
         """
         Delete a vector by ID.
 
         Args:
             vector_id (Union[str, int]): ID of the vector to delete.
+            namespace (str, optional): Namespace of the vector. Defaults to the namespace it is routed to.
+        """
+        self.delete_batch([vector_id], namespace=namespace)
+
+    def delete_batch(self, vector_ids: List[Union[str, int]], namespace: Optional[str] = None):
         """
-        self.index.delete(ids=[str(vector_id)], namespace=self.namespace)
+        Delete several vectors, one delete request per namespace and chunk of batch_size IDs.
 
-    def update(self, vector_id: Union[str, int], vector: Optional[List[float]] = None, payload: Optional[Dict] = None):
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+            namespace (str, optional): Namespace of the vectors. Defaults to the namespace each is routed to.
+        """
+        grouped = self._group_by_namespace([str(vector_id) for vector_id in vector_ids], namespace)
+        for ids_namespace, ids in grouped.items():
+            for start in range(0, len(ids), self.batch_size):
+                self.index.delete(ids=ids[start : start + self.batch_size], namespace=ids_namespace)
+            for vector_id in ids:
+                self._id_namespaces.pop(vector_id, None)
+
+    def update(
+        self,
+        vector_id: Union[str, int],
+        vector: Optional[List[float]] = None,
+        payload: Optional[Dict] = None,
+        namespace: Optional[str] = None,
+    ):
         """
         Update a vector and its payload.
 
@@ -258,42 +437,85 @@ class PineconeDB(VectorStoreBase):
             vector_id (Union[str, int]): ID of the vector to update.
             vector (list, optional): Updated vector. Defaults to None.
             payload (dict, optional): Updated payload. Defaults to None.
+            namespace (str, optional): Namespace of the vector. Defaults to the namespace it is routed to.
         """
-        item = {
-            "id": str(vector_id),
-        }
-
-        if vector is not None:
-            item["values"] = vector
+        self.update_batch([vector_id], [vector], [payload], namespace=namespace)
 
-        if payload is not None:
-            item["metadata"] = payload
-
-            if self.hybrid_search and self.sparse_encoder and "text" in payload:
-                sparse_vector = self.sparse_encoder.encode_documents(payload["text"])
-                item["sparse_values"] = sparse_vector
-
-        self.index.upsert(vectors=[item], namespace=self.namespace)
+    def update_batch(
+        self,
+        vector_ids: List[Union[str, int]],
+        vectors: Optional[List[List[float]]] = None,
+        payloads: Optional[List[Dict]] = None,
+        namespace: Optional[str] = None,
+    ):
+        """
+        Update several vectors and payloads with chunked upserts.
 
-    def get(self, vector_id: Union[str, int]) -> OutputData:
+        Args:
+            vector_ids (list): IDs of the vectors to update.
+            vectors (list, optional): Updated vectors. Defaults to None.
+            payloads (list, optional): Updated payloads. Defaults to None.
+            namespace (str, optional): Namespace of the vectors. Defaults to the namespace each is routed to.
+        """
+        vector_ids = [str(vector_id) for vector_id in vector_ids]
+        vectors = vectors or [None] * len(vector_ids)
+        payloads = payloads or [None] * len(vector_ids)
+
+        namespaces = {}
+        for ids_namespace, ids in self._group_by_namespace(vector_ids, namespace, payloads).items():
+            for vector_id in ids:
+                namespaces[vector_id] = ids_namespace
+
+        records_by_namespace = defaultdict(list)
+        for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+            # IDs found in no namespace are written where a new record would go
+            ids_namespace = namespaces.get(vector_id, self._namespace_for(payload))
+            self._remember_namespace(vector_id, ids_namespace)
+            if vector is None:
+                # An upsert needs the values, metadata-only changes go through update instead
+                if payload is not None:
+                    self.index.update(id=vector_id, set_metadata=payload, namespace=ids_namespace)
+                continue
+            records_by_namespace[ids_namespace].append(self._build_record(vector_id, vector, payload))
+
+        self._upsert(records_by_namespace)
+
+    def get(self, vector_id: Union[str, int], namespace: Optional[str] = None) -> OutputData:
         """
         Retrieve a vector by ID.
 
         Args:
             vector_id (Union[str, int]): ID of the vector to retrieve.
+            namespace (str, optional): Namespace of the vector. Defaults to the namespace it is routed to.
 
         Returns:
             dict: Retrieved vector or None if not found.
         """
         try:
-            response = self.index.fetch(ids=[str(vector_id)], namespace=self.namespace)
-            if str(vector_id) in response.vectors:
-                return self._parse_output(response.vectors[str(vector_id)])
-            return None
+            return self.get_batch([vector_id], namespace=namespace)[0]
         except Exception as e:
             logger.error(f"Error retrieving vector {vector_id}: {e}")
             return None
 
+    def get_batch(
+        self, vector_ids: List[Union[str, int]], namespace: Optional[str] = None
+    ) -> List[Optional[OutputData]]:
+        """
+        Retrieve several vectors with chunked fetch requests.
+
+        Args:
+            vector_ids (list): IDs of the vectors to retrieve.
+            namespace (str, optional): Namespace of the vectors. Defaults to the namespace each is routed to.
+
+        Returns:
+            list: Retrieved vectors in the order of vector_ids, None for IDs that were not found.
+        """
+        vector_ids = [str(vector_id) for vector_id in vector_ids]
+        found = self._fetch(vector_ids, namespace)
+        return [
+            self._parse_output(found[vector_id][1]) if vector_id in found else None for vector_id in vector_ids
+        ]
+
     def list_cols(self):
         """
         List all indexes/collections.
@@ -333,23 +555,21 @@ class PineconeDB(VectorStoreBase):
         """
         filter_dict = self._create_filter(filters) if filters else None
 
-        stats = self.index.describe_index_stats()
-        dimension = stats.dimension
-
-        zero_vector = [0.0] * dimension
+        # The index dimension is known from the config, no need for a describe_index_stats round trip
+        zero_vector = [0.0] * self.embedding_model_dims
 
         query_params = {
             "vector": zero_vector,
             "top_k": limit,
             "include_metadata": True,
-            "include_values": True,
+            "include_values": False,
         }
 
         if filter_dict:
             query_params["filter"] = filter_dict
 
         try:
-            response = self.index.query(**query_params, namespace=self.namespace)
+            response = self.index.query(**query_params, namespace=self._namespace_for(filters))
             response = response.to_dict()
             results = self._parse_output(response["matches"])
             return [results]
@@ -1,5 +1,6 @@
 import json
 import logging
+from copy import deepcopy
 from datetime import datetime
 from functools import reduce
 
@@ -51,6 +52,12 @@ class RedisDB(VectorStoreBase):
         redis_url: str,
         collection_name: str,
         embedding_model_dims: int,
+        index_algorithm: str = "flat",
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 200,
+        hnsw_ef_runtime: int = 10,
+        vector_datatype: str = "float32",
+        batch_size: int = 500,
     ):
         """
         Initialize the Redis vector store.
@@ -59,15 +66,28 @@ class RedisDB(VectorStoreBase):
             redis_url (str): Redis URL.
             collection_name (str): Collection name.
             embedding_model_dims (int): Embedding model dimensions.
+            index_algorithm (str, optional): Vector index algorithm, "flat" or "hnsw". Defaults to "flat".
+            hnsw_m (int, optional): HNSW max outgoing edges per node. Defaults to 16.
+            hnsw_ef_construction (int, optional): HNSW candidate list size at build time. Defaults to 200.
+            hnsw_ef_runtime (int, optional): HNSW candidate list size at query time. Defaults to 10.
+            vector_datatype (str, optional): Vector storage datatype, "float32" or "float16". Defaults to "float32".
+            batch_size (int, optional): Number of commands sent per pipeline for batch operations. Defaults to 500.
         """
         self.embedding_model_dims = embedding_model_dims
+        self.index_algorithm = index_algorithm
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_runtime = hnsw_ef_runtime
+        self.vector_datatype = vector_datatype
+        self.vector_dtype = np.float16 if vector_datatype == "float16" else np.float32
+        self.batch_size = batch_size
+
         index_schema = {
             "name": collection_name,
             "prefix": f"mem0:{collection_name}",
         }
 
-        fields = DEFAULT_FIELDS.copy()
-        fields[-1]["attrs"]["dims"] = embedding_model_dims
+        fields = self._build_fields(embedding_model_dims)
 
         self.schema = {"index": index_schema, "fields": fields}
 
@@ -76,6 +96,76 @@ class RedisDB(VectorStoreBase):
         self.index.set_client(self.client)
         self.index.create(overwrite=True)
 
+    def _build_fields(self, dims: int, distance: str = "cosine") -> list:
+        """Build the index fields with the configured vector index algorithm and datatype."""
+        fields = deepcopy(DEFAULT_FIELDS)
+        attrs = fields[-1]["attrs"]
+        attrs["dims"] = dims
+        attrs["distance_metric"] = distance
+        attrs["algorithm"] = self.index_algorithm
+        attrs["datatype"] = self.vector_datatype
+        if self.index_algorithm == "hnsw":
+            attrs["m"] = self.hnsw_m
+            attrs["ef_construction"] = self.hnsw_ef_construction
+            attrs["ef_runtime"] = self.hnsw_ef_runtime
+        return fields
+
+    def _build_entry(self, vector_id, vector: bytes, payload: dict) -> dict:
+        entry = {
+            "memory_id": vector_id,
+            "hash": payload["hash"],
+            "memory": payload["data"],
+            "created_at": int(datetime.fromisoformat(payload["created_at"]).timestamp()),
+            "embedding": vector,
+        }
+        if payload.get("updated_at"):
+            entry["updated_at"] = int(datetime.fromisoformat(payload["updated_at"]).timestamp())
+
+        for field in ["agent_id", "run_id", "user_id"]:
+            if field in payload:
+                entry[field] = payload[field]
+
+        entry["metadata"] = json.dumps({k: v for k, v in payload.items() if k not in excluded_keys})
+        return entry
+
+    def _build_filter(self, filters: dict):
+        conditions = [Tag(key) == value for key, value in filters.items() if value is not None]
+        return reduce(lambda x, y: x & y, conditions)
+
+    def _build_vector_query(self, vectors: list, limit: int, filters: dict) -> VectorQuery:
+        return VectorQuery(
+            vector=np.asarray(vectors, dtype=self.vector_dtype).tobytes(),
+            vector_field_name="embedding",
+            return_fields=["memory_id", "hash", "agent_id", "run_id", "user_id", "memory", "metadata", "created_at"],
+            filter_expression=self._build_filter(filters),
+            num_results=limit,
+            dtype=self.vector_datatype,
+        )
+
+    def _to_memory_result(self, result: dict) -> MemoryResult:
+        return MemoryResult(
+            id=result["memory_id"],
+            score=result["vector_distance"],
+            payload={
+                "hash": result["hash"],
+                "data": result["memory"],
+                "created_at": datetime.fromtimestamp(
+                    int(result["created_at"]), tz=pytz.timezone("US/Pacific")
+                ).isoformat(timespec="microseconds"),
+                **(
+                    {
+                        "updated_at": datetime.fromtimestamp(
+                            int(result["updated_at"]), tz=pytz.timezone("US/Pacific")
+                        ).isoformat(timespec="microseconds")
+                    }
+                    if "updated_at" in result
+                    else {}
+                ),
+                **{field: result[field] for field in ["agent_id", "run_id", "user_id"] if field in result},
+                **{k: v for k, v in json.loads(extract_json(result["metadata"])).items()},
+            },
+        )
+
     def create_col(self, name=None, vector_size=None, distance=None):
         """
         Create a new collection (index) in Redis.
@@ -100,9 +190,7 @@ class RedisDB(VectorStoreBase):
         }
 
         # Copy the default fields and update the vector field with the specified dimensions
-        fields = DEFAULT_FIELDS.copy()
-        fields[-1]["attrs"]["dims"] = embedding_dims
-        fields[-1]["attrs"]["distance_metric"] = distance_metric
+        fields = self._build_fields(embedding_dims, distance_metric)
 
         # Create the schema
         schema = {"index": index_schema, "fields": fields}
@@ -120,88 +208,58 @@ class RedisDB(VectorStoreBase):
         return index
 
     def insert(self, vectors: list, payloads: list = None, ids: list = None):
-        data = []
-        for vector, payload, id in zip(vectors, payloads, ids):
-            # Start with required fields
-            entry = {
-                "memory_id": id,
-                "hash": payload["hash"],
-                "memory": payload["data"],
-                "created_at": int(datetime.fromisoformat(payload["created_at"]).timestamp()),
-                "embedding": np.array(vector, dtype=np.float32).tobytes(),
-            }
-
-            # Conditionally add optional fields
-            for field in ["agent_id", "run_id", "user_id"]:
-                if field in payload:
-                    entry[field] = payload[field]
-
-            # Add metadata excluding specific keys
-            entry["metadata"] = json.dumps({k: v for k, v in payload.items() if k not in excluded_keys})
-
-            data.append(entry)
-        self.index.load(data, id_field="memory_id")
+        # Convert all vectors in one go instead of allocating an array per row
+        embeddings = np.asarray(vectors, dtype=self.vector_dtype)
+        data = [
+            self._build_entry(id, embedding.tobytes(), payload)
+            for embedding, payload, id in zip(embeddings, payloads, ids)
+        ]
+        self.index.load(data, id_field="memory_id", batch_size=self.batch_size)
 
     def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None):
-        conditions = [Tag(key) == value for key, value in filters.items() if value is not None]
-        filter = reduce(lambda x, y: x & y, conditions)
+        results = self.index.query(self._build_vector_query(vectors, limit, filters))
+        return [self._to_memory_result(result) for result in results]
 
-        v = VectorQuery(
-            vector=np.array(vectors, dtype=np.float32).tobytes(),
-            vector_field_name="embedding",
-            return_fields=["memory_id", "hash", "agent_id", "run_id", "user_id", "memory", "metadata", "created_at"],
-            filter_expression=filter,
-            num_results=limit,
-        )
+    def search_batch(self, queries: list, vectors_list: list, limit: int = 5, filters: dict = None):
+        """
+        Search for several query vectors in a single pipelined round trip.
 
-        results = self.index.query(v)
+        Args:
+            queries (list): Query strings, one per vector.
+            vectors_list (list): Query vectors.
+            limit (int, optional): Number of results per query. Defaults to 5.
+            filters (dict, optional): Filters applied to every query. Defaults to None.
 
-        return [
-            MemoryResult(
-                id=result["memory_id"],
-                score=result["vector_distance"],
-                payload={
-                    "hash": result["hash"],
-                    "data": result["memory"],
-                    "created_at": datetime.fromtimestamp(
-                        int(result["created_at"]), tz=pytz.timezone("US/Pacific")
-                    ).isoformat(timespec="microseconds"),
-                    **(
-                        {
-                            "updated_at": datetime.fromtimestamp(
-                                int(result["updated_at"]), tz=pytz.timezone("US/Pacific")
-                            ).isoformat(timespec="microseconds")
-                        }
-                        if "updated_at" in result
-                        else {}
-                    ),
-                    **{field: result[field] for field in ["agent_id", "run_id", "user_id"] if field in result},
-                    **{k: v for k, v in json.loads(extract_json(result["metadata"])).items()},
-                },
-            )
-            for result in results
-        ]
+        Returns:
+            list: One list of MemoryResult per query, in input order.
+        """
+        vector_queries = [self._build_vector_query(vectors, limit, filters) for vectors in vectors_list]
+        batch_results = self.index.batch_query(vector_queries, batch_size=self.batch_size)
+        return [[self._to_memory_result(result) for result in results] for results in batch_results]
 
     def delete(self, vector_id):
         self.index.drop_keys(f"{self.schema['index']['prefix']}:{vector_id}")
 
-    def update(self, vector_id=None, vector=None, payload=None):
-        data = {
-            "memory_id": vector_id,
-            "hash": payload["hash"],
-            "memory": payload["data"],
-            "created_at": int(datetime.fromisoformat(payload["created_at"]).timestamp()),
-            "updated_at": int(datetime.fromisoformat(payload["updated_at"]).timestamp()),
-            "embedding": np.array(vector, dtype=np.float32).tobytes(),
-        }
-
-        for field in ["agent_id", "run_id", "user_id"]:
-            if field in payload:
-                data[field] = payload[field]
+    def delete_batch(self, vector_ids: list):
+        prefix = self.schema["index"]["prefix"]
+        keys = [f"{prefix}:{vector_id}" for vector_id in vector_ids]
+        for i in range(0, len(keys), self.batch_size):
+            self.index.drop_keys(keys[i : i + self.batch_size])
 
-        data["metadata"] = json.dumps({k: v for k, v in payload.items() if k not in excluded_keys})
+    def update(self, vector_id=None, vector=None, payload=None):
+        data = self._build_entry(vector_id, np.asarray(vector, dtype=self.vector_dtype).tobytes(), payload)
         self.index.load(data=[data], keys=[f"{self.schema['index']['prefix']}:{vector_id}"], id_field="memory_id")
 
+    def update_batch(self, vector_ids: list, vectors: list = None, payloads: list = None):
+        prefix = self.schema["index"]["prefix"]
+        embeddings = np.asarray(vectors, dtype=self.vector_dtype)
+        data = [
+            self._build_entry(vector_id, embedding.tobytes(), payload)
+            for vector_id, embedding, payload in zip(vector_ids, embeddings, payloads)
+        ]
+        keys = [f"{prefix}:{vector_id}" for vector_id in vector_ids]
+        self.index.load(data=data, keys=keys, id_field="memory_id", batch_size=self.batch_size)
+
     def get(self, vector_id):
         result = self.index.fetch(vector_id)
         payload = {
@@ -256,8 +314,7 @@ class RedisDB(VectorStoreBase):
         """
         List all recent created memories from the vector store.
         """
-        conditions = [Tag(key) == value for key, value in filters.items() if value is not None]
-        filter = reduce(lambda x, y: x & y, conditions)
+        filter = self._build_filter(filters)
         query = Query(str(filter)).sort_by("created_at", asc=False)
         if limit is not None:
             query = Query(str(filter)).sort_by("created_at", asc=False).paging(0, limit)
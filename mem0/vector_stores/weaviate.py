@@ -36,6 +36,8 @@ class Weaviate(VectorStoreBase):
         cluster_url: str = None,
         auth_client_secret: str = None,
         additional_headers: dict = None,
+        batch_size: Optional[int] = None,
+        batch_concurrent_requests: int = 2,
     ):
         """
         Initialize the Weaviate vector store.
@@ -47,6 +49,8 @@ class Weaviate(VectorStoreBase):
             cluster_url (str, optional): URL for Weaviate server. Defaults to None.
             auth_config (dict, optional): Authentication configuration for Weaviate. Defaults to None.
             additional_headers (dict, optional): Additional headers for requests. Defaults to None.
+            batch_size (int, optional): Fixed batch size for writes. Defaults to None, which uses dynamic batching.
+            batch_concurrent_requests (int, optional): Concurrent requests for fixed-size batches. Defaults to 2.
         """
         if "localhost" in cluster_url: 
             self.client = weaviate.connect_to_local(headers=additional_headers)
@@ -81,6 +85,8 @@ class Weaviate(VectorStoreBase):
 
         self.collection_name = collection_name
         self.embedding_model_dims = embedding_model_dims
+        self.batch_size = batch_size
+        self.batch_concurrent_requests = batch_concurrent_requests
         self.create_col(embedding_model_dims)
 
     def _parse_output(self, data: Dict) -> List[OutputData]:
@@ -155,6 +161,25 @@ class Weaviate(VectorStoreBase):
             properties=properties,
         )
 
+    def _batch(self, collection):
+        """
+        Open a batch context on a collection.
+
+        Dynamic batching sizes the requests from the server's queue depth, a fixed size can be configured instead.
+        """
+        if self.batch_size:
+            return collection.batch.fixed_size(
+                batch_size=self.batch_size, concurrent_requests=self.batch_concurrent_requests
+            )
+        return collection.batch.dynamic()
+
+    def _log_failed_objects(self, collection):
+        failed_objects = collection.batch.failed_objects
+        if failed_objects:
+            logger.error(
+                f"Failed to write {len(failed_objects)} objects to {self.collection_name}: {failed_objects[0].message}"
+            )
+
     def insert(self, vectors, payloads=None, ids=None):
         """
         Insert vectors into a collection.
@@ -165,7 +190,8 @@ class Weaviate(VectorStoreBase):
             ids (list, optional): List of IDs corresponding to vectors. Defaults to None.
         """
         logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
-        with self.client.batch.fixed_size(batch_size=100) as batch:
+        collection = self.client.collections.get(str(self.collection_name))
+        with self._batch(collection) as batch:
             for idx, vector in enumerate(vectors):
                 object_id = ids[idx] if ids and idx < len(ids) else str(uuid.uuid4())
                 object_id = get_valid_uuid(object_id)
@@ -176,7 +202,8 @@ class Weaviate(VectorStoreBase):
                 if "ids" in data_object:
                     del data_object["ids"]
 
-                batch.add_object(collection=self.collection_name, properties=data_object, uuid=object_id, vector=vector)
+                batch.add_object(properties=data_object, uuid=object_id, vector=vector)
+        self._log_failed_objects(collection)
 
     def search(
         self, query: str, vectors: List[float], limit: int = 5, filters: Optional[Dict] = None
@@ -252,6 +279,58 @@ class Weaviate(VectorStoreBase):
                 existing_payload: Mapping[str, str] = existing_data
                 collection.data.update(uuid=vector_id, properties=existing_payload, vector=vector)
 
+    def update_batch(self, vector_ids, vectors=None, payloads=None):
+        """
+        Update several vectors and payloads through the batch API.
+
+        Existing objects are fetched in one query so that partial updates keep their current vector and properties.
+
+        Args:
+            vector_ids (list): IDs of the vectors to update.
+            vectors (list, optional): Updated vectors. Defaults to None.
+            payloads (list, optional): Updated payloads. Defaults to None.
+        """
+        if not vector_ids:
+            return
+        vector_ids = [get_valid_uuid(vector_id) for vector_id in vector_ids]
+        vectors = vectors or [None] * len(vector_ids)
+        payloads = payloads or [None] * len(vector_ids)
+
+        collection = self.client.collections.get(str(self.collection_name))
+        response = collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(vector_ids),
+            limit=len(vector_ids),
+            include_vector=True,
+        )
+        existing = {str(obj.uuid): obj for obj in response.objects}
+
+        with self._batch(collection) as batch:
+            for vector_id, vector, payload in zip(vector_ids, vectors, payloads):
+                current = existing.get(vector_id)
+                if current is None:
+                    logger.warning(f"Object {vector_id} not found in {self.collection_name}, skipping update")
+                    continue
+                properties = dict(current.properties)
+                if payload:
+                    properties.update(payload)
+                    properties.pop("id", None)
+                if vector is None:
+                    vector = current.vector.get("default") if isinstance(current.vector, dict) else current.vector
+                batch.add_object(properties=properties, uuid=vector_id, vector=vector)
+        self._log_failed_objects(collection)
+
+    def delete_batch(self, vector_ids):
+        """
+        Delete several vectors with a single delete_many request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        if not vector_ids:
+            return
+        collection = self.client.collections.get(str(self.collection_name))
+        collection.data.delete_many(where=Filter.by_id().contains_any([get_valid_uuid(v) for v in vector_ids]))
+
     def get(self, vector_id):
         """
         Retrieve a vector by ID.
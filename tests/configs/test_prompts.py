@@ -17,3 +17,31 @@ def test_get_update_memory_messages():
     ##
     result = prompts.get_update_memory_messages(retrieved_old_memory_dict, response_content, None)
     assert result.startswith(prompts.DEFAULT_UPDATE_MEMORY_PROMPT)
+
+
+def test_static_instructions_come_before_the_input():
+    # Prompts shared by every call must not change with the date or the user, or providers cannot cache them
+    assert "{" + "datetime" not in prompts.FACT_RETRIEVAL_PROMPT
+
+    system_prompt = prompts.get_update_memory_system_prompt()
+    result = prompts.get_update_memory_messages([{"id": "1", "text": "old memory 1"}], ["new fact"])
+    assert result.startswith(system_prompt)
+    assert "old memory 1" not in system_prompt
+    assert result.index("old memory 1") < result.index("new fact")
+
+
+def test_graph_prompts_do_not_depend_on_the_user():
+    from mem0.graphs.utils import get_delete_messages, get_extraction_messages, get_relations_extraction_messages
+
+    alice = get_relations_extraction_messages("I like tea", "user_id: alice", ["alice", "tea"])
+    bob = get_relations_extraction_messages("I like tea", "user_id: bob", ["bob", "tea"])
+    assert alice[0] == bob[0]
+    assert "CUSTOM_PROMPT" not in alice[0]["content"]
+    assert alice[1]["content"].startswith("用户标识: user_id: alice\n\n")
+
+    custom = get_relations_extraction_messages("I like tea", "alice", ["alice"], "Only extract drinks")
+    assert "4. Only extract drinks" in custom[0]["content"]
+    assert custom[1]["content"] == "用户标识: alice\n\nI like tea"
+
+    assert get_extraction_messages("I like tea", "alice")[0] == get_extraction_messages("I like tea", "bob")[0]
+    assert get_delete_messages("", "I like tea", "alice")[0] == get_delete_messages("", "I like tea", "bob")[0]
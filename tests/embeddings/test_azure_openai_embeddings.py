@@ -31,6 +31,20 @@ def test_embed_text(mock_openai_client):
     assert embedding == [0.1, 0.2, 0.3]
 
 
+def test_embed_batch_sends_chunks_of_max_batch_size(mock_openai_client, monkeypatch):
+    monkeypatch.setattr(AzureOpenAIEmbedding, "MAX_BATCH_SIZE", 2)
+    embedder = AzureOpenAIEmbedding(BaseEmbedderConfig(model="text-embedding-ada-002"))
+    mock_openai_client.embeddings.create.side_effect = lambda input, **kwargs: Mock(
+        data=[Mock(embedding=[float(len(text))]) for text in input]
+    )
+
+    result = embedder.embed_batch(["a", "bb\nb", "cccc"])
+
+    mock_openai_client.embeddings.create.assert_any_call(input=["a", "bb b"], model="text-embedding-ada-002")
+    mock_openai_client.embeddings.create.assert_called_with(input=["cccc"], model="text-embedding-ada-002")
+    assert result == [[1.0], [4.0], [4.0]]
+
+
 @pytest.mark.parametrize(
     "default_headers, expected_header",
     [(None, None), ({"Test": "test_value"}, "test_value"), ({}, None)],
@@ -1,7 +1,13 @@
+import json
+import threading
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
 
 import numpy as np
 import pytest
+from tokenizers import Tokenizer
+from tokenizers.models import WordLevel
+from tokenizers.pre_tokenizers import Whitespace
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
 from mem0.embeddings.huggingface import HuggingFaceEmbedding
@@ -70,3 +76,86 @@ def test_embed_with_custom_embedding_dims(mock_sentence_transformer):
     assert embedder.config.embedding_dims == 768
 
     assert result == [1.0, 1.1, 1.2]
+
+
+@pytest.fixture
+def onnx_model_dir(tmp_path):
+    """A local Sentence Transformers model whose ONNX session embeds token ``i`` as ``[i, 1]``."""
+    tokenizer = Tokenizer(WordLevel({"[PAD]": 0, "[UNK]": 1, "hello": 2, "big": 3, "world": 4}, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = Whitespace()
+    tokenizer.save(str(tmp_path / "tokenizer.json"))
+    (tmp_path / "modules.json").write_text(
+        json.dumps(
+            [
+                {"idx": 0, "path": "", "type": "sentence_transformers.models.Transformer"},
+                {"idx": 1, "path": "1_Pooling", "type": "sentence_transformers.models.Pooling"},
+                {"idx": 2, "path": "2_Normalize", "type": "sentence_transformers.models.Normalize"},
+            ]
+        )
+    )
+    (tmp_path / "1_Pooling").mkdir()
+    (tmp_path / "1_Pooling" / "config.json").write_text(json.dumps({"pooling_mode_mean_tokens": True}))
+    (tmp_path / "onnx").mkdir()
+    (tmp_path / "onnx" / "model.onnx").write_bytes(b"")
+
+    def run(output_names, feeds):
+        ids = feeds["input_ids"].astype(np.float32)
+        return [np.stack([ids, np.ones_like(ids)], axis=-1)]
+
+    session = Mock()
+    session.get_inputs.return_value = [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+    session.get_outputs.return_value = [SimpleNamespace(name="last_hidden_state")]
+    session.run.side_effect = run
+
+    from mem0.embeddings import huggingface_onnx
+
+    huggingface_onnx._encoders.clear()
+    with patch.object(huggingface_onnx.ort, "InferenceSession", return_value=session) as mock_session:
+        yield tmp_path, session, mock_session
+    huggingface_onnx._encoders.clear()
+
+
+def test_onnx_backend_pools_and_normalizes(onnx_model_dir):
+    model_dir, session, mock_session = onnx_model_dir
+    config = BaseEmbedderConfig(
+        model=str(model_dir), model_kwargs={"backend": "onnxruntime", "intra_op_num_threads": 2}
+    )
+    embedder = HuggingFaceEmbedding(config)
+
+    assert embedder.config.embedding_dims == 2
+    assert mock_session.call_args.kwargs["sess_options"].intra_op_num_threads == 2
+
+    # The padding of the shorter text is left out of its mean
+    first, second = embedder.embed_batch(["hello world", "big"])
+    assert first == pytest.approx((np.array([3.0, 1.0]) / np.linalg.norm([3.0, 1.0])).tolist())
+    assert second == pytest.approx((np.array([3.0, 1.0]) / np.linalg.norm([3.0, 1.0])).tolist())
+    assert embedder.embed("hello") == pytest.approx((np.array([2.0, 1.0]) / np.linalg.norm([2.0, 1.0])).tolist())
+
+    # Embedders of the same model share the loaded session
+    HuggingFaceEmbedding(
+        BaseEmbedderConfig(model=str(model_dir), model_kwargs={"backend": "onnxruntime", "intra_op_num_threads": 2})
+    )
+    mock_session.assert_called_once()
+
+
+def test_onnx_backend_micro_batches_concurrent_texts(onnx_model_dir):
+    model_dir, session, _ = onnx_model_dir
+    config = BaseEmbedderConfig(
+        model=str(model_dir),
+        embedding_dims=2,
+        model_kwargs={"backend": "onnxruntime", "max_batch_size": 3, "max_wait_ms": 5000},
+    )
+    embedder = HuggingFaceEmbedding(config)
+
+    results = {}
+    threads = [
+        threading.Thread(target=lambda text=text: results.update({text: embedder.embed(text)}))
+        for text in ("hello", "big", "world")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    session.run.assert_called_once()
+    assert sorted(len(embedding) for embedding in results.values()) == [2, 2, 2]
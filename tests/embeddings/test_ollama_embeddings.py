@@ -3,33 +3,61 @@ from unittest.mock import Mock, patch
 import pytest
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
+from mem0.embeddings import ollama
 from mem0.embeddings.ollama import OllamaEmbedding
 
 
 @pytest.fixture
 def mock_ollama_client():
+    ollama._available_models.clear()
     with patch("mem0.embeddings.ollama.Client") as mock_ollama:
         mock_client = Mock()
         mock_client.list.return_value = {"models": [{"name": "nomic-embed-text"}]}
         mock_ollama.return_value = mock_client
         yield mock_client
+    ollama._available_models.clear()
 
 
 def test_embed_text(mock_ollama_client):
     config = BaseEmbedderConfig(model="nomic-embed-text", embedding_dims=512)
     embedder = OllamaEmbedding(config)
 
-    mock_response = {"embedding": [0.1, 0.2, 0.3, 0.4, 0.5]}
-    mock_ollama_client.embeddings.return_value = mock_response
+    mock_response = {"embeddings": [[0.1, 0.2, 0.3, 0.4, 0.5]]}
+    mock_ollama_client.embed.return_value = mock_response
 
     text = "Sample text to embed."
     embedding = embedder.embed(text)
 
-    mock_ollama_client.embeddings.assert_called_once_with(model="nomic-embed-text", prompt=text)
+    mock_ollama_client.embed.assert_called_once_with(model="nomic-embed-text", input=[text], keep_alive=None)
 
     assert embedding == [0.1, 0.2, 0.3, 0.4, 0.5]
 
 
+def test_embed_batch_sends_chunks(mock_ollama_client):
+    config = BaseEmbedderConfig(model="nomic-embed-text", ollama_batch_size=2, ollama_keep_alive="10m")
+    embedder = OllamaEmbedding(config)
+    mock_ollama_client.embed.side_effect = lambda model, input, keep_alive: {
+        "embeddings": [[float(len(text))] for text in input]
+    }
+
+    assert embedder.embed_batch(["a", "bb", "ccc"]) == [[1.0], [2.0], [3.0]]
+    assert embedder.embed_batch([]) == []
+
+    assert [call.kwargs["input"] for call in mock_ollama_client.embed.call_args_list] == [["a", "bb"], ["ccc"]]
+    assert all(call.kwargs["keep_alive"] == "10m" for call in mock_ollama_client.embed.call_args_list)
+
+
+def test_legacy_embeddings_use_the_unnormalized_endpoint(mock_ollama_client):
+    config = BaseEmbedderConfig(model="nomic-embed-text", ollama_legacy_embeddings=True)
+    embedder = OllamaEmbedding(config)
+    mock_ollama_client.embeddings.side_effect = lambda model, prompt, keep_alive: {"embedding": [float(len(prompt))]}
+
+    assert embedder.embed_batch(["a", "bb"]) == [[1.0], [2.0]]
+
+    assert [call.kwargs["prompt"] for call in mock_ollama_client.embeddings.call_args_list] == ["a", "bb"]
+    mock_ollama_client.embed.assert_not_called()
+
+
 def test_ensure_model_exists(mock_ollama_client):
     config = BaseEmbedderConfig(model="nomic-embed-text", embedding_dims=512)
     embedder = OllamaEmbedding(config)
@@ -41,3 +69,17 @@ def test_ensure_model_exists(mock_ollama_client):
     embedder._ensure_model_exists()
 
     mock_ollama_client.pull.assert_called_once_with("nomic-embed-text")
+
+
+def test_model_check_runs_once_per_process(mock_ollama_client):
+    # Ollama lists models with their tag
+    mock_ollama_client.list.return_value = {"models": [{"model": "nomic-embed-text:latest"}]}
+
+    OllamaEmbedding(BaseEmbedderConfig(model="nomic-embed-text"))
+    OllamaEmbedding(BaseEmbedderConfig(model="nomic-embed-text:latest"))
+
+    mock_ollama_client.list.assert_called_once()
+    mock_ollama_client.pull.assert_not_called()
+
+    OllamaEmbedding(BaseEmbedderConfig(model="nomic-embed-text", ollama_base_url="http://gpu-box:11434"))
+    assert mock_ollama_client.list.call_count == 2
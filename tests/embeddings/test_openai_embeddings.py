@@ -88,3 +88,33 @@ def test_embed_uses_environment_api_key(mock_openai_client, monkeypatch):
         input=["Environment key test"], model="text-embedding-3-small", dimensions=1536
     )
     assert result == [1.3, 1.4, 1.5]
+
+
+def test_embed_batch_uses_single_request(mock_openai_client):
+    embedder = OpenAIEmbedding(BaseEmbedderConfig())
+    mock_response = Mock()
+    mock_response.data = [Mock(embedding=[0.1]), Mock(embedding=[0.2])]
+    mock_openai_client.embeddings.create.return_value = mock_response
+
+    result = embedder.embed_batch(["Hello\nworld", "Bye"])
+
+    mock_openai_client.embeddings.create.assert_called_once_with(
+        input=["Hello world", "Bye"], model="text-embedding-3-small", dimensions=1536
+    )
+    assert result == [[0.1], [0.2]]
+
+
+def test_embed_batch_sends_chunks_of_max_batch_size(mock_openai_client, monkeypatch):
+    monkeypatch.setattr(OpenAIEmbedding, "MAX_BATCH_SIZE", 2)
+    embedder = OpenAIEmbedding(BaseEmbedderConfig())
+    mock_openai_client.embeddings.create.side_effect = lambda input, **kwargs: Mock(
+        data=[Mock(embedding=[float(len(text))]) for text in input]
+    )
+
+    result = embedder.embed_batch(["a", "bb", "ccc"])
+
+    assert [call.kwargs["input"] for call in mock_openai_client.embeddings.create.call_args_list] == [
+        ["a", "bb"],
+        ["ccc"],
+    ]
+    assert result == [[1.0], [2.0], [3.0]]
@@ -0,0 +1,57 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mem0.configs.llms.aws_bedrock import AWSBedrockConfig
+from mem0.llms.aws_bedrock import AWSBedrockLLM
+
+MESSAGES = [
+    {"role": "system", "content": "Extract the facts."},
+    {"role": "user", "content": "I like tea."},
+]
+
+
+@pytest.fixture
+def mock_bedrock_client():
+    with patch("mem0.llms.aws_bedrock.boto3") as mock_boto3:
+        mock_client = Mock()
+        mock_boto3.client.return_value = mock_client
+        yield mock_client
+
+
+def test_anthropic_system_prompt_gets_cache_control(mock_bedrock_client):
+    callback = Mock()
+    config = AWSBedrockConfig(
+        model="anthropic.claude-3-5-haiku-20241022-v1:0", prompt_caching=True, response_callback=callback
+    )
+    llm = AWSBedrockLLM(config)
+    body = {"content": [{"text": '{"facts": ["likes tea"]}'}], "usage": {"cache_read_input_tokens": 1200}}
+    mock_bedrock_client.invoke_model.return_value = {"body": Mock(read=Mock(return_value=json.dumps(body).encode()))}
+
+    response = llm.generate_response(MESSAGES)
+
+    assert response == '{"facts": ["likes tea"]}'
+    request = json.loads(mock_bedrock_client.invoke_model.call_args.kwargs["body"])
+    assert request["system"] == [
+        {"type": "text", "text": "Extract the facts.", "cache_control": {"type": "ephemeral"}}
+    ]
+    assert request["messages"] == [{"role": "user", "content": [{"type": "text", "text": "I like tea."}]}]
+    assert callback.call_args.args[1]["usage"]["cache_read_input_tokens"] == 1200
+
+
+def test_converse_system_prompt_gets_cache_point(mock_bedrock_client):
+    llm = AWSBedrockLLM(AWSBedrockConfig(model="amazon.nova-lite-v1:0", prompt_caching=True))
+    mock_bedrock_client.converse.return_value = {
+        "output": {"message": {"content": [{"text": "Hi there"}]}},
+        "usage": {"cacheReadInputTokens": 1200},
+    }
+
+    assert llm.generate_response(MESSAGES) == "Hi there"
+    request = mock_bedrock_client.converse.call_args.kwargs
+    assert request["system"] == [{"text": "Extract the facts."}, {"cachePoint": {"type": "default"}}]
+    assert request["messages"] == [{"role": "user", "content": [{"text": "I like tea."}]}]
+
+    llm.config.prompt_caching = False
+    llm.generate_response(MESSAGES)
+    assert mock_bedrock_client.converse.call_args.kwargs["system"] == [{"text": "Extract the facts."}]
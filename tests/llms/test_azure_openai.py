@@ -1,5 +1,6 @@
 from unittest.mock import Mock, patch
 
+import httpx
 import pytest
 
 from mem0.configs.llms.azure import AzureOpenAIConfig
@@ -131,6 +132,48 @@ def test_generate_with_http_proxies(default_headers):
         mock_http_client.assert_called_once_with(proxies="http://testproxy.mem0.net:8000")
 
 
+@pytest.mark.parametrize(
+    "proxies",
+    ["http://testproxy.mem0.net:8000", {"https://": "http://testproxy.mem0.net:8000"}],
+)
+def test_async_client_uses_the_configured_proxies(proxies):
+    with (
+        patch("mem0.llms.azure_openai.AzureOpenAI"),
+        patch("mem0.llms.azure_openai.AsyncAzureOpenAI") as mock_async_azure_openai,
+        patch("httpx.Client"),
+    ):
+        config = AzureOpenAIConfig(model=MODEL, http_client_proxies=proxies, azure_kwargs={"api_key": "test"})
+        llm = AzureOpenAILLM(config)
+
+        _ = llm.async_client
+
+    http_client = mock_async_azure_openai.call_args.kwargs["http_client"]
+    assert isinstance(http_client, httpx.AsyncClient)
+    transport = http_client._transport_for_url(httpx.URL("https://example.openai.azure.com"))
+    assert transport._pool._proxy_url.host == b"testproxy.mem0.net"
+    assert mock_async_azure_openai.call_args.kwargs["api_key"] == "test"
+
+
+@pytest.mark.asyncio
+async def test_custom_http_client_falls_back_to_the_sync_client():
+    with (
+        patch("mem0.llms.azure_openai.AzureOpenAI") as mock_azure_openai,
+        patch("mem0.llms.azure_openai.AsyncAzureOpenAI") as mock_async_azure_openai,
+    ):
+        config = AzureOpenAIConfig(model=MODEL, azure_kwargs={"api_key": "test"})
+        config.http_client = httpx.Client()
+        llm = AzureOpenAILLM(config)
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="I'm doing well, thank you!"))]
+        mock_azure_openai.return_value.chat.completions.create.return_value = mock_response
+
+        response = await llm.agenerate_response([{"role": "user", "content": "How are you?"}])
+
+    assert response == "I'm doing well, thank you!"
+    assert mock_azure_openai.call_args.kwargs["http_client"] is config.http_client
+    mock_async_azure_openai.assert_not_called()
+
+
 def test_init_with_api_key(monkeypatch):
     # Patch environment variables to None to force config usage
     monkeypatch.delenv("LLM_AZURE_OPENAI_API_KEY", raising=False)
@@ -1,4 +1,4 @@
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -32,3 +32,70 @@ def test_generate_response_without_tools(mock_ollama_client):
         model="llama3.1:70b", messages=messages, options={"temperature": 0.7, "num_predict": 100, "top_p": 1.0}
     )
     assert response == "I'm doing well, thank you for asking!"
+
+
+@pytest.mark.asyncio
+async def test_agenerate_response_uses_async_client(mock_ollama_client):
+    config = OllamaConfig(model="llama3.1:70b", temperature=0.7, max_tokens=100, top_p=1.0)
+    messages = [{"role": "user", "content": "Hello, how are you?"}]
+
+    with patch("mem0.llms.ollama.AsyncClient") as mock_async_ollama:
+        mock_async_client = Mock()
+        mock_async_client.chat = AsyncMock(return_value={"message": {"content": "I'm doing well!"}})
+        mock_async_ollama.return_value = mock_async_client
+
+        llm = OllamaLLM(config)
+        response = await llm.agenerate_response(messages)
+
+    mock_async_client.chat.assert_awaited_once_with(
+        model="llama3.1:70b", messages=messages, options={"temperature": 0.7, "num_predict": 100, "top_p": 1.0}
+    )
+    mock_ollama_client.chat.assert_not_called()
+    assert response == "I'm doing well!"
+
+
+def test_json_response_formats_are_passed_as_format(mock_ollama_client):
+    llm = OllamaLLM(OllamaConfig(model="llama3.1:70b"))
+    messages = [{"role": "user", "content": "I like tennis."}]
+    schema = {"type": "object", "properties": {"facts": {"type": "array"}}}
+    mock_ollama_client.chat.return_value = {"message": {"content": '{"facts": ["Likes tennis"]}'}}
+
+    llm.generate_response(messages, response_format={"type": "json_schema", "json_schema": {"schema": schema}})
+    assert mock_ollama_client.chat.call_args.kwargs["format"] == schema
+
+    llm.generate_response(messages, response_format={"type": "json_object"})
+    assert mock_ollama_client.chat.call_args.kwargs["format"] == "json"
+
+
+def test_tool_calls_are_generated_against_the_tool_schema(mock_ollama_client):
+    llm = OllamaLLM(OllamaConfig(model="llama3.1:70b"))
+    tools = [
+        {
+            "type": "function",
+            "function": {
+                "name": "delete_graph_memory",
+                "description": "Delete a relation",
+                "parameters": {"type": "object", "properties": {"source": {"type": "string"}}, "required": ["source"]},
+            },
+        },
+        {
+            "type": "function",
+            "function": {"name": "noop", "description": "Do nothing", "parameters": {"type": "object"}},
+        },
+    ]
+    mock_ollama_client.chat.return_value = {
+        "message": {"content": '{"tool_calls": [{"name": "delete_graph_memory", "arguments": {"source": "alice"}}]}'}
+    }
+
+    response = llm.generate_response([{"role": "user", "content": "Alice moved away."}], tools=tools)
+
+    params = mock_ollama_client.chat.call_args.kwargs
+    items = params["format"]["properties"]["tool_calls"]["items"]
+    assert [call["properties"]["name"]["enum"] for call in items["anyOf"]] == [["delete_graph_memory"], ["noop"]]
+    assert params["messages"][0]["role"] == "system"
+    assert params["messages"][1] == {"role": "user", "content": "Alice moved away."}
+    assert response["tool_calls"] == [{"name": "delete_graph_memory", "arguments": {"source": "alice"}}]
+
+    # A response without calls is a valid answer, not a failure
+    mock_ollama_client.chat.return_value = {"message": {"content": '{"tool_calls": []}'}}
+    assert llm.generate_response([{"role": "user", "content": "Hi"}], tools=tools)["tool_calls"] == []
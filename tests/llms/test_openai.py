@@ -1,5 +1,5 @@
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -207,3 +207,70 @@ def test_callback_with_tools(mock_openai_client):
     mock_callback.assert_called_once()
     # Check that tool_calls exists in the message
     assert hasattr(mock_callback.call_args[0][1].choices[0].message, 'tool_calls')
+
+
+@pytest.mark.asyncio
+async def test_agenerate_response_uses_async_client(mock_openai_client):
+    config = OpenAIConfig(model="gpt-4o", temperature=0.7, max_tokens=100, top_p=1.0)
+    messages = [{"role": "user", "content": "Hello, how are you?"}]
+    mock_response = Mock()
+    mock_response.choices = [Mock(message=Mock(content="I'm doing well, thank you for asking!"))]
+
+    with patch("mem0.llms.openai.AsyncOpenAI") as mock_async_openai:
+        mock_async_client = Mock()
+        mock_async_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_async_openai.return_value = mock_async_client
+
+        llm = OpenAILLM(config)
+        mock_async_openai.assert_not_called()
+        response = await llm.agenerate_response(messages)
+
+    mock_async_client.chat.completions.create.assert_awaited_once_with(
+        model="gpt-4o", messages=messages, temperature=0.7, max_tokens=100, top_p=1.0
+    )
+    mock_openai_client.chat.completions.create.assert_not_called()
+    assert response == "I'm doing well, thank you for asking!"
+
+
+def stream_chunks(*texts):
+    return [Mock(choices=[Mock(delta=Mock(content=text))]) for text in texts] + [Mock(choices=[])]
+
+
+def test_stream_json_items(mock_openai_client):
+    config = OpenAIConfig(model="gpt-4o", temperature=0.7, max_tokens=100, top_p=1.0)
+    messages = [{"role": "user", "content": "Update the memories"}]
+    mock_openai_client.chat.completions.create.return_value = iter(
+        stream_chunks('```json\n{"memory": [{"id": "0", "ev', 'ent": "ADD"}, {"id"', None, ': "1"}]}\n```')
+    )
+
+    llm = OpenAILLM(config)
+    items = llm.stream_json_items(messages, key="memory", response_format={"type": "json_object"})
+
+    assert next(items) == {"id": "0", "event": "ADD"}
+    assert list(items) == [{"id": "1"}]
+    mock_openai_client.chat.completions.create.assert_called_once_with(
+        stream=True,
+        model="gpt-4o",
+        messages=messages,
+        temperature=0.7,
+        max_tokens=100,
+        top_p=1.0,
+        response_format={"type": "json_object"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_astream_json_items_uses_async_client(mock_openai_client):
+    config = OpenAIConfig(model="gpt-4o", temperature=0.7, max_tokens=100, top_p=1.0)
+
+    async def stream():
+        for chunk in stream_chunks('{"memory": [{"id": "0"},', ' {"id": "1"}]}'):
+            yield chunk
+
+    with patch("mem0.llms.openai.AsyncOpenAI") as mock_async_openai:
+        mock_async_openai.return_value.chat.completions.create = AsyncMock(return_value=stream())
+        llm = OpenAILLM(config)
+        items = [item async for item in llm.astream_json_items([{"role": "user", "content": "Hi"}], key="memory")]
+
+    assert items == [{"id": "0"}, {"id": "1"}]
+    mock_openai_client.chat.completions.create.assert_not_called()
@@ -3,6 +3,7 @@ from unittest.mock import Mock, patch
 import pytest
 
 from mem0.configs.llms.base import BaseLlmConfig
+from mem0.configs.llms.vllm import VllmConfig
 from mem0.llms.vllm import VllmLLM
 
 
@@ -34,27 +35,32 @@ def test_generate_response_without_tools(mock_vllm_client):
     assert response == "I'm doing well, thank you for asking!"
 
 
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "add_memory",
+            "description": "Add a memory",
+            "parameters": {
+                "type": "object",
+                "properties": {"data": {"type": "string", "description": "Data to add to memory"}},
+                "required": ["data"],
+            },
+        },
+    }
+]
+
+
 def test_generate_response_with_tools(mock_vllm_client):
-    config = BaseLlmConfig(model="Qwen/Qwen2.5-32B-Instruct", temperature=0.7, max_tokens=100, top_p=1.0)
+    config = VllmConfig(
+        model="Qwen/Qwen2.5-32B-Instruct", temperature=0.7, max_tokens=100, top_p=1.0, structured_output=False
+    )
     llm = VllmLLM(config)
     messages = [
         {"role": "system", "content": "You are a helpful assistant."},
         {"role": "user", "content": "Add a new memory: Today is a sunny day."},
     ]
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": "add_memory",
-                "description": "Add a memory",
-                "parameters": {
-                    "type": "object",
-                    "properties": {"data": {"type": "string", "description": "Data to add to memory"}},
-                    "required": ["data"],
-                },
-            },
-        }
-    ]
+    tools = TOOLS
 
     mock_response = Mock()
     mock_message = Mock()
@@ -84,3 +90,47 @@ def test_generate_response_with_tools(mock_vllm_client):
     assert len(response["tool_calls"]) == 1
     assert response["tool_calls"][0]["name"] == "add_memory"
     assert response["tool_calls"][0]["arguments"] == {"data": "Today is a sunny day."}
+
+
+def test_json_schema_response_format_uses_guided_decoding(mock_vllm_client):
+    llm = VllmLLM(VllmConfig(model="Qwen/Qwen2.5-32B-Instruct", temperature=0.7, max_tokens=100, top_p=1.0))
+    messages = [{"role": "user", "content": "I like tennis."}]
+    schema = {"type": "object", "properties": {"facts": {"type": "array"}}}
+    mock_vllm_client.chat.completions.create.return_value = Mock(
+        choices=[Mock(message=Mock(content='{"facts": ["Likes tennis"]}'))]
+    )
+
+    assert llm.supports_json_schema is True
+    llm.generate_response(messages, response_format={"type": "json_schema", "json_schema": {"schema": schema}})
+    params = mock_vllm_client.chat.completions.create.call_args.kwargs
+    assert params["extra_body"] == {"guided_json": schema}
+    assert "response_format" not in params
+
+    llm.generate_response(messages, response_format={"type": "json_object"})
+    params = mock_vllm_client.chat.completions.create.call_args.kwargs
+    assert params["response_format"] == {"type": "json_object"}
+    assert "extra_body" not in params
+
+
+def test_tool_calls_use_guided_decoding(mock_vllm_client):
+    llm = VllmLLM(VllmConfig(model="Qwen/Qwen2.5-32B-Instruct"))
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": "Add a new memory: Today is a sunny day."},
+    ]
+    content = '{"tool_calls": [{"name": "add_memory", "arguments": {"data": "Today is a sunny day."}}]}'
+    mock_vllm_client.chat.completions.create.return_value = Mock(choices=[Mock(message=Mock(content=content))])
+
+    response = llm.generate_response(messages, tools=TOOLS)
+
+    params = mock_vllm_client.chat.completions.create.call_args.kwargs
+    assert "tools" not in params
+    guided = params["extra_body"]["guided_json"]
+    call_schema = guided["properties"]["tool_calls"]["items"]
+    assert call_schema["properties"]["name"]["enum"] == ["add_memory"]
+    assert call_schema["properties"]["arguments"] == TOOLS[0]["function"]["parameters"]
+    assert params["messages"][0]["content"].startswith("You are a helpful assistant.")
+    assert "add_memory: Add a memory" in params["messages"][0]["content"]
+    assert params["messages"][1] == messages[1]
+    assert response["content"] == content
+    assert response["tool_calls"] == [{"name": "add_memory", "arguments": {"data": "Today is a sunny day."}}]
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from mem0.configs.prompts import FACT_RETRIEVAL_BATCH_PROMPT, FACT_RETRIEVAL_BATCH_SCHEMA, FACT_RETRIEVAL_SCHEMA
+from mem0.memory.fact_batcher import FactExtractionBatcher
+
+
+def batched_response(facts_by_id):
+    return json.dumps({"results": [{"id": i, "facts": facts} for i, facts in facts_by_id.items()]})
+
+
+def facts_of(response):
+    return json.loads(response)["facts"]
+
+
+def test_concurrent_requests_share_one_call():
+    llm = Mock()
+    llm.generate_response.return_value = batched_response({"0": ["a"], "1": ["b"], "2": []})
+    batcher = FactExtractionBatcher(llm, max_wait_ms=5000, max_batch_size=3)
+
+    futures = [batcher.submit("system", f"Input:\n{text}") for text in ("one", "two", "three")]
+
+    assert [facts_of(future.result(timeout=5)) for future in futures] == [["a"], ["b"], []]
+    llm.generate_response.assert_called_once()
+    messages = llm.generate_response.call_args.kwargs["messages"]
+    assert messages[0]["content"] == "system" + FACT_RETRIEVAL_BATCH_PROMPT
+    assert messages[1]["content"] == "对话 0:\nInput:\none\n\n对话 1:\nInput:\ntwo\n\n对话 2:\nInput:\nthree"
+
+
+def test_lone_request_is_sent_after_the_wait_as_a_single_prompt():
+    llm = Mock()
+    llm.generate_response.return_value = '{"facts": ["a"]}'
+    batcher = FactExtractionBatcher(llm, max_wait_ms=1, max_batch_size=8)
+
+    assert batcher.extract("system", "Input:\none") == '{"facts": ["a"]}'
+    llm.generate_response.assert_called_once_with(
+        messages=[{"role": "system", "content": "system"}, {"role": "user", "content": "Input:\none"}],
+        response_format={"type": "json_object"},
+    )
+
+
+def test_schema_response_formats_are_used_for_single_and_batched_calls():
+    llm = Mock()
+    llm.supports_json_schema = True
+    llm.generate_response.side_effect = [batched_response({"0": ["a"]}), '{"facts": ["b"]}']
+    response_format = {"type": "json_schema", "json_schema": {"name": "facts", "schema": FACT_RETRIEVAL_SCHEMA}}
+    batcher = FactExtractionBatcher(llm, max_wait_ms=5000, max_batch_size=2, response_format=response_format)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(batcher.extract, "system", f"Input:\n{text}") for text in ("one", "two")]
+        assert sorted(facts_of(future.result(timeout=5)) for future in futures) == [["a"], ["b"]]
+
+    batched, single = llm.generate_response.call_args_list
+    assert batched.kwargs["response_format"]["json_schema"]["schema"] == FACT_RETRIEVAL_BATCH_SCHEMA
+    assert single.kwargs["response_format"] == response_format
+
+
+def test_missing_conversations_fall_back_to_single_calls():
+    llm = Mock()
+    llm.generate_response.side_effect = [batched_response({"0": ["a"]}), '{"facts": ["b"]}']
+    batcher = FactExtractionBatcher(llm, max_wait_ms=5000, max_batch_size=2)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(batcher.extract, "system", "Input:\none")
+        second = executor.submit(batcher.extract, "system", "Input:\ntwo")
+        assert facts_of(first.result(timeout=5)) == ["a"]
+        assert facts_of(second.result(timeout=5)) == ["b"]
+
+    assert llm.generate_response.call_count == 2
+    assert llm.generate_response.call_args.kwargs["messages"][1]["content"] == "Input:\ntwo"
+
+
+@pytest.mark.asyncio
+async def test_async_callers_share_one_async_call():
+    llm = Mock()
+    llm.agenerate_response = AsyncMock(return_value=batched_response({"0": ["a"], "1": ["b"]}))
+    batcher = FactExtractionBatcher(llm, max_wait_ms=5000, max_batch_size=2)
+
+    responses = await asyncio.gather(batcher.aextract("system", "one"), batcher.aextract("system", "two"))
+
+    assert [facts_of(response) for response in responses] == [["a"], ["b"]]
+    llm.agenerate_response.assert_awaited_once()
+    llm.generate_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_callers_extract_on_their_own_when_the_batch_fails():
+    llm = Mock()
+    llm.agenerate_response = AsyncMock(side_effect=["not json", '{"facts": ["a"]}', '{"facts": ["b"]}'])
+    batcher = FactExtractionBatcher(llm, max_wait_ms=5000, max_batch_size=2)
+
+    responses = await asyncio.gather(batcher.aextract("system", "one"), batcher.aextract("system", "two"))
+
+    # The batched answer could not be parsed, both callers extracted on their own
+    assert sorted(facts_of(response) for response in responses) == [["a"], ["b"]]
+    assert llm.agenerate_response.await_count == 3
+    llm.generate_response.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_lone_async_request_is_sent_after_the_wait():
+    llm = Mock()
+    llm.agenerate_response = AsyncMock(return_value='{"facts": ["a"]}')
+    batcher = FactExtractionBatcher(llm, max_wait_ms=1, max_batch_size=8)
+
+    assert await batcher.aextract("system", "Input:\none") == '{"facts": ["a"]}'
+    llm.agenerate_response.assert_awaited_once_with(
+        messages=[{"role": "system", "content": "system"}, {"role": "user", "content": "Input:\none"}],
+        response_format={"type": "json_object"},
+    )
@@ -26,6 +26,8 @@ class TestKuzu:
 
         # Mock graph store config
         config.graph_store.config.db = ":memory:"
+        config.graph_store.config.vector_index = True
+        config.graph_store.config.vector_index_candidates = 50
 
         # Mock LLM config
         config.llm.provider = "mock_llm"
@@ -43,6 +45,7 @@ class TestKuzu:
             return self.embeddings[text]
 
         mock_model.embed.side_effect = mock_embed
+        mock_model.embed_batch.side_effect = lambda texts: [mock_embed(text) for text in texts]
         return mock_model
 
     @pytest.fixture
@@ -134,6 +137,13 @@ class TestKuzu:
             "bob_knows_charlie",
         ])
 
+        # Both entities reach bob_knows_charlie, it is returned once
+        results = kuzu_memory._search_graph_db(["bob", "charlie"], filters, threshold=0.8)
+        relations = [f"{result['source']}_{result['relationship']}_{result['destination']}" for result in results]
+        assert len(relations) == len(set(relations))
+        assert "bob_knows_charlie" in relations
+        assert "charlie_likes_alice" in relations
+
         result = kuzu_memory._delete_entities(data2, filters)
         assert result[0] == [{"source": "charlie", "relationship": "likes", "target": "alice"}]
         assert get_node_count(kuzu_memory) == 4
@@ -159,6 +169,120 @@ class TestKuzu:
         assert get_node_count(kuzu_memory) == 0
         assert get_edge_count(kuzu_memory) == 0
 
+    @pytest.mark.parametrize("vector_index", [True, False])
+    @patch("mem0.memory.kuzu_memory.EmbedderFactory")
+    @patch("mem0.memory.kuzu_memory.LlmFactory")
+    def test_kuzu_bulk_add_resolves_similar_nodes(
+        self, mock_llm_factory, mock_embedder_factory, mock_config, mock_embedding_model, mock_llm, vector_index
+    ):
+        """Test that similar names resolve to existing nodes and repeated shapes reuse prepared statements"""
+        mock_config.graph_store.config.vector_index = vector_index
+        mock_embedder_factory.create.return_value = mock_embedding_model
+        mock_llm_factory.create.return_value = mock_llm
+        self.embeddings["alicia"] = [value + 0.01 for value in self.embeddings["alice"]]
+
+        kuzu_memory = MemoryGraph(mock_config)
+        assert kuzu_memory.use_vector_index == vector_index
+
+        filters = {"user_id": "test_user"}
+        result = kuzu_memory._add_entities(
+            [
+                {"source": "alice", "destination": "bob", "relationship": "knows"},
+                {"source": "alice", "destination": "bob", "relationship": "knows"},
+            ],
+            filters,
+            {},
+        )
+        assert result == [[{"source": "alice", "relationship": "knows", "target": "bob"}]] * 2
+        statements = len(kuzu_memory._prepared_statements)
+
+        result = kuzu_memory._add_entities(
+            [{"source": "alicia", "destination": "charlie", "relationship": "knows"}], filters, {}
+        )
+        assert result == [[{"source": "alice", "relationship": "knows", "target": "charlie"}]]
+        assert get_node_count(kuzu_memory) == 3
+        assert len(kuzu_memory._prepared_statements) == statements + 1
+
+        rows = kuzu_memory.kuzu_execute(
+            "MATCH (n)-[r]->(m) WHERE m.name = $name RETURN n.mentions AS node_mentions, r.mentions AS mentions",
+            parameters={"name": "bob"},
+        )
+        assert rows == [{"node_mentions": 3, "mentions": 2}]
+
+    @pytest.mark.parametrize("max_candidates", [1000, 50])
+    @patch("mem0.memory.kuzu_memory.EmbedderFactory")
+    @patch("mem0.memory.kuzu_memory.LlmFactory")
+    def test_kuzu_vector_index_finds_the_scope_behind_other_users_nodes(
+        self,
+        mock_llm_factory,
+        mock_embedder_factory,
+        mock_config,
+        mock_embedding_model,
+        mock_llm,
+        max_candidates,
+        monkeypatch,
+    ):
+        """Test that the candidates grow, or the scope is compared, when the nearest nodes belong to other users"""
+        monkeypatch.setattr(MemoryGraph, "VECTOR_INDEX_MAX_CANDIDATES", max_candidates)
+        mock_embedder_factory.create.return_value = mock_embedding_model
+        mock_llm_factory.create.return_value = mock_llm
+        self.embeddings["alicia"] = [value + 0.01 for value in self.embeddings["alice"]]
+
+        kuzu_memory = MemoryGraph(mock_config)
+        assert kuzu_memory.use_vector_index
+        kuzu_memory._add_entities(
+            [{"source": "alice", "destination": "bob", "relationship": "knows"}], {"user_id": "test_user"}, {}
+        )
+        # More nodes of other users than candidates, all of them nearer to "alicia" than the user's "alice"
+        for i in range(mock_config.graph_store.config.vector_index_candidates + 10):
+            kuzu_memory._add_entities(
+                [{"source": "alicia", "destination": "dave", "relationship": "knows"}], {"user_id": f"other_{i}"}, {}
+            )
+
+        result = kuzu_memory._add_entities(
+            [{"source": "alicia", "destination": "charlie", "relationship": "knows"}], {"user_id": "test_user"}, {}
+        )
+        assert result == [[{"source": "alice", "relationship": "knows", "target": "charlie"}]]
+
+    @patch("mem0.memory.kuzu_memory.EmbedderFactory")
+    @patch("mem0.memory.kuzu_memory.LlmFactory")
+    def test_kuzu_iter_all_and_batched_delete_all(
+        self, mock_llm_factory, mock_embedder_factory, mock_config, mock_embedding_model, mock_llm
+    ):
+        """Test that relations are paged with a cursor and nodes are deleted in batches"""
+        mock_embedder_factory.create.return_value = mock_embedding_model
+        mock_llm_factory.create.return_value = mock_llm
+
+        kuzu_memory = MemoryGraph(mock_config)
+        filters = {"user_id": "test_user"}
+        kuzu_memory._add_entities(
+            [
+                {"source": "alice", "destination": "bob", "relationship": "knows"},
+                {"source": "bob", "destination": "charlie", "relationship": "knows"},
+                {"source": "charlie", "destination": "alice", "relationship": "knows"},
+                {"source": "dave", "destination": "alice", "relationship": "admires"},
+            ],
+            filters,
+            {},
+        )
+        kuzu_memory._add_entities(
+            [{"source": "alice", "destination": "bob", "relationship": "knows"}], {"user_id": "other_user"}, {}
+        )
+
+        results = list(kuzu_memory.iter_all(filters, batch_size=3))
+        assert sorted(f"{r['source']}_{r['relationship']}_{r['target']}" for r in results) == [
+            "alice_knows_bob",
+            "bob_knows_charlie",
+            "charlie_knows_alice",
+            "dave_admires_alice",
+        ]
+
+        kuzu_memory.delete_all(filters, batch_size=3)
+        assert get_node_count(kuzu_memory) == 2
+        assert list(kuzu_memory.iter_all({"user_id": "other_user"})) == [
+            {"source": "alice", "relationship": "knows", "target": "bob"}
+        ]
+
 def get_node_count(kuzu_memory):
     results = kuzu_memory.kuzu_execute(
         """
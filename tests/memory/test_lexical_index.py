@@ -0,0 +1,43 @@
+from mem0.memory.lexical_index import LexicalIndex, tokenize
+
+
+def test_tokenize_splits_words_and_cjk_bigrams():
+    assert tokenize("Alice likes ice_cream") == ["alice", "likes", "ice", "cream"]
+    assert tokenize("我喜欢周杰伦") == ["我喜", "喜欢", "欢周", "周杰", "杰伦"]
+    assert tokenize("猫 and dogs") == ["猫", "and", "dogs"]
+
+
+def test_match_entities_requires_every_name_token():
+    index = LexicalIndex()
+    index.add_names(["alice", "ice_cream", "周杰伦", "bob"])
+
+    assert index.match_entities("Does Alice like ice cream?") == ["alice", "ice_cream"]
+    assert index.match_entities("malice and cream") == []
+    assert index.match_entities("我想听周杰伦的歌") == ["周杰伦"]
+
+
+def test_top_n_prefers_matching_relations_and_keeps_order_on_ties():
+    index = LexicalIndex()
+    relations = [
+        {"source": "alice", "relationship": "lives_in", "destination": "paris"},
+        {"source": "alice", "relationship": "likes", "destination": "pizza"},
+        {"source": "bob", "relationship": "likes", "destination": "sushi"},
+    ]
+    index.add_relations(relations)
+
+    assert index.top_n("who likes pizza", relations, n=2) == [relations[1], relations[2]]
+    assert index.top_n("nothing relevant", relations, n=5) == relations
+
+
+def test_remove_relations_updates_statistics():
+    index = LexicalIndex()
+    relation = {"source": "alice", "relationship": "likes", "destination": "pizza"}
+    index.add_relations([relation, relation])
+    assert len(index) == 1
+
+    index.remove_relations([relation])
+    index.remove_relations([relation])
+
+    assert len(index) == 0
+    assert index._total_length == 0
+    assert index.entity_names == {"alice", "pizza"}
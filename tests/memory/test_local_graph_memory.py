@@ -0,0 +1,256 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from mem0.memory.local_graph_memory import LocalGraphStore, MemoryGraph
+
+
+class TestLocalGraphMemory:
+    """Test that the in-process graph memory works correctly"""
+
+    embeddings = {
+        "alice": np.random.uniform(0.0, 0.9, 384).tolist(),
+        "bob": np.random.uniform(0.0, 0.9, 384).tolist(),
+        "charlie": np.random.uniform(0.0, 0.9, 384).tolist(),
+        "dave": np.random.uniform(0.0, 0.9, 384).tolist(),
+    }
+
+    @pytest.fixture
+    def mock_config(self):
+        config = Mock()
+        config.embedder.provider = "mock_embedder"
+        config.embedder.config = {"model": "mock_model"}
+        config.vector_store.config = {"dimensions": 384}
+        config.graph_store.config.path = None
+        config.graph_store.config.snapshot_every = 1000
+        config.graph_store.combined_extraction = False
+        config.graph_store.custom_prompt = None
+        config.llm.provider = "mock_llm"
+        config.llm.config = {"api_key": "test_key"}
+        return config
+
+    @pytest.fixture
+    def mock_embedding_model(self):
+        mock_model = Mock()
+        mock_model.embed.side_effect = lambda text: self.embeddings[text]
+        mock_model.embed_batch.side_effect = lambda texts: [self.embeddings[text] for text in texts]
+        return mock_model
+
+    @pytest.fixture
+    def graph(self, mock_config, mock_embedding_model):
+        with (
+            patch("mem0.memory.local_graph_memory.EmbedderFactory") as mock_embedder_factory,
+            patch("mem0.memory.local_graph_memory.LlmFactory") as mock_llm_factory,
+        ):
+            mock_embedder_factory.create.return_value = mock_embedding_model
+            mock_llm_factory.create.return_value = Mock()
+            yield MemoryGraph(mock_config)
+
+    def test_add_search_delete(self, graph):
+        filters = {"user_id": "test_user", "agent_id": "test_agent", "run_id": "test_run"}
+        data1 = [
+            {"source": "alice", "destination": "bob", "relationship": "knows"},
+            {"source": "bob", "destination": "charlie", "relationship": "knows"},
+            {"source": "charlie", "destination": "alice", "relationship": "knows"},
+        ]
+        data2 = [{"source": "charlie", "destination": "alice", "relationship": "likes"}]
+
+        result = graph._add_entities(data1, filters, {})
+        assert result[0] == [{"source": "alice", "relationship": "knows", "target": "bob"}]
+        assert result[2] == [{"source": "charlie", "relationship": "knows", "target": "alice"}]
+        assert len(graph.store.nodes) == 3
+        assert get_edge_count(graph) == 3
+
+        graph._add_entities(data2, filters, {})
+        graph._add_entities([{"source": "dave", "destination": "alice", "relationship": "admires"}], filters, {})
+        assert len(graph.store.nodes) == 4
+        assert get_edge_count(graph) == 5
+
+        results = graph.get_all(filters)
+        assert {f"{r['source']}_{r['relationship']}_{r['target']}" for r in results} == {
+            "alice_knows_bob",
+            "bob_knows_charlie",
+            "charlie_likes_alice",
+            "charlie_knows_alice",
+            "dave_admires_alice",
+        }
+        assert len(graph.get_all(filters, limit=2)) == 2
+        assert graph.get_all({"user_id": "other_user"}) == []
+
+        results = graph._search_graph_db(["bob"], filters, threshold=0.8)
+        assert {f"{r['source']}_{r['relationship']}_{r['destination']}" for r in results} == {
+            "alice_knows_bob",
+            "bob_knows_charlie",
+        }
+        assert all(r["similarity"] == pytest.approx(1.0) for r in results)
+
+        # Both entities reach bob_knows_charlie, it is returned once
+        results = graph._search_graph_db(["bob", "charlie"], filters, threshold=0.8)
+        relations = [f"{r['source']}_{r['relationship']}_{r['destination']}" for r in results]
+        assert len(relations) == len(set(relations))
+        assert "charlie_likes_alice" in relations
+
+        result = graph._delete_entities(data2, filters)
+        assert result[0] == [{"source": "charlie", "relationship": "likes", "target": "alice"}]
+        assert get_edge_count(graph) == 4
+
+        graph.delete_all(filters)
+        assert len(graph.store.nodes) == 0
+        assert get_edge_count(graph) == 0
+
+        graph._add_entities(data2, filters, {})
+        assert len(graph.store.nodes) == 2
+        graph.reset()
+        assert len(graph.store.nodes) == 0
+
+    def test_add_resolves_similar_nodes(self, graph):
+        self.embeddings["alicia"] = [value + 0.01 for value in self.embeddings["alice"]]
+        filters = {"user_id": "test_user"}
+
+        result = graph._add_entities(
+            [
+                {"source": "alice", "destination": "bob", "relationship": "knows"},
+                {"source": "alice", "destination": "bob", "relationship": "knows"},
+            ],
+            filters,
+            {},
+        )
+        assert result == [[{"source": "alice", "relationship": "knows", "target": "bob"}]] * 2
+
+        result = graph._add_entities(
+            [{"source": "alicia", "destination": "charlie", "relationship": "knows"}], filters, {}
+        )
+        assert result == [[{"source": "alice", "relationship": "knows", "target": "charlie"}]]
+        assert sorted(node["name"] for node in graph.store.nodes.values()) == ["alice", "bob", "charlie"]
+
+        (alice_id,) = graph.store.ids_by_name("alice", filters)
+        (bob_id,) = graph.store.ids_by_name("bob", filters)
+        assert graph.store.nodes[alice_id]["mentions"] == 3
+        assert graph.store.out_edges[alice_id][("knows", bob_id)]["mentions"] == 2
+
+    def test_concurrent_adds_create_a_node_once(self, graph):
+        filters = {"user_id": "test_user"}
+        to_be_added = [{"source": "alice", "destination": "bob", "relationship": "knows"}]
+        most_similar = graph.store.most_similar
+
+        def slow_most_similar(*args):
+            # Widen the gap between resolving the names and creating the nodes
+            time.sleep(0.01)
+            return most_similar(*args)
+
+        graph.store.most_similar = slow_most_similar
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: graph._add_entities(to_be_added, filters, {}), range(16)))
+
+        assert sorted(node["name"] for node in graph.store.nodes.values()) == ["alice", "bob"]
+        (alice_id,) = graph.store.ids_by_name("alice", filters)
+        assert graph.store.nodes[alice_id]["mentions"] == 16
+
+    def test_iter_all_and_batched_delete_all(self, graph):
+        filters = {"user_id": "test_user"}
+        graph._add_entities(
+            [
+                {"source": "alice", "destination": "bob", "relationship": "knows"},
+                {"source": "bob", "destination": "charlie", "relationship": "knows"},
+                {"source": "dave", "destination": "alice", "relationship": "admires"},
+            ],
+            filters,
+            {},
+        )
+        graph._add_entities([{"source": "alice", "destination": "bob", "relationship": "knows"}], {"user_id": "u2"}, {})
+
+        results = list(graph.iter_all(filters, batch_size=1))
+        assert sorted(f"{r['source']}_{r['relationship']}_{r['target']}" for r in results) == [
+            "alice_knows_bob",
+            "bob_knows_charlie",
+            "dave_admires_alice",
+        ]
+
+        graph.delete_all(filters, batch_size=3)
+        assert len(graph.store.nodes) == 2
+        assert graph.get_all({"user_id": "u2"}) == [{"source": "alice", "relationship": "knows", "target": "bob"}]
+
+    def test_search_without_entities_uses_the_query_embedding(self, graph):
+        filters = {"user_id": "test_user"}
+        graph._add_entities([{"source": "alice", "destination": "bob", "relationship": "knows"}], filters, {})
+        graph._retrieve_nodes_from_data = Mock(return_value={})
+        context = Mock(embedding=self.embeddings["alice"])
+
+        results = graph.search("who does she know", filters, context=context)
+
+        assert results == [{"source": "alice", "relationship": "knows", "destination": "bob"}]
+
+    def test_combined_extraction_falls_back_without_tool_calls(self, graph, mock_config):
+        mock_config.graph_store.combined_extraction = True
+        graph.llm.generate_response.return_value = "no tools here"
+        graph._retrieve_nodes_from_data = Mock(return_value={"alice": "person"})
+        graph._establish_nodes_relations_from_data = Mock(return_value=[])
+        graph._add_entities = Mock(return_value=[])
+
+        graph.add("Alice", {"user_id": "test_user"})
+
+        graph.llm.generate_response.assert_called_once()
+        graph._retrieve_nodes_from_data.assert_called_once_with("Alice", {"user_id": "test_user"})
+        graph._establish_nodes_relations_from_data.assert_called_once_with(
+            "Alice", {"user_id": "test_user"}, {"alice": "person"}
+        )
+
+def test_local_graph_store_persistence(tmp_path):
+    filters = {"user_id": "test_user"}
+    embedding = [1.0, 0.0, 0.0]
+    store = LocalGraphStore(path=str(tmp_path), snapshot_every=3)
+    alice, bob = store.add_nodes(
+        [
+            {"name": "alice", "user_id": "test_user", "mentions": 1, "embedding": embedding},
+            {"name": "bob", "user_id": "test_user", "mentions": 1, "embedding": [0.0, 1.0, 0.0]},
+        ]
+    )
+    store.merge_edges([(alice, "knows", bob, 1)])
+    # The third record triggers a snapshot and truncates the write-ahead log
+    store.merge_edges([(alice, "knows", bob, 1)])
+    assert (tmp_path / "snapshot.npz").exists()
+    assert (tmp_path / "wal.jsonl").read_text() == ""
+
+    (charlie,) = store.add_nodes([{"name": "charlie", "user_id": "test_user", "mentions": 1, "embedding": embedding}])
+    store.merge_edges([(bob, "knows", charlie, 1)])
+    store.delete_edges([(alice, "knows", bob)])
+    store.close()
+
+    # A torn write at the end of the log is ignored
+    with open(tmp_path / "wal.jsonl", "a") as f:
+        f.write('{"op": "delete_nodes", "ids": [')
+
+    reloaded = LocalGraphStore(path=str(tmp_path))
+    assert {node["name"] for node in reloaded.nodes.values()} == {"alice", "bob", "charlie"}
+    assert reloaded.has_edge(bob, "knows", charlie)
+    assert not reloaded.has_edge(alice, "knows", bob)
+    assert reloaded.most_similar([embedding], reloaded.scope_ids(filters), 0.9, top_k=2)[0] == [
+        (alice, pytest.approx(1.0)),
+        (charlie, pytest.approx(1.0)),
+    ]
+    # Records written after the torn one survive the next reload
+    reloaded.delete_nodes([charlie])
+    reloaded.close()
+    assert set(LocalGraphStore(path=str(tmp_path)).nodes) == {alice, bob}
+
+
+
+def test_empty_writes_are_not_logged(tmp_path):
+    store = LocalGraphStore(path=str(tmp_path))
+
+    assert store.add_nodes([]) == []
+    store.mention_nodes({})
+    store.merge_edges([])
+    store.delete_edges([])
+    store.delete_nodes([])
+    store.close()
+
+    assert (tmp_path / "wal.jsonl").read_text() == ""
+
+
+def get_edge_count(graph):
+    return sum(len(edges) for edges in graph.store.out_edges.values())
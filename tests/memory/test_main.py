@@ -1,8 +1,10 @@
+import json
 import logging
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from mem0.configs.prompts import get_update_memory_messages
 from mem0.memory.main import AsyncMemory, Memory
 
 
@@ -10,6 +12,7 @@ def _setup_mocks(mocker):
     """Helper to setup common mocks for both sync and async fixtures"""
     mock_embedder = mocker.MagicMock()
     mock_embedder.return_value.embed.return_value = [0.1, 0.2, 0.3]
+    mock_embedder.return_value.embed_batch.side_effect = lambda texts, *args: [[0.1, 0.2, 0.3]] * len(texts)
     mocker.patch("mem0.utils.factory.EmbedderFactory.create", mock_embedder)
 
     mock_vector_store = mocker.MagicMock()
@@ -77,6 +80,149 @@ class TestAddToVectorStoreErrors:
         assert "Invalid JSON response" in caplog.text
 
 
+class TestMessageFilter:
+    def test_content_free_messages_skip_fact_extraction(self, mocker):
+        _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+        memory = Memory.from_config({"fact_extraction_filter": {}})
+
+        result = memory._add_to_vector_store(
+            messages=[{"role": "user", "content": "Thanks!"}], metadata={}, filters={}, infer=True
+        )
+
+        assert result == []
+        memory.llm.generate_response.assert_not_called()
+        assert memory.message_filter.stats()["skipped"] == 1
+
+
+class TestUpdateMemoryTokenBudget:
+    def test_large_fact_sets_are_split_into_parallel_update_calls(self, mocker):
+        mock_llm, mock_vector_store = _setup_mocks(mocker)
+        memory = Memory()
+        memory.update_memory_token_budget = len(get_update_memory_messages([], [])) + 80
+        memory.llm.count_tokens = len
+        memory._create_memory = mocker.MagicMock(return_value="new-id")
+        memory._update_memory = mocker.MagicMock()
+        mocker.patch("mem0.memory.main.capture_event")
+
+        facts = ["likes coffee every morning", "drinks green tea at night", "lives in Berlin now"]
+        shared = mocker.MagicMock(id="mem-a", payload={"data": "likes tea"})
+        memory.vector_store.search_batch.return_value = [
+            [shared],
+            [shared],
+            [mocker.MagicMock(id="mem-b", payload={"data": "lives in Paris"})],
+        ]
+
+        def generate_response(messages, response_format):
+            prompt = messages[-1]["content"]
+            if "Input:" in prompt:
+                return json.dumps({"facts": facts})
+            if facts[0] in prompt:
+                return '{"memory": [{"id": "0", "text": "likes coffee", "event": "UPDATE"}]}'
+            if facts[1] in prompt:
+                return '{"memory": [{"id": "0", "text": "likes tea at night", "event": "UPDATE"}]}'
+            return '{"memory": [{"id": "1", "text": "lives in Berlin", "event": "ADD"}]}'
+
+        memory.llm.generate_response.side_effect = generate_response
+
+        result = memory._add_to_vector_store(
+            messages=[{"role": "user", "content": "test"}], metadata={}, filters={}, infer=True
+        )
+
+        # One extraction call and one update call per fact
+        assert memory.llm.generate_response.call_count == 4
+        memory._update_memory.assert_called_once()
+        assert memory._update_memory.call_args.kwargs["memory_id"] == "mem-a"
+        assert [item["event"] for item in result] == ["UPDATE", "ADD"]
+
+
+    @pytest.mark.parametrize("extra_budget", [80, 10_000])
+    def test_memory_shared_by_facts_is_shown_once_with_its_temporary_id(self, mocker, extra_budget):
+        _setup_mocks(mocker)
+        memory = Memory()
+        memory.update_memory_token_budget = len(get_update_memory_messages([], [])) + extra_budget
+        memory.llm.count_tokens = len
+        memory._update_memory = mocker.MagicMock()
+        mocker.patch("mem0.memory.main.capture_event")
+
+        facts = ["likes coffee every morning", "drinks green tea at night"]
+        memory.vector_store.search_batch.return_value = [
+            [mocker.MagicMock(id="uuid-a", payload={"data": "likes tea"})],
+            [mocker.MagicMock(id="uuid-a", payload={"data": "likes tea"})],
+        ]
+        update_prompts = []
+
+        def generate_response(messages, response_format):
+            prompt = messages[-1]["content"]
+            if "Input:" in prompt:
+                return json.dumps({"facts": facts})
+            update_prompts.append(prompt)
+            return '{"memory": [{"id": "0", "text": "likes coffee and tea", "event": "UPDATE"}]}'
+
+        memory.llm.generate_response.side_effect = generate_response
+
+        memory._add_to_vector_store(messages=[{"role": "user", "content": "test"}], metadata={}, filters={}, infer=True)
+
+        assert update_prompts
+        for prompt in update_prompts:
+            assert "uuid-a" not in prompt
+            assert prompt.count("'id': '0'") == 1
+        memory._update_memory.assert_called_once()
+        assert memory._update_memory.call_args.kwargs["memory_id"] == "uuid-a"
+
+
+class TestStreamMemoryActions:
+    def test_actions_are_applied_while_the_response_streams(self, mocker):
+        _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+        memory = Memory.from_config({"stream_memory_actions": True})
+        memory._create_memory = mocker.MagicMock(return_value="new-id")
+        memory._delete_memory = mocker.MagicMock()
+        memory.llm.generate_response.return_value = '{"facts": ["lives in Berlin"]}'
+        memory.vector_store.search_batch.return_value = [[mocker.MagicMock(id="mem-a", payload={"data": "Paris"})]]
+
+        def stream_json_items(messages, key, response_format):
+            yield {"id": "0", "text": "Paris", "event": "DELETE"}
+            # The first action has been applied before the model writes the second one
+            memory._delete_memory.assert_called_once_with(memory_id="mem-a")
+            memory._create_memory.assert_not_called()
+            yield {"id": "1", "text": "lives in Berlin", "event": "ADD"}
+
+        memory.llm.stream_json_items.side_effect = stream_json_items
+
+        result = memory._add_to_vector_store(
+            messages=[{"role": "user", "content": "I moved to Berlin"}], metadata={}, filters={}, infer=True
+        )
+
+        assert [item["event"] for item in result] == ["DELETE", "ADD"]
+        assert memory.llm.stream_json_items.call_args.kwargs["key"] == "memory"
+
+    @pytest.mark.asyncio
+    async def test_async_split_prompts_stream_concurrently(self, mocker):
+        _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+        memory = await AsyncMemory.from_config({"stream_memory_actions": True})
+        memory._create_memory = AsyncMock(return_value="new-id")
+        memory._update_memory = AsyncMock()
+        memory.llm.agenerate_response = AsyncMock(return_value='{"facts": ["a", "b"]}')
+        memory._get_update_memory_prompts = mocker.MagicMock(return_value=["prompt a", "prompt b"])
+        memory.vector_store.search_batch.return_value = [[mocker.MagicMock(id="mem-a", payload={"data": "x"})]] * 2
+
+        async def astream_json_items(messages, key, response_format):
+            yield {"id": "0", "text": messages[0]["content"], "event": "UPDATE"}
+            yield {"id": "1", "text": messages[0]["content"], "event": "ADD"}
+
+        memory.llm.astream_json_items = astream_json_items
+
+        result = await memory._add_to_vector_store(
+            messages=[{"role": "user", "content": "test"}], metadata={}, effective_filters={}, infer=True
+        )
+
+        # Both calls saw memory 0, only the first change to it is applied
+        memory._update_memory.assert_awaited_once()
+        assert sorted(item["event"] for item in result) == ["ADD", "ADD", "UPDATE"]
+
+
 @pytest.mark.asyncio
 class TestAsyncAddToVectorStoreErrors:
     @pytest.fixture
@@ -96,7 +242,7 @@ class TestAsyncAddToVectorStoreErrors:
     async def test_async_empty_llm_response_fact_extraction(self, mock_async_memory, caplog, mocker):
         """Test empty response in AsyncMemory._add_to_vector_store"""
         mocker.patch("mem0.utils.factory.EmbedderFactory.create", return_value=MagicMock())
-        mock_async_memory.llm.generate_response.return_value = ""
+        mock_async_memory.llm.agenerate_response = AsyncMock(return_value="")
         mock_capture_event = mocker.MagicMock()
         mocker.patch("mem0.memory.main.capture_event", mock_capture_event)
 
@@ -104,7 +250,8 @@ class TestAsyncAddToVectorStoreErrors:
             result = await mock_async_memory._add_to_vector_store(
                 messages=[{"role": "user", "content": "test"}], metadata={}, effective_filters={}, infer=True
             )
-        assert mock_async_memory.llm.generate_response.call_count == 1
+        assert mock_async_memory.llm.agenerate_response.await_count == 1
+        mock_async_memory.llm.generate_response.assert_not_called()
         assert result == []
         assert "Error in new_retrieved_facts" in caplog.text
         assert mock_capture_event.call_count == 1
@@ -113,7 +260,7 @@ class TestAsyncAddToVectorStoreErrors:
     async def test_async_empty_llm_response_memory_actions(self, mock_async_memory, caplog, mocker):
         """Test empty response in AsyncMemory._add_to_vector_store"""
         mocker.patch("mem0.utils.factory.EmbedderFactory.create", return_value=MagicMock())
-        mock_async_memory.llm.generate_response.side_effect = ['{"facts": ["test fact"]}', ""]
+        mock_async_memory.llm.agenerate_response = AsyncMock(side_effect=['{"facts": ["test fact"]}', ""])
         mock_capture_event = mocker.MagicMock()
         mocker.patch("mem0.memory.main.capture_event", mock_capture_event)
 
@@ -0,0 +1,154 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mem0.configs.prompts import UPDATE_MEMORY_SCHEMA, get_update_memory_messages, get_update_memory_system_prompt
+from mem0.memory.utils import (
+    JSONArrayStreamParser,
+    assign_temp_memory_ids,
+    build_update_memory_prompts,
+    count_tokens,
+    get_fact_retrieval_messages,
+    get_json_response_format,
+    get_update_memory_chat_messages,
+    merge_memory_actions,
+)
+
+BASE_PROMPT_SIZE = len(get_update_memory_messages([], []))
+
+
+def memory(memory_id, text):
+    return {"id": memory_id, "text": text}
+
+
+def test_count_tokens_falls_back_to_utf8_size():
+    with patch("mem0.memory.utils._get_token_encoding", return_value=None):
+        assert count_tokens("abcdef") == 2
+        assert count_tokens("喜欢咖啡") == 4
+    assert count_tokens("I like coffee") > 0
+
+
+def test_update_prompt_within_budget_is_unchanged():
+    memories_by_fact = [[memory("0", "likes tea"), memory("1", "lives in Paris")], [memory("0", "likes tea")]]
+    facts = ["likes coffee", "moved to Berlin"]
+
+    prompts = build_update_memory_prompts(memories_by_fact, facts, None, BASE_PROMPT_SIZE + 1000, len)
+
+    assert prompts == [get_update_memory_messages([memory("0", "likes tea"), memory("1", "lives in Paris")], facts)]
+
+
+def test_update_prompt_keeps_closest_memories_and_splits_facts():
+    memories_by_fact = [
+        [memory("0", "a" * 20), memory("1", "b" * 20)],
+        [memory("2", "c" * 20), memory("0", "a" * 20)],
+        [memory("3", "d" * 20)],
+    ]
+    facts = ["x" * 20, "y" * 20, "z" * 20]
+    fact_cost = len(repr(facts[0])) + 1
+    memory_cost = len(repr(memories_by_fact[0][0])) + 1
+
+    # Two facts fit in half the room, the rest is enough for only two memories
+    available = 2 * fact_cost + 2 * memory_cost + 1
+    prompts = build_update_memory_prompts(memories_by_fact, facts, None, BASE_PROMPT_SIZE + available, len)
+
+    assert prompts == [
+        get_update_memory_messages([memory("0", "a" * 20), memory("2", "c" * 20)], facts[:2]),
+        get_update_memory_messages([memory("3", "d" * 20)], facts[2:]),
+    ]
+    assert all(len(prompt) <= BASE_PROMPT_SIZE + available for prompt in prompts)
+
+
+def test_merge_memory_actions_keeps_first_change_per_memory():
+    merged = merge_memory_actions(
+        [
+            {"memory": [{"id": "0", "text": "likes coffee", "event": "UPDATE"}]},
+            {"memory": [{"id": "0", "text": "likes green tea", "event": "UPDATE"}, {"id": "1", "event": "ADD"}]},
+            {},
+            "not a dict",
+        ]
+    )
+
+    assert merged == {"memory": [{"id": "0", "text": "likes coffee", "event": "UPDATE"}, {"id": "1", "event": "ADD"}]}
+
+
+ACTIONS = [
+    {"id": "0", "text": "likes {coffee}, \"black\"", "event": "UPDATE", "old_memory": "likes tea ]"},
+    {"id": "1", "text": "lives in Berlin", "event": "ADD"},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_stream_parser_yields_items_as_they_complete(chunk_size):
+    response = "```json\n" + json.dumps({"memory": ACTIONS}, indent=2, ensure_ascii=False) + "\n```"
+    parser = JSONArrayStreamParser("memory")
+
+    items, completed_at = [], []
+    for start in range(0, len(response), chunk_size):
+        for item in parser.feed(response[start : start + chunk_size]):
+            items.append(item)
+            completed_at.append(start)
+    items.extend(parser.close())
+
+    assert items == ACTIONS
+    assert parser.finished
+    if chunk_size == 1:
+        # The first action is handed out before the second one has been written
+        assert completed_at[0] < response.index('"lives in Berlin"')
+
+
+def test_stream_parser_scalars_and_fallback():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('{"facts": ["a, b", 1') == ["a, b"]
+    assert parser.feed(", true]}") == [1, True]
+
+    # A response where the array does not follow its key directly is parsed when the stream ends
+    parser = JSONArrayStreamParser("memory")
+    assert parser.feed('{"result": {"memory": null}, "memory"') == []
+    assert parser.feed(": {}}") == []
+    assert parser.close() == []
+
+    # Invalid items are skipped, a truncated stream keeps the items completed before it broke off
+    parser = JSONArrayStreamParser("memory")
+    assert parser.feed('{"memory" : [{"id": "0"}, {"id": 1, broken}, {"id": "2"}, {"id"') == [{"id": "0"}, {"id": "2"}]
+    assert parser.close() == []
+
+
+def test_update_prompt_instructions_are_sent_as_system_message():
+    prompt = get_update_memory_messages([memory("0", "likes tea")], ["likes coffee"], "custom instructions")
+
+    system, user = get_update_memory_chat_messages(prompt, "custom instructions")
+    assert system == {"role": "system", "content": get_update_memory_system_prompt("custom instructions").strip()}
+    assert user["role"] == "user"
+    assert "likes tea" in user["content"] and "likes coffee" in user["content"]
+
+    # Prompts built some other way are sent as they are
+    assert get_update_memory_chat_messages("custom prompt") == [{"role": "user", "content": "custom prompt"}]
+
+
+def test_fact_retrieval_date_is_part_of_the_input():
+    system_prompt, user_prompt = get_fact_retrieval_messages("user: hi")
+    assert user_prompt.startswith("当前日期: ")
+    assert user_prompt.endswith("Input:\nuser: hi")
+
+
+def test_json_schema_is_only_requested_from_backends_enforcing_it():
+    # Mocked LLMs answer every attribute, only an explicit True counts
+    assert get_json_response_format(MagicMock(), "memory_actions", UPDATE_MEMORY_SCHEMA) == {"type": "json_object"}
+
+    llm = MagicMock(supports_json_schema=True)
+    assert get_json_response_format(llm, "memory_actions", UPDATE_MEMORY_SCHEMA) == {
+        "type": "json_schema",
+        "json_schema": {"name": "memory_actions", "schema": UPDATE_MEMORY_SCHEMA},
+    }
+
+
+def test_temporary_ids_are_shared_by_facts_retrieving_the_same_memory():
+    by_fact = [[memory("uuid-a", "likes tea")], [memory("uuid-b", "in Paris"), memory("uuid-a", "likes tea")]]
+    unique = [memory("uuid-a", "likes tea"), memory("uuid-b", "in Paris")]
+
+    memories, memories_by_fact, mapping = assign_temp_memory_ids(unique, by_fact)
+
+    assert memories == [memory("0", "likes tea"), memory("1", "in Paris")]
+    assert memories_by_fact == [[memory("0", "likes tea")], [memory("1", "in Paris"), memory("0", "likes tea")]]
+    assert mapping == {"0": "uuid-a", "1": "uuid-b"}
@@ -0,0 +1,63 @@
+import pytest
+
+from mem0.memory.message_filter import MessageFilter
+
+
+def user(content):
+    return {"role": "user", "content": content}
+
+
+def assistant(content):
+    return {"role": "assistant", "content": content}
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [
+        [user("Hi there! Thanks :)")],
+        [user("you're welcome")],
+        [user("hello"), assistant("Hello! How can I help you today?")],
+        [user("你好，谢谢！"), assistant("不客气！有什么可以帮您的吗？")],
+        [user("ありがとうございます")],
+        [user("👍🙏")],
+        [user("k.")],
+        [{"role": "system", "content": "You are a helpful assistant."}, {"role": "tool", "content": "{}"}],
+    ],
+)
+def test_content_free_messages_are_skipped(messages):
+    assert not MessageFilter().should_extract(messages)
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [
+        [user("Hi, I'm Bob and I love history")],
+        [user("我对花生过敏")],
+        [user("No"), assistant("Do you eat meat?")],
+        [user("42")],
+        [user([{"type": "image_url", "image_url": {"url": "https://example.com/cat.png"}}])],
+    ],
+)
+def test_messages_with_facts_are_extracted(messages):
+    assert MessageFilter().should_extract(messages)
+
+
+def test_custom_phrases_classifier_and_stats():
+    scores = {"the weather is nice": 0.1}
+    message_filter = MessageFilter(
+        stop_phrases=["Roger that!", "收到了"], classifier=lambda text: scores.get(text, 0.9)
+    )
+
+    assert not message_filter.should_extract([user("roger that")])
+    assert not message_filter.should_extract([user("收到了")])
+    assert not message_filter.should_extract([user("the weather is nice")])
+    assert message_filter.should_extract([user("I moved to Berlin")])
+
+    assert message_filter.stats() == {
+        "checked": 4,
+        "skipped": 3,
+        "empty": 0,
+        "stop_phrases": 2,
+        "too_short": 0,
+        "classifier": 1,
+    }
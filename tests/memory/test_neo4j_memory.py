@@ -0,0 +1,478 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mem0.memory.graph_memory import MemoryGraph
+from mem0.memory.utils import SearchContext
+
+
+class TestNeo4jMemoryGraph:
+    """Test the Neo4j MemoryGraph query batching"""
+
+    @pytest.fixture
+    def mock_config(self):
+        config = Mock()
+        config.embedder.provider = "mock_embedder"
+        config.embedder.config = {"model": "mock_model"}
+        config.vector_store.config = {"dimensions": 3}
+        config.graph_store.config.base_label = True
+        config.graph_store.config.vector_index = True
+        config.graph_store.config.vector_index_candidates = 50
+        config.graph_store.config.entity_match_fast_path = True
+        config.graph_store.config.lexical_index_max_rows = 100_000
+        config.graph_store.config.lexical_index_refresh_seconds = 60
+        config.graph_store.llm = None
+        config.graph_store.custom_prompt = None
+        config.graph_store.combined_extraction = False
+        config.llm.provider = "mock_llm"
+        config.llm.config = {"api_key": "test_key"}
+        return config
+
+    @pytest.fixture
+    def embedding_model(self):
+        model = Mock()
+        model.config.embedding_dims = 3
+        model.embed_batch.side_effect = lambda texts, memory_action=None: [[float(len(t)), 0.0, 1.0] for t in texts]
+        return model
+
+    @pytest.fixture
+    def graph_memory(self, mock_config, embedding_model):
+        with (
+            patch("mem0.memory.graph_memory.Neo4jGraph") as mock_graph,
+            patch("mem0.memory.graph_memory.EmbedderFactory") as mock_embedder_factory,
+            patch("mem0.memory.graph_memory.LlmFactory") as mock_llm_factory,
+        ):
+            mock_embedder_factory.create.return_value = embedding_model
+            mock_llm_factory.create.return_value = Mock()
+            mock_graph.return_value.query.return_value = []
+            memory = MemoryGraph(mock_config)
+            memory.graph = mock_graph.return_value
+            memory.graph.query.reset_mock()
+            yield memory
+
+    def test_add_entities_uses_one_embedding_call_and_two_queries(self, graph_memory, embedding_model):
+        to_be_added = [
+            {"source": "alice", "relationship": "likes", "destination": "bob"},
+            {"source": "alice", "relationship": "knows", "destination": "carol"},
+            {"source": "bob", "relationship": "likes", "destination": "carol"},
+        ]
+        graph_memory.graph.query.side_effect = [
+            [{"name": "alice", "node_id": "4:abc:1"}],
+            [
+                {"source": "alice", "relationship": "likes", "target": "bob"},
+                {"source": "alice", "relationship": "knows", "target": "carol"},
+                {"source": "bob", "relationship": "likes", "target": "carol"},
+            ],
+        ]
+
+        result = graph_memory._add_entities(to_be_added, {"user_id": "u1"}, {"alice": "person", "bob": "person"})
+
+        embedding_model.embed_batch.assert_called_once_with(["alice", "bob", "carol"])
+        embedding_model.embed.assert_not_called()
+        assert graph_memory.graph.query.call_count == 2
+
+        cypher = graph_memory.graph.query.call_args_list[1][0][0]
+        params = graph_memory.graph.query.call_args[1]["params"]
+        assert "UNWIND $nodes AS node" in cypher
+        assert "UNWIND $relations AS rel" in cypher
+        assert "MERGE (source)-[r:`likes`]->(destination)" in cypher
+        assert "MERGE (source)-[r:`knows`]->(destination)" in cypher
+        nodes = {node["name"]: node for node in params["nodes"]}
+        assert nodes["alice"]["id"] == "4:abc:1"
+        assert nodes["alice"]["mentions"] == 2
+        assert nodes["carol"]["id"] is None
+        assert nodes["carol"]["type"] == "__User__"
+        assert params["node_types"] == ["person", "__User__"]
+        assert params["relationship_types"] == ["likes", "knows"]
+        assert len(result) == 3
+
+    def test_add_entities_scopes_merge_by_agent_and_run(self, graph_memory):
+        graph_memory.graph.query.side_effect = [[], []]
+
+        graph_memory._add_entities(
+            [{"source": "alice", "relationship": "likes", "destination": "bob"}],
+            {"user_id": "u1", "agent_id": "a1", "run_id": "r1"},
+            {},
+        )
+
+        cypher = graph_memory.graph.query.call_args[0][0]
+        params = graph_memory.graph.query.call_args[1]["params"]
+        assert "{name: node.name, user_id: $user_id, agent_id: $agent_id, run_id: $run_id}" in cypher
+        assert params["agent_id"] == "a1"
+        assert params["run_id"] == "r1"
+
+    def test_add_entities_with_nothing_to_add(self, graph_memory, embedding_model):
+        assert graph_memory._add_entities([], {"user_id": "u1"}, {}) == []
+        graph_memory.graph.query.assert_not_called()
+        embedding_model.embed_batch.assert_not_called()
+
+    def test_node_resolution_uses_vector_index(self, graph_memory):
+        assert graph_memory.use_vector_index
+        graph_memory.graph.query.return_value = [{"name": "alice", "node_id": "4:abc:1"}]
+
+        result = graph_memory._search_nodes_batch({"alice": [0.1, 0.2, 0.3]}, {"user_id": "u1", "agent_id": "a1"})
+
+        cypher = graph_memory.graph.query.call_args[0][0]
+        params = graph_memory.graph.query.call_args[1]["params"]
+        assert "db.index.vector.queryNodes('entity_embedding_index', $candidate_k, candidate.embedding)" in cypher
+        assert "candidate_node.user_id = $user_id AND candidate_node.agent_id = $agent_id" in cypher
+        assert "vector.similarity.cosine" not in cypher
+        assert params["candidate_k"] == 50
+        assert result == {"alice": "4:abc:1"}
+
+    @pytest.mark.parametrize("index_dims, used", [(3, True), (1024, False)])
+    def test_existing_vector_index_is_checked_against_the_embedder(
+        self, mock_config, embedding_model, index_dims, used
+    ):
+        # The embedder does not know its dimensions, a probe embedding tells them
+        embedding_model.config.embedding_dims = None
+        embedding_model.embed.return_value = [0.1, 0.2, 0.3]
+        with (
+            patch("mem0.memory.graph_memory.Neo4jGraph") as mock_graph,
+            patch("mem0.memory.graph_memory.EmbedderFactory") as mock_embedder_factory,
+            patch("mem0.memory.graph_memory.LlmFactory"),
+        ):
+            mock_embedder_factory.create.return_value = embedding_model
+
+            def query(cypher, params=None):
+                if cypher.startswith("SHOW INDEXES"):
+                    return [{"options": {"indexConfig": {"vector.dimensions": index_dims}}}]
+                return []
+
+            mock_graph.return_value.query.side_effect = query
+            memory = MemoryGraph(mock_config)
+
+        queries = [call[0][0] for call in mock_graph.return_value.query.call_args_list]
+        assert memory.use_vector_index == used
+        # The index is shared with other processes, it is never dropped or replaced implicitly
+        assert not any(q.startswith(("DROP INDEX", "CREATE VECTOR INDEX")) for q in queries)
+
+    def test_missing_vector_index_is_created(self, mock_config, embedding_model):
+        with (
+            patch("mem0.memory.graph_memory.Neo4jGraph") as mock_graph,
+            patch("mem0.memory.graph_memory.EmbedderFactory") as mock_embedder_factory,
+            patch("mem0.memory.graph_memory.LlmFactory"),
+        ):
+            mock_embedder_factory.create.return_value = embedding_model
+            mock_graph.return_value.query.return_value = []
+            memory = MemoryGraph(mock_config)
+
+        created = [
+            call[0][0]
+            for call in mock_graph.return_value.query.call_args_list
+            if call[0][0].startswith("CREATE VECTOR INDEX")
+        ]
+        assert memory.use_vector_index
+        assert len(created) == 1 and "`vector.dimensions`: 3," in created[0]
+        embedding_model.embed.assert_not_called()
+
+    def test_vector_index_is_not_used_when_it_cannot_be_created(self, mock_config, embedding_model):
+        with (
+            patch("mem0.memory.graph_memory.Neo4jGraph") as mock_graph,
+            patch("mem0.memory.graph_memory.EmbedderFactory") as mock_embedder_factory,
+            patch("mem0.memory.graph_memory.LlmFactory"),
+        ):
+            mock_embedder_factory.create.return_value = embedding_model
+
+            def query(cypher, params=None):
+                if cypher.startswith("CREATE VECTOR INDEX"):
+                    raise RuntimeError("not allowed")
+                return []
+
+            mock_graph.return_value.query.side_effect = query
+            memory = MemoryGraph(mock_config)
+
+        assert not memory.use_vector_index
+
+    def test_nodes_of_the_scope_are_compared_exactly_by_default(self, mock_config, embedding_model):
+        mock_config.graph_store.config.vector_index = False
+        with (
+            patch("mem0.memory.graph_memory.Neo4jGraph") as mock_graph,
+            patch("mem0.memory.graph_memory.EmbedderFactory") as mock_embedder_factory,
+            patch("mem0.memory.graph_memory.LlmFactory"),
+        ):
+            mock_embedder_factory.create.return_value = embedding_model
+            mock_graph.return_value.query.return_value = []
+            memory = MemoryGraph(mock_config)
+
+        queries = [call[0][0] for call in mock_graph.return_value.query.call_args_list]
+        assert not memory.use_vector_index
+        assert not any("entity_embedding_index" in q for q in queries)
+        embedding_model.embed.assert_not_called()
+
+        memory._search_graph_db(["alice"], {"user_id": "u1"})
+
+        cypher = memory.graph.query.call_args[0][0]
+        assert "queryNodes" not in cypher
+        assert "n.user_id = $user_id" in cypher
+
+    def test_node_resolution_without_vector_index_compares_scoped_nodes(self, graph_memory):
+        graph_memory.use_vector_index = False
+        graph_memory.graph.query.return_value = []
+
+        graph_memory._search_source_node([0.1, 0.2, 0.3], {"user_id": "u1"}, threshold=0.75)
+
+        cypher = graph_memory.graph.query.call_args[0][0]
+        assert "queryNodes" not in cypher
+        assert "vector.similarity.cosine(source_candidate.embedding, $source_embedding)" in cypher
+
+    def test_search_graph_db_runs_one_query_for_all_entities(self, graph_memory, embedding_model):
+        graph_memory.graph.query.return_value = [{"source": "alice", "relationship": "likes", "destination": "bob"}]
+
+        result = graph_memory._search_graph_db(["alice", "bob", "carol"], {"user_id": "u1"}, limit=10)
+
+        embedding_model.embed_batch.assert_called_once_with(["alice", "bob", "carol"])
+        graph_memory.graph.query.assert_called_once()
+        cypher = graph_memory.graph.query.call_args[0][0]
+        params = graph_memory.graph.query.call_args[1]["params"]
+        assert "UNWIND $n_embeddings AS n_embedding" in cypher
+        assert "max(similarity) AS similarity" in cypher
+        assert len(params["n_embeddings"]) == 3
+        assert result == [{"source": "alice", "relationship": "likes", "destination": "bob"}]
+
+    def test_search_graph_db_without_entities(self, graph_memory):
+        assert graph_memory._search_graph_db([], {"user_id": "u1"}) == []
+        graph_memory.graph.query.assert_not_called()
+
+    def test_combined_extraction_uses_one_llm_call(self, graph_memory):
+        graph_memory.config.graph_store.combined_extraction = True
+        graph_memory.llm.generate_response.return_value = {
+            "tool_calls": [
+                {
+                    "name": "extract_entities_and_relations",
+                    "arguments": {
+                        "entities": [
+                            {"entity": "Alice", "entity_type": "person"},
+                            {"entity": "Ice Cream", "entity_type": "food"},
+                        ],
+                        "relations": [{"source": "Alice", "relationship": "likes", "destination": "Ice Cream"}],
+                    },
+                }
+            ]
+        }
+        graph_memory._retrieve_nodes_from_data = Mock()
+        graph_memory._establish_nodes_relations_from_data = Mock()
+        graph_memory._search_graph_db = Mock(return_value=[])
+        graph_memory._delete_entities = Mock(return_value=[])
+        graph_memory._add_entities = Mock(return_value=[])
+
+        graph_memory.add("Alice likes ice cream", {"user_id": "u1"})
+
+        graph_memory.llm.generate_response.assert_called_once()
+        tools = graph_memory.llm.generate_response.call_args[1]["tools"]
+        assert tools[0]["function"]["name"] == "extract_entities_and_relations"
+        graph_memory._retrieve_nodes_from_data.assert_not_called()
+        graph_memory._establish_nodes_relations_from_data.assert_not_called()
+        graph_memory._search_graph_db.assert_called_once_with(
+            node_list=["alice", "ice_cream"], filters={"user_id": "u1"}
+        )
+        graph_memory._add_entities.assert_called_once_with(
+            [{"source": "alice", "relationship": "likes", "destination": "ice_cream"}],
+            {"user_id": "u1"},
+            {"alice": "person", "ice_cream": "food"},
+        )
+
+    def test_combined_extraction_falls_back_without_tool_calls(self, graph_memory):
+        graph_memory.config.graph_store.combined_extraction = True
+        graph_memory.llm.generate_response.return_value = "no tools here"
+        graph_memory._retrieve_nodes_from_data = Mock(return_value={"alice": "person"})
+        graph_memory._establish_nodes_relations_from_data = Mock(return_value=[])
+        graph_memory._search_graph_db = Mock(return_value=[])
+        graph_memory._add_entities = Mock(return_value=[])
+
+        graph_memory.add("Alice", {"user_id": "u1"})
+
+        graph_memory._retrieve_nodes_from_data.assert_called_once_with("Alice", {"user_id": "u1"})
+        graph_memory._establish_nodes_relations_from_data.assert_called_once()
+
+    def test_combined_extraction_with_nothing_to_extract_does_not_fall_back(self, graph_memory):
+        graph_memory.config.graph_store.combined_extraction = True
+        graph_memory.llm.generate_response.return_value = {
+            "tool_calls": [{"name": "extract_entities_and_relations", "arguments": {"entities": [], "relations": []}}]
+        }
+        graph_memory._retrieve_nodes_from_data = Mock()
+        graph_memory._establish_nodes_relations_from_data = Mock()
+        graph_memory._search_graph_db = Mock(return_value=[])
+        graph_memory._add_entities = Mock(return_value=[])
+
+        graph_memory.add("Hello", {"user_id": "u1"})
+
+        graph_memory.llm.generate_response.assert_called_once()
+        graph_memory._retrieve_nodes_from_data.assert_not_called()
+        graph_memory._establish_nodes_relations_from_data.assert_not_called()
+
+    def test_delete_decision_skipped_when_existing_edges_are_restated(self, graph_memory):
+        graph_memory._retrieve_nodes_from_data = Mock(return_value={"alice": "person", "bob": "person"})
+        graph_memory._establish_nodes_relations_from_data = Mock(
+            return_value=[{"source": "alice", "relationship": "knows", "destination": "bob"}]
+        )
+        graph_memory._search_graph_db = Mock(
+            return_value=[{"source": "alice", "relationship": "knows", "destination": "bob"}]
+        )
+        graph_memory._add_entities = Mock(return_value=[])
+
+        result = graph_memory.add("Alice knows Bob", {"user_id": "u1"})
+
+        graph_memory.llm.generate_response.assert_not_called()
+        assert result["deleted_entities"] == []
+
+    def test_search_matches_stored_entity_names_without_llm(self, graph_memory):
+        graph_memory.graph.query.return_value = [
+            {"source": "alice", "relationship": "likes", "destination": "ice_cream"},
+            {"source": "bob", "relationship": None, "destination": None},
+        ]
+        graph_memory._search_graph_db = Mock(return_value=[])
+        context = SearchContext("Does Alice like ice cream?", {"user_id": "u1"}, Mock())
+
+        graph_memory.search("Does Alice like ice cream?", {"user_id": "u1"}, context=context)
+        graph_memory.search("What about Alice?", {"user_id": "u1"})
+
+        graph_memory.llm.generate_response.assert_not_called()
+        assert set(graph_memory._search_graph_db.call_args_list[0][1]["node_list"]) == {"alice", "ice_cream"}
+        # Entity names are loaded once per scope
+        graph_memory.graph.query.assert_called_once()
+
+    def test_search_falls_back_to_llm_extraction(self, graph_memory):
+        graph_memory.graph.query.return_value = [{"source": "bob", "relationship": None, "destination": None}]
+        graph_memory._retrieve_nodes_from_data = Mock(return_value={"alice": "person"})
+        graph_memory._search_graph_db = Mock(return_value=[])
+
+        graph_memory.search("Who is Alice?", {"user_id": "u1"})
+
+        graph_memory._retrieve_nodes_from_data.assert_called_once_with("Who is Alice?", {"user_id": "u1"})
+
+    def test_search_without_entities_uses_the_shared_query_embedding(self, graph_memory):
+        graph_memory.graph.query.return_value = []
+        graph_memory._retrieve_nodes_from_data = Mock(return_value={})
+        graph_memory._search_graph_db = Mock(return_value=[])
+        embedder = Mock()
+        embedder.embed.return_value = [0.1, 0.2, 0.3]
+        context = SearchContext("Anything new?", {"user_id": "u1"}, embedder)
+
+        graph_memory.search("Anything new?", {"user_id": "u1"}, context=context)
+
+        graph_memory._search_graph_db.assert_called_once_with(
+            node_list=["Anything new?"], filters={"user_id": "u1"}, limit=100, embeddings=[[0.1, 0.2, 0.3]]
+        )
+        embedder.embed.assert_called_once_with("Anything new?", "search")
+
+    def test_added_entities_are_visible_to_the_name_index(self, graph_memory):
+        graph_memory.graph.query.side_effect = [
+            [{"source": "alice", "relationship": None, "destination": None}],
+            [],
+            [{"source": "alice", "relationship": "likes", "target": "pizza"}],
+        ]
+        graph_memory._lexical_index({"user_id": "u1"})
+
+        graph_memory._add_entities(
+            [{"source": "alice", "relationship": "likes", "destination": "pizza"}],
+            {"user_id": "u1", "agent_id": "a1"},
+            {},
+        )
+
+        assert graph_memory._match_entities_from_query("Any pizza?", {"user_id": "u1"}) == {"pizza": None}
+        graph_memory.graph.query.side_effect = None
+        graph_memory.delete_all({"user_id": "u1"})
+        assert graph_memory._lexical_indexes == {}
+
+    def test_search_reranks_with_the_cached_index(self, graph_memory):
+        graph_memory.graph.query.return_value = [
+            {"source": "user_01", "relationship": "喜欢", "destination": "周杰伦"},
+            {"source": "user_01", "relationship": "居住于", "destination": "上海"},
+        ]
+        graph_memory._search_graph_db = Mock(
+            return_value=[
+                {"source": "user_01", "relationship": "居住于", "destination": "上海"},
+                {"source": "user_01", "relationship": "喜欢", "destination": "周杰伦"},
+            ]
+        )
+
+        results = graph_memory.search("周杰伦的新歌", {"user_id": "u1"})
+        graph_memory.search("周杰伦的新歌", {"user_id": "u1"})
+
+        graph_memory.llm.generate_response.assert_not_called()
+        assert graph_memory._search_graph_db.call_args[1]["node_list"] == ["周杰伦"]
+        assert results[0] == {"source": "user_01", "relationship": "喜欢", "destination": "周杰伦"}
+        graph_memory.graph.query.assert_called_once()
+
+    def test_index_is_rebuilt_when_the_graph_drifts(self, graph_memory):
+        graph_memory.graph.query.return_value = [{"source": "alice", "relationship": "likes", "destination": "bob"}]
+        index = graph_memory._lexical_index({"user_id": "u1"})
+
+        graph_memory.lexical_index_refresh_seconds = 0
+        graph_memory.graph.query.return_value = [{"relations": 1}]
+        assert graph_memory._lexical_index({"user_id": "u1"}) is index
+
+        graph_memory.graph.query.side_effect = [
+            [{"relations": 2}],
+            [
+                {"source": "alice", "relationship": "likes", "destination": "bob"},
+                {"source": "carol", "relationship": "likes", "destination": "pizza"},
+            ],
+        ]
+        rebuilt = graph_memory._lexical_index({"user_id": "u1"})
+
+        assert rebuilt is not index
+        assert len(rebuilt) == 2
+        assert graph_memory._lexical_index_checked_at.keys() == graph_memory._lexical_indexes.keys()
+
+    def test_scopes_above_the_size_cap_are_not_cached(self, graph_memory):
+        graph_memory.lexical_index_max_rows = 1
+        rows = [
+            {"source": "alice", "relationship": "likes", "destination": "bob"},
+            {"source": "carol", "relationship": "likes", "destination": "pizza"},
+        ]
+        graph_memory.graph.query.return_value = rows
+        graph_memory._retrieve_nodes_from_data = Mock(return_value={"carol": "person"})
+        graph_memory._search_graph_db = Mock(return_value=rows)
+
+        results = graph_memory.search("what does carol like", {"user_id": "u1"})
+
+        assert graph_memory.graph.query.call_args[1]["params"]["max_rows"] == 2
+        assert graph_memory._lexical_indexes == {}
+        graph_memory._retrieve_nodes_from_data.assert_called_once()
+        assert results[0] == {"source": "carol", "relationship": "likes", "destination": "pizza"}
+
+    def test_deleted_relations_leave_the_index(self, graph_memory):
+        graph_memory.graph.query.return_value = [{"source": "alice", "relationship": "likes", "destination": "bob"}]
+        index = graph_memory._lexical_index({"user_id": "u1"})
+
+        graph_memory._delete_entities(
+            [{"source": "alice", "relationship": "likes", "destination": "bob"}], {"user_id": "u1"}
+        )
+
+        assert len(index) == 0
+        assert index.entity_names == {"alice", "bob"}
+
+    def test_delete_all_runs_in_batched_transactions(self, graph_memory):
+        graph_memory.config.graph_store.config.database = "neo4j"
+
+        graph_memory.delete_all({"user_id": "u1"}, batch_size=500)
+
+        query = graph_memory.graph.query.call_args[0][0]
+        assert "IN TRANSACTIONS OF 500 ROWS" in query
+        assert graph_memory.graph.query.call_args[1]["session_params"] == {"database": "neo4j"}
+
+    def test_iter_all_pages_with_a_cursor(self, graph_memory):
+        graph_memory.graph.query.side_effect = [
+            [
+                {"source": "alice", "relationship": "likes", "target": "bob", "relation_id": "r1"},
+                {"source": "bob", "relationship": "knows", "target": "carol", "relation_id": "r2"},
+            ],
+            [{"source": "carol", "relationship": "likes", "target": "pizza", "relation_id": "r3"}],
+        ]
+
+        results = list(graph_memory.iter_all({"user_id": "u1", "agent_id": "a1"}, batch_size=2))
+
+        assert [r["target"] for r in results] == ["bob", "carol", "pizza"]
+        assert results[0] == {"source": "alice", "relationship": "likes", "target": "bob"}
+        calls = graph_memory.graph.query.call_args_list
+        assert len(calls) == 2
+        assert calls[1][1]["params"]["cursor"] == "r2"
+        assert calls[1][1]["params"]["agent_id"] == "a1"
+
+
+def test_entity_match_fast_path_is_opt_in():
+    from mem0.graphs.configs import Neo4jConfig
+
+    assert Neo4jConfig(url="bolt://localhost:7687", username="neo4j", password="x").entity_match_fast_path is False
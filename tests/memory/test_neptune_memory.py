@@ -1,3 +1,4 @@
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 import pytest
@@ -15,9 +16,12 @@ class TestNeptuneMemory(unittest.TestCase):
         self.config = MagicMock()
         self.config.graph_store.config.endpoint = "neptune-graph://test-graph"
         self.config.graph_store.config.base_label = True
+        self.config.graph_store.config.batch_size = 100
+        self.config.graph_store.config.max_concurrency = 4
         self.config.llm.provider = "openai_structured"
         self.config.graph_store.llm = None
         self.config.graph_store.custom_prompt = None
+        self.config.graph_store.combined_extraction = False
 
         # Create mock for NeptuneAnalyticsGraph
         self.mock_graph = MagicMock()
@@ -187,148 +191,172 @@ class TestNeptuneMemory(unittest.TestCase):
         self.memory_graph._delete_all_cypher.assert_called_once_with(self.test_filters)
         self.mock_graph.query.assert_called_once_with(mock_cypher, params=mock_params)
 
-    def test_search_source_node(self):
-        """Test the _search_source_node method."""
-        # Mock embedding
-        mock_embedding = [0.1, 0.2, 0.3]
-
-        # Mock the _search_source_node_cypher method
-        mock_cypher = "MATCH (n) RETURN n"
-        mock_params = {"source_embedding": mock_embedding, "user_id": self.user_id, "threshold": 0.9}
-        self.memory_graph._search_source_node_cypher = MagicMock(return_value=(mock_cypher, mock_params))
-
-        # Mock the graph.query result
-        mock_query_result = [{"id(source_candidate)": 123, "cosine_similarity": 0.95}]
-        self.mock_graph.query.return_value = mock_query_result
-
-        # Call the _search_source_node method
-        result = self.memory_graph._search_source_node(mock_embedding, self.user_id, threshold=0.9)
-
-        # Verify the method calls
-        self.memory_graph._search_source_node_cypher.assert_called_once_with(mock_embedding, self.user_id, 0.9)
-        self.mock_graph.query.assert_called_once_with(mock_cypher, params=mock_params)
-
-        # Check the result
-        self.assertEqual(result, mock_query_result)
-
-    def test_search_destination_node(self):
-        """Test the _search_destination_node method."""
-        # Mock embedding
-        mock_embedding = [0.1, 0.2, 0.3]
-
-        # Mock the _search_destination_node_cypher method
-        mock_cypher = "MATCH (n) RETURN n"
-        mock_params = {"destination_embedding": mock_embedding, "user_id": self.user_id, "threshold": 0.9}
-        self.memory_graph._search_destination_node_cypher = MagicMock(return_value=(mock_cypher, mock_params))
-
-        # Mock the graph.query result
-        mock_query_result = [{"id(destination_candidate)": 456, "cosine_similarity": 0.92}]
-        self.mock_graph.query.return_value = mock_query_result
-
-        # Call the _search_destination_node method
-        result = self.memory_graph._search_destination_node(mock_embedding, self.user_id, threshold=0.9)
-
-        # Verify the method calls
-        self.memory_graph._search_destination_node_cypher.assert_called_once_with(mock_embedding, self.user_id, 0.9)
-        self.mock_graph.query.assert_called_once_with(mock_cypher, params=mock_params)
-
-        # Check the result
-        self.assertEqual(result, mock_query_result)
-
     def test_search_graph_db(self):
         """Test the _search_graph_db method."""
-        # Mock node list
-        node_list = ["alice", "bob"]
-
-        # Mock embedding
-        mock_embedding = [0.1, 0.2, 0.3]
-        self.mock_embedding_model.embed.return_value = mock_embedding
-
-        # Mock the _search_graph_db_cypher method
-        mock_cypher = "MATCH (n) RETURN n"
-        mock_params = {"n_embedding": mock_embedding, "user_id": self.user_id, "threshold": 0.7, "limit": 10}
-        self.memory_graph._search_graph_db_cypher = MagicMock(return_value=(mock_cypher, mock_params))
-
-        # Mock the graph.query results
-        mock_query_result1 = [{"source": "alice", "relationship": "knows", "destination": "bob"}]
-        mock_query_result2 = [{"source": "bob", "relationship": "works_with", "destination": "charlie"}]
-        self.mock_graph.query.side_effect = [mock_query_result1, mock_query_result2]
-
-        # Call the _search_graph_db method
-        result = self.memory_graph._search_graph_db(node_list, self.test_filters, limit=10)
-
-        # Verify the method calls
-        self.assertEqual(self.mock_embedding_model.embed.call_count, 2)
-        self.assertEqual(self.memory_graph._search_graph_db_cypher.call_count, 2)
-        self.assertEqual(self.mock_graph.query.call_count, 2)
-
-        # Check the result
-        expected_result = mock_query_result1 + mock_query_result2
-        self.assertEqual(result, expected_result)
-
-    def test_add_entities(self):
-        """Test the _add_entities method."""
-        # Mock data
-        to_be_added = [{"source": "alice", "relationship": "knows", "destination": "bob"}]
-        entity_type_map = {"alice": "person", "bob": "person"}
-
-        # Mock embeddings
-        mock_embedding = [0.1, 0.2, 0.3]
-        self.mock_embedding_model.embed.return_value = mock_embedding
-
-        # Mock search results
-        mock_source_search = [{"id(source_candidate)": 123, "cosine_similarity": 0.95}]
-        mock_dest_search = [{"id(destination_candidate)": 456, "cosine_similarity": 0.92}]
-
-        # Mock the search methods
-        self.memory_graph._search_source_node = MagicMock(return_value=mock_source_search)
-        self.memory_graph._search_destination_node = MagicMock(return_value=mock_dest_search)
-
-        # Mock the _add_entities_cypher method
-        mock_cypher = "MATCH (n) RETURN n"
-        mock_params = {"source_id": 123, "destination_id": 456}
-        self.memory_graph._add_entities_cypher = MagicMock(return_value=(mock_cypher, mock_params))
+        self.mock_embedding_model.embed_batch.return_value = [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]]
+        self.mock_graph.query.return_value = [
+            {"source": "alice", "relationship": "knows", "relation_id": "r1", "destination": "bob", "similarity": 0.8},
+            {"source": "bob", "relationship": "knows", "relation_id": "r1", "destination": "bob", "similarity": 0.9},
+        ]
 
-        # Mock the graph.query result
-        mock_query_result = [{"source": "alice", "relationship": "knows", "target": "bob"}]
-        self.mock_graph.query.return_value = mock_query_result
+        result = self.memory_graph._search_graph_db(["alice", "bob"], self.test_filters, limit=10)
 
-        # Call the _add_entities method
-        result = self.memory_graph._add_entities(to_be_added, self.user_id, entity_type_map)
+        # Both embeddings are sent in one UNWIND query
+        self.mock_embedding_model.embed_batch.assert_called_once_with(["alice", "bob"])
+        self.mock_graph.query.assert_called_once()
+        cypher, kwargs = self.mock_graph.query.call_args
+        self.assertIn("UNWIND $embeddings AS n_embedding", cypher[0])
+        self.assertEqual(kwargs["params"]["embeddings"], [[0.1, 0.2, 0.3], [0.3, 0.2, 0.1]])
 
-        # Verify the method calls
-        self.assertEqual(self.mock_embedding_model.embed.call_count, 2)
-        self.memory_graph._search_source_node.assert_called_once_with(mock_embedding, self.user_id, threshold=0.9)
-        self.memory_graph._search_destination_node.assert_called_once_with(mock_embedding, self.user_id, threshold=0.9)
-        self.memory_graph._add_entities_cypher.assert_called_once()
-        self.mock_graph.query.assert_called_once_with(mock_cypher, params=mock_params)
-
-        # Check the result
-        self.assertEqual(result, [mock_query_result])
+        # A relation reached from both entities is returned once with its best similarity
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]["similarity"], 0.9)
 
     def test_delete_entities(self):
         """Test the _delete_entities method."""
-        # Mock data
-        to_be_deleted = [{"source": "alice", "relationship": "knows", "destination": "bob"}]
+        to_be_deleted = [
+            {"source": "alice", "relationship": "knows", "destination": "bob"},
+            {"source": "alice", "relationship": "knows", "destination": "carol"},
+            {"source": "alice", "relationship": "likes", "destination": "pizza"},
+        ]
+        self.mock_graph.query.side_effect = lambda cypher, params: [
+            {"source": "alice", "relationship": relationship, "target": row["dest_name"]}
+            for relationship in ("knows", "likes")
+            if f"[r:{relationship}]" in cypher
+            for row in params["rows"]
+        ]
 
-        # Mock the _delete_entities_cypher method
-        mock_cypher = "MATCH (n) RETURN n"
-        mock_params = {"source_name": "alice", "dest_name": "bob", "user_id": self.user_id}
-        self.memory_graph._delete_entities_cypher = MagicMock(return_value=(mock_cypher, mock_params))
+        result = self.memory_graph._delete_entities(to_be_deleted, self.user_id)
 
-        # Mock the graph.query result
-        mock_query_result = [{"source": "alice", "relationship": "knows", "target": "bob"}]
-        self.mock_graph.query.return_value = mock_query_result
+        # One query per relationship type
+        self.assertEqual(self.mock_graph.query.call_count, 2)
+        self.assertEqual(
+            result,
+            [
+                [{"source": "alice", "relationship": "knows", "target": "bob"}],
+                [{"source": "alice", "relationship": "knows", "target": "carol"}],
+                [{"source": "alice", "relationship": "likes", "target": "pizza"}],
+            ],
+        )
 
-        # Call the _delete_entities method
-        result = self.memory_graph._delete_entities(to_be_deleted, self.user_id)
 
-        # Verify the method calls
-        self.memory_graph._delete_entities_cypher.assert_called_once_with("alice", "bob", "knows", self.user_id)
-        self.mock_graph.query.assert_called_once_with(mock_cypher, params=mock_params)
+class RecordingNeptuneGraph:
+    """Stand-in for the Neptune client that records the generated openCypher and answers from an in-memory graph."""
+
+    def __init__(self, existing_nodes=None):
+        self.queries = []
+        self.lock = threading.Lock()
+        self.nodes = dict(existing_nodes or {})
+        self.edges = {}
+
+    def query(self, cypher, params=None):
+        with self.lock:
+            self.queries.append((cypher, params))
+            if "distanceByEmbedding" in cypher:
+                # Rows whose embedding equals a stored node's embedding resolve to it
+                return [
+                    {"idx": row["idx"], "node_id": node_id, "cosine_similarity": 1.0}
+                    for row in params["rows"]
+                    for node_id, node in self.nodes.items()
+                    if node["embedding"] == row["embedding"]
+                ]
+            if "MERGE (n" in cypher:
+                results = []
+                for row in params["rows"]:
+                    node_id = len(self.nodes) + 1
+                    self.nodes[node_id] = {
+                        "name": row["name"],
+                        "embedding": row["embedding"],
+                        "mentions": row["mentions"],
+                    }
+                    results.append({"name": row["name"], "node_id": node_id})
+                return results
+            if "SET\n                n.mentions" in cypher:
+                for row in params["rows"]:
+                    self.nodes[row["node_id"]]["mentions"] += row["mentions"]
+                return [{"node_id": row["node_id"]} for row in params["rows"]]
+            if "MERGE (source)" in cypher:
+                relationship = cypher.split("[r:")[1].split("]")[0]
+                results = []
+                for row in params["rows"]:
+                    key = (row["source_id"], relationship, row["destination_id"])
+                    self.edges[key] = self.edges.get(key, 0) + row["mentions"]
+                    results.append(
+                        {
+                            "source": self.nodes[row["source_id"]]["name"],
+                            "source_id": row["source_id"],
+                            "relationship": relationship,
+                            "target": self.nodes[row["destination_id"]]["name"],
+                            "destination_id": row["destination_id"],
+                        }
+                    )
+                return results
+            raise AssertionError(f"Unexpected query: {cypher}")
+
+
+class TestNeptuneBatching(unittest.TestCase):
+    """Run the generated openCypher against a recording stand-in, without AWS."""
+
+    embeddings = {"alice": [1.0, 0.0], "bob": [0.0, 1.0], "carol": [0.5, 0.5], "dave": [0.2, 0.8]}
+
+    def make_memory_graph(self, graph, batch_size=100):
+        config = MagicMock()
+        config.graph_store.config.endpoint = None
+        config.graph_store.config.base_label = True
+        config.graph_store.config.batch_size = batch_size
+        config.graph_store.config.max_concurrency = 4
+        config.graph_store.llm = None
+        config.llm.provider = "openai_structured"
+        embedding_model = MagicMock()
+        embedding_model.embed_batch.side_effect = lambda texts: [self.embeddings[text] for text in texts]
+        with (
+            patch.object(NeptuneBase, "_create_embedding_model", return_value=embedding_model),
+            patch.object(NeptuneBase, "_create_llm", return_value=MagicMock()),
+        ):
+            return MemoryGraph(config, graph=graph)
+
+    def test_add_entities_batches_round_trips(self):
+        graph = RecordingNeptuneGraph(existing_nodes={1: {"name": "alice", "embedding": [1.0, 0.0], "mentions": 1}})
+        memory_graph = self.make_memory_graph(graph)
+
+        result = memory_graph._add_entities(
+            [
+                {"source": "alice", "relationship": "knows", "destination": "bob"},
+                {"source": "alice", "relationship": "knows", "destination": "carol"},
+                {"source": "alice", "relationship": "knows", "destination": "bob"},
+                {"source": "bob", "relationship": "likes", "destination": "dave"},
+            ],
+            "test_user",
+            {"bob": "person", "carol": "person", "dave": "person"},
+        )
+
+        # One node search, one mention update, one node merge and one merge per relationship type
+        self.assertEqual(len(graph.queries), 5)
+        self.assertEqual(result[0], [{"source": "alice", "relationship": "knows", "target": "bob"}])
+        self.assertEqual(result[3], [{"source": "bob", "relationship": "likes", "target": "dave"}])
+        self.assertEqual(graph.nodes[1]["mentions"], 4)
+        self.assertEqual(sorted(node["name"] for node in graph.nodes.values()), ["alice", "bob", "carol", "dave"])
+        bob_id = next(node_id for node_id, node in graph.nodes.items() if node["name"] == "bob")
+        self.assertEqual(graph.nodes[bob_id]["mentions"], 3)
+        self.assertEqual(graph.edges[(1, "knows", bob_id)], 2)
+
+    def test_add_entities_splits_rows_into_batches(self):
+        graph = RecordingNeptuneGraph()
+        memory_graph = self.make_memory_graph(graph, batch_size=2)
+
+        memory_graph._add_entities(
+            [
+                {"source": "alice", "relationship": "knows", "destination": "bob"},
+                {"source": "carol", "relationship": "knows", "destination": "dave"},
+            ],
+            "test_user",
+            {},
+        )
 
-        # Check the result
-        self.assertEqual(result, [mock_query_result])
+        searches = [params for cypher, params in graph.queries if "distanceByEmbedding" in cypher]
+        self.assertEqual([len(params["rows"]) for params in searches], [2, 2])
+        self.assertEqual(len(graph.nodes), 4)
+        self.assertEqual(len(graph.edges), 2)
 
 
 if __name__ == "__main__":
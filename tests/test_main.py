@@ -1,5 +1,5 @@
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
 import pytest
 
@@ -28,6 +28,7 @@ def memory_instance():
         mock_embedder.create.return_value = Mock()
         mock_vector_store.create.return_value = Mock()
         mock_vector_store.create.return_value.search.return_value = []
+        mock_vector_store.create.return_value.search_batch.return_value = []
         mock_llm.create.return_value = Mock()
         
         # Create a mock instance that won't try to access config attributes
@@ -52,6 +53,7 @@ def memory_custom_instance():
         mock_embedder.create.return_value = Mock()
         mock_vector_store.create.return_value = Mock()
         mock_vector_store.create.return_value.search.return_value = []
+        mock_vector_store.create.return_value.search_batch.return_value = []
         mock_llm.create.return_value = Mock()
         
         # Create a mock instance that won't try to access config attributes
@@ -161,7 +163,10 @@ def test_search(memory_instance, version, enable_graph):
     memory_instance.embedding_model.embed.assert_called_once_with("test query", "search")
 
     if enable_graph:
-        memory_instance.graph.search.assert_called_once_with("test query", {"user_id": "test_user"}, 100)
+        memory_instance.graph.search.assert_called_once_with("test query", {"user_id": "test_user"}, 100, context=ANY)
+        context = memory_instance.graph.search.call_args[1]["context"]
+        assert context.query == "test query"
+        assert context.embedding == [0.1, 0.2, 0.3]
     else:
         memory_instance.graph.search.assert_not_called()
 
@@ -194,14 +199,16 @@ def test_delete(memory_instance):
 def test_delete_all(memory_instance, version, enable_graph):
     memory_instance.config.version = version
     memory_instance.enable_graph = enable_graph
-    mock_memories = [Mock(id="1"), Mock(id="2")]
+    mock_memories = [Mock(id="1", payload={"data": "Memory 1"}), Mock(id="2", payload={"data": "Memory 2"})]
     memory_instance.vector_store.list = Mock(return_value=(mock_memories, None))
-    memory_instance._delete_memory = Mock()
+    memory_instance.vector_store.delete_batch = Mock()
+    memory_instance.db = Mock()
     memory_instance.graph.delete_all = Mock()
 
     result = memory_instance.delete_all(user_id="test_user")
 
-    assert memory_instance._delete_memory.call_count == 2
+    memory_instance.vector_store.delete_batch.assert_called_once_with(["1", "2"])
+    assert memory_instance.db.add_history.call_count == 2
 
     if enable_graph:
         memory_instance.graph.delete_all.assert_called_once_with({"user_id": "test_user"})
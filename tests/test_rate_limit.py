@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from mem0.utils import rate_limit
+from mem0.utils.factory import EmbedderFactory, LlmFactory
+from mem0.utils.rate_limit import CircuitOpenError, ConcurrencyLimiter, RateLimitConfig, RateLimiter, TokenBucket
+
+
+class RateLimitError(Exception):
+    def __init__(self, retry_after=None):
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        self.response = httpx.Response(429, headers=headers)
+        super().__init__("rate limited")
+
+
+@pytest.fixture(autouse=True)
+def clear_limiters():
+    rate_limit._limiters.clear()
+    yield
+    rate_limit._limiters.clear()
+
+
+@pytest.fixture
+def sleeps():
+    with patch("mem0.utils.rate_limit.time.sleep") as mock_sleep:
+        yield mock_sleep
+
+
+def test_token_bucket_charges_debt():
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(2) == pytest.approx(2.0, abs=0.05)
+
+
+def test_retry_after_pauses_all_callers(sleeps):
+    limiter = RateLimiter("llm:test", RateLimitConfig(max_retries=2))
+    fn = Mock(side_effect=[RateLimitError(retry_after=3), "ok"])
+
+    assert limiter.call(fn, "prompt") == "ok"
+    assert fn.call_count == 2
+    # The throttled caller waits out Retry-After, and the pause also holds back the next caller
+    sleeps.assert_any_call(3.0)
+    assert limiter._reserve(0) == pytest.approx(3.0, abs=0.05)
+    assert limiter.stats()["throttled"] == 1
+    assert limiter.stats()["retries"] == 1
+
+
+def test_retries_stop_and_bad_requests_are_not_retried(sleeps):
+    limiter = RateLimiter("llm:test", RateLimitConfig(max_retries=1, failure_threshold=10))
+    fn = Mock(side_effect=RateLimitError())
+    with pytest.raises(RateLimitError):
+        limiter.call(fn)
+    assert fn.call_count == 2
+
+    fn = Mock(side_effect=ValueError("bad request"))
+    with pytest.raises(ValueError):
+        limiter.call(fn)
+    assert fn.call_count == 1
+
+
+def test_circuit_breaker_opens_and_probes():
+    limiter = RateLimiter("llm:test", RateLimitConfig(max_retries=0, failure_threshold=2, recovery_timeout=0.05))
+    failing = Mock(side_effect=ConnectionError("down"))
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            limiter.call(failing)
+
+    with pytest.raises(CircuitOpenError):
+        limiter.call(failing)
+    assert failing.call_count == 2
+    assert limiter.stats()["circuit_state"] == "open"
+    assert limiter.stats()["rejected"] == 1
+
+    time.sleep(0.06)
+    assert limiter.call(Mock(return_value="ok")) == "ok"
+    assert limiter.stats()["circuit_state"] == "closed"
+
+
+def test_concurrency_limit_is_shared_by_threads_and_coroutines():
+    slots = ConcurrencyLimiter(2)
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal peak
+        slots.acquire()
+        with lock:
+            peak = max(peak, slots.in_flight)
+        time.sleep(0.01)
+        slots.release()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak <= 2
+    assert slots.in_flight == 0
+
+    async def run():
+        slots.acquire()
+        slots.acquire()
+        waiter = asyncio.ensure_future(slots.aacquire())
+        await asyncio.sleep(0)
+        assert slots.queue_depth == 1
+        slots.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        assert slots.in_flight == 2
+
+        # A cancelled waiter gives its place up
+        cancelled = asyncio.ensure_future(slots.aacquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert slots.queue_depth == 0
+        slots.release()
+        slots.release()
+        assert slots.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_factories_share_limiter_per_provider():
+    with patch("mem0.llms.openai.OpenAI") as mock_openai:
+        mock_response = Mock()
+        mock_response.choices = [Mock(message=Mock(content="Response"))]
+        mock_openai.return_value.chat.completions.create.return_value = mock_response
+
+        config = {"model": "gpt-4o", "rate_limit": {"max_concurrency": 2, "requests_per_minute": 600}}
+        first = LlmFactory.create("openai", config)
+        second = LlmFactory.create("openai", {"model": "gpt-4o-mini", "rate_limit": {"max_concurrency": 8}})
+
+        assert "rate_limit" in config
+        assert first.generate_response([{"role": "user", "content": "Hello"}]) == "Response"
+        second.generate_response([{"role": "user", "content": "Hello"}])
+
+    stats = rate_limit.rate_limiter_stats()
+    assert list(stats) == ["llm:openai"]
+    assert stats["llm:openai"]["requests"] == 2
+    assert stats["llm:openai"]["in_flight"] == 0
+    assert rate_limit._limiters["llm:openai"].config.max_concurrency == 2
+
+    with patch("mem0.embeddings.openai.OpenAI"):
+        embedder = EmbedderFactory.create("openai", {"rate_limit": {"requests_per_minute": 100}}, None)
+    embedder.client.embeddings.create.return_value = Mock(data=[Mock(embedding=[0.1, 0.2])])
+    assert embedder.embed("Hello") == [0.1, 0.2]
+    assert rate_limiter_requests("embedder:openai") == 1
+
+
+def rate_limiter_requests(name):
+    return rate_limit.rate_limiter_stats()[name]["requests"]
+
+
+def test_streams_are_limited_until_the_first_chunk(sleeps):
+    chunks = [Mock(choices=[Mock(delta=Mock(content=text))]) for text in ('{"memory": [1,', " 2]}")]
+    with patch("mem0.llms.openai.OpenAI") as mock_openai:
+        mock_openai.return_value.chat.completions.create.side_effect = [RateLimitError(retry_after=1), iter(chunks)]
+        llm = LlmFactory.create("openai", {"model": "gpt-4o", "rate_limit": {"max_concurrency": 1}})
+
+        items = llm.stream_json_items([{"role": "user", "content": "Hello"}], key="memory")
+        assert next(items) == 1
+        # The slot is free again while the rest of the stream arrives
+        assert rate_limit._limiters["llm:openai"].stats()["in_flight"] == 0
+        assert list(items) == [2]
+
+    assert rate_limit._limiters["llm:openai"].stats()["retries"] == 1
+
+
+def test_interrupted_probe_reopens_the_circuit():
+    limiter = RateLimiter("llm:test", RateLimitConfig(max_retries=0, failure_threshold=1, recovery_timeout=0.05))
+    with pytest.raises(ConnectionError):
+        limiter.call(Mock(side_effect=ConnectionError("down")))
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def run():
+        await asyncio.sleep(0.06)
+        # The probe times out, its cancellation records no outcome
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.acall(hang), timeout=0.01)
+        assert limiter.stats()["circuit_state"] == "open"
+
+        await asyncio.sleep(0.06)
+
+        async def ok():
+            return "ok"
+
+        assert await limiter.acall(ok) == "ok"
+
+    asyncio.run(run())
+    assert limiter.stats()["circuit_state"] == "closed"
+
+    with pytest.raises(ConnectionError):
+        limiter.call(Mock(side_effect=ConnectionError("down")))
+    time.sleep(0.06)
+    with pytest.raises(KeyboardInterrupt):
+        limiter.call(Mock(side_effect=KeyboardInterrupt))
+    assert limiter.stats()["circuit_state"] == "open"
@@ -40,7 +40,9 @@ def test_search_vectors(chromadb_instance, mock_chromadb_client):
     vectors = [[0.1, 0.2, 0.3]]
     results = chromadb_instance.search(query="", vectors=vectors, limit=2)
 
-    chromadb_instance.collection.query.assert_called_once_with(query_embeddings=vectors, where=None, n_results=2)
+    chromadb_instance.collection.query.assert_called_once_with(
+        query_embeddings=vectors, where=None, n_results=2, include=["metadatas", "distances"]
+    )
 
     assert len(results) == 2
     assert results[0].id == "id1"
@@ -64,7 +66,7 @@ def test_search_vectors_with_filters(chromadb_instance, mock_chromadb_client):
     # Verify that _generate_where_clause was called with the filters
     expected_where = {"$and": [{"user_id": "alice"}, {"agent_id": "agent1"}, {"run_id": "run1"}]}
     chromadb_instance.collection.query.assert_called_once_with(
-        query_embeddings=vectors, where=expected_where, n_results=2
+        query_embeddings=vectors, where=expected_where, n_results=2, include=["metadatas", "distances"]
     )
 
     assert len(results) == 1
@@ -89,7 +91,7 @@ def test_search_vectors_with_single_filter(chromadb_instance, mock_chromadb_clie
 
     # Verify that single filter is passed as-is (no $and wrapper)
     chromadb_instance.collection.query.assert_called_once_with(
-        query_embeddings=vectors, where=filters, n_results=2
+        query_embeddings=vectors, where=filters, n_results=2, include=["metadatas", "distances"]
     )
 
     assert len(results) == 1
@@ -109,7 +111,7 @@ def test_search_vectors_with_no_filters(chromadb_instance, mock_chromadb_client)
     results = chromadb_instance.search(query="", vectors=vectors, limit=2, filters=None)
 
     chromadb_instance.collection.query.assert_called_once_with(
-        query_embeddings=vectors, where=None, n_results=2
+        query_embeddings=vectors, where=None, n_results=2, include=["metadatas", "distances"]
     )
 
     assert len(results) == 1
@@ -145,7 +147,7 @@ def test_get_vector(chromadb_instance):
 
     result = chromadb_instance.get(vector_id="id1")
 
-    chromadb_instance.collection.get.assert_called_once_with(ids=["id1"])
+    chromadb_instance.collection.get.assert_called_once_with(ids=["id1"], include=["metadatas"])
 
     assert result.id == "id1"
     assert result.score == 0.1
@@ -162,7 +164,7 @@ def test_list_vectors(chromadb_instance):
 
     results = chromadb_instance.list(limit=2)
 
-    chromadb_instance.collection.get.assert_called_once_with(where=None, limit=2)
+    chromadb_instance.collection.get.assert_called_once_with(where=None, limit=2, include=["metadatas"])
 
     assert len(results[0]) == 2
     assert results[0][0].id == "id1"
@@ -183,7 +185,7 @@ def test_list_vectors_with_filters(chromadb_instance):
 
     # Verify that _generate_where_clause was called with the filters
     expected_where = {"$and": [{"user_id": "alice"}, {"agent_id": "agent1"}, {"run_id": "run1"}]}
-    chromadb_instance.collection.get.assert_called_once_with(where=expected_where, limit=2)
+    chromadb_instance.collection.get.assert_called_once_with(where=expected_where, limit=2, include=["metadatas"])
 
     assert len(results[0]) == 1
     assert results[0][0].payload["user_id"] == "alice"
@@ -204,12 +206,71 @@ def test_list_vectors_with_single_filter(chromadb_instance):
     results = chromadb_instance.list(filters=filters, limit=2)
 
     # Verify that single filter is passed as-is (no $and wrapper)
-    chromadb_instance.collection.get.assert_called_once_with(where=filters, limit=2)
+    chromadb_instance.collection.get.assert_called_once_with(where=filters, limit=2, include=["metadatas"])
 
     assert len(results[0]) == 1
     assert results[0][0].payload["user_id"] == "alice"
 
 
+def test_insert_splits_into_max_batch_size_chunks(chromadb_instance):
+    chromadb_instance._batch_size = 2
+    vectors = [[0.1], [0.2], [0.3]]
+    payloads = [{"n": 1}, {"n": 2}, {"n": 3}]
+
+    chromadb_instance.insert(vectors=vectors, payloads=payloads, ids=["id1", "id2", "id3"])
+
+    assert chromadb_instance.collection.add.call_count == 2
+    chromadb_instance.collection.add.assert_called_with(ids=["id3"], embeddings=[[0.3]], metadatas=[{"n": 3}])
+
+
+def test_batch_size_defaults_to_client_max_batch_size(chromadb_instance, mock_chromadb_client):
+    mock_chromadb_client.return_value.get_max_batch_size.return_value = 41666
+
+    assert chromadb_instance.batch_size == 41666
+
+
+def test_update_and_delete_batch(chromadb_instance):
+    chromadb_instance._batch_size = 2
+
+    chromadb_instance.update_batch(["id1", "id2"], vectors=[[0.1], [0.2]], payloads=[{"n": 1}, {"n": 2}])
+    chromadb_instance.delete_batch(["id1", "id2", "id3"])
+
+    chromadb_instance.collection.update.assert_called_once_with(
+        ids=["id1", "id2"], embeddings=[[0.1], [0.2]], metadatas=[{"n": 1}, {"n": 2}]
+    )
+    assert [c.kwargs["ids"] for c in chromadb_instance.collection.delete.call_args_list] == [["id1", "id2"], ["id3"]]
+
+
+def test_search_batch(chromadb_instance):
+    chromadb_instance.collection.query.return_value = {
+        "ids": [["id1", "id2"], ["id3"]],
+        "distances": [[0.1, 0.2], [0.3]],
+        "metadatas": [[{"n": 1}, {"n": 2}], [{"n": 3}]],
+    }
+
+    results = chromadb_instance.search_batch(["q1", "q2"], [[0.1], [0.2]], limit=2)
+
+    chromadb_instance.collection.query.assert_called_once_with(
+        query_embeddings=[[0.1], [0.2]], where=None, n_results=2, include=["metadatas", "distances"]
+    )
+    assert [[r.id for r in res] for res in results] == [["id1", "id2"], ["id3"]]
+    assert results[1][0].score == 0.3
+
+
+def test_iter_all_pages_with_offset(chromadb_instance):
+    chromadb_instance.collection.get.side_effect = [
+        {"ids": ["id1", "id2"], "metadatas": [{"n": 1}, {"n": 2}]},
+        {"ids": ["id3"], "metadatas": [{"n": 3}]},
+    ]
+
+    results = list(chromadb_instance.iter_all(filters={"user_id": "alice"}, batch_size=2))
+
+    assert [r.id for r in results] == ["id1", "id2", "id3"]
+    offsets = [c.kwargs["offset"] for c in chromadb_instance.collection.get.call_args_list]
+    assert offsets == [0, 2]
+    assert chromadb_instance.collection.get.call_args.kwargs["include"] == ["metadatas"]
+
+
 def test_generate_where_clause_multiple_filters():
     """Test _generate_where_clause with multiple filters."""
     filters = {"user_id": "alice", "agent_id": "agent1", "run_id": "run1"}
@@ -212,6 +212,65 @@ class TestElasticsearchDB(unittest.TestCase):
         self.assertEqual(results[0].score, 0.8)
         self.assertEqual(results[0].payload, {"key1": "value1"})
 
+    def test_search_filters_inside_knn(self):
+        self.client_mock.search.return_value = {"hits": {"hits": []}}
+        self.es_db.num_candidates_multiplier = 10
+
+        self.es_db.search(query="", vectors=[0.1] * 1536, limit=5, filters={"user_id": "alice"})
+
+        body = self.client_mock.search.call_args[1]["body"]
+        self.assertEqual(body["knn"]["num_candidates"], 50)
+        self.assertEqual(body["knn"]["filter"], {"bool": {"must": [{"term": {"metadata.user_id": "alice"}}]}})
+        self.assertNotIn("query", body)
+        self.assertEqual(body["_source"], ["metadata"])
+
+    def test_search_batch(self):
+        hit = {"_id": "id1", "_score": 0.8, "_source": {"metadata": {"key1": "value1"}}}
+        self.client_mock.msearch = MagicMock(
+            return_value={"responses": [{"hits": {"hits": [hit]}}, {"hits": {"hits": []}}]}
+        )
+
+        results = self.es_db.search_batch(["q1", "q2"], [[0.1] * 1536, [0.2] * 1536], limit=3)
+
+        self.client_mock.msearch.assert_called_once()
+        self.client_mock.search.assert_not_called()
+        body = self.client_mock.msearch.call_args[1]["body"]
+        self.assertEqual(len(body), 4)
+        self.assertEqual(body[0], {"index": "test_collection"})
+        self.assertEqual(body[3]["knn"]["query_vector"], [0.2] * 1536)
+        self.assertEqual([len(r) for r in results], [1, 0])
+        self.assertEqual(results[0][0].id, "id1")
+
+    def test_insert_with_parallel_bulk_and_refresh(self):
+        self.es_db.bulk_thread_count = 4
+        self.es_db.bulk_chunk_size = 100
+        self.es_db.refresh = "wait_for"
+
+        with patch("mem0.vector_stores.elasticsearch.parallel_bulk") as mock_parallel_bulk:
+            mock_parallel_bulk.return_value = iter([(True, {}), (True, {})])
+            self.es_db.insert(vectors=[[0.1] * 1536, [0.2] * 1536], payloads=[{}, {}], ids=["id1", "id2"])
+
+            mock_parallel_bulk.assert_called_once()
+            kwargs = mock_parallel_bulk.call_args[1]
+            self.assertEqual(kwargs["thread_count"], 4)
+            self.assertEqual(kwargs["chunk_size"], 100)
+            self.assertEqual(kwargs["refresh"], "wait_for")
+
+    def test_delete_batch(self):
+        with patch("mem0.vector_stores.elasticsearch.bulk") as mock_bulk:
+            self.es_db.delete_batch(["id1", "id2"])
+
+            mock_bulk.assert_called_once()
+            actions = mock_bulk.call_args[0][1]
+            self.assertEqual(
+                actions,
+                [
+                    {"_op_type": "delete", "_index": "test_collection", "_id": "id1"},
+                    {"_op_type": "delete", "_index": "test_collection", "_id": "id2"},
+                ],
+            )
+        self.client_mock.delete.assert_not_called()
+
     def test_custom_search_query(self):
         # Mock custom search query
         self.es_db.custom_search_query = Mock()
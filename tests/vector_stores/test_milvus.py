@@ -0,0 +1,134 @@
+import importlib.util
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mem0.configs.vector_stores.milvus import MetricType
+from mem0.vector_stores.milvus import MilvusDB
+
+
+@pytest.fixture
+def mock_client():
+    with patch("mem0.vector_stores.milvus.MilvusClient") as mock_client_cls:
+        client = MagicMock()
+        client.has_collection.return_value = False
+        client.describe_collection.return_value = {
+            "fields": [{"name": "id"}, {"name": "vectors"}, {"name": "metadata"}, {"name": "user_id"}]
+        }
+        mock_client_cls.return_value = client
+        yield client
+
+
+def _make_db(**kwargs):
+    params = dict(
+        url="http://localhost:19530",
+        token=None,
+        collection_name="test",
+        embedding_model_dims=4,
+        metric_type=MetricType.COSINE,
+        db_name="",
+    )
+    params.update(kwargs)
+    return MilvusDB(**params)
+
+
+def test_create_col_with_partition_key_and_index_params(mock_client):
+    _make_db(index_type="HNSW", index_params={"M": 16, "efConstruction": 200})
+
+    schema = mock_client.create_collection.call_args.kwargs["schema"]
+    partition_fields = [field for field in schema.fields if field.is_partition_key]
+    assert [field.name for field in partition_fields] == ["user_id"]
+
+    add_index = mock_client.prepare_index_params.return_value.add_index
+    assert add_index.call_args.kwargs["index_type"] == "HNSW"
+    assert add_index.call_args.kwargs["params"] == {"M": 16, "efConstruction": 200}
+
+
+def test_filter_uses_partition_key_field(mock_client):
+    db = _make_db()
+    assert db._create_filter({"user_id": "alice", "agent_id": "bot"}) == (
+        '(user_id == "alice") and (metadata["agent_id"] == "bot")'
+    )
+
+
+def test_filter_falls_back_to_metadata_for_legacy_collections(mock_client):
+    mock_client.has_collection.return_value = True
+    mock_client.describe_collection.return_value = {"fields": [{"name": "id"}, {"name": "metadata"}]}
+    db = _make_db()
+
+    assert db._create_filter({"user_id": "alice"}) == '(metadata["user_id"] == "alice")'
+    db.insert(ids=["id1"], vectors=[[0.1] * 4], payloads=[{"user_id": "alice"}])
+    assert "user_id" not in mock_client.insert.call_args.kwargs["data"][0]
+
+
+def test_insert_batches_rows(mock_client):
+    db = _make_db(batch_size=2)
+    db.insert(
+        ids=["id1", "id2", "id3"],
+        vectors=[[0.1] * 4] * 3,
+        payloads=[{"user_id": "alice"}, {"user_id": "bob"}, {"agent_id": "bot"}],
+    )
+
+    assert mock_client.insert.call_count == 2
+    first_batch = mock_client.insert.call_args_list[0].kwargs["data"]
+    second_batch = mock_client.insert.call_args_list[1].kwargs["data"]
+    assert [row["user_id"] for row in first_batch] == ["alice", "bob"]
+    assert second_batch[0]["user_id"] == ""
+
+
+def test_search_batch_sends_one_request(mock_client):
+    db = _make_db(search_params={"ef": 64})
+    mock_client.search.return_value = [
+        [{"id": "id1", "distance": 0.9, "entity": {"metadata": {"data": "a"}}}],
+        [],
+    ]
+
+    results = db.search_batch(["q1", "q2"], [[0.1] * 4, [0.2] * 4], limit=3, filters={"user_id": "alice"})
+
+    mock_client.search.assert_called_once()
+    kwargs = mock_client.search.call_args.kwargs
+    assert kwargs["data"] == [[0.1] * 4, [0.2] * 4]
+    assert kwargs["filter"] == '(user_id == "alice")'
+    assert kwargs["search_params"] == {"params": {"ef": 64}}
+    assert [[r.id for r in res] for res in results] == [["id1"], []]
+
+
+def test_update_and_delete_batch(mock_client):
+    db = _make_db()
+    db.update_batch(["id1", "id2"], vectors=[[0.1] * 4, [0.2] * 4], payloads=[{"user_id": "a"}, {"user_id": "b"}])
+    db.delete_batch(["id1", "id2"])
+
+    mock_client.upsert.assert_called_once()
+    assert len(mock_client.upsert.call_args.kwargs["data"]) == 2
+    mock_client.delete.assert_called_once_with(collection_name="test", ids=["id1", "id2"])
+
+
+@pytest.mark.skipif(importlib.util.find_spec("milvus_lite") is None, reason="Milvus Lite is not installed")
+def test_milvus_lite_round_trip(tmp_path):
+    db = MilvusDB(
+        url=str(tmp_path / "milvus.db"),
+        token=None,
+        collection_name="mem0_test",
+        embedding_model_dims=4,
+        metric_type=MetricType.COSINE,
+        db_name="",
+        index_type="HNSW",
+        index_params={"M": 8, "efConstruction": 64},
+        search_params={"ef": 32},
+    )
+    db.insert(
+        ids=["a", "b", "c"],
+        vectors=[[1, 0, 0, 0], [0.9, 0.1, 0, 0], [0, 1, 0, 0]],
+        payloads=[
+            {"user_id": "alice", "data": "a"},
+            {"user_id": "bob", "data": "b"},
+            {"user_id": "alice", "data": "c"},
+        ],
+    )
+
+    results = db.search_batch(["q1", "q2"], [[1, 0, 0, 0], [0, 1, 0, 0]], limit=2, filters={"user_id": "alice"})
+    assert [[r.id for r in res] for res in results] == [["a", "c"], ["c", "a"]]
+
+    db.delete_batch(["a", "c"])
+    assert db.list(filters={"user_id": "alice"})[0] == []
+    assert db.get("b").payload["data"] == "b"
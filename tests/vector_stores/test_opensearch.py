@@ -177,6 +177,60 @@ class TestOpenSearchDB(unittest.TestCase):
         self.assertEqual(results[0].score, 0.8)
         self.assertEqual(results[0].payload, {"key1": "value1"})
 
+    def test_search_filters_are_pushed_into_knn_for_lucene(self):
+        self.client_mock.search.return_value = {"hits": {"hits": []}}
+        self.os_db.engine = "lucene"
+
+        self.os_db.search(query="", vectors=[0.1] * 1536, limit=5, filters={"user_id": "alice"})
+
+        body = self.client_mock.search.call_args[1]["body"]
+        self.assertEqual(body["size"], 5)
+        self.assertEqual(body["_source"], ["id", "payload"])
+        knn = body["query"]["knn"]["vector_field"]
+        self.assertEqual(knn["filter"], {"bool": {"filter": [{"term": {"payload.user_id.keyword": "alice"}}]}})
+
+    def test_search_filters_fall_back_to_post_filter_for_nmslib(self):
+        self.client_mock.search.return_value = {"hits": {"hits": []}}
+
+        self.os_db.search(query="", vectors=[0.1] * 1536, limit=5, filters={"user_id": "alice"})
+
+        body = self.client_mock.search.call_args[1]["body"]
+        self.assertIn("bool", body["query"])
+        self.assertNotIn("filter", body["query"]["bool"]["must"]["knn"]["vector_field"])
+
+    def test_insert_uses_bulk(self):
+        with patch("mem0.vector_stores.opensearch.bulk") as mock_bulk:
+            self.os_db.insert(vectors=[[0.1] * 1536], payloads=[{"key1": "value1"}], ids=["id1"])
+
+            mock_bulk.assert_called_once()
+            actions = mock_bulk.call_args[0][1]
+            self.assertEqual(actions[0]["_id"], "id1")
+            self.assertEqual(
+                actions[0]["_source"], {"vector_field": [0.1] * 1536, "payload": {"key1": "value1"}, "id": "id1"}
+            )
+        self.client_mock.index.assert_not_called()
+
+    def test_delete_batch(self):
+        self.client_mock.search.return_value = {
+            "hits": {"hits": [{"_id": "doc1", "_source": {"id": "id1"}}, {"_id": "doc2", "_source": {"id": "id2"}}]}
+        }
+        with patch("mem0.vector_stores.opensearch.bulk") as mock_bulk:
+            self.os_db.delete_batch(["id1", "id2"])
+
+            self.client_mock.search.assert_called_once()
+            actions = mock_bulk.call_args[0][1]
+            self.assertEqual([action["_id"] for action in actions], ["doc1", "doc2"])
+            self.assertTrue(all(action["_op_type"] == "delete" for action in actions))
+
+    def test_search_batch(self):
+        self.client_mock.msearch = MagicMock(return_value={"responses": [{"hits": {"hits": []}}] * 2})
+
+        results = self.os_db.search_batch(["q1", "q2"], [[0.1] * 1536, [0.2] * 1536], limit=5)
+
+        self.client_mock.msearch.assert_called_once()
+        self.assertEqual(len(self.client_mock.msearch.call_args[1]["body"]), 4)
+        self.assertEqual(results, [[], []])
+
     def test_delete(self):
         mock_search_response = {"hits": {"hits": [{"_id": "doc1", "_source": {"id": "id1"}}]}}
         self.client_mock.search.return_value = mock_search_response
@@ -188,3 +188,132 @@ def test_count_with_none_vector_count(pinecone_db):
     count = pinecone_db.count()
     assert count == 0
     pinecone_db.index.describe_index_stats.assert_called_once()
+
+
+@pytest.fixture
+def tenant_pinecone_db(mock_pinecone_client):
+    return PineconeDB(
+        collection_name="test_index",
+        embedding_model_dims=128,
+        client=mock_pinecone_client,
+        api_key="fake_api_key",
+        environment="us-west1-gcp",
+        serverless_config=None,
+        pod_config=None,
+        hybrid_search=False,
+        metric="cosine",
+        batch_size=2,
+        extra_params=None,
+        namespace="test_namespace",
+        namespace_field="user_id",
+    )
+
+
+def test_insert_chunks_with_async_requests(mock_pinecone_client):
+    db = PineconeDB(
+        collection_name="test_index",
+        embedding_model_dims=128,
+        client=mock_pinecone_client,
+        api_key="fake_api_key",
+        environment="us-west1-gcp",
+        serverless_config=None,
+        pod_config=None,
+        hybrid_search=False,
+        metric="cosine",
+        batch_size=2,
+        extra_params=None,
+        namespace="test_namespace",
+        pool_threads=4,
+    )
+    mock_pinecone_client.Index.assert_called_with("test_index", pool_threads=4)
+
+    db.insert([[0.1] * 128] * 5, [{"data": str(i)} for i in range(5)], [f"id{i}" for i in range(5)])
+
+    assert db.index.upsert.call_count == 3
+    for call in db.index.upsert.call_args_list:
+        assert call.kwargs["async_req"] is True
+    assert db.index.upsert.return_value.get.call_count == 3
+
+
+def test_namespace_per_tenant_routing(tenant_pinecone_db):
+    db = tenant_pinecone_db
+
+    db.insert([[0.1] * 128, [0.2] * 128], [{"user_id": "alice"}, {"user_id": "bob"}], ["id1", "id2"])
+    namespaces = sorted(call.kwargs["namespace"] for call in db.index.upsert.call_args_list)
+    assert namespaces == ["alice", "bob"]
+
+    db.index.query.return_value.matches = []
+    db.search("query", [0.1] * 128, filters={"user_id": "alice"})
+    assert db.index.query.call_args.kwargs["namespace"] == "alice"
+
+    db.delete_batch(["id1", "id2"])
+    deletes = {call.kwargs["namespace"]: call.kwargs["ids"] for call in db.index.delete.call_args_list}
+    assert deletes == {"alice": ["id1"], "bob": ["id2"]}
+
+
+def test_known_namespaces_are_used_without_scanning(tenant_pinecone_db):
+    from pinecone import Vector
+
+    db = tenant_pinecone_db
+    db.index.fetch.return_value.vectors = {"id2": Vector(id="id2", values=[0.1] * 128, metadata={"user_id": "bob"})}
+
+    results = db.get_batch(["id2", "missing"], namespace="bob")
+
+    assert results[0].id == "id2"
+    assert results[1] is None
+    db.index.fetch.assert_called_once_with(ids=["id2", "missing"], namespace="bob")
+    assert db._id_namespaces["id2"] == "bob"
+
+    db.update("id3", payload={"user_id": "carol", "data": "x"})
+    db.index.update.assert_called_once_with(id="id3", set_metadata={"user_id": "carol", "data": "x"}, namespace="carol")
+    db.index.describe_index_stats.assert_not_called()
+
+
+def test_unseen_ids_are_looked_up_in_every_namespace(tenant_pinecone_db):
+    from pinecone import Vector
+
+    # A fresh instance, e.g. after a restart or in another worker, has no namespace for the ID
+    db = tenant_pinecone_db
+    db.index.describe_index_stats.return_value.namespaces = {"alice": MagicMock(), "bob": MagicMock()}
+    stored = {"bob": {"id2": Vector(id="id2", values=[0.1] * 128, metadata={"user_id": "bob", "data": "x"})}}
+
+    def fetch(ids, namespace):
+        response = MagicMock()
+        response.vectors = {i: v for i, v in stored.get(namespace, {}).items() if i in ids}
+        return response
+
+    db.index.fetch.side_effect = fetch
+
+    assert db.get("id2").payload == {"user_id": "bob", "data": "x"}
+    assert db._id_namespaces["id2"] == "bob"
+
+    db._id_namespaces.clear()
+    db.update("id2", payload={"data": "y"})
+    db.index.update.assert_called_once_with(id="id2", set_metadata={"data": "y"}, namespace="bob")
+
+    db._id_namespaces.clear()
+    db.delete("id2")
+    db.index.delete.assert_called_once_with(ids=["id2"], namespace="bob")
+
+    assert db.get("missing") is None
+    db.delete("missing")
+    db.index.delete.assert_called_once()
+
+
+def test_remembered_namespaces_are_bounded(tenant_pinecone_db, monkeypatch):
+    monkeypatch.setattr(PineconeDB, "NAMESPACE_CACHE_SIZE", 2)
+    db = tenant_pinecone_db
+
+    payloads = [{"user_id": "alice"}, {"user_id": "bob"}, {"user_id": "carol"}]
+    db.insert([[0.1] * 128] * 3, payloads, ["id1", "id2", "id3"])
+
+    assert list(db._id_namespaces.items()) == [("id2", "bob"), ("id3", "carol")]
+
+
+def test_update_batch_without_vector_uses_set_metadata(pinecone_db):
+    pinecone_db.update_batch(["id1", "id2"], [[0.5] * 128, None], [{"name": "a"}, {"name": "b"}])
+
+    pinecone_db.index.upsert.assert_called_once_with(
+        vectors=[{"id": "id1", "values": [0.5] * 128, "metadata": {"name": "a"}}], namespace="test_namespace"
+    )
+    pinecone_db.index.update.assert_called_once_with(id="id2", set_metadata={"name": "b"}, namespace="test_namespace")
@@ -0,0 +1,139 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from mem0.vector_stores.redis import DEFAULT_FIELDS, RedisDB
+
+
+@pytest.fixture
+def mock_redis():
+    with patch("mem0.vector_stores.redis.redis.Redis") as mock_redis_cls, patch(
+        "mem0.vector_stores.redis.SearchIndex"
+    ) as mock_index_cls:
+        mock_index = MagicMock()
+        mock_index_cls.from_dict.return_value = mock_index
+        yield mock_redis_cls, mock_index_cls, mock_index
+
+
+def _payload(**extra):
+    payload = {
+        "hash": "abc",
+        "data": "Likes sci-fi movies",
+        "created_at": "2025-01-01T10:00:00-08:00",
+        "user_id": "alice",
+    }
+    payload.update(extra)
+    return payload
+
+
+def _result(memory_id, distance):
+    return {
+        "memory_id": memory_id,
+        "vector_distance": distance,
+        "hash": "abc",
+        "memory": "Likes sci-fi movies",
+        "created_at": "1735754400",
+        "user_id": "alice",
+        "metadata": "{}",
+    }
+
+
+def test_default_schema_uses_flat_float32(mock_redis):
+    _, mock_index_cls, _ = mock_redis
+    store = RedisDB(redis_url="redis://localhost:6379", collection_name="test", embedding_model_dims=3)
+
+    attrs = store.schema["fields"][-1]["attrs"]
+    assert attrs["algorithm"] == "flat"
+    assert attrs["datatype"] == "float32"
+    assert attrs["dims"] == 3
+    assert "m" not in attrs
+    # The module level defaults must not be mutated by an instance
+    assert "dims" not in DEFAULT_FIELDS[-1]["attrs"]
+    mock_index_cls.from_dict.assert_called_once_with(store.schema)
+
+
+def test_hnsw_float16_schema(mock_redis):
+    store = RedisDB(
+        redis_url="redis://localhost:6379",
+        collection_name="test",
+        embedding_model_dims=3,
+        index_algorithm="hnsw",
+        hnsw_m=32,
+        hnsw_ef_construction=400,
+        hnsw_ef_runtime=50,
+        vector_datatype="float16",
+    )
+
+    attrs = store.schema["fields"][-1]["attrs"]
+    assert attrs["algorithm"] == "hnsw"
+    assert attrs["datatype"] == "float16"
+    assert attrs["m"] == 32
+    assert attrs["ef_construction"] == 400
+    assert attrs["ef_runtime"] == 50
+
+
+def test_insert_loads_all_rows_in_one_batch(mock_redis):
+    _, _, mock_index = mock_redis
+    store = RedisDB(
+        redis_url="redis://localhost:6379",
+        collection_name="test",
+        embedding_model_dims=3,
+        vector_datatype="float16",
+        batch_size=50,
+    )
+
+    vectors = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+    store.insert(vectors=vectors, payloads=[_payload(), _payload(category="movies")], ids=["id1", "id2"])
+
+    mock_index.load.assert_called_once()
+    data = mock_index.load.call_args.args[0]
+    assert mock_index.load.call_args.kwargs == {"id_field": "memory_id", "batch_size": 50}
+    assert [entry["memory_id"] for entry in data] == ["id1", "id2"]
+    assert data[0]["embedding"] == np.array(vectors[0], dtype=np.float16).tobytes()
+    assert data[1]["metadata"] == '{"category": "movies"}'
+    assert data[0]["user_id"] == "alice"
+
+
+def test_delete_batch_drops_keys_in_chunks(mock_redis):
+    _, _, mock_index = mock_redis
+    store = RedisDB(redis_url="redis://localhost:6379", collection_name="test", embedding_model_dims=3, batch_size=2)
+
+    store.delete_batch(["id1", "id2", "id3"])
+
+    assert mock_index.drop_keys.call_count == 2
+    assert mock_index.drop_keys.call_args_list[0].args[0] == ["mem0:test:id1", "mem0:test:id2"]
+    assert mock_index.drop_keys.call_args_list[1].args[0] == ["mem0:test:id3"]
+
+
+def test_update_batch_uses_explicit_keys(mock_redis):
+    _, _, mock_index = mock_redis
+    store = RedisDB(redis_url="redis://localhost:6379", collection_name="test", embedding_model_dims=3)
+
+    store.update_batch(
+        ["id1", "id2"],
+        vectors=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]],
+        payloads=[_payload(updated_at="2025-01-02T10:00:00-08:00"), _payload()],
+    )
+
+    mock_index.load.assert_called_once()
+    kwargs = mock_index.load.call_args.kwargs
+    assert kwargs["keys"] == ["mem0:test:id1", "mem0:test:id2"]
+    assert "updated_at" in kwargs["data"][0]
+    assert "updated_at" not in kwargs["data"][1]
+
+
+def test_search_batch_uses_single_batch_query(mock_redis):
+    _, _, mock_index = mock_redis
+    store = RedisDB(redis_url="redis://localhost:6379", collection_name="test", embedding_model_dims=3)
+    mock_index.batch_query.return_value = [[_result("id1", 0.1)], [_result("id2", 0.2), _result("id3", 0.3)]]
+
+    results = store.search_batch(
+        ["q1", "q2"], [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], limit=2, filters={"user_id": "alice"}
+    )
+
+    mock_index.batch_query.assert_called_once()
+    assert len(mock_index.batch_query.call_args.args[0]) == 2
+    mock_index.query.assert_not_called()
+    assert [[r.id for r in res] for res in results] == [["id1"], ["id2", "id3"]]
+    assert results[1][0].payload["user_id"] == "alice"
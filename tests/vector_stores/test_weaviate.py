@@ -1,3 +1,121 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mem0.vector_stores.weaviate import Weaviate
+
+ID_1 = str(uuid.UUID(int=1))
+ID_2 = str(uuid.UUID(int=2))
+ID_3 = str(uuid.UUID(int=3))
+
+
+@pytest.fixture
+def mock_client():
+    client = MagicMock()
+    client.collections.exists.return_value = True
+    collection = client.collections.get.return_value
+    collection.batch.failed_objects = []
+    with patch("mem0.vector_stores.weaviate.weaviate.connect_to_local", return_value=client):
+        yield client
+
+
+@pytest.fixture
+def weaviate_db(mock_client):
+    return Weaviate(collection_name="test_collection", embedding_model_dims=3, cluster_url="http://localhost:8080")
+
+
+def _stored_object(object_id, properties, vector):
+    obj = MagicMock()
+    obj.uuid = uuid.UUID(object_id)
+    obj.properties = properties
+    obj.vector = {"default": vector}
+    return obj
+
+
+def test_insert_uses_dynamic_batching_by_default(weaviate_db, mock_client):
+    collection = mock_client.collections.get.return_value
+
+    weaviate_db.insert([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], [{"data": "a"}, {"data": "b"}], [ID_1, ID_2])
+
+    collection.batch.dynamic.assert_called_once_with()
+    collection.batch.fixed_size.assert_not_called()
+    batch = collection.batch.dynamic.return_value.__enter__.return_value
+    assert [call.kwargs["uuid"] for call in batch.add_object.call_args_list] == [ID_1, ID_2]
+    assert batch.add_object.call_args_list[1].kwargs["properties"] == {"data": "b"}
+
+
+def test_insert_uses_fixed_size_batches_when_configured(weaviate_db, mock_client):
+    weaviate_db.batch_size = 50
+    weaviate_db.batch_concurrent_requests = 4
+    collection = mock_client.collections.get.return_value
+
+    weaviate_db.insert([[0.1, 0.2, 0.3]], [{"data": "a"}], [ID_1])
+
+    collection.batch.fixed_size.assert_called_once_with(batch_size=50, concurrent_requests=4)
+    collection.batch.dynamic.assert_not_called()
+
+
+def test_failed_batch_objects_are_logged(weaviate_db, mock_client, caplog):
+    collection = mock_client.collections.get.return_value
+    collection.batch.failed_objects = [MagicMock(message="vector length mismatch")]
+
+    weaviate_db.insert([[0.1, 0.2, 0.3]], [{"data": "a"}], [ID_1])
+
+    assert "Failed to write 1 objects to test_collection: vector length mismatch" in caplog.text
+
+
+def test_update_batch_keeps_current_vector_and_properties(weaviate_db, mock_client):
+    collection = mock_client.collections.get.return_value
+    collection.query.fetch_objects.return_value.objects = [
+        _stored_object(ID_1, {"data": "old", "user_id": "alice"}, [0.1, 0.1, 0.1]),
+        _stored_object(ID_2, {"data": "kept", "user_id": "bob"}, [0.2, 0.2, 0.2]),
+    ]
+
+    weaviate_db.update_batch(
+        [ID_1, ID_2, ID_3],
+        vectors=[None, [0.9, 0.9, 0.9], [0.3, 0.3, 0.3]],
+        payloads=[{"data": "new", "id": ID_1}, None, {"data": "missing"}],
+    )
+
+    fetch = collection.query.fetch_objects.call_args.kwargs
+    assert fetch["filters"].value == [ID_1, ID_2, ID_3]
+    assert fetch["limit"] == 3
+    assert fetch["include_vector"] is True
+
+    batch = collection.batch.dynamic.return_value.__enter__.return_value
+    writes = {call.kwargs["uuid"]: call.kwargs for call in batch.add_object.call_args_list}
+    assert set(writes) == {ID_1, ID_2}
+    assert writes[ID_1]["properties"] == {"data": "new", "user_id": "alice"}
+    assert writes[ID_1]["vector"] == [0.1, 0.1, 0.1]
+    assert writes[ID_2]["properties"] == {"data": "kept", "user_id": "bob"}
+    assert writes[ID_2]["vector"] == [0.9, 0.9, 0.9]
+    collection.data.update.assert_not_called()
+
+
+def test_update_batch_without_ids_does_nothing(weaviate_db, mock_client):
+    collection = mock_client.collections.get.return_value
+
+    weaviate_db.update_batch([])
+
+    collection.query.fetch_objects.assert_not_called()
+    collection.batch.dynamic.assert_not_called()
+
+
+def test_delete_batch_sends_one_delete_many_request(weaviate_db, mock_client):
+    collection = mock_client.collections.get.return_value
+
+    weaviate_db.delete_batch([ID_1, uuid.UUID(ID_2)])
+
+    collection.data.delete_many.assert_called_once()
+    where = collection.data.delete_many.call_args.kwargs["where"]
+    assert where.value == [ID_1, ID_2]
+    collection.data.delete_by_id.assert_not_called()
+
+    weaviate_db.delete_batch([])
+    collection.data.delete_many.assert_called_once()
+
+
 # import os
 # import uuid
 # import httpx